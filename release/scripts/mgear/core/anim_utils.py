@@ -7,7 +7,9 @@ from .six import PY2
 
 # Maya imports
 from maya import cmds
+from maya.api import OpenMaya
 import mgear.pymaya as pm
+from mgear.pymaya import modifier
 from mgear.pymaya import versions
 
 # mGear imports
@@ -20,6 +22,7 @@ from mgear.core import transform
 from mgear.core import utils
 from mgear.core import attribute
 from mgear.core import vector
+from mgear.core import sampling
 from mgear.core.attribute import reset_selected_channels_value
 from mgear.core.pickWalk import get_all_tag_children
 
@@ -1431,8 +1434,335 @@ def getMirrorTarget(nameSpace=None, node=None):
         return node
 
 
+##################################################
+# MIRROR TABLE
+##################################################
+
+# mirror tables by rig root uuid
+__mirror_tables = {}
+__mirror_callbacks = []
+# callbacks watching the controls of each mirror table, by rig root uuid
+__mirror_table_callbacks = {}
+
+# attribute changes of the controls invalidating their mirror table
+MIRROR_TABLE_MESSAGES = (
+    OpenMaya.MNodeMessage.kAttributeLocked
+    | OpenMaya.MNodeMessage.kAttributeUnlocked
+    | OpenMaya.MNodeMessage.kAttributeKeyable
+    | OpenMaya.MNodeMessage.kAttributeUnkeyable
+    | OpenMaya.MNodeMessage.kAttributeAdded
+    | OpenMaya.MNodeMessage.kAttributeRemoved
+    | OpenMaya.MNodeMessage.kAttributeRenamed
+)
+
+
+def clear_mirror_tables():
+    """Clear the cached mirror tables
+
+    The tables are cleared before opening a scene or creating a new one, and
+    the table of a rig is removed when its controls are renamed, deleted, or
+    their channels are added, removed, locked, made keyable or inverted.
+    """
+    for uuid in list(__mirror_tables):
+        remove_mirror_table(uuid)
+
+
+def _clear_mirror_tables(*args):
+    clear_mirror_tables()
+
+
+def remove_mirror_table(uuid):
+    """Remove the cached mirror table of a rig, and its callbacks
+
+    Args:
+        uuid (str): The rig root uuid
+    """
+    __mirror_tables.pop(uuid, None)
+    for callback in __mirror_table_callbacks.pop(uuid, []):
+        OpenMaya.MMessage.removeCallback(callback)
+
+
+def _mirror_control_changed(msg, plug, other_plug, uuid):
+    # the invert attributes set the channels multiplier
+    if msg & MIRROR_TABLE_MESSAGES or (
+        msg & OpenMaya.MNodeMessage.kAttributeSet
+        and plug.partialName().startswith("inv")
+    ):
+        remove_mirror_table(uuid)
+
+
+def _mirror_control_removed(*args):
+    remove_mirror_table(args[-1])
+
+
+def _add_mirror_table_callbacks(uuid, names):
+    """Add the callbacks removing a mirror table when its controls change
+
+    Args:
+        uuid (str): The rig root uuid
+        names (list of str): The controls and their mirror targets
+    """
+    callbacks = __mirror_table_callbacks.setdefault(uuid, [])
+    for name in names:
+        try:
+            selection = OpenMaya.MSelectionList()
+            selection.add(name)
+            mobject = selection.getDependNode(0)
+        except RuntimeError:
+            continue
+        callbacks.extend(
+            [
+                OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                    mobject, _mirror_control_changed, uuid
+                ),
+                OpenMaya.MNodeMessage.addNameChangedCallback(
+                    mobject, _mirror_control_removed, uuid
+                ),
+                OpenMaya.MNodeMessage.addNodePreRemovalCallback(
+                    mobject, _mirror_control_removed, uuid
+                ),
+            ]
+        )
+
+
+def get_rig_root(node):
+    """Get the rig root of a node
+
+    Args:
+        node (str or PyNode): The node
+
+    Returns:
+        str: The rig root long name, None if the node isn't in a rig
+    """
+    if hasattr(node, "longName"):
+        path = node.longName()
+    else:
+        path = (cmds.ls(node, long=True) or [""])[0]
+
+    parts = path.split("|")
+    for i in range(len(parts), 1, -1):
+        holder = "|".join(parts[:i])
+        if cmds.attributeQuery("is_rig", node=holder, exists=True):
+            return holder
+
+
+def get_mirror_table(root, rebuild=False):
+    """Get the mirror table of a rig
+
+    The table is built once for all the rig controls and cached, until the
+    controls change, see clear_mirror_tables.
+
+    Args:
+        root (str or PyNode): The rig root
+        rebuild (bool, optional): If True, build the table again
+
+    Returns:
+        dict: The mirror table, see build_mirror_table
+    """
+    uuid = cmds.ls(root, uuid=True)[0]
+    table = __mirror_tables.get(uuid)
+    if table is None or rebuild:
+        remove_mirror_table(uuid)
+        controls = getControlers(pm.PyNode(root)) or []
+        table = build_mirror_table(controls)
+        __mirror_tables[uuid] = table
+
+        names = set()
+        for control in controls:
+            name = control.name()
+            names.add(name)
+            entry = table.get(stripNamespace(name))
+            if entry is not None:
+                nameSpace = getNamespace(name)
+                names.add(
+                    ":".join([nameSpace, entry[0]]) if nameSpace else entry[0]
+                )
+        _add_mirror_table_callbacks(uuid, sorted(names))
+
+        if not __mirror_callbacks:
+            for msg in (
+                OpenMaya.MSceneMessage.kBeforeOpen,
+                OpenMaya.MSceneMessage.kBeforeNew,
+            ):
+                __mirror_callbacks.append(
+                    OpenMaya.MSceneMessage.addCallback(
+                        msg, _clear_mirror_tables
+                    )
+                )
+
+    return table
+
+
+def build_mirror_table(nodes):
+    """Build the mirror table of some controls
+
+    Args:
+        nodes (list of PyNode): The controls
+
+    Returns:
+        dict: The mirror target and the channels of each control, without
+            namespace. The channels are tuples of the control attribute,
+            the target attribute and the invert multiplier. The target
+            channels locked or missing are skipped.
+            {"arm_L0_fk0_ctl": ("arm_R0_fk0_ctl", [("tx", "tx", -1), ...])}
+    """
+    table = {}
+    for node in nodes:
+        if isinstance(node, str):
+            node = pm.PyNode(node)
+
+        name = node.name()
+        target = getMirrorTarget(getNamespace(name), node)
+        if target is None:
+            continue
+
+        table[stripNamespace(name)] = (
+            stripNamespace(target.name()),
+            _get_mirror_channels(node, target),
+        )
+
+    return table
+
+
+def _get_mirror_channels(srcNode, targetNode):
+    """Get the mirrored channels of a control, see build_mirror_table"""
+    channels = []
+    for attrName in listAttrForMirror(srcNode):
+
+        # whether does attribute "invTx" exists when attrName is "tx"
+        invCheckName = getInvertCheckButtonAttrName(attrName)
+        if pm.attributeQuery(
+            invCheckName, node=srcNode, shortName=True, exists=True
+        ) and srcNode.attr(invCheckName).get():
+            inv = -1
+        else:
+            inv = 1
+
+        # if attr name is side specified, record inverted attr name
+        if isSideElement(attrName):
+            invAttrName = swapSideLabel(attrName)
+        else:
+            invAttrName = attrName
+
+        if any(invAttrName.count(skip) for skip in NO_MIRROR_ATTRIBUTES):
+            continue
+        if not cmds.attributeQuery(
+            invAttrName, node=targetNode.name(), shortName=True, exists=True
+        ):
+            continue
+        if targetNode.attr(invAttrName).isLocked():
+            continue
+        # only the single values can be inverted
+        if not isinstance(srcNode.attr(attrName).get(), (bool, int, float)):
+            continue
+
+        channels.append((attrName, invAttrName, inv))
+
+    return channels
+
+
+def get_mirror_pairs(nodes, flip=False):
+    """Get the mirrored channels of the controls from the mirror tables
+
+    The controls out of a rig controllers set get a mirror entry built on
+    the fly.
+
+    Args:
+        nodes (list of PyNode or str): Controls to mirror
+        flip (bool, optional): If True, also mirror the targets onto the
+            controls
+
+    Returns:
+        list: The source attribute name, the target attribute name and the
+            invert multiplier of each channel
+    """
+    names = [n if isinstance(n, str) else n.name() for n in nodes]
+    # tables by namespace
+    tables = {}
+
+    def get_entry(name):
+        nameSpace = getNamespace(name)
+        short = stripNamespace(name)
+        table = tables.get(nameSpace)
+        if table is None:
+            root = get_rig_root(name)
+            table = get_mirror_table(root) if root else {}
+            tables[nameSpace] = table
+        if short not in table:
+            return build_mirror_table([name]).get(short)
+        return table[short]
+
+    pairs = []
+    for name in names:
+        entry = get_entry(name)
+        if entry is None:
+            continue
+        nameSpace = getNamespace(name)
+        target = ":".join([nameSpace, entry[0]]) if nameSpace else entry[0]
+        for attrName, invAttrName, inv in entry[1]:
+            pairs.append(
+                (
+                    "{}.{}".format(name, attrName),
+                    "{}.{}".format(target, invAttrName),
+                    inv,
+                )
+            )
+
+        # To flip a pose, do mirroring both ways.
+        if flip and target not in names:
+            entry = get_entry(target)
+            if entry is None:
+                continue
+            for attrName, invAttrName, inv in entry[1]:
+                pairs.append(
+                    (
+                        "{}.{}".format(target, attrName),
+                        "{}.{}".format(name, invAttrName),
+                        inv,
+                    )
+                )
+
+    return pairs
+
+
+def _is_free_to_change(attr):
+    """Check if an attribute is neither locked nor driven by a connection
+
+    Args:
+        attr (str): The attribute name
+
+    Returns:
+        bool: True if the attribute value can be set by a modifier
+    """
+    selection = OpenMaya.MSelectionList()
+    selection.add(attr)
+    plug = selection.getPlug(0)
+    return plug.isFreeToChange() == OpenMaya.MPlug.kFreeToChange
+
+
+def _set_mirror_values(values):
+    """Set the mirrored values one by one, logging the failing channels
+
+    Args:
+        values (list): The target attribute names and values
+    """
+    for tgt, value in values:
+        try:
+            pm.setAttr(tgt, value)
+        except Exception as e:
+            mgear.log(
+                "applyMirror failed: {0}: {1}".format(tgt, e),
+                mgear.sev_error,
+            )
+
+
 def mirrorPose(flip=False, nodes=None):
-    """Summary
+    """Mirror or flip the pose of the controls
+
+    The channels of the cached mirror tables of the rigs are read at once.
+    The free target channels are set in a single batch, and the keyed or
+    driven ones one by one. If the batch fails, its channels are set one by
+    one too.
 
     Args:
         flip (bool, options): Set the function behaviour to flip
@@ -1446,34 +1776,140 @@ def mirrorPose(flip=False, nodes=None):
 
     pm.undoInfo(ock=1)
     try:
-        nameSpace = False
-        nameSpace = getNamespace(nodes[0])
+        pairs = get_mirror_pairs(nodes, flip)
 
-        mirrorEntries = []
-        for oSel in nodes:
-            target = getMirrorTarget(nameSpace, oSel)
-            mirrorEntries.extend(calculateMirrorData(oSel, target))
+        # the sources are read first, as the targets can be sources
+        sources = modifier.getAttrs([src for src, _, _ in pairs])
 
-            # To flip a pose, do mirroring both ways.
-            if target not in nodes and flip:
-                mirrorEntries.extend(calculateMirrorData(target, oSel))
+        batched = []
+        single = []
+        for (src, tgt, inv), value in zip(pairs, sources):
+            if _is_free_to_change(tgt):
+                batched.append((tgt, value * inv))
+            else:
+                single.append((tgt, value * inv))
+
+        # the errors of the batched edits are raised when the batch executes
+        try:
+            with modifier.Batch():
+                for tgt, value in batched:
+                    pm.setAttr(tgt, value)
+        except Exception as e:
+            mgear.log(
+                "mirrorPose batch failed, setting the channels one by one: "
+                "{0}".format(e),
+                mgear.sev_warning,
+            )
+            single = batched + single
 
-        for dat in mirrorEntries:
-            applyMirror(nameSpace, dat)
+        _set_mirror_values(single)
 
     except Exception as e:
         pm.displayWarning("Flip/Mirror pose fail")
         pm.displayWarning(
             "If you are using Custom naming rules in controls. "
             "It is possible that the name configuration makes hard to track "
-            "the correct object to mirror for {}".format(oSel.name())
+            "the correct object to mirror"
         )
-        import traceback
+        traceback.print_exc()
+        print(e)
+
+    finally:
+        pm.undoInfo(cck=1)
+
+
+def mirrorAnimation(flip=False, nodes=None, time_range=None):
+    """Mirror or flip the animation of the controls in a frame range
+
+    The keys of the animation curves connected to the source channels are
+    pasted on the target channels, inverted if needed. The keys of the
+    targets in the range are replaced. The source channels without
+    animation set a single key, or their value, on the targets.
+
+    Args:
+        flip (bool, options): Set the function behaviour to flip
+        nodes (None,  [PyNode]): Controls to mirro/flip the animation
+        time_range (tuple, optional): The start and end frames. The playback
+            range by default
+    """
+    if nodes is None:
+        nodes = pm.selected()
+
+    if not nodes:
+        return
+
+    if not time_range:
+        time_range = (
+            cmds.playbackOptions(q=True, min=True),
+            cmds.playbackOptions(q=True, max=True),
+        )
+    start, end = time_range
 
+    pm.undoInfo(ock=1)
+    snapshots = []
+    try:
+        pairs = get_mirror_pairs(nodes, flip)
+
+        # the source curves are copied first, the targets can be sources
+        sources = {}
+        for src, _, _ in pairs:
+            if src in sources:
+                continue
+            curves = cmds.listConnections(
+                src, source=True, destination=False, type="animCurve"
+            )
+            if curves:
+                sources[src] = cmds.duplicate(curves[0])[0]
+                snapshots.append(sources[src])
+            else:
+                sources[src] = None
+        statics = [pair for pair in pairs if sources[pair[0]] is None]
+        values = modifier.getAttrs([pair[0] for pair in statics])
+
+        for src, tgt, inv in pairs:
+            snapshot = sources[src]
+            node, attr = tgt.split(".", 1)
+            if snapshot is None:
+                continue
+            if cmds.copyKey(snapshot, time=(start, end)):
+                cmds.pasteKey(
+                    node, attribute=attr, time=(start, end), option="replace"
+                )
+                if inv == -1:
+                    cmds.scaleKey(
+                        node,
+                        attribute=attr,
+                        time=(start, end),
+                        valueScale=-1,
+                        valuePivot=0,
+                    )
+            else:
+                cmds.cutKey(
+                    node, attribute=attr, time=(start, end), clear=True
+                )
+
+        static_values = []
+        for (src, tgt, inv), value in zip(statics, values):
+            node, attr = tgt.split(".", 1)
+            if cmds.keyframe(node, attribute=attr, q=True, keyframeCount=True):
+                cmds.cutKey(
+                    node, attribute=attr, time=(start, end), clear=True
+                )
+                cmds.setKeyframe(
+                    node, attribute=attr, time=start, value=value * inv
+                )
+            else:
+                static_values.append((tgt, value * inv))
+        modifier.setAttrs(static_values)
+
+    except Exception as e:
+        pm.displayWarning("Flip/Mirror animation fail")
         traceback.print_exc()
         print(e)
 
     finally:
+        if snapshots:
+            cmds.delete(snapshots)
         pm.undoInfo(cck=1)
 
 
@@ -1871,6 +2307,64 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
             if isinstance(c, AbstractAnimationTransfer):
                 c.deleteLater()
 
+    def bakeSampledAnimation(
+        self,
+        switch_attr_name,
+        val_src_nodes,
+        key_src_nodes,
+        key_dst_nodes,
+        startFrame,
+        endFrame,
+        onlyKeyframes=True,
+    ):
+        # type = (str, List[pm.nodetypes.Transform],
+        # List[pm.nodetypes.Transform],
+        # List[pm.nodetypes.Transform], int, int, bool) -> None
+        """Bake the animation without moving the timeline.
+
+        The source world matrices are sampled on all the frames, then the
+        destination channels are solved and keyed at once.
+        """
+        pm.cycleCheck(e=False)
+
+        channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+        src_keys = pm.keyframe(key_src_nodes, at=["t", "r", "s"], q=True)
+        keyframeList = sorted(set(src_keys or []))
+        frames = [
+            x
+            for x in range(startFrame, endFrame + 1)
+            if not onlyKeyframes or x in keyframeList
+        ]
+
+        pairs = [
+            (src, dst)
+            for src, dst in zip(val_src_nodes, key_dst_nodes)
+            if src
+        ]
+        worldMatrices = sampling.get_world_matrices(
+            [src for src, _ in pairs], frames
+        )
+
+        # delete animation in the space switch channel and destination ctrls
+        pm.cutKey(key_dst_nodes, at=channels, time=(startFrame, endFrame))
+        pm.cutKey(switch_attr_name, time=(startFrame, endFrame))
+
+        # set the new space in the channel
+        self.changeAttrToBoundValue()
+        if frames:
+            cmds.setKeyframe(
+                str(switch_attr_name),
+                time=frames,
+                value=cmds.getAttr(str(switch_attr_name)),
+            )
+
+        # bake the stored transforms to the cotrols
+        sampling.bake_world_matrices(
+            [dst for _, dst in pairs], worldMatrices, frames, channels
+        )
+
+        pm.cycleCheck(e=True)
+
     @utils.one_undo
     @utils.viewport_off
     def bakeAnimation(
@@ -1889,6 +2383,17 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         # List[pm.nodetypes.Transform],
         # List[pm.nodetypes.Transform], int, int, bool) -> None
 
+        if sampling.NUMPY_READY:
+            return self.bakeSampledAnimation(
+                switch_attr_name,
+                val_src_nodes,
+                key_src_nodes,
+                key_dst_nodes,
+                startFrame,
+                endFrame,
+                onlyKeyframes,
+            )
+
         # Temporaly turn off cycle check to avoid misleading cycle message
         # on Maya 2016.  With Maya 2016.5 and 2017 the cycle warning doesn't
         # show up
@@ -1994,6 +2499,17 @@ class ParentSpaceTransfer(AbstractAnimationTransfer):
         definition="",
     ):
 
+        if sampling.NUMPY_READY:
+            return self.bakeSampledAnimation(
+                switch_attr_name,
+                val_src_nodes,
+                key_src_nodes,
+                key_dst_nodes,
+                startFrame,
+                endFrame,
+                onlyKeyframes,
+            )
+
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
         src_keys = pm.keyframe(key_src_nodes, at=["t", "r", "s"], q=True)
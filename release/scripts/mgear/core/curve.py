@@ -5,6 +5,7 @@
 #############################################
 # GLOBAL
 #############################################
+import collections
 from functools import wraps
 import mgear.pymaya as pm
 import maya.cmds as cmds
@@ -21,6 +22,13 @@ from mgear.core import transform
 
 from .six import string_types
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
 #############################################
 # CURVE
 #############################################
@@ -1046,36 +1054,345 @@ def lock_first_point(crv):
 # ========================================
 
 
-def evaluate_cubic_nurbs(control_points, percentage, knots=None, weights=None):
+def uniform_knots(count, degree=3):
+    """
+    Get the clamped uniform knot vector of a curve.
+
+    Args:
+        count (int): Number of control points.
+        degree (int, optional): Degree of the curve.
+
+    Returns:
+        list: Knot vector, with count + degree + 1 knots.
+    """
+    inner = count - degree - 1
+    return (
+        [0] * (degree + 1)
+        + [i for i in range(1, inner + 1)]
+        + [inner + 1] * (degree + 1)
+    )
+
+
+class NurbsEvaluator(object):
+    """
+    Batch evaluator of a NURBS curve.
+
+    Evaluates all the parameters of an array in one NumPy pass, using the
+    non-zero basis functions of the knot span of each parameter. The spans
+    and basis functions of the last parameter arrays are cached, so the
+    positions and tangents at the same parameters are computed once.
+
+    Args:
+        control_points (list): List of control points, each as [x, y, z].
+        degree (int, optional): Degree of the curve. Lowered if there are
+            not enough control points.
+        knots (list, optional): Knot vector, with
+            len(control_points) + degree + 1 knots. Clamped uniform if None.
+        weights (list, optional): List of weights corresponding to control
+            points.
+
+    Example:
+        .. code-block:: python
+
+            ev = curve.NurbsEvaluator.from_curve("spine_crv")
+            points, tangents = ev.evaluate(
+                ev.arc_length_params(100), tangents=True
+            )
+    """
+
+    # number of parameter arrays whose basis functions are kept
+    CACHE_SIZE = 8
+
+    def __init__(self, control_points, degree=3, knots=None, weights=None):
+        if not NUMPY_READY:
+            raise RuntimeError("NumPy is required to evaluate NURBS curves")
+
+        self.points = np.asarray(control_points, dtype=float)
+        count = len(self.points)
+        if count < 2:
+            raise ValueError("A curve needs at least 2 control points")
+        self.degree = min(degree, count - 1)
+        if knots is None:
+            knots = uniform_knots(count, self.degree)
+        self.knots = np.asarray(knots, dtype=float)
+        if len(self.knots) != count + self.degree + 1:
+            raise ValueError(
+                "Expected {} knots, got {}".format(
+                    count + self.degree + 1, len(self.knots)
+                )
+            )
+        if weights is None:
+            self.weights = np.ones(count)
+        else:
+            self.weights = np.asarray(weights, dtype=float)
+        self.__cache = collections.OrderedDict()
+
+    @classmethod
+    def from_curve(cls, curve, space=om2.MSpace.kWorld):
+        """
+        Get the evaluator of a Maya NURBS curve.
+
+        Args:
+            curve (str or PyNode): The curve transform or shape.
+            space (int, optional): The space of the control points.
+
+        Returns:
+            NurbsEvaluator: The evaluator.
+        """
+        sel_list = om2.MSelectionList()
+        sel_list.add(str(curve))
+        curve_fn = om2.MFnNurbsCurve(sel_list.getDagPath(0))
+        cvs = curve_fn.cvPositions(space)
+        # Maya doesn't store the first and last knots, which don't change
+        # the curve inside its domain
+        knots = list(curve_fn.knots())
+        knots = [knots[0]] + knots + [knots[-1]]
+        return cls(
+            [[p.x, p.y, p.z] for p in cvs],
+            degree=curve_fn.degree,
+            knots=knots,
+            weights=[p.w for p in cvs],
+        )
+
+    @property
+    def domain(self):
+        """tuple: The first and last parameters of the curve."""
+        return (
+            float(self.knots[self.degree]),
+            float(self.knots[len(self.points)]),
+        )
+
+    def params_from_percentages(self, percentages):
+        """
+        Get the parameters at percentages of the curve domain.
+
+        Args:
+            percentages (array): Curve positions as percentages (0 to 100).
+
+        Returns:
+            array: The parameters.
+        """
+        start, end = self.domain
+        return start + (end - start) * (
+            np.asarray(percentages, dtype=float) / 100.0
+        )
+
+    def spans(self, params):
+        """
+        Get the knot span of each parameter.
+
+        Args:
+            params (array): The parameters.
+
+        Returns:
+            array: Index of the knot starting each span, the last span
+                includes the end of the domain.
+        """
+        spans = np.searchsorted(self.knots, params, side="right") - 1
+        return np.clip(spans, self.degree, len(self.points) - 1)
+
+    def _basis(self, params):
+        """
+        Get the spans and the non-zero basis functions and derivatives.
+
+        Returns:
+            tuple: spans (m), basis (m, degree + 1), derivatives
+                (m, degree + 1)
+        """
+        key = params.tobytes()
+        cached = self.__cache.get(key)
+        if cached is not None:
+            self.__cache.move_to_end(key)
+            return cached
+
+        p = self.degree
+        knots = self.knots
+        m = len(params)
+        spans = self.spans(params)
+
+        # de Boor's triangular scheme, all the parameters at once
+        basis = np.zeros((m, p + 1))
+        basis[:, 0] = 1.0
+        left = np.zeros((m, p + 1))
+        right = np.zeros((m, p + 1))
+        lower = basis
+        for j in range(1, p + 1):
+            lower = basis.copy()
+            left[:, j] = params - knots[spans + 1 - j]
+            right[:, j] = knots[spans + j] - params
+            saved = np.zeros(m)
+            for r in range(j):
+                temp = basis[:, r] / (right[:, r + 1] + left[:, j - r])
+                basis[:, r] = saved + right[:, r + 1] * temp
+                saved = left[:, j - r] * temp
+            basis[:, j] = saved
+
+        # derivatives from the basis functions of degree p - 1
+        derivatives = np.zeros((m, p + 1))
+        if p > 0:
+            lower = np.concatenate(
+                [np.zeros((m, 1)), lower[:, :p], np.zeros((m, 1))], axis=1
+            )
+            for r in range(p + 1):
+                index = spans - p + r
+                for sign, column, start in (
+                    (1.0, r, index),
+                    (-1.0, r + 1, index + 1),
+                ):
+                    delta = knots[start + p] - knots[start]
+                    valid = delta != 0
+                    derivatives[valid, r] += (
+                        sign * p * lower[valid, column] / delta[valid]
+                    )
+
+        cached = (spans, basis, derivatives)
+        self.__cache[key] = cached
+        while len(self.__cache) > self.CACHE_SIZE:
+            self.__cache.popitem(last=False)
+        return cached
+
+    def evaluate(self, params, tangents=False):
+        """
+        Evaluate the curve at several parameters.
+
+        Args:
+            params (array): The parameters, inside the curve domain.
+            tangents (bool, optional): Also return the first derivatives.
+
+        Returns:
+            array or tuple: The points (m, 3), and the tangents (m, 3) if
+                tangents is True.
+        """
+        params = np.atleast_1d(np.asarray(params, dtype=float))
+        spans, basis, derivatives = self._basis(params)
+        index = spans[:, None] - self.degree + np.arange(self.degree + 1)
+
+        weights = self.weights[index]
+        weighted = basis * weights
+        w = weighted.sum(axis=1)
+        points = (
+            np.einsum("mk,mkd->md", weighted, self.points[index])
+            / w[:, None]
+        )
+        if not tangents:
+            return points
+
+        d_weighted = derivatives * weights
+        dw = d_weighted.sum(axis=1)
+        d_points = np.einsum("mk,mkd->md", d_weighted, self.points[index])
+        return points, (d_points - dw[:, None] * points) / w[:, None]
+
+    def arc_lengths(self, samples=None):
+        """
+        Get the cumulated length of the curve at sampled parameters.
+
+        Args:
+            samples (int, optional): Number of samples. 64 per span, at
+                least 256, if None.
+
+        Returns:
+            tuple: The sampled parameters and the length at each of them.
+        """
+        if samples is None:
+            spans = len(np.unique(self.knots[self.degree : len(self.points)]))
+            samples = max(256, 64 * spans)
+        params = np.linspace(self.domain[0], self.domain[1], samples)
+        points = self.evaluate(params)
+        lengths = np.concatenate(
+            [[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))]
+        )
+        return params, lengths
+
+    def length(self, samples=None):
+        """
+        Get the length of the curve.
+
+        Args:
+            samples (int, optional): Number of samples of the curve.
+
+        Returns:
+            float: The length.
+        """
+        return float(self.arc_lengths(samples)[1][-1])
+
+    def arc_length_params(self, count, samples=None):
+        """
+        Get the parameters of points evenly distributed by length.
+
+        The lengths are measured on the polyline of the sampled curve, so
+        the distribution is as precise as the sampling.
+
+        Args:
+            count (int): Number of parameters, including the curve ends.
+            samples (int, optional): Number of samples of the curve.
+
+        Returns:
+            array: The parameters.
+        """
+        params, lengths = self.arc_lengths(samples)
+        return np.interp(
+            np.linspace(0.0, lengths[-1], count), lengths, params
+        )
+
+
+def evaluate_cubic_nurbs(
+    control_points, percentage, knots=None, weights=None, uniform=False
+):
     """
     Evaluate a cubic NURBS curve at a given percentage.
 
     Args:
         control_points (list): List of control points, each as [x, y, z].
-        percentage (float): Curve position as a percentage (0 to 100).
+        percentage (float or list): Curve position as a percentage (0 to
+            100), or a list of them.
         knots (list, optional): Knot vector.
         weights (list, optional): List of weights corresponding to control
                                   points.
+        uniform (bool, optional): The percentage is of the curve length
+            instead of the curve parameter. Requires NumPy.
 
     Returns:
-        list: Evaluated point as [x, y, z].
+        list: Evaluated point as [x, y, z], or a list of them if percentage
+            is a list.
     """
+    single = not isinstance(percentage, (list, tuple)) and not (
+        NUMPY_READY and isinstance(percentage, np.ndarray)
+    )
+    if not NUMPY_READY:
+        if uniform:
+            raise RuntimeError("NumPy is required to evaluate by length")
+        percentages = [percentage] if single else percentage
+        points = [
+            _evaluate_cubic_nurbs_slow(control_points, pct, knots, weights)
+            for pct in percentages
+        ]
+        return points[0] if single else points
+
+    ev = NurbsEvaluator(control_points, degree=3, knots=knots, weights=weights)
+    percentages = np.atleast_1d(np.asarray(percentage, dtype=float))
+    if uniform:
+        params, lengths = ev.arc_lengths()
+        params = np.interp(lengths[-1] * percentages / 100.0, lengths, params)
+    else:
+        params = ev.params_from_percentages(percentages)
+    points = ev.evaluate(params).tolist()
+    return points[0] if single else points
+
+
+def _evaluate_cubic_nurbs_slow(control_points, percentage, knots, weights):
+    # evaluation of one point with cox_de_boor, when NumPy isn't available
     n = len(control_points) - 1
-    p = 3  # Degree for cubic curve
+    p = min(3, n)  # Degree for cubic curve
     d = len(control_points[0])  # Dimension of each point
 
     if knots is None:
-        knots = (
-            [0] * (p + 1)
-            + [i for i in range(1, n - p + 2)]
-            + [n - p + 2] * (p + 1)
-        )
+        knots = uniform_knots(n + 1, p)
 
     if weights is None:
         weights = [1.0] * (n + 1)
 
     # Normalize the u parameter to fit within the knot vector range
-    u = knots[p] + (knots[-(p + 1)] - knots[p]) * (percentage / 100.0)
+    u = knots[p] + (knots[n + 1] - knots[p]) * (percentage / 100.0)
 
     # Slightly reduce u if percentage is 100 to avoid division by zero
     if percentage == 100:
@@ -1100,6 +1417,8 @@ def cox_de_boor(u, i, p, knots):
     """
     Cox-De Boor algorithm to evaluate B-Spline basis function.
 
+    Recursive, prefer NurbsEvaluator to evaluate more than a few points.
+
     Args:
         u (float): Parameter value.
         i (int): Index of control point.
@@ -1127,14 +1446,21 @@ def cox_de_boor(u, i, p, knots):
     return N1 + N2
 
 
-def create_locator_at_curve_point(object_names, percentage):
+def create_locator_at_curve_point(object_names, percentage, uniform=False):
     """
     Create a locator at a point on a cubic NURBS curve in Maya.
 
     Args:
         object_names (list): The names of the objects representing control
                              points in Maya.
-        percentage (float): Curve position as a percentage (0 to 100).
+        percentage (float or list): Curve position as a percentage (0 to
+            100), or a list of them to create a locator at each.
+        uniform (bool, optional): The percentage is of the curve length
+            instead of the curve parameter.
+
+    Returns:
+        str or list: The locator name, or a list of them if percentage is
+            a list.
 
     Example usage in Maya
     Select objects representing control points in Maya before running the script
@@ -1149,12 +1475,22 @@ def create_locator_at_curve_point(object_names, percentage):
         )
         control_points.append(pos)
 
-    point_on_curve = evaluate_cubic_nurbs(control_points, percentage)
+    single = not isinstance(percentage, (list, tuple))
+    points = evaluate_cubic_nurbs(
+        control_points,
+        [percentage] if single else percentage,
+        uniform=uniform,
+    )
+
+    locators = []
+    for point_on_curve in points:
+        locator_name = cmds.spaceLocator()[0]
+        cmds.setAttr(locator_name + ".translateX", point_on_curve[0])
+        cmds.setAttr(locator_name + ".translateY", point_on_curve[1])
+        cmds.setAttr(locator_name + ".translateZ", point_on_curve[2])
+        locators.append(locator_name)
 
-    locator_name = cmds.spaceLocator()[0]
-    cmds.setAttr(locator_name + ".translateX", point_on_curve[0])
-    cmds.setAttr(locator_name + ".translateY", point_on_curve[1])
-    cmds.setAttr(locator_name + ".translateZ", point_on_curve[2])
+    return locators[0] if single else locators
 
 
 def add_linear_skinning_to_curve(curve_name, joint_list):
@@ -1,9 +1,18 @@
 """Nvigate the DAG hierarchy"""
 
 
+import contextlib
+
 import maya.cmds as cmds
+import maya.api.OpenMaya as om2
 import mgear.pymaya as pm
 
+# transform descendants of the indexed nodes, by node full path, then by
+# short name. Only kept inside a name_index context
+__name_indexes = {}
+__index_callbacks = []
+__index_depth = [0]
+
 #############################################
 # DAG
 #############################################
@@ -37,6 +46,134 @@ def getShapes(node):
     return node.listRelatives(shapes=True, fullPath=True)
 
 
+#############################################
+# DAG name index
+#############################################
+
+
+def clear_name_index(*args):
+    """Clears the DAG name indexes.
+
+    The indexes are cleared by callbacks on each DAG change, rename and scene
+    change, so this is only needed if the callbacks were removed.
+    """
+    __name_indexes.clear()
+
+
+@contextlib.contextmanager
+def name_index():
+    """Context manager keeping the DAG name indexes, i.e. to parse a guide.
+
+    Inside the context the name index of each node is built once, and cleared
+    on any DAG change. On exit of the outermost context the indexes are
+    cleared and their callbacks removed. Outside of it, each search walks the
+    hierarchy.
+
+    Example:
+        >>> with dag.name_index():
+        ...     guide.setFromHierarchy(root)
+    """
+    if not __index_depth[0]:
+        _add_index_callbacks()
+    __index_depth[0] += 1
+    try:
+        yield
+    finally:
+        __index_depth[0] -= 1
+        if not __index_depth[0]:
+            remove_name_index_callbacks()
+
+
+def _add_index_callbacks():
+    """Adds the callbacks clearing the name indexes on any DAG change"""
+    if __index_callbacks:
+        return
+
+    __index_callbacks.extend(
+        [
+            om2.MDagMessage.addAllDagChangesCallback(clear_name_index),
+            om2.MDGMessage.addNodeRemovedCallback(
+                clear_name_index, "dagNode"
+            ),
+            om2.MNodeMessage.addNameChangedCallback(
+                om2.MObject.kNullObj, clear_name_index
+            ),
+            om2.MSceneMessage.addCallback(
+                om2.MSceneMessage.kBeforeOpen, clear_name_index
+            ),
+            om2.MSceneMessage.addCallback(
+                om2.MSceneMessage.kBeforeNew, clear_name_index
+            ),
+        ]
+    )
+
+
+def remove_name_index_callbacks():
+    """Removes the callbacks of the name indexes, and clears them"""
+    for callback in __index_callbacks:
+        om2.MMessage.removeCallback(callback)
+    del __index_callbacks[:]
+    __name_indexes.clear()
+
+
+def get_name_index(node):
+    """Returns the transform descendants of a node, by short name.
+
+    The index is built with a single walk of the hierarchy. Inside a
+    name_index context it is kept until the DAG changes.
+
+    Arguments:
+        node (dagNode or str): The input node
+
+    Returns:
+        dict: The MDagPath list of the descendants, by short name, in depth
+            first order
+
+    """
+    selection = om2.MSelectionList()
+    selection.add(node if isinstance(node, str) else node.longName())
+    root = selection.getDagPath(0)
+
+    key = root.fullPathName()
+    index = __name_indexes.get(key)
+    if index is not None:
+        return index
+
+    index = {}
+    dag_it = om2.MItDag(om2.MItDag.kDepthFirst, om2.MFn.kTransform)
+    dag_it.reset(root, om2.MItDag.kDepthFirst, om2.MFn.kTransform)
+    while not dag_it.isDone():
+        path = dag_it.getPath()
+        if path != root:
+            name = om2.MFnDependencyNode(path.node()).name()
+            index.setdefault(name, []).append(path)
+        dag_it.next()
+
+    if __index_depth[0]:
+        __name_indexes[key] = index
+    return index
+
+
+def _iter_indexed(node, exact_type=False):
+    """Yields the short name and full path of the indexed descendants.
+
+    Arguments:
+        node (dagNode or str): The input node
+        exact_type (bool): Only the transform nodes, not the derived types
+            as joints
+
+    """
+    for name, paths in get_name_index(node).items():
+        for path in paths:
+            if not exact_type or path.apiType() == om2.MFn.kTransform:
+                yield name, path.fullPathName()
+
+
+#############################################
+# Find
+#############################################
+
+
 def findChild(node, name):
     """Returns the first child of input node, with a matching name.
 
@@ -88,28 +225,26 @@ def findChildrenPartial(node, name):
 def __findChildren(node, name, firstOnly=False, partialName=False):
 
     if partialName:
-        children = [item for item
-                    in node.listRelatives(allDescendents=True,
-                                          type="transform", fullPath=True)
-                    if item.split("|")[-1].split("_")[-1] == name]
+        children = [item for itemName, item
+                    in _iter_indexed(node, exact_type=True)
+                    if itemName.split("_")[-1] == name]
     else:
-        children = [item for item
-                    in node.listRelatives(allDescendents=True,
-                                          type="transform", fullPath=True)
-                    if item.split("|")[-1] == name]
+        children = [item for itemName, item
+                    in _iter_indexed(node, exact_type=True)
+                    if itemName == name]
     if not children:
         return False
     if firstOnly:
-        return children[0]
+        return pm.PyNode(children[0])
 
-    return children
+    return [pm.PyNode(x) for x in children]
 
 
 def __findChild(node, name):
     """This find children function will stop search after first
      child found.child
 
-    This is a faster version of __findchildren
+    This is a faster version of __findchildren, looking up the name index
 
     Arguments:
         node (dagNode): The input node to search
@@ -118,17 +253,9 @@ def __findChild(node, name):
     Returns:
         dagNode: Children node
     """
-    try:
-        for item in cmds.listRelatives(node.name(),
-                                       allDescendents=True,
-                                       type="transform", fullPath=True):
-            if item.split("|")[-1] == name:
-                return pm.PyNode(item)
-    except pm.MayaNodeError:
-        for item in node.listRelatives(allDescendents=True,
-                                       type="transform", fullPath=True):
-            if item.split("|")[-1] == name:
-                return item
+    paths = get_name_index(node).get(name)
+    if paths:
+        return pm.PyNode(paths[0].fullPathName())
 
     return False
 
@@ -184,13 +311,12 @@ def findComponentChildren(node, name, sideIndex):
 
     """
     children = []
-    for item in node.listRelatives(allDescendents=True,
-                                   type="transform", fullPath=True):
-        checkName = item.split("|")[-1].split("_")
+    for itemName, item in _iter_indexed(node, exact_type=True):
+        checkName = itemName.split("_")
         if checkName[0] == name and checkName[1] == sideIndex:
             children.append(item)
 
-    return children
+    return [pm.PyNode(x) for x in children]
 
 
 def findComponentChildren2(node, name, sideIndex):
@@ -215,9 +341,8 @@ def findComponentChildren2(node, name, sideIndex):
 
     """
     children = []
-    for item in cmds.listRelatives(node.name(), allDescendents=True,
-                                   fullPath=True, type="transform"):
-        checkName = item.split("|")[-1].split("_")
+    for itemName, item in _iter_indexed(node):
+        checkName = itemName.split("_")
         if checkName[0] == name and checkName[1] == sideIndex:
             children.append(item)
 
@@ -246,12 +371,9 @@ def findComponentChildren3(node, name, sideIndex):
 
     """
     children = []
-    for item in cmds.listRelatives(node.name(), allDescendents=True,
-                                   fullPath=True, type="transform") or []:
-        checkName = item.split("|")[-1]
-        in_name = "_".join([name, sideIndex])
-
-        if in_name in checkName:
+    in_name = "_".join([name, sideIndex])
+    for itemName, item in _iter_indexed(node):
+        if in_name in itemName:
             children.append(item)
 
     return [pm.PyNode(x) for x in children]
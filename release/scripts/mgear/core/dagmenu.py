@@ -20,6 +20,7 @@ from mgear.core.anim_utils import bindPose
 from mgear.core.pickWalk import get_all_tag_children
 from mgear.core.transform import resetTransform
 from mgear.core.anim_utils import mirrorPose
+from mgear.core.anim_utils import mirrorAnimation
 from mgear.core.anim_utils import get_host_from_node
 from mgear.core.anim_utils import change_rotate_order
 from mgear.core.anim_utils import ikFkMatch_with_namespace
@@ -76,12 +77,24 @@ def __mirror_flip_pose_callback(*args):
     controls = [pm.PyNode(x) for x in args[0]]
 
     # triggers mirror
-    # we handle the mirror/flip each control individually even if the function
-    # accepts several controls. Flipping on proxy attributes like blend
-    # attributes cause an issue to rather than trying the complete list we do
-    # one control to avoid the mirror to stop
-    for ctl in controls:
-        mirrorPose(flip=args[1], nodes=[ctl])
+    # the free channels are set in a single batch and the keyed or driven
+    # ones one by one, the channels failing to set are logged without
+    # stopping the mirror
+    mirrorPose(flip=args[1], nodes=controls)
+
+
+def __mirror_flip_animation_callback(*args):
+    """Wrapper function to call mGears mirrorAnimation function
+
+    Args:
+        list: callback from menuItem
+    """
+
+    # cast controls into pymel object nodes
+    controls = [pm.PyNode(x) for x in args[0]]
+
+    # the animation of the playback range is mirrored
+    mirrorAnimation(flip=args[1], nodes=controls)
 
 
 def _get_controls(switch_control, blend_attr, comp_ctl_list=None):
@@ -1059,6 +1072,22 @@ def mgear_dagmenu_fill(parent_menu, current_control):
         command=partial(__mirror_flip_pose_callback, child_controls, True),
     )
 
+    # add mirror and flip animation
+    cmds.menuItem(
+        parent=parent_menu,
+        label="Mirror animation",
+        command=partial(
+            __mirror_flip_animation_callback, _current_selection, False
+        ),
+    )
+    cmds.menuItem(
+        parent=parent_menu,
+        label="Flip animation",
+        command=partial(
+            __mirror_flip_animation_callback, _current_selection, True
+        ),
+    )
+
     # divider
     cmds.menuItem(parent=parent_menu, divider=True)
 
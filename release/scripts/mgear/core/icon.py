@@ -6,14 +6,512 @@
 import mgear.pymaya as pm
 from maya import cmds
 import maya.OpenMaya as om
-import mgear.pymaya.util as pmu
+import maya.api.OpenMaya as om2
 from mgear.pymaya import datatypes
+from mgear.pymaya import modifier
 from mgear.core import curve, attribute
 
+import collections
 import math
 
 import mgear
 
+#############################################
+# SHAPE LIBRARY
+#############################################
+
+ShapeCurve = collections.namedtuple(
+    "ShapeCurve", ["points", "knots", "degree", "form", "line_width", "suffix"]
+)
+
+# scale of the compiled shapes in x, y and z, by create keyword argument.
+AXES_WHD = ("w", "h", "d")
+AXES_WD = ("w", None, "d")
+AXES_WHW = ("w", "h", "w")
+AXES_W = ("w", "w", "w")
+
+# icon shapes by name: (curves or builder, axes, color, rotated)
+__shapes = {}
+# builder curves compiled by (name, degree, rotation offset)
+__compiled = {}
+
+
+def _cube_curves(degree):
+    # p is positive, N is negative
+    ppp = (0.5, 0.5, 0.5)
+    ppN = (0.5, 0.5, -0.5)
+    pNp = (0.5, -0.5, 0.5)
+    Npp = (-0.5, 0.5, 0.5)
+    pNN = (0.5, -0.5, -0.5)
+    NNp = (-0.5, -0.5, 0.5)
+    NpN = (-0.5, 0.5, -0.5)
+    NNN = (-0.5, -0.5, -0.5)
+
+    v_array = [
+        ppp,
+        ppN,
+        NpN,
+        NNN,
+        NNp,
+        Npp,
+        NpN,
+        Npp,
+        ppp,
+        pNp,
+        NNp,
+        pNp,
+        pNN,
+        ppN,
+        pNN,
+        NNN,
+    ]
+    return [(v_array, False, 1)]
+
+
+def _pyramid_curves(degree):
+    top = (0, 1, 0)
+    pp = (0.5, 0, 0.5)
+    pN = (0.5, 0, -0.5)
+    Np = (-0.5, 0, 0.5)
+    NN = (-0.5, 0, -0.5)
+
+    return [([pp, top, pN, pp, Np, top, NN, Np, NN, pN], False, 1)]
+
+
+def _square_curves(degree):
+    v_array = [(0.5, 0, 0.5), (0.5, 0, -0.5), (-0.5, 0, -0.5), (-0.5, 0, 0.5)]
+    return [(v_array, True, 1)]
+
+
+def _flower_curves(degree):
+    v_array = [
+        (0, -1, 0),
+        (-0.4, 0.4, 0),
+        (1, 0, 0),
+        (-0.4, -0.4, 0),
+        (0, 1, 0),
+        (0.4, -0.4, 0),
+        (-1, 0, 0),
+        (0.4, 0.4, 0),
+    ]
+    return [(v_array, True, degree)]
+
+
+def _circle_points(y=0):
+    dlen = 0.5
+    return [
+        (0, y, -dlen * 1.108),
+        (dlen * 0.78, y, -dlen * 0.78),
+        (dlen * 1.108, y, 0),
+        (dlen * 0.78, y, dlen * 0.78),
+        (0, y, dlen * 1.108),
+        (-dlen * 0.78, y, dlen * 0.78),
+        (-dlen * 1.108, y, 0),
+        (-dlen * 0.78, y, -dlen * 0.78),
+    ]
+
+
+def _circle_curves(degree):
+    return [(_circle_points(), True, degree)]
+
+
+def _cylinder_curves(degree):
+    dlen = 0.5
+    dhei = 0.5
+
+    if degree == 3:
+        offsetMult = 1
+    else:
+        offsetMult = 1.108
+
+    return [
+        (_circle_points(dhei), True, degree),
+        (_circle_points(-dhei), True, degree),
+        (
+            [(0, dhei, -dlen * offsetMult), (0, -dhei, -dlen * offsetMult)],
+            True,
+            1,
+        ),
+        (
+            [(0, -dhei, dlen * offsetMult), (0, dhei, dlen * offsetMult)],
+            True,
+            1,
+        ),
+        (
+            [(dlen * offsetMult, dhei, 0), (dlen * offsetMult, -dhei, 0)],
+            True,
+            1,
+        ),
+        (
+            [(-dlen * offsetMult, -dhei, 0), (-dlen * offsetMult, dhei, 0)],
+            True,
+            1,
+        ),
+    ]
+
+
+def _compas_curves(degree):
+    dlen = 0.5
+    division = 24
+
+    point_pos = []
+    for i in range(division):
+        angle = (2 * math.pi) * i / division
+        x = dlen * math.sin(angle)
+        z = dlen * math.cos(angle)
+        if i == division // 2:
+            z -= dlen * 0.4
+        point_pos.append((x, 0, z))
+
+    return [(point_pos, True, degree)]
+
+
+def _diamond_curves(degree):
+    dlen = 0.5
+
+    top = (0, dlen, 0)
+    pp = (dlen, 0, dlen)
+    pN = (dlen, 0, -dlen)
+    Np = (-dlen, 0, dlen)
+    NN = (-dlen, 0, -dlen)
+    bottom = (0, -dlen, 0)
+
+    v_array = [
+        pp,
+        top,
+        pN,
+        pp,
+        Np,
+        top,
+        NN,
+        Np,
+        NN,
+        pN,
+        bottom,
+        NN,
+        bottom,
+        Np,
+        bottom,
+        pp,
+    ]
+    return [(v_array, False, 1)]
+
+
+def _cubewithpeak_curves(degree):
+    dlen = 0.5
+
+    peak = (0, 1, 0)
+    ppp = (dlen, dlen, dlen)
+    ppN = (dlen, dlen, -dlen)
+    pNp = (dlen, 0, dlen)
+    Npp = (-dlen, dlen, dlen)
+    pNN = (dlen, 0, -dlen)
+    NNp = (-dlen, 0, dlen)
+    NpN = (-dlen, dlen, -dlen)
+    NNN = (-dlen, 0, -dlen)
+
+    v_array = [
+        peak,
+        ppp,
+        ppN,
+        peak,
+        NpN,
+        ppN,
+        NpN,
+        peak,
+        Npp,
+        NpN,
+        NNN,
+        NNp,
+        Npp,
+        NpN,
+        Npp,
+        ppp,
+        pNp,
+        NNp,
+        pNp,
+        pNN,
+        ppN,
+        pNN,
+        NNN,
+    ]
+    return [(v_array, False, 1)]
+
+
+def _sphere_curves(degree, rot_offset=None):
+    # the circles rotations are added to the rotation offset
+    x, y, z = rot_offset if rot_offset else (0, 0, 0)
+    rotations = [
+        (x, y, z),
+        (x + 1.5708, y, z),
+        (x + 1.5708 * 4, y, z + 1.5708 * 3),
+    ]
+
+    curves = []
+    for rotation in rotations:
+        euler = om2.MEulerRotation(*rotation)
+        points = [
+            tuple(om2.MVector(p).rotateBy(euler)) for p in _circle_points()
+        ]
+        curves.append((points, True, degree))
+
+    return curves
+
+
+def _arrow_curves(degree):
+    dlen = 0.5
+
+    v_array = [
+        (0, 0.3 * dlen, -dlen),
+        (0, 0.3 * dlen, 0.3 * dlen),
+        (0, 0.6 * dlen, 0.3 * dlen),
+        (0, 0, dlen),
+        (0, -0.6 * dlen, 0.3 * dlen),
+        (0, -0.3 * dlen, 0.3 * dlen),
+        (0, -0.3 * dlen, -dlen),
+    ]
+    return [(v_array, True, 1)]
+
+
+def _crossarrow_curves(degree):
+    dlen = 0.5
+
+    v_array = [
+        (0.2 * dlen, 0, 0.2 * dlen),
+        (0.2 * dlen, 0, 0.6 * dlen),
+        (0.4 * dlen, 0, 0.6 * dlen),
+        (0, 0, dlen),
+        (-0.4 * dlen, 0, 0.6 * dlen),
+        (-0.2 * dlen, 0, 0.6 * dlen),
+        (-0.2 * dlen, 0, 0.2 * dlen),
+        (-0.6 * dlen, 0, 0.2 * dlen),
+        (-0.6 * dlen, 0, 0.4 * dlen),
+        (-dlen, 0, 0),
+        (-0.6 * dlen, 0, -0.4 * dlen),
+        (-0.6 * dlen, 0, -0.2 * dlen),
+        (-0.2 * dlen, 0, -0.2 * dlen),
+        (-0.2 * dlen, 0, -0.6 * dlen),
+        (-0.4 * dlen, 0, -0.6 * dlen),
+        (0, 0, -dlen),
+        (0.4 * dlen, 0, -0.6 * dlen),
+        (0.2 * dlen, 0, -0.6 * dlen),
+        (0.2 * dlen, 0, -0.2 * dlen),
+        (0.6 * dlen, 0, -0.2 * dlen),
+        (0.6 * dlen, 0, -0.4 * dlen),
+        (dlen, 0, 0),
+        (0.6 * dlen, 0, 0.4 * dlen),
+        (0.6 * dlen, 0, 0.2 * dlen),
+    ]
+    return [(v_array, True, 1)]
+
+
+def _cross_curves(degree):
+    width = 0.35
+    offset1 = width * 0.5
+    offset2 = width * 1.5
+
+    v_array = [
+        (width, offset2, 0),
+        (offset2, width, 0),
+        (offset1, 0, 0),
+        (offset2, -width, 0),
+        (width, -offset2, 0),
+        (0, -offset1, 0),
+        (-width, -offset2, 0),
+        (-offset2, -width, 0),
+        (-offset1, 0, 0),
+        (-offset2, width, 0),
+        (-width, offset2, 0),
+        (0, offset1, 0),
+    ]
+    return [(v_array, True, 1)]
+
+
+def _null_curves(degree):
+    dlen = 0.5
+
+    return [
+        ([(dlen, 0, 0), (-dlen, 0, 0)], False, 1),
+        ([(0, dlen, 0), (0, -dlen, 0)], False, 1),
+        ([(0, 0, dlen), (0, 0, -dlen)], False, 1),
+    ]
+
+
+def compile_curves(curves):
+    """Compile the curves of a shape
+
+    The closed curves are compiled as periodic curves, wrapping the first
+    points like curve.addCurve.
+
+    Arguments:
+        curves (list): The points, closed state and degree of each curve.
+
+    Returns:
+        list of ShapeCurve: The compiled curves.
+    """
+    compiled = []
+    for i, (points, closed, degree) in enumerate(curves):
+        points = [tuple(float(v) for v in p) for p in points]
+        if closed:
+            points.extend(points[:degree])
+            knots = list(range(len(points) + degree - 1))
+            form = om2.MFnNurbsCurve.kPeriodic
+        else:
+            spans = len(points) - degree
+            knots = [0] * (degree - 1) + list(range(spans + 1))
+            knots += [spans] * (degree - 1)
+            form = om2.MFnNurbsCurve.kOpen
+
+        suffix = "Shape" if not i else "_{}crvShape".format(i - 1)
+        compiled.append(
+            ShapeCurve(points, knots, degree, form, None, suffix)
+        )
+
+    return compiled
+
+
+def register_shape(name, curves, axes=None, color=None, rotated=False):
+    """Register an icon shape in the library
+
+    Arguments:
+        name (str): The icon name.
+        curves (function or list of ShapeCurve): The shape builder, getting
+            the degree and returning the curves for compile_curves, or the
+            compiled curves.
+        axes (tuple of str, optional): The create keyword arguments scaling
+            the shape in x, y and z. None to keep the shape size.
+        color (int or list of float, optional): The color overriding the
+            color of the icons.
+        rotated (bool, optional): True if the builder gets the rotation
+            offset as second argument.
+    """
+    __shapes[name] = (curves, axes, color, rotated)
+    _clear_compiled(name)
+
+
+def _clear_compiled(name):
+    for key in [k for k in __compiled if k[0] == name]:
+        del __compiled[key]
+
+
+def unregister_shapes(names):
+    """Remove icon shapes from the library
+
+    Arguments:
+        names (list of str): The icons names.
+    """
+    for name in names:
+        __shapes.pop(name, None)
+        _clear_compiled(name)
+
+
+def is_registered(name):
+    """Check if an icon shape is in the library
+
+    Arguments:
+        name (str): The icon name.
+
+    Returns:
+        bool: True if the icon can be created.
+    """
+    return name in __shapes
+
+
+def register_curve_data(data, rplStr=["", ""]):
+    """Register the curves of a serialized curve data dict as icon shapes
+
+    The curves are built like curve.update_curve_from_data, without scaling.
+
+    Arguments:
+        data (dict): serialized curve data
+        rplStr (list, optional): String to replace in names.
+            [old Name to replace, new name to set]
+
+    Returns:
+        list of str: The registered icons names.
+    """
+    names = []
+    for crv in data["curves_names"]:
+        crv_dict = data[crv]
+        shp_dict = crv_dict["shapes"]
+
+        compiled = []
+        for sh in crv_dict["shapes_names"]:
+            points = [tuple(p) for p in shp_dict[sh]["points"]]
+            degree = shp_dict[sh]["degree"]
+            if shp_dict[sh]["form"] != "open":
+                form = om2.MFnNurbsCurve.kPeriodic
+            else:
+                form = om2.MFnNurbsCurve.kOpen
+            compiled.append(
+                ShapeCurve(
+                    points,
+                    list(range(len(points) + degree - 1)),
+                    degree,
+                    form,
+                    shp_dict[sh].get("line_width"),
+                    sh[len(crv):] if sh.startswith(crv) else "Shape",
+                )
+            )
+
+        name = crv.replace(rplStr[0], rplStr[1])
+        register_shape(name, compiled, color=crv_dict["crv_color"])
+        names.append(name)
+
+    return names
+
+
+def get_shape_curves(name, degree=3, rot_offset=None):
+    """Get the compiled curves of an icon shape
+
+    Arguments:
+        name (str): The icon name.
+        degree (int): The degree of the curves following the icon degree.
+        rot_offset (vector): The rotation offset of the rotated shapes.
+
+    Returns:
+        list of ShapeCurve: The curves, None if the icon isn't registered.
+    """
+    entry = __shapes.get(name)
+    if entry is None:
+        return
+
+    curves, _, _, rotated = entry
+    if not callable(curves):
+        return curves
+
+    rotation = tuple(rot_offset) if rotated and rot_offset else None
+    key = (name, degree, rotation)
+    compiled = __compiled.get(key)
+    if compiled is None:
+        if rotated:
+            compiled = compile_curves(curves(degree, rotation))
+        else:
+            compiled = compile_curves(curves(degree))
+        __compiled[key] = compiled
+
+    return compiled
+
+
+for _name, _builder, _axes in (
+    ("cube", _cube_curves, AXES_WHD),
+    ("pyramid", _pyramid_curves, AXES_WHD),
+    ("square", _square_curves, AXES_WD),
+    ("flower", _flower_curves, AXES_W),
+    ("circle", _circle_curves, AXES_W),
+    ("cylinder", _cylinder_curves, AXES_WHW),
+    ("compas", _compas_curves, AXES_W),
+    ("diamond", _diamond_curves, AXES_W),
+    ("cubewithpeak", _cubewithpeak_curves, AXES_W),
+    ("arrow", _arrow_curves, AXES_W),
+    ("crossarrow", _crossarrow_curves, AXES_W),
+    ("cross", _cross_curves, AXES_W),
+    ("null", _null_curves, AXES_W),
+):
+    register_shape(_name, _builder, _axes)
+register_shape("sphere", _sphere_curves, AXES_W, rotated=True)
+
+
 #############################################
 # ICON
 #############################################
@@ -40,7 +538,7 @@ def create(
         icon (str): Icon type. Options: "cube", "pyramid", "square",
             "flower", "circle", "cylinder", "compas", "diamond",
                     "cubewithpeak", "sphere", "arrow", "crossarrow",
-                    "cross", "null"
+                    "cross", "null", or any shape registered in the library
         kwargs: The keyword arguments can vary depending of the icon type.
                     Please refear to the specific icon method for more info.
 
@@ -48,140 +546,150 @@ def create(
         dagNode: The newly created icon.
 
     """
-    if "w" not in kwargs.keys():
-        kwargs["w"] = 1
-    if "h" not in kwargs.keys():
-        kwargs["h"] = 1
-    if "d" not in kwargs.keys():
-        kwargs["d"] = 1
-    if "po" not in kwargs.keys():
-        kwargs["po"] = None
-    if "ro" not in kwargs.keys():
-        kwargs["ro"] = None
-    if "degree" not in kwargs.keys():
-        kwargs["degree"] = 3
-
-    if icon == "cube":
-        ctl = cube(
-            parent,
-            name,
-            kwargs["w"],
-            kwargs["h"],
-            kwargs["d"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-        )
-    elif icon == "pyramid":
-        ctl = pyramid(
-            parent,
-            name,
-            kwargs["w"],
-            kwargs["h"],
-            kwargs["d"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-        )
-    elif icon == "square":
-        ctl = square(
-            parent,
-            name,
-            kwargs["w"],
-            kwargs["d"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-        )
-    elif icon == "flower":
-        ctl = flower(
-            parent,
-            name,
-            kwargs["w"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-            kwargs["degree"],
-        )
-    elif icon == "circle":
-        ctl = circle(
-            parent,
-            name,
-            kwargs["w"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-            kwargs["degree"],
-        )
-    elif icon == "cylinder":
-        ctl = cylinder(
-            parent,
-            name,
-            kwargs["w"],
-            kwargs["h"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-            kwargs["degree"],
-        )
-    elif icon == "compas":
-        ctl = compas(
-            parent,
-            name,
-            kwargs["w"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-            kwargs["degree"],
-        )
-    elif icon == "diamond":
-        ctl = diamond(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
-        )
-    elif icon == "cubewithpeak":
-        ctl = cubewithpeak(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
-        )
-    elif icon == "sphere":
-        ctl = sphere(
-            parent,
-            name,
-            kwargs["w"],
-            color,
-            m,
-            kwargs["po"],
-            kwargs["ro"],
-            kwargs["degree"],
-        )
-    elif icon == "arrow":
-        ctl = arrow(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
-        )
-    elif icon == "crossarrow":
-        ctl = crossarrow(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
+    kwargs.update(parent=parent, name=name, m=m, color=color, icon=icon)
+    return create_many([kwargs])[0]
+
+
+def create_many(items):
+    """Create several icons at once
+
+    The icons are created with a single modifier, and a single undo item.
+
+    Arguments:
+        items (list of dict): The create arguments of each icon, i.e.
+            {"parent": root, "name": "ctl", "m": m, "color": 17,
+            "icon": "cube", "w": 2}
+
+    Returns:
+        list of dagNode: The newly created icons. None for the invalid
+            icons types.
+    """
+    # the pending pymaya batch can create the parents
+    modifier.sync()
+
+    mod = om2.MDagModifier()
+    icons = []
+    for item in items:
+        icon = item.get("icon", "cube")
+        if not is_registered(icon):
+            mgear.log("invalid type of ico", mgear.sev_error)
+            icons.append(None)
+            continue
+
+        parent = item.get("parent")
+        parent_path = _get_dag_path(parent) if parent is not None else None
+        transform = mod.createNode(
+            "transform",
+            parent_path.node() if parent_path else om2.MObject.kNullObj,
         )
-    elif icon == "cross":
-        ctl = cross(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
+        curves, color = _get_icon_curves(icon, item)
+        shapes = [mod.createNode("nurbsCurve", transform) for _ in curves]
+        icons.append((item, parent_path, transform, shapes, curves, color))
+    mod.doIt()
+
+    for built in icons:
+        if built is None:
+            continue
+        item, parent_path, transform, shapes, curves, color = built
+        name = item.get("name", "icon")
+        mod.renameNode(transform, name)
+        _set_local_matrix(mod, transform, item.get("m"), parent_path)
+
+        for shape, crv in zip(shapes, curves):
+            mod.renameNode(shape, name + crv.suffix)
+            data = om2.MFnNurbsCurveData().create()
+            om2.MFnNurbsCurve().create(
+                crv.points, crv.knots, crv.degree, crv.form, False, False, data
+            )
+            fn = om2.MFnDependencyNode(shape)
+            mod.newPlugValue(fn.findPlug("cached", False), data)
+            _set_shape_color(mod, fn, color)
+            if crv.line_width is not None:
+                mod.newPlugValueFloat(
+                    fn.findPlug("lineWidth", False), crv.line_width
+                )
+    modifier.execute(mod)
+
+    return [
+        pm.PyNode(om2.MDagPath.getAPathTo(built[2]).fullPathName())
+        if built is not None
+        else None
+        for built in icons
+    ]
+
+
+def _get_dag_path(node):
+    if hasattr(node, "dagPath"):
+        return node.dagPath()
+    selection = om2.MSelectionList()
+    selection.add(str(node))
+    return selection.getDagPath(0)
+
+
+def _get_icon_curves(icon, item):
+    """Get the icon curves sized and offset by the create arguments"""
+    _, axes, color, rotated = __shapes[icon]
+    pos_offset = item.get("po")
+    rot_offset = item.get("ro")
+    curves = get_shape_curves(icon, item.get("degree", 3), rot_offset)
+
+    tm = om2.MTransformationMatrix()
+    if axes:
+        tm.setScale(
+            [item.get(axis, 1) if axis else 1 for axis in axes],
+            om2.MSpace.kTransform,
         )
-    elif icon == "null":
-        ctl = null(
-            parent, name, kwargs["w"], color, m, kwargs["po"], kwargs["ro"]
+    if rot_offset and not rotated:
+        tm.setRotation(
+            om2.MEulerRotation(rot_offset[0], rot_offset[1], rot_offset[2])
         )
+    if pos_offset:
+        tm.setTranslation(om2.MVector(pos_offset), om2.MSpace.kTransform)
 
-    else:
-        mgear.log("invalid type of ico", mgear.sev_error)
+    matrix = tm.asMatrix()
+    curves = [
+        crv._replace(points=[om2.MPoint(p) * matrix for p in crv.points])
+        for crv in curves
+    ]
+
+    return curves, item.get("color", [0, 0, 0]) if color is None else color
+
+
+def _set_local_matrix(mod, transform, m, parent_path):
+    """Set the transform channels to place it at the m world matrix"""
+    m = om2.MMatrix(m) if m is not None else om2.MMatrix()
+    if parent_path is not None:
+        m *= parent_path.inclusiveMatrixInverse()
+    if m.isEquivalent(om2.MMatrix.kIdentity):
         return
 
-    return ctl
+    tm = om2.MTransformationMatrix(m)
+    fn = om2.MFnDependencyNode(transform)
+    rotation = tm.rotation()
+    for attr, values in (
+        ("translate", tm.translation(om2.MSpace.kTransform)),
+        ("scale", tm.scale(om2.MSpace.kTransform)),
+        ("shear", tm.shear(om2.MSpace.kTransform)),
+    ):
+        for axis, value in zip("XYZ", values):
+            mod.newPlugValueDouble(fn.findPlug(attr + axis, False), value)
+    for axis, value in zip("XYZ", (rotation.x, rotation.y, rotation.z)):
+        mod.newPlugValueMAngle(
+            fn.findPlug("rotate" + axis, False), om2.MAngle(value)
+        )
+
+
+def _set_shape_color(mod, fn, color):
+    """Set the shape color like curve.set_color"""
+    mod.newPlugValueBool(fn.findPlug("overrideEnabled", False), True)
+    if isinstance(color, int):
+        mod.newPlugValueInt(fn.findPlug("overrideColor", False), color)
+    else:
+        mod.newPlugValueBool(fn.findPlug("overrideRGBColors", False), True)
+        for channel, value in zip("RGB", color):
+            mod.newPlugValueFloat(
+                fn.findPlug("overrideColor" + channel, False), value
+            )
 
 
 def cube(
@@ -213,46 +721,18 @@ def cube(
     Returns:
         dagNode: The newly created icon.
     """
-    lenX = width * 0.5
-    lenY = height * 0.5
-    lenZ = depth * 0.5
-
-    # p is positive, N is negative
-    ppp = datatypes.Vector(lenX, lenY, lenZ)
-    ppN = datatypes.Vector(lenX, lenY, lenZ * -1)
-    pNp = datatypes.Vector(lenX, lenY * -1, lenZ)
-    Npp = datatypes.Vector(lenX * -1, lenY, lenZ)
-    pNN = datatypes.Vector(lenX, lenY * -1, lenZ * -1)
-    NNp = datatypes.Vector(lenX * -1, lenY * -1, lenZ)
-    NpN = datatypes.Vector(lenX * -1, lenY, lenZ * -1)
-    NNN = datatypes.Vector(lenX * -1, lenY * -1, lenZ * -1)
-
-    v_array = [
-        ppp,
-        ppN,
-        NpN,
-        NNN,
-        NNp,
-        Npp,
-        NpN,
-        Npp,
-        ppp,
-        pNp,
-        NNp,
-        pNp,
-        pNN,
-        ppN,
-        pNN,
-        NNN,
-    ]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "cube",
+        w=width,
+        h=height,
+        d=depth,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def pyramid(
@@ -281,30 +761,22 @@ def pyramid(
         rot_offset (vector): The xyz rotation offset of the curve
             from its center. xyz in radians
 
-    Returns:
-        dagNode: The newly created icon.
-
-    """
-    lenX = width * 0.5
-    lenY = height
-    lenZ = depth * 0.5
-
-    # p is positive, N is negative
-    top = datatypes.Vector(0, lenY, 0)
-    pp = datatypes.Vector(lenX, 0, lenZ)
-    pN = datatypes.Vector(lenX, 0, lenZ * -1)
-    Np = datatypes.Vector(lenX * -1, 0, lenZ)
-    NN = datatypes.Vector(lenX * -1, 0, lenZ * -1)
-
-    v_array = [pp, top, pN, pp, Np, top, NN, Np, NN, pN]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
+    Returns:
+        dagNode: The newly created icon.
 
-    return node
+    """
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "pyramid",
+        w=width,
+        h=height,
+        d=depth,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def square(
@@ -335,21 +807,17 @@ def square(
         dagNode: The newly created icon.
 
     """
-    lenX = width * 0.5
-    lenZ = depth * 0.5
-
-    v0 = datatypes.Vector(lenX, 0, lenZ)
-    v1 = datatypes.Vector(lenX, 0, lenZ * -1)
-    v2 = datatypes.Vector(lenX * -1, 0, lenZ * -1)
-    v3 = datatypes.Vector(lenX * -1, 0, lenZ)
-
-    points = getPointArrayWithOffset([v0, v1, v2, v3], pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "square",
+        w=width,
+        d=depth,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def flower(
@@ -379,27 +847,18 @@ def flower(
         dagNode: The newly created icon.
 
     """
-    dlen = width
-
-    v0 = datatypes.Vector(0, -dlen, 0)
-    v1 = datatypes.Vector(-dlen * 0.4, dlen * 0.4, 0)
-    v2 = datatypes.Vector(dlen, 0, 0)
-    v3 = datatypes.Vector(-dlen * 0.4, -dlen * 0.4, 0)
-    v4 = datatypes.Vector(0, dlen, 0)
-    v5 = datatypes.Vector(dlen * 0.4, -dlen * 0.4, 0)
-    v6 = datatypes.Vector(-dlen, 0, 0)
-    v7 = datatypes.Vector(dlen * 0.4, dlen * 0.4, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "flower",
+        w=width,
+        degree=degree,
+        po=pos_offset,
+        ro=rot_offset,
     )
 
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
-
 
 def circle(
     parent=None,
@@ -428,27 +887,18 @@ def circle(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0, 0, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * 0.78, 0, -dlen * 0.78)
-    v2 = datatypes.Vector(dlen * 1.108, 0, 0)
-    v3 = datatypes.Vector(dlen * 0.78, 0, dlen * 0.78)
-    v4 = datatypes.Vector(0, 0, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * 0.78, 0, dlen * 0.78)
-    v6 = datatypes.Vector(-dlen * 1.108, 0, 0)
-    v7 = datatypes.Vector(-dlen * 0.78, 0, -dlen * 0.78)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "circle",
+        w=width,
+        degree=degree,
+        po=pos_offset,
+        ro=rot_offset,
     )
 
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
-
 
 def cylinder(
     parent=None,
@@ -479,75 +929,18 @@ def cylinder(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-    dhei = heigth * 0.5
-
-    if degree == 3:
-        offsetMult = 1
-    else:
-        offsetMult = 1.108
-
-    # upper circle
-    v0 = datatypes.Vector(0, dhei, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * 0.78, dhei, -dlen * 0.78)
-    v2 = datatypes.Vector(dlen * 1.108, dhei, 0)
-    v3 = datatypes.Vector(dlen * 0.78, dhei, dlen * 0.78)
-    v4 = datatypes.Vector(0, dhei, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * 0.78, dhei, dlen * 0.78)
-    v6 = datatypes.Vector(-dlen * 1.108, dhei, 0)
-    v7 = datatypes.Vector(-dlen * 0.78, dhei, -dlen * 0.78)
-
-    # lower circle
-    v8 = datatypes.Vector(0, -dhei, -dlen * 1.108)
-    v9 = datatypes.Vector(dlen * 0.78, -dhei, -dlen * 0.78)
-    v10 = datatypes.Vector(dlen * 1.108, -dhei, 0)
-    v11 = datatypes.Vector(dlen * 0.78, -dhei, dlen * 0.78)
-    v12 = datatypes.Vector(0, -dhei, dlen * 1.108)
-    v13 = datatypes.Vector(-dlen * 0.78, -dhei, dlen * 0.78)
-    v14 = datatypes.Vector(-dlen * 1.108, -dhei, 0)
-    v15 = datatypes.Vector(-dlen * 0.78, -dhei, -dlen * 0.78)
-
-    # curves
-    v16 = datatypes.Vector(0, dhei, -dlen * offsetMult)
-    v17 = datatypes.Vector(0, -dhei, -dlen * offsetMult)
-    v18 = datatypes.Vector(0, -dhei, dlen * offsetMult)
-    v19 = datatypes.Vector(0, dhei, dlen * offsetMult)
-
-    v20 = datatypes.Vector(dlen * offsetMult, dhei, 0)
-    v21 = datatypes.Vector(dlen * offsetMult, -dhei, 0)
-    v22 = datatypes.Vector(-dlen * offsetMult, -dhei, 0)
-    v23 = datatypes.Vector(-dlen * offsetMult, dhei, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset
-    )
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    points = getPointArrayWithOffset(
-        [v8, v9, v10, v11, v12, v13, v14, v15], pos_offset, rot_offset
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "cylinder",
+        w=width,
+        h=heigth,
+        degree=degree,
+        po=pos_offset,
+        ro=rot_offset,
     )
-    crv_0 = curve.addCurve(parent, node + "_0crv", points, True, degree, m)
-
-    points = getPointArrayWithOffset([v16, v17], pos_offset, rot_offset)
-    crv_1 = curve.addCurve(parent, node + "_1crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v18, v19], pos_offset, rot_offset)
-    crv_2 = curve.addCurve(parent, node + "_2crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v20, v21], pos_offset, rot_offset)
-    crv_3 = curve.addCurve(parent, node + "_3crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v22, v23], pos_offset, rot_offset)
-    crv_4 = curve.addCurve(parent, node + "_4crv", points, True, 1, m)
-
-    for crv in [crv_0, crv_1, crv_2, crv_3, crv_4]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
 
 
 def compas(
@@ -577,27 +970,17 @@ def compas(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    division = 24
-
-    point_pos = []
-    v = datatypes.Vector(0, 0, dlen)
-
-    for i in range(division):
-        if i == division / 2:
-            w = datatypes.Vector(v.x, v.y, v.z - dlen * 0.4)
-        else:
-            w = datatypes.Vector(v.x, v.y, v.z)
-        point_pos.append(w)
-        v = v.rotateBy((0, (2 * pmu.math.pi) / (division + 0.0), 0))
-
-    points = getPointArrayWithOffset(point_pos, pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "compas",
+        w=width,
+        degree=degree,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def diamond(
@@ -628,41 +1011,16 @@ def diamond(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    top = datatypes.Vector(0, dlen, 0)
-    pp = datatypes.Vector(dlen, 0, dlen)
-    pN = datatypes.Vector(dlen, 0, dlen * -1)
-    Np = datatypes.Vector(dlen * -1, 0, dlen)
-    NN = datatypes.Vector(dlen * -1, 0, dlen * -1)
-    bottom = (0, -dlen, 0)
-
-    v_array = [
-        pp,
-        top,
-        pN,
-        pp,
-        Np,
-        top,
-        NN,
-        Np,
-        NN,
-        pN,
-        bottom,
-        NN,
-        bottom,
-        Np,
-        bottom,
-        pp,
-    ]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "diamond",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def cubewithpeak(
@@ -691,51 +1049,16 @@ def cubewithpeak(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    peak = datatypes.Vector(0, width, 0)
-    ppp = datatypes.Vector(dlen, dlen, dlen)
-    ppN = datatypes.Vector(dlen, dlen, dlen * -1)
-    pNp = datatypes.Vector(dlen, 0, dlen)
-    Npp = datatypes.Vector(dlen * -1, dlen, dlen)
-    pNN = datatypes.Vector(dlen, 0, dlen * -1)
-    NNp = datatypes.Vector(dlen * -1, 0, dlen)
-    NpN = datatypes.Vector(dlen * -1, dlen, dlen * -1)
-    NNN = datatypes.Vector(dlen * -1, 0, dlen * -1)
-
-    v_array = [
-        peak,
-        ppp,
-        ppN,
-        peak,
-        NpN,
-        ppN,
-        NpN,
-        peak,
-        Npp,
-        NpN,
-        NNN,
-        NNp,
-        Npp,
-        NpN,
-        Npp,
-        ppp,
-        pNp,
-        NNp,
-        pNp,
-        pNN,
-        ppN,
-        pNN,
-        NNN,
-    ]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "cubewithpeak",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def sphere(
@@ -765,53 +1088,18 @@ def sphere(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0, 0, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * 0.78, 0, -dlen * 0.78)
-    v2 = datatypes.Vector(dlen * 1.108, 0, 0)
-    v3 = datatypes.Vector(dlen * 0.78, 0, dlen * 0.78)
-    v4 = datatypes.Vector(0, 0, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * 0.78, 0, dlen * 0.78)
-    v6 = datatypes.Vector(-dlen * 1.108, 0, 0)
-    v7 = datatypes.Vector(-dlen * 0.78, 0, -dlen * 0.78)
-
-    ro = datatypes.Vector([1.5708, 0, 0])
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset
-    )
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    if rot_offset:
-        rot_offset += ro
-    else:
-        rot_offset = ro
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset
-    )
-    crv_0 = curve.addCurve(parent, node + "_0crv", points, True, degree, m)
-
-    ro = datatypes.Vector([1.5708, 0, 1.5708])
-    if rot_offset:
-        rot_offset += ro
-    else:
-        rot_offset = ro
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset + ro + ro
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "sphere",
+        w=width,
+        degree=degree,
+        po=pos_offset,
+        ro=rot_offset,
     )
 
-    crv_1 = curve.addCurve(parent, node + "_1crv", points, True, degree, m)
-
-    for crv in [crv_0, crv_1]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
-
 
 def arrow(
     parent=None,
@@ -839,26 +1127,17 @@ def arrow(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0, 0.3 * dlen, -dlen)
-    v1 = datatypes.Vector(0, 0.3 * dlen, 0.3 * dlen)
-    v2 = datatypes.Vector(0, 0.6 * dlen, 0.3 * dlen)
-    v3 = datatypes.Vector(0, 0, dlen)
-    v4 = datatypes.Vector(0, -0.6 * dlen, 0.3 * dlen)
-    v5 = datatypes.Vector(0, -0.3 * dlen, 0.3 * dlen)
-    v6 = datatypes.Vector(0, -0.3 * dlen, -dlen)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6], pos_offset, rot_offset
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "arrow",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
     )
 
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
-
 
 def crossarrow(
     parent=None,
@@ -886,66 +1165,16 @@ def crossarrow(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0.2 * dlen, 0, 0.2 * dlen)
-    v1 = datatypes.Vector(0.2 * dlen, 0, 0.6 * dlen)
-    v2 = datatypes.Vector(0.4 * dlen, 0, 0.6 * dlen)
-    v3 = datatypes.Vector(0, 0, dlen)
-    v4 = datatypes.Vector(-0.4 * dlen, 0, 0.6 * dlen)
-    v5 = datatypes.Vector(-0.2 * dlen, 0, 0.6 * dlen)
-    v6 = datatypes.Vector(-0.2 * dlen, 0, 0.2 * dlen)
-    v7 = datatypes.Vector(-0.6 * dlen, 0, 0.2 * dlen)
-    v8 = datatypes.Vector(-0.6 * dlen, 0, 0.4 * dlen)
-    v9 = datatypes.Vector(-dlen, 0, 0)
-    v10 = datatypes.Vector(-0.6 * dlen, 0, -0.4 * dlen)
-    v11 = datatypes.Vector(-0.6 * dlen, 0, -0.2 * dlen)
-    v12 = datatypes.Vector(-0.2 * dlen, 0, -0.2 * dlen)
-    v13 = datatypes.Vector(-0.2 * dlen, 0, -0.6 * dlen)
-    v14 = datatypes.Vector(-0.4 * dlen, 0, -0.6 * dlen)
-    v15 = datatypes.Vector(0, 0, -dlen)
-    v16 = datatypes.Vector(0.4 * dlen, 0, -0.6 * dlen)
-    v17 = datatypes.Vector(0.2 * dlen, 0, -0.6 * dlen)
-    v18 = datatypes.Vector(0.2 * dlen, 0, -0.2 * dlen)
-    v19 = datatypes.Vector(0.6 * dlen, 0, -0.2 * dlen)
-    v20 = datatypes.Vector(0.6 * dlen, 0, -0.4 * dlen)
-    v21 = datatypes.Vector(dlen, 0, 0)
-    v22 = datatypes.Vector(0.6 * dlen, 0, 0.4 * dlen)
-    v23 = datatypes.Vector(0.6 * dlen, 0, 0.2 * dlen)
-
-    v_array = [
-        v0,
-        v1,
-        v2,
-        v3,
-        v4,
-        v5,
-        v6,
-        v7,
-        v8,
-        v9,
-        v10,
-        v11,
-        v12,
-        v13,
-        v14,
-        v15,
-        v16,
-        v17,
-        v18,
-        v19,
-        v20,
-        v21,
-        v22,
-        v23,
-    ]
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "crossarrow",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def cross(
@@ -974,38 +1203,17 @@ def cross(
         dagNode: The newly created icon.
 
     """
-    width = width * 0.35
-    offset1 = width * 0.5
-    offset2 = width * 1.5
-
-    v0 = datatypes.Vector(width, offset2, 0)
-    v1 = datatypes.Vector(offset2, width, 0)
-    v2 = datatypes.Vector(offset1, 0, 0)
-
-    v3 = datatypes.Vector(offset2, -width, 0)
-    v4 = datatypes.Vector(width, -offset2, 0)
-    v5 = datatypes.Vector(0, -offset1, 0)
-
-    v6 = datatypes.Vector(-width, -offset2, 0)
-    v7 = datatypes.Vector(-offset2, -width, 0)
-    v8 = datatypes.Vector(-offset1, 0, 0)
-
-    v9 = datatypes.Vector(-offset2, width, 0)
-    v10 = datatypes.Vector(-width, offset2, 0)
-    v11 = datatypes.Vector(0, offset1, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11],
-        pos_offset,
-        rot_offset,
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "cross",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
     )
 
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
-
 
 def null(
     parent=None,
@@ -1033,32 +1241,16 @@ def null(
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(dlen, 0, 0)
-    v1 = datatypes.Vector(-dlen, 0, 0)
-    v2 = datatypes.Vector(0, dlen, 0)
-    v3 = datatypes.Vector(0, -dlen, 0)
-    v4 = datatypes.Vector(0, 0, dlen)
-    v5 = datatypes.Vector(0, 0, -dlen)
-
-    points = getPointArrayWithOffset([v0, v1], pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    points = getPointArrayWithOffset([v2, v3], pos_offset, rot_offset)
-    crv_0 = curve.addCurve(parent, name, points, False, 1, m)
-
-    points = getPointArrayWithOffset([v4, v5], pos_offset, rot_offset)
-    crv_1 = curve.addCurve(parent, name, points, False, 1, m)
-
-    for crv in [crv_0, crv_1]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
+    return create(
+        parent,
+        name,
+        m,
+        color,
+        "null",
+        w=width,
+        po=pos_offset,
+        ro=rot_offset,
+    )
 
 
 def axis(
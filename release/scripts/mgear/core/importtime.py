@@ -0,0 +1,127 @@
+"""Import time report of the mGear modules.
+
+The modules are imported in a new mayapy process, started with the Python
+-X importtime option, so the modules already imported in the running Maya
+session are also measured. The mGear rows of the report are kept, and
+printed sorted by cumulative time.
+
+Example:
+    >>> from mgear.core import importtime
+    >>> rows = importtime.report(["mgear.shifter"])
+"""
+import os
+import subprocess
+import sys
+
+import mgear
+from mgear import menu
+from mgear.core import utils
+
+# modules imported by the mGear menu when it is first opened
+DEFAULT_MODULES = ["mgear", "mgear.menu"] + [
+    module for module, _ in menu.MENU_INSTALLERS + menu.TOOL_INSTALLERS
+]
+
+IMPORT_SCRIPT = (
+    "import maya.standalone\n"
+    "maya.standalone.initialize()\n"
+    "{imports}\n"
+)
+
+PREFIX = "import time:"
+
+
+def parse(output, prefix="mgear"):
+    """Parse the output of the Python -X importtime option.
+
+    Args:
+        output (str): The process standard error output
+        prefix (str, optional): Keep only the modules starting with it, all
+            the modules if empty
+
+    Returns:
+        list: The (module, self time, cumulative time, depth) rows, in
+            import order. The times are in seconds
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith(PREFIX):
+            continue
+        fields = line[len(PREFIX):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_time = int(fields[0]) / 1e6
+            cumulative = int(fields[1]) / 1e6
+        except ValueError:
+            # header line
+            continue
+        name = fields[2].strip()
+        if prefix and not (name == prefix or name.startswith(prefix + ".")):
+            continue
+        depth = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+        rows.append((name, self_time, cumulative, depth))
+
+    return rows
+
+
+def measure(modules=None, prefix="mgear"):
+    """Import modules in a new mayapy process, measuring the import times.
+
+    Args:
+        modules (list of str, optional): The modules to import, the modules
+            imported by the mGear menu if None
+        prefix (str, optional): Keep only the modules starting with it
+
+    Returns:
+        list: The (module, self time, cumulative time, depth) rows, in
+            import order. The times are in seconds
+    """
+    modules = modules or DEFAULT_MODULES
+    script = IMPORT_SCRIPT.format(
+        imports="\n".join("import {}".format(m) for m in modules)
+    )
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+
+    process = subprocess.Popen(
+        [utils.get_mayapy_path(), "-X", "importtime", "-c", script],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+    )
+    _, output = process.communicate()
+    if process.returncode:
+        mgear.log(
+            "The import time process failed:\n{}".format(output[-2000:]),
+            mgear.sev_error,
+        )
+
+    return parse(output, prefix)
+
+
+def report(modules=None, prefix="mgear", limit=30):
+    """Print the slowest modules to import.
+
+    Args:
+        modules (list of str, optional): The modules to import, the modules
+            imported by the mGear menu if None
+        prefix (str, optional): Keep only the modules starting with it
+        limit (int, optional): The number of modules printed
+
+    Returns:
+        list: The (module, self time, cumulative time, depth) rows, sorted
+            by cumulative time
+    """
+    rows = sorted(measure(modules, prefix), key=lambda r: r[2], reverse=True)
+
+    lines = ["{:>10} {:>10}  {}".format("self (s)", "total (s)", "module")]
+    for name, self_time, cumulative, _ in rows[:limit]:
+        lines.append(
+            "{:10.3f} {:10.3f}  {}".format(self_time, cumulative, name)
+        )
+    print("\n".join(lines))
+
+    return rows
@@ -47,6 +47,11 @@ def install_skinning_menu():
             partial(skin.exportJsonSkinPack, None, None),
             "mgear_package_out.svg",
         ),
+        (
+            "Export Skin Pack Columnar",
+            partial(skin.exportColumnarSkinPack, None, None),
+            "mgear_package_out.svg",
+        ),
         ("-----", None),
         ("Get Names in gSkin File", partial(skin.getObjsFromSkinFile, None)),
         ("-----", None),
@@ -6,8 +6,21 @@
 import mgear.pymaya as pm
 import mgear.pymaya.datatypes as datatypes
 from maya import OpenMaya as om
+import maya.api.OpenMaya as om2
 from . import utils
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
 
 #############################################
 # Vertex
@@ -540,3 +553,290 @@ def get_edge_center(mesh_dag_path, edge_indices):
             point_count += 1
 
     return om.MPoint(point_sum / point_count)  # Convert MVector back to MPoint
+
+
+#################################################
+# SPATIAL INDEX
+#################################################
+
+
+class _KDTree(object):
+    """Minimal KD-tree for closest point queries, used without scipy.
+
+    Arguments:
+        points (array): (n, 3) positions
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(self, points):
+        self.points = points
+        self.order = np.arange(len(points))
+        # (start, end, axis, split, left, right), left is -1 for the leaves
+        self.nodes = []
+
+        stack = [(0, len(points), None)]
+        while stack:
+            start, end, parent = stack.pop()
+            node = len(self.nodes)
+            if parent is not None:
+                self.nodes[parent[0]][parent[1]] = node
+
+            if end - start <= self.LEAF_SIZE:
+                self.nodes.append([start, end, 0, 0.0, -1, -1])
+                continue
+
+            idx = self.order[start:end]
+            pts = points[idx]
+            axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+            mid = (start + end) // 2
+            part = np.argpartition(pts[:, axis], mid - start)
+            self.order[start:end] = idx[part]
+            split = points[self.order[mid], axis]
+            self.nodes.append([start, end, axis, split, -1, -1])
+            stack.append((mid, end, (node, 5)))
+            stack.append((start, mid, (node, 4)))
+
+    def query_one(self, point):
+        """Get the closest point.
+
+        Arguments:
+            point (array): The position
+
+        Returns:
+            float, int: The distance and the index of the closest point
+        """
+        best_dist = np.inf
+        best_index = -1
+        stack = [(0, 0.0)]
+        while stack:
+            node, plane_dist = stack.pop()
+            if plane_dist >= best_dist:
+                continue
+
+            start, end, axis, split, left, right = self.nodes[node]
+            if left < 0:
+                idx = self.order[start:end]
+                dist = ((self.points[idx] - point) ** 2).sum(axis=1)
+                i = dist.argmin()
+                if dist[i] < best_dist:
+                    best_dist = dist[i]
+                    best_index = idx[i]
+                continue
+
+            diff = point[axis] - split
+            near, far = (left, right) if diff <= 0 else (right, left)
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        return np.sqrt(best_dist), best_index
+
+    def query(self, points):
+        result = [self.query_one(p) for p in points]
+        return (
+            np.array([r[0] for r in result]),
+            np.array([r[1] for r in result], dtype=np.int64),
+        )
+
+
+def closest_point_indices(points, positions):
+    """Get the closest of a set of points for several positions.
+
+    Uses scipy cKDTree if available.
+
+    Arguments:
+        points (array): (n, 3) positions to search
+        positions (array): (m, 3) positions to query
+
+    Returns:
+        array, array: The indices of the closest points and the distances
+    """
+    if not NUMPY_READY:
+        raise RuntimeError("NumPy is required by the closest point queries")
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if cKDTree is not None:
+        tree = cKDTree(points)
+    else:
+        tree = _KDTree(points)
+    distances, indices = tree.query(positions)
+    return np.asarray(indices, dtype=np.int64), np.asarray(distances)
+
+
+def _get_mesh_dag_path2(geo):
+    selection = om2.MSelectionList()
+    selection.add(str(geo))
+    dag = selection.getDagPath(0)
+    if dag.apiType() == om2.MFn.kTransform:
+        for i in range(dag.childCount()):
+            child = dag.child(i)
+            if child.hasFn(om2.MFn.kMesh) and not om2.MFnDagNode(
+                child
+            ).isIntermediateObject:
+                dag.push(child)
+                break
+    if not dag.hasFn(om2.MFn.kMesh):
+        raise ValueError("Node is not a mesh: {}".format(geo))
+
+    return dag
+
+
+class MeshSpatialIndex(object):
+    """Mesh data in NumPy arrays with a KD-tree for closest vertex queries.
+
+    The vertex positions, in world space, and the faces are read once, the
+    index doesn't follow later changes of the mesh. Uses scipy cKDTree if
+    available.
+
+    Arguments:
+        geo (dagNode or str): Mesh object or shape
+
+    Attributes:
+        name (str): The shape partial path name
+        points (array): (n, 3) vertex positions
+        face_vertices (array): The vertices of all the faces
+        face_offsets (array): The start of each face in face_vertices, and
+            the end of the last face
+        face_normals (array): (n, 3) face normals
+
+    >>> index = mn.MeshSpatialIndex("skin_geo_setup")
+    >>> vertices, distances = index.closest_vertices([(0, 1, 0)])
+    """
+
+    def __init__(self, geo):
+        if not NUMPY_READY:
+            raise RuntimeError("NumPy is required by the mesh spatial index")
+
+        dag = _get_mesh_dag_path2(geo)
+        self.name = dag.partialPathName()
+
+        mesh_fn = om2.MFnMesh(dag)
+        self.points = np.array(
+            mesh_fn.getPoints(om2.MSpace.kWorld), dtype=np.float64
+        )[:, :3]
+        counts, vertices = mesh_fn.getVertices()
+        counts = np.array(counts, dtype=np.int64)
+        self.face_vertices = np.array(vertices, dtype=np.int64)
+        self.face_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.face_normals = self.__face_normals()
+
+        # faces of each vertex
+        faces = np.repeat(np.arange(len(counts)), counts)
+        order = np.argsort(self.face_vertices, kind="stable")
+        self.__vertex_faces = faces[order]
+        self.__vertex_face_offsets = np.searchsorted(
+            self.face_vertices[order], np.arange(len(self.points) + 1)
+        )
+
+        if cKDTree is not None:
+            self.__tree = cKDTree(self.points)
+        else:
+            self.__tree = _KDTree(self.points)
+
+    def __face_normals(self):
+        # Newell's method, also valid for non planar faces
+        pts = self.points[self.face_vertices]
+        following = np.arange(1, len(pts) + 1)
+        following[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        cross = np.cross(pts, pts[following])
+        normals = np.add.reduceat(cross, self.face_offsets[:-1])
+        length = np.linalg.norm(normals, axis=1)
+        length[length == 0] = 1.0
+        return normals / length[:, None]
+
+    def closest_vertices(self, positions):
+        """Get the closest vertex of several positions.
+
+        Arguments:
+            positions (list): World space positions
+
+        Returns:
+            array, array: The vertex indices and the distances
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        distances, indices = self.__tree.query(positions)
+        return np.asarray(indices, dtype=np.int64), np.asarray(distances)
+
+    def closest_vertex(self, position):
+        """Get the closest vertex of a position.
+
+        Arguments:
+            position (vector or list): World space position
+
+        Returns:
+            int: The vertex index
+        """
+        return int(self.closest_vertices([list(position)[:3]])[0][0])
+
+    def vertex_faces(self, vertex):
+        """Get the faces using a vertex.
+
+        Arguments:
+            vertex (int): The vertex index
+
+        Returns:
+            array: The face indices
+        """
+        return self.__vertex_faces[
+            self.__vertex_face_offsets[vertex] : self.__vertex_face_offsets[
+                vertex + 1
+            ]
+        ]
+
+    def face_vertex_indices(self, face):
+        """Get the vertices of a face.
+
+        Arguments:
+            face (int): The face index
+
+        Returns:
+            array: The vertex indices
+        """
+        return self.face_vertices[
+            self.face_offsets[face] : self.face_offsets[face + 1]
+        ]
+
+    def vertex_frame(self, vertex):
+        """Get the position and normal of the faces around a vertex.
+
+        Arguments:
+            vertex (int): The vertex index
+
+        Returns:
+            array, array: The bounding box center of the faces connected to
+                the vertex, and the average of their normals
+        """
+        faces = self.vertex_faces(vertex)
+        vertices = np.unique(
+            np.concatenate([self.face_vertex_indices(f) for f in faces])
+        )
+        pts = self.points[vertices]
+        center = (pts.min(axis=0) + pts.max(axis=0)) * 0.5
+        normal = self.face_normals[faces].sum(axis=0)
+        length = np.linalg.norm(normal)
+        if length:
+            normal = normal / length
+        return center, normal
+
+    def vertex_position(self, vertex):
+        """Get a vertex position.
+
+        Arguments:
+            vertex (int): The vertex index
+
+        Returns:
+            vector: The world space position
+        """
+        return datatypes.Vector(*self.points[vertex])
+
+    def vertex_name(self, vertex):
+        """Get the name of a vertex component.
+
+        Arguments:
+            vertex (int): The vertex index
+
+        Returns:
+            str: The name, i.e. "bodyShape.vtx[12]"
+        """
+        return "{}.vtx[{}]".format(self.name, int(vertex))
@@ -0,0 +1,303 @@
+"""World matrix sampling and baking, without moving the timeline.
+
+The matrices of a frame range are evaluated with DG contexts into a
+(frames, nodes, 4, 4) buffer. The local channels matching some world
+matrices are solved from the buffers, and keyed in bulk on the animation
+curves.
+
+The matrices follow the Maya convention, row vectors and row major.
+"""
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+from mgear.pymaya import modifier
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+CHANNELS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
+
+######################################
+# Sampling
+######################################
+
+
+def _get_node(node):
+    selection = om2.MSelectionList()
+    selection.add(str(node))
+    return selection.getDagPath(0)
+
+
+def _get_plug(path, attr):
+    plug = om2.MFnDependencyNode(path.node()).findPlug(attr, False)
+    if plug.isArray:
+        plug = plug.elementByLogicalIndex(path.instanceNumber())
+    return plug
+
+
+def _read_matrices(plugs, context):
+    if hasattr(om2, "MDGContextGuard"):
+        with om2.MDGContextGuard(context):
+            data = [plug.asMObject() for plug in plugs]
+    else:
+        data = [plug.asMObject(context) for plug in plugs]
+
+    return [tuple(om2.MFnMatrixData(d).matrix()) for d in data]
+
+
+def sample_matrices(plugs, frames):
+    """Evaluate matrix plugs on several frames.
+
+    Args:
+        plugs (list of MPlug): The matrix plugs
+        frames (list of float): The frames
+
+    Returns:
+        numpy.ndarray: The (frames, plugs, 4, 4) matrices
+    """
+    unit = om2.MTime.uiUnit()
+    buffer = np.empty((len(frames), len(plugs), 16))
+    for i, frame in enumerate(frames):
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        buffer[i] = _read_matrices(plugs, context)
+
+    return buffer.reshape(len(frames), len(plugs), 4, 4)
+
+
+def get_world_matrices(nodes, frames):
+    """Evaluate the world matrices of some nodes on several frames.
+
+    Args:
+        nodes (list of str or PyNode): The nodes
+        frames (list of float): The frames
+
+    Returns:
+        numpy.ndarray: The (frames, nodes, 4, 4) matrices
+    """
+    plugs = [_get_plug(_get_node(n), "worldMatrix") for n in nodes]
+    return sample_matrices(plugs, frames)
+
+
+######################################
+# Solving
+######################################
+
+
+def _nearest_ancestors(paths):
+    """Get the index of the nearest ancestor of each path, in the paths"""
+    names = [p.fullPathName() for p in paths]
+    ancestors = []
+    for name in names:
+        nearest = None
+        for i, other in enumerate(names):
+            if name.startswith(other + "|") and (
+                nearest is None or len(other) > len(names[nearest])
+            ):
+                nearest = i
+        ancestors.append(nearest)
+
+    return ancestors
+
+
+def solve_local_matrices(paths, world_matrices, frames):
+    """Get the local matrices of some nodes matching world matrices.
+
+    The parent matrices are evaluated on the frames. When a node is below
+    another one of the nodes, its parent matrix follows the new world
+    matrix of that node.
+
+    Args:
+        paths (list of MDagPath): The nodes
+        world_matrices (numpy.ndarray): The (frames, nodes, 4, 4) world
+            matrices to match
+        frames (list of float): The frames
+
+    Returns:
+        numpy.ndarray: The (frames, nodes, 4, 4) local matrices
+    """
+    plugs = [_get_plug(p, "parentMatrix") for p in paths]
+    plugs += [_get_plug(p, "worldMatrix") for p in paths]
+    sampled = sample_matrices(plugs, frames)
+    parents = sampled[:, : len(paths)]
+    worlds = sampled[:, len(paths) :]
+
+    for j, k in enumerate(_nearest_ancestors(paths)):
+        if k is None:
+            continue
+        # the offset from the ancestor to the parent is kept
+        offset = np.matmul(parents[:, j], np.linalg.inv(worlds[:, k]))
+        parents[:, j] = np.matmul(offset, world_matrices[:, k])
+
+    return np.matmul(world_matrices, np.linalg.inv(parents))
+
+
+def get_channel_values(path, local_matrices):
+    """Get the translate, rotate and scale values of local matrices.
+
+    The rotate pivot, scale pivot and rotate axis of the node are
+    compensated. The rotations are filtered to be continuous, starting
+    from the current rotation.
+
+    Args:
+        path (MDagPath): The transform node
+        local_matrices (numpy.ndarray): The (frames, 4, 4) matrices
+
+    Returns:
+        numpy.ndarray: The (frames, 9) tx, ty, tz, rx, ry, rz, sx, sy and
+            sz values, in internal units
+    """
+    fn = om2.MFnTransform(path)
+    current = fn.transformation()
+    rotate_order = fn.findPlug("rotateOrder", False).asInt()
+    axis = current.rotationOrientation()
+    previous = fn.rotation(om2.MSpace.kTransform).reorder(rotate_order)
+
+    space = om2.MSpace.kTransform
+    rotate_pivot = current.rotatePivot(space)
+    rotate_pivot_translation = current.rotatePivotTranslation(space)
+    scale_pivot = current.scalePivot(space)
+    scale_pivot_translation = current.scalePivotTranslation(space)
+    has_pivots = not all(
+        om2.MVector(p).isEquivalent(om2.MVector.kZeroVector)
+        for p in (
+            rotate_pivot,
+            rotate_pivot_translation,
+            scale_pivot,
+            scale_pivot_translation,
+        )
+    )
+    has_axis = not axis.isEquivalent(om2.MQuaternion.kIdentity)
+
+    values = np.empty((len(local_matrices), 9))
+    for i, local in enumerate(local_matrices):
+        tm = om2.MTransformationMatrix(om2.MMatrix(local.ravel().tolist()))
+        quaternion = tm.rotation(True)
+        if has_axis:
+            quaternion = axis.inverse() * quaternion
+        rotation = quaternion.asEulerRotation().reorder(rotate_order)
+        rotation = rotation.closestSolution(previous)
+        previous = rotation
+        scale = tm.scale(space)
+        translation = om2.MVector(local[3, :3].tolist())
+
+        if has_pivots or has_axis:
+            # removes the translation added by the pivots
+            pivoted = om2.MTransformationMatrix()
+            pivoted.setScalePivot(scale_pivot, space, False)
+            pivoted.setScalePivotTranslation(scale_pivot_translation, space)
+            pivoted.setRotatePivot(rotate_pivot, space, False)
+            pivoted.setRotatePivotTranslation(rotate_pivot_translation, space)
+            pivoted.setRotationOrientation(axis, False)
+            pivoted.setRotation(rotation)
+            pivoted.setScale(scale, space)
+            pivoted.setShear(tm.shear(space), space)
+            offset = pivoted.asMatrix()
+            translation -= om2.MVector(offset[12], offset[13], offset[14])
+
+        values[i, :3] = tuple(translation)
+        values[i, 3:6] = (rotation.x, rotation.y, rotation.z)
+        values[i, 6:] = scale
+
+    return values
+
+
+######################################
+# Keying
+######################################
+
+
+class _KeysEdit(object):
+    """Undo item of the keys added on the animation curves"""
+
+    def __init__(self, mod, change):
+        self.mod = mod
+        self.change = change
+
+    def doIt(self):
+        self.mod.doIt()
+        self.change.redoIt()
+
+    def undoIt(self):
+        self.change.undoIt()
+        self.mod.undoIt()
+
+
+def _get_anim_curve(plug, mod):
+    """Get the animation curve of a plug, creating it if needed.
+
+    Returns:
+        MObject: The curve, None if the plug is driven by another node
+    """
+    source = plug.source()
+    if source.isNull:
+        return oma2.MFnAnimCurve().create(plug, mod)
+    if source.node().hasFn(om2.MFn.kAnimCurve):
+        return source.node()
+
+
+def set_keys(plugs, frames, values):
+    """Key several plugs on several frames.
+
+    The existing keys on the frames are replaced, the locked plugs and the
+    plugs driven by other nodes than an animation curve are skipped. The
+    keys are a single undo item.
+
+    Args:
+        plugs (list of MPlug): The plugs
+        frames (list of float): The frames
+        values (numpy.ndarray): The (frames, plugs) values, in internal
+            units
+    """
+    unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(f, unit) for f in frames])
+    tangent = oma2.MFnAnimCurve.kTangentGlobal
+
+    mod = om2.MDGModifier()
+    curves = [
+        None if plug.isLocked else _get_anim_curve(plug, mod)
+        for plug in plugs
+    ]
+    mod.doIt()
+
+    change = oma2.MAnimCurveChange()
+    for i, curve in enumerate(curves):
+        if curve is not None:
+            oma2.MFnAnimCurve(curve).addKeys(
+                times, values[:, i].tolist(), tangent, tangent, True, change
+            )
+
+    modifier.record(_KeysEdit(mod, change))
+
+
+def bake_world_matrices(nodes, world_matrices, frames, channels=CHANNELS):
+    """Key the local channels of some nodes matching world matrices.
+
+    Args:
+        nodes (list of str or PyNode): The transform nodes
+        world_matrices (numpy.ndarray): The (frames, nodes, 4, 4) world
+            matrices to match
+        frames (list of float): The frames
+        channels (list of str, optional): The channels to key
+    """
+    if not frames or not nodes:
+        return
+
+    modifier.sync()
+    paths = [_get_node(n) for n in nodes]
+    local_matrices = solve_local_matrices(paths, world_matrices, frames)
+
+    plugs = []
+    values = []
+    for j, path in enumerate(paths):
+        node_values = get_channel_values(path, local_matrices[:, j])
+        fn = om2.MFnDependencyNode(path.node())
+        for channel in channels:
+            plugs.append(fn.findPlug(channel, False))
+            values.append(node_values[:, CHANNELS.index(channel)])
+
+    set_keys(plugs, frames, np.stack(values, axis=1))
@@ -12,24 +12,40 @@ This module is derivated from Chad Vernon's Skin IO.
 #############################################
 import os
 import json
-import pickle as pickle
+import array
+import hashlib
+from concurrent import futures
 
 import mgear.pymaya as pm
 from maya import cmds
 import maya.OpenMaya as OpenMaya
 import maya.OpenMayaAnim as OpenMayaAnim
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
 from .six import string_types
 from mgear.vendor.Qt import QtWidgets
 from mgear.vendor.Qt import QtCore
 from mgear.vendor.Qt import QtGui
 from mgear.core import pyqt
 from mgear.core import utils
+from mgear.core import skin_io
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
-FILE_EXT = ".gSkin"
-FILE_JSON_EXT = ".jSkin"
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+FILE_EXT = skin_io.FILE_EXT
+FILE_JSON_EXT = skin_io.FILE_JSON_EXT
+FILE_NPZ_EXT = skin_io.FILE_NPZ_EXT
 PACK_EXT = ".gSkinPack"
 
+# skinDataFormat of the sparse columnar data stored in FILE_NPZ_EXT files
+COLUMNAR_FORMAT = "columnar"
+
 ######################################
 # Skin getters
 ######################################
@@ -187,6 +203,115 @@ def getCurrentWeights(skinCls, dagPath, components):
     return weights
 
 
+def get_skin_cluster_api2(skin_cluster_name):
+    """Retrieve the OpenMaya 2.0 skin cluster function set and geometry.
+
+    The components cover every point of the deformed shape, in the same
+    order as the weights returned by MFnSkinCluster.getWeights.
+
+    Args:
+        skin_cluster_name (str): The name of the skin cluster.
+
+    Returns:
+        tuple: MFnSkinCluster, MDagPath of the shape and components MObject
+
+    Raises:
+        TypeError: If the deformed shape type is not supported.
+    """
+    selection = om2.MSelectionList()
+    selection.add(skin_cluster_name)
+    skin_fn = oma2.MFnSkinCluster(selection.getDependNode(0))
+    dag_path = skin_fn.getPathAtIndex(0)
+
+    if dag_path.hasFn(om2.MFn.kMesh):
+        comp_fn = om2.MFnSingleIndexedComponent()
+        components = comp_fn.create(om2.MFn.kMeshVertComponent)
+        comp_fn.setCompleteData(om2.MFnMesh(dag_path).numVertices)
+    elif dag_path.hasFn(om2.MFn.kNurbsCurve):
+        comp_fn = om2.MFnSingleIndexedComponent()
+        components = comp_fn.create(om2.MFn.kCurveCVComponent)
+        comp_fn.setCompleteData(om2.MFnNurbsCurve(dag_path).numCVs)
+    elif dag_path.hasFn(om2.MFn.kNurbsSurface):
+        surface_fn = om2.MFnNurbsSurface(dag_path)
+        comp_fn = om2.MFnDoubleIndexedComponent()
+        components = comp_fn.create(om2.MFn.kSurfaceCVComponent)
+        comp_fn.setCompleteData(surface_fn.numCVsInU, surface_fn.numCVsInV)
+    else:
+        raise TypeError(
+            "{}: deformed shape type is not supported".format(
+                skin_cluster_name
+            )
+        )
+
+    return skin_fn, dag_path, components
+
+
+def getSkinHash(obj, skinCls):
+    """Get a hash of the topology and skin weights of a skinned object
+
+    Any change in the data written to the skin file changes the hash, so it
+    can be used to skip the export of unchanged objects.
+
+    Arguments:
+        obj (dagNode): The skinned object
+        skinCls (PyNode): The skincluster node
+
+    Returns:
+        str: The hexadecimal hash
+    """
+    skin_fn, dag_path, components = get_skin_cluster_api2(skinCls.name())
+    skinHash = hashlib.sha1()
+    skinHash.update(obj.name().encode("utf-8"))
+
+    # topology
+    if dag_path.hasFn(om2.MFn.kMesh):
+        counts, connects = om2.MFnMesh(dag_path).getVertices()
+        skinHash.update(array.array("i", counts).tobytes())
+        skinHash.update(array.array("i", connects).tobytes())
+    elif dag_path.hasFn(om2.MFn.kNurbsCurve):
+        curve_fn = om2.MFnNurbsCurve(dag_path)
+        topology = [curve_fn.numCVs, curve_fn.degree, curve_fn.form]
+        skinHash.update(str(topology).encode("utf-8"))
+    elif dag_path.hasFn(om2.MFn.kNurbsSurface):
+        surface_fn = om2.MFnNurbsSurface(dag_path)
+        topology = [
+            surface_fn.numCVsInU,
+            surface_fn.numCVsInV,
+            surface_fn.degreeInU,
+            surface_fn.degreeInV,
+        ]
+        skinHash.update(str(topology).encode("utf-8"))
+
+    # weights
+    influences = [
+        om2.MFnDependencyNode(p.node()).name()
+        for p in skin_fn.influenceObjects()
+    ]
+    skinHash.update(str(influences).encode("utf-8"))
+    weights, _ = skin_fn.getWeights(dag_path, components)
+    skinHash.update(array.array("d", weights).tobytes())
+    blendWeights = skin_fn.getBlendWeights(dag_path, components)
+    skinHash.update(array.array("d", blendWeights).tobytes())
+    for attr in ["skinningMethod", "normalizeWeights"]:
+        skinHash.update(str(skinCls.attr(attr).get()).encode("utf-8"))
+
+    return skinHash.hexdigest()
+
+
+def getDataInfluences(dataDic):
+    """Get the influence names stored in a skin data dictionary
+
+    Arguments:
+        dataDic (dict): The skin data of one object
+
+    Returns:
+        list: The influence names
+    """
+    if dataDic.get("skinDataFormat") == COLUMNAR_FORMAT:
+        return list(dataDic["influences"])
+    return list(dataDic["weights"].keys())
+
+
 ######################################
 # Skin Collectors
 ######################################
@@ -241,43 +366,77 @@ def collectData(skinCls, dataDic):
     dataDic["skinClsName"] = skinCls.name()
 
 
+def collectColumnarData(skinCls, dataDic):
+    """Collect the skincluster data in sparse columnar (CSR) layout
+
+    The non zero weights of vertex ``i`` are stored in
+    ``weightValues[indptr[i]:indptr[i + 1]]`` and the matching influences
+    in ``influenceIndices``, indexing the ``influences`` name list.
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dataDic (dict): The dictionary to fill with the skin data
+    """
+    skin_fn, dag_path, components = get_skin_cluster_api2(skinCls.name())
+    weights, num_influences = skin_fn.getWeights(dag_path, components)
+
+    dense = np.array(weights, dtype=np.float64).reshape(-1, num_influences)
+    vertices, influences = np.nonzero(dense)
+    indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.count_nonzero(dense, axis=1), out=indptr[1:])
+
+    dataDic["influences"] = [
+        om2.MFnDependencyNode(p.node()).name().split(":")[-1]
+        for p in skin_fn.influenceObjects()
+    ]
+    dataDic["vertexCount"] = dense.shape[0]
+    dataDic["indptr"] = indptr
+    dataDic["influenceIndices"] = influences.astype(np.int32)
+    dataDic["weightValues"] = dense[vertices, influences]
+    dataDic["blendWeights"] = np.array(
+        skin_fn.getBlendWeights(dag_path, components), dtype=np.float64
+    )
+
+    for attr in ["skinningMethod", "normalizeWeights"]:
+        dataDic[attr] = skinCls.attr(attr).get()
+
+    dataDic["skinClsName"] = skinCls.name()
+
+
 ######################################
 # Skin export
 ######################################
 
 
-def exportSkin(filePath=None, objs=None, *args):
-    if not objs:
-        if pm.selected():
-            objs = pm.selected()
-        else:
-            pm.displayWarning("Please Select One or more objects")
-            return False
+def pruneSkinWeights(obj, skinCls):
+    """Prune the infinitely small weights of a skinned mesh
 
-    packDic = {"objs": [], "objDDic": [], "bypassObj": []}
+    Arguments:
+        obj (dagNode): The skinned object
+        skinCls (PyNode): The skincluster node
+    """
+    # start by pruning by a tiny amount. Enough to not make  noticeable
+    # change to the skin, but it will remove infinitely small weights.
+    # Otherwise, compressing will do almost nothing!
+    if isinstance(obj.getShape(), pm.nodetypes.Mesh):
+        # TODO: Implement pruning on nurbs. Less straight-forward
+        pm.skinPercent(skinCls, obj, pruneWeights=0.001)
 
-    if not filePath:
 
-        f2 = "jSkin ASCII  (*{});;gSkin Binary (*{})".format(
-            FILE_JSON_EXT, FILE_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f2 + f3
-        filePath = pm.fileDialog2(fileMode=0, fileFilter=fileFilters)
-        if filePath:
-            filePath = filePath[0]
+def collectSkinPack(objs, file_ext, prune=True):
+    """Collect the skin data of the given objects
 
-        else:
-            return False
+    Arguments:
+        objs (list): The skinned objects
+        file_ext (str): The skin file extension, sets the data format
+        prune (bool, optional): Prune the small weights before collecting
 
-    if not filePath.endswith(FILE_EXT) and not filePath.endswith(
-        FILE_JSON_EXT
-    ):
-        # filePath += file_ext
-        pm.displayWarning("Not valid file extension for: {}".format(filePath))
-        return
+    Returns:
+        dict: The skin pack data with the objs and objDDic keys
+    """
+    packDic = {"objs": [], "objDDic": [], "bypassObj": []}
+    columnar = file_ext == FILE_NPZ_EXT
 
-    _, file_ext = os.path.splitext(filePath)
     # object parsing
     for obj in objs:
         skinCls = getSkinCluster(obj)
@@ -287,12 +446,8 @@ def exportSkin(filePath=None, objs=None, *args):
             )
             pass
         else:
-            # start by pruning by a tiny amount. Enough to not make  noticeable
-            # change to the skin, but it will remove infinitely small weights.
-            # Otherwise, compressing will do almost nothing!
-            if isinstance(obj.getShape(), pm.nodetypes.Mesh):
-                # TODO: Implement pruning on nurbs. Less straight-forward
-                pm.skinPercent(skinCls, obj, pruneWeights=0.001)
+            if prune:
+                pruneSkinWeights(obj, skinCls)
 
             dataDic = {
                 "weights": {},
@@ -307,7 +462,12 @@ def exportSkin(filePath=None, objs=None, *args):
             dataDic["objName"] = obj.name()
             dataDic["nameSpace"] = obj.namespace()
 
-            collectData(skinCls, dataDic)
+            if columnar:
+                dataDic["skinDataFormat"] = COLUMNAR_FORMAT
+                del dataDic["weights"]
+                collectColumnarData(skinCls, dataDic)
+            else:
+                collectData(skinCls, dataDic)
 
             packDic["objs"].append(obj.name())
             packDic["objDDic"].append(dataDic)
@@ -315,29 +475,87 @@ def exportSkin(filePath=None, objs=None, *args):
             pm.displayInfo(
                 exportMsg.format(
                     skinCls.name(),
-                    len(dataDic["weights"].keys()),
-                    len(dataDic["blendWeights"]),
+                    len(getDataInfluences(dataDic)),
+                    dataDic["vertexCount"],
                     obj.name(),
                 )
             )
 
-    if packDic["objs"]:
-        if filePath.endswith(FILE_EXT):
-            with open(filePath, "wb") as fp:
-                pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+    return packDic
+
+
+def exportSkin(filePath=None, objs=None, *args):
+    if not objs:
+        if pm.selected():
+            objs = pm.selected()
+        else:
+            pm.displayWarning("Please Select One or more objects")
+            return False
+
+    if not filePath:
+
+        f2 = "jSkin ASCII  (*{});;gSkin Binary (*{})".format(
+            FILE_JSON_EXT, FILE_EXT
+        )
+        f3 = ";;nSkin Columnar (*{})".format(FILE_NPZ_EXT)
+        f4 = ";;All Files (*.*)"
+        fileFilters = f2 + f3 + f4
+        filePath = pm.fileDialog2(fileMode=0, fileFilter=fileFilters)
+        if filePath:
+            filePath = filePath[0]
+
         else:
-            with open(filePath, "w") as fp:
-                json.dump(packDic, fp, indent=4, sort_keys=True)
+            return False
+
+    _, file_ext = os.path.splitext(filePath)
+    if file_ext not in [FILE_EXT, FILE_JSON_EXT, FILE_NPZ_EXT]:
+        # filePath += file_ext
+        pm.displayWarning("Not valid file extension for: {}".format(filePath))
+        return
 
+    if file_ext == FILE_NPZ_EXT and not NUMPY_READY:
+        pm.displayWarning(
+            "NumPy is not available. Can't export: {}".format(filePath)
+        )
+        return
+
+    packDic = collectSkinPack(objs, file_ext)
+    if packDic["objs"]:
+        skin_io.write_skin_file(filePath, packDic)
         return True
 
 
 @utils.timeFunc
-def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
-    if use_json:
-        file_ext = FILE_JSON_EXT
-    else:
-        file_ext = FILE_EXT
+def exportSkinPack(
+    packPath=None, objs=None, use_json=False, file_ext=None, *args, **kwargs
+):
+    """Export the skin of each object to its own file and a skin pack file
+
+    The skin data is collected in the main thread while the files
+    already collected are encoded and written to disk by a pool of worker
+    processes. Only a few objects are kept in memory at the same time.
+
+    The pack file stores a hash of the topology and weights of each object.
+    When exporting over an existing pack, the objects with the same hash
+    and an existing skin file are not collected and written again.
+
+    Arguments:
+        packPath (str, optional): The skin pack file path
+        objs (list, optional): The objects to export. Default is selection
+        use_json (bool, optional): Export jSkin files instead of gSkin
+        file_ext (str, optional): The skin file extension. Overrides use_json
+        *args: Maya callback arguments
+        **kwargs: workers (int) number of worker processes. Default from
+            concurrent.futures. incremental (bool) skip the unchanged
+            objects. Default True
+    """
+    workers = kwargs.get("workers")
+    incremental = kwargs.get("incremental", True)
+    if file_ext is None:
+        if use_json:
+            file_ext = FILE_JSON_EXT
+        else:
+            file_ext = FILE_EXT
 
     if not objs:
         if pm.selected():
@@ -362,18 +580,60 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
         pm.displayWarning("Not valid file extension for: {}".format(packPath))
         return
 
+    if file_ext == FILE_NPZ_EXT and not NUMPY_READY:
+        pm.displayWarning(
+            "NumPy is not available. Can't export: {}".format(packPath)
+        )
+        return
+
     packDic["rootPath"], packName = os.path.split(packPath)
 
-    for obj in objs:
-        fileName = obj.stripNamespace() + file_ext
-        filePath = os.path.join(packDic["rootPath"], fileName)
-        if exportSkin(filePath, [obj], use_json):
-            packDic["packFiles"].append(fileName)
-            pm.displayInfo(filePath)
-        else:
-            pm.displayWarning(
-                obj.name() + ": Skipped because don't have Skin Cluster"
+    previousHashes = {}
+    if incremental and os.path.isfile(packPath):
+        with open(packPath) as fp:
+            previousHashes = json.load(fp).get("hashes", {})
+
+    fileNames = []
+    written = set()
+    hashes = {}
+    with skin_io.get_worker_pool(workers) as pool:
+        pending = set()
+        # bound the collected data waiting to be written
+        maxPending = skin_io.get_max_pending(workers)
+        for obj in objs:
+            fileName = obj.stripNamespace() + file_ext
+            filePath = os.path.join(packDic["rootPath"], fileName)
+            skinCls = getSkinCluster(obj)
+            if not skinCls:
+                pm.displayWarning(
+                    obj.name() + ": Skipped because don't have Skin Cluster"
+                )
+                continue
+            pruneSkinWeights(obj, skinCls)
+            hashes[fileName] = getSkinHash(obj, skinCls)
+            if previousHashes.get(fileName) == hashes[fileName]:
+                if os.path.isfile(filePath):
+                    fileNames.append(fileName)
+                    written.add(fileName)
+                    pm.displayInfo("Unchanged skin: {}".format(filePath))
+                    continue
+
+            objPackDic = collectSkinPack([obj], file_ext, prune=False)
+            if not objPackDic["objs"]:
+                continue
+            fileNames.append(fileName)
+            pending.add(
+                pool.submit(skin_io.write_skin_file, filePath, objPackDic)
             )
+            if len(pending) >= maxPending:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                written.update(_writtenSkinFiles(done))
+        written.update(_writtenSkinFiles(futures.as_completed(pending)))
+
+    packDic["packFiles"] = [f for f in fileNames if f in written]
+    packDic["hashes"] = {f: hashes[f] for f in packDic["packFiles"]}
 
     if packDic["packFiles"]:
         data_string = json.dumps(packDic, indent=4, sort_keys=True)
@@ -387,10 +647,35 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
         )
 
 
+def _writtenSkinFiles(done):
+    """Get the file names of the finished skin file writing jobs
+
+    Arguments:
+        done (iterable): The finished futures of skin_io.write_skin_file
+
+    Returns:
+        list: The written file names
+    """
+    written = []
+    for future in done:
+        try:
+            filePath = future.result()
+        except Exception as e:
+            pm.displayWarning("Skin file export failed: {}".format(e))
+            continue
+        pm.displayInfo(filePath)
+        written.append(os.path.basename(filePath))
+    return written
+
+
 def exportJsonSkinPack(packPath=None, objs=None, *args):
     exportSkinPack(packPath, objs, use_json=True)
 
 
+def exportColumnarSkinPack(packPath=None, objs=None, *args):
+    exportSkinPack(packPath, objs, file_ext=FILE_NPZ_EXT)
+
+
 ######################################
 # Skin setters
 ######################################
@@ -468,8 +753,61 @@ def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
     )
 
 
+def setColumnarData(skinCls, dataDic):
+    """Set the skincluster data stored in sparse columnar (CSR) layout
+
+    The full weight buffer is built in one vectorized pass and applied
+    with a single MFnSkinCluster.setWeights call. Scene influences not
+    found in the data keep their current weights.
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dataDic (dict): The skin data collected with collectColumnarData
+    """
+    skin_fn, dag_path, components = get_skin_cluster_api2(skinCls.name())
+    weights, num_influences = skin_fn.getWeights(dag_path, components)
+
+    influenceMap = {
+        om2.MFnDependencyNode(p.node()).name(): ii
+        for ii, p in enumerate(skin_fn.influenceObjects())
+    }
+    remap = np.array(
+        [influenceMap.get(inf, -1) for inf in dataDic["influences"]],
+        dtype=np.int64,
+    )
+
+    indptr = dataDic["indptr"]
+    vertexCount = len(indptr) - 1
+    rows = np.repeat(np.arange(vertexCount), np.diff(indptr))
+    cols = remap[dataDic["influenceIndices"]]
+    valid = cols >= 0
+
+    dense = np.array(weights, dtype=np.float64).reshape(-1, num_influences)
+    dense[:, remap[remap >= 0]] = 0.0
+    dense[rows[valid], cols[valid]] = dataDic["weightValues"][valid]
+
+    skin_fn.setWeights(
+        dag_path,
+        components,
+        om2.MIntArray(range(num_influences)),
+        om2.MDoubleArray(dense.ravel().tolist()),
+        False,
+    )
+    skin_fn.setBlendWeights(
+        dag_path,
+        components,
+        om2.MDoubleArray(np.asarray(dataDic["blendWeights"]).tolist()),
+    )
+
+
 # @utils.timeFunc
 def setData(skinCls, dataDic, compressed):
+    if dataDic.get("skinDataFormat") == COLUMNAR_FORMAT:
+        setColumnarData(skinCls, dataDic)
+        for attr in ["skinningMethod", "normalizeWeights"]:
+            skinCls.attr(attr).set(dataDic[attr])
+        return
+
     dagPath, components = getGeometryComponents(skinCls)
     setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed)
     for attr in ["skinningMethod", "normalizeWeights"]:
@@ -482,29 +820,41 @@ def setData(skinCls, dataDic, compressed):
 ######################################
 
 
+def readSkinFile(filePath):
+    """Read any of the supported skin file formats
+
+    Arguments:
+        filePath (str): The file path to read
+
+    Returns:
+        dict: The skin pack data with the objs and objDDic keys
+    """
+    return skin_io.read_skin_file(filePath)
+
+
+def _skinFileFilters():
+    f1 = "mGear Skin (*{0} *{1} *{2})".format(
+        FILE_EXT, FILE_JSON_EXT, FILE_NPZ_EXT
+    )
+    f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
+        FILE_EXT, FILE_JSON_EXT
+    )
+    f3 = ";;nSkin Columnar (*{0})".format(FILE_NPZ_EXT)
+    f4 = ";;All Files (*.*)"
+    return f1 + f2 + f3 + f4
+
+
 def _getObjsFromSkinFile(filePath=None, *args):
     # retrive the object names inside gSkin file
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
-        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-            FILE_EXT, FILE_JSON_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f1 + f2 + f3
-        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
+        filePath = pm.fileDialog2(fileMode=1, fileFilter=_skinFileFilters())
     if not filePath:
         return
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
     # Read in the file
-    with open(filePath, "r") as fp:
-        if filePath.endswith(FILE_EXT):
-            data = pickle.load(fp)
-        else:
-            data = json.load(fp)
-
-        return data["objs"]
+    return readSkinFile(filePath)["objs"]
 
 
 def getObjsFromSkinFile(filePath=None, *args):
@@ -518,33 +868,30 @@ def getObjsFromSkinFile(filePath=None, *args):
 def importSkin(filePath=None, *args):
 
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
-        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-            FILE_EXT, FILE_JSON_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f1 + f2 + f3
-        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
+        filePath = pm.fileDialog2(fileMode=1, fileFilter=_skinFileFilters())
     if not filePath:
         return
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
     # Read in the file
-    if filePath.endswith(FILE_EXT):
-        with open(filePath, "rb") as fp:
-            dataPack = pickle.load(fp)
-    else:
-        with open(filePath, "r") as fp:
-            dataPack = json.load(fp)
+    importSkinData(readSkinFile(filePath))
+
 
+def importSkinData(dataPack):
+    """Apply the skin data read from a skin file to the scene objects
+
+    Arguments:
+        dataPack (dict): The skin pack data with the objs and objDDic keys
+    """
     for data in dataPack["objDDic"]:
         # This checks if the jSkin file has the new style compressed format.
         # use a skinDataFormat key to check for backwards compatibility.
         # If it doesn't exist, just continue with the old method.
+        # The columnar format also stores the vertexCount.
         compressed = False
         if "skinDataFormat" in data:
-            if data["skinDataFormat"] == "compressed":
+            if data["skinDataFormat"] in ["compressed", COLUMNAR_FORMAT]:
                 compressed = True
 
         try:
@@ -590,7 +937,7 @@ def importSkin(filePath=None, *args):
                 skinCluster = getSkinCluster(objNode)
             else:
                 try:
-                    joints = list(data["weights"].keys())
+                    joints = getDataInfluences(data)
                     # strip | from longName, or skinCluster command may fail.
                     skinName = data["skinClsName"].replace("|", "")
                     skinCluster = pm.skinCluster(
@@ -601,7 +948,7 @@ def importSkin(filePath=None, *args):
                         [pm.PyNode(x).name() for x in pm.ls(type="joint")]
                     )
                     notFound = []
-                    for j in data["weights"].keys():
+                    for j in getDataInfluences(data):
                         if j not in sceneJoints:
                             notFound.append(str(j))
                     pm.displayWarning(
@@ -624,7 +971,19 @@ def importSkin(filePath=None, *args):
 
 
 @utils.timeFunc
-def importSkinPack(filePath=None, *args):
+def importSkinPack(filePath=None, *args, **kwargs):
+    """Import all the skin files of a skin pack
+
+    The skin files are read and decoded by a pool of worker processes and
+    applied in the main thread in the pack order, as soon as each one and
+    the previous ones are ready.
+
+    Arguments:
+        filePath (str, optional): The skin pack file path
+        *args: Maya callback arguments
+        **kwargs: workers (int) number of worker processes. Default from
+            concurrent.futures
+    """
     if not filePath:
         filePath = pm.fileDialog2(
             fileMode=1, fileFilter="mGear skinPack (*%s)" % PACK_EXT
@@ -636,9 +995,18 @@ def importSkinPack(filePath=None, *args):
 
     with open(filePath) as fp:
         packDic = json.load(fp)
-        for pFile in packDic["packFiles"]:
-            filePath = os.path.join(os.path.split(filePath)[0], pFile)
-            importSkin(filePath, True)
+
+    rootPath = os.path.split(filePath)[0]
+    filePaths = [os.path.join(rootPath, f) for f in packDic["packFiles"]]
+    for pFile, dataPack, error in skin_io.read_skin_files(
+        filePaths, kwargs.get("workers")
+    ):
+        if error is not None:
+            pm.displayWarning(
+                "Can't read skin file {}: {}".format(pFile, error)
+            )
+            continue
+        importSkinData(dataPack)
 
 
 ######################################
@@ -0,0 +1,271 @@
+"""
+Skin file encoding and decoding.
+
+This module doesn't use the Maya API, so the serialization of the skin files
+can run in worker processes while the skinCluster data is collected and
+applied by mgear.core.skin in the main thread.
+"""
+
+import collections
+import contextlib
+import io
+import multiprocessing
+import multiprocessing.spawn
+import os
+import sys
+import json
+import pickle as pickle
+from concurrent import futures
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+FILE_EXT = ".gSkin"
+FILE_JSON_EXT = ".jSkin"
+FILE_NPZ_EXT = ".nSkin"
+
+# per object arrays stored in the columnar container
+COLUMNAR_ARRAYS = [
+    "indptr",
+    "influenceIndices",
+    "weightValues",
+    "blendWeights",
+]
+
+
+######################################
+# Encoding
+######################################
+
+
+def _dumps_columnar(packDic):
+    """Encode skin data collected with skin.collectColumnarData
+
+    The metadata is stored as a JSON string in the "header" array and the
+    arrays of each object are stored as "<objIndex>_<arrayName>".
+
+    Args:
+        packDic (dict): The skin pack data with the objs and objDDic keys
+
+    Returns:
+        bytes: The NumPy archive
+    """
+    arrays = {}
+    header = {"objs": packDic["objs"], "objDDic": []}
+    for i, dataDic in enumerate(packDic["objDDic"]):
+        metadata = {}
+        for key, value in dataDic.items():
+            if key in COLUMNAR_ARRAYS:
+                arrays["{}_{}".format(i, key)] = value
+            else:
+                metadata[key] = value
+        header["objDDic"].append(metadata)
+    arrays["header"] = np.array(json.dumps(header))
+
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    return buf.getvalue()
+
+
+def _loads_columnar(data):
+    """Decode skin data encoded with _dumps_columnar
+
+    Args:
+        data (bytes): The NumPy archive
+
+    Returns:
+        dict: The skin pack data with the objs and objDDic keys
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        packDic = json.loads(str(npz["header"]))
+        for i, dataDic in enumerate(packDic["objDDic"]):
+            for key in COLUMNAR_ARRAYS:
+                dataDic[key] = npz["{}_{}".format(i, key)]
+
+    return packDic
+
+
+def _check_numpy(file_ext):
+    if file_ext == FILE_NPZ_EXT and not NUMPY_READY:
+        raise RuntimeError(
+            "NumPy is not available. Can't process {} files".format(file_ext)
+        )
+
+
+def dumps(packDic, file_ext):
+    """Encode the skin pack data in the format of the given file extension
+
+    Args:
+        packDic (dict): The skin pack data with the objs and objDDic keys
+        file_ext (str): FILE_EXT, FILE_JSON_EXT or FILE_NPZ_EXT
+
+    Returns:
+        bytes: The encoded data
+    """
+    _check_numpy(file_ext)
+    if file_ext == FILE_NPZ_EXT:
+        return _dumps_columnar(packDic)
+    elif file_ext == FILE_EXT:
+        return pickle.dumps(packDic, pickle.HIGHEST_PROTOCOL)
+    else:
+        data_string = json.dumps(packDic, indent=4, sort_keys=True)
+        return data_string.encode("utf-8")
+
+
+def loads(data, file_ext):
+    """Decode skin pack data encoded in the format of the given extension
+
+    Args:
+        data (bytes): The encoded data
+        file_ext (str): FILE_EXT, FILE_JSON_EXT or FILE_NPZ_EXT
+
+    Returns:
+        dict: The skin pack data with the objs and objDDic keys
+    """
+    _check_numpy(file_ext)
+    if file_ext == FILE_NPZ_EXT:
+        return _loads_columnar(data)
+    elif file_ext == FILE_EXT:
+        return pickle.loads(data)
+    else:
+        return json.loads(data.decode("utf-8"))
+
+
+def write_skin_file(filePath, packDic):
+    """Encode and write a skin file. The format is set by the extension
+
+    Args:
+        filePath (str): The file path to write
+        packDic (dict): The skin pack data with the objs and objDDic keys
+
+    Returns:
+        str: The written file path
+    """
+    data = dumps(packDic, os.path.splitext(filePath)[-1])
+    with open(filePath, "wb") as fp:
+        fp.write(data)
+    return filePath
+
+
+def read_skin_file(filePath):
+    """Read and decode a skin file. The format is set by the extension
+
+    Args:
+        filePath (str): The file path to read
+
+    Returns:
+        dict: The skin pack data with the objs and objDDic keys
+    """
+    with open(filePath, "rb") as fp:
+        data = fp.read()
+    return loads(data, os.path.splitext(filePath)[-1])
+
+
+######################################
+# Worker pool
+######################################
+
+
+def get_max_pending(workers=None):
+    """Get the number of skin files jobs to keep in flight
+
+    Bounds the skin data held in memory while the files are processed.
+
+    Args:
+        workers (int, optional): Number of workers
+
+    Returns:
+        int: Twice the number of workers
+    """
+    return (workers or os.cpu_count() or 1) * 2
+
+
+def _get_python_executable():
+    """Get the Python interpreter of the worker processes
+
+    Inside the Maya GUI sys.executable is the Maya binary, so the mayapy of
+    the running Maya is used instead.
+
+    Returns:
+        str: The interpreter path
+    """
+    name = os.path.basename(sys.executable).lower()
+    if name.startswith(("python", "mayapy")):
+        return sys.executable
+
+    from mgear.core import utils
+
+    return utils.get_mayapy_path()
+
+
+@contextlib.contextmanager
+def get_worker_pool(workers=None):
+    """Get an executor to encode/decode skin files in parallel
+
+    Uses a pool of spawned processes, since pickle and json hold the GIL.
+    Only the file paths and the skin data are sent to the workers, the Maya
+    API stays in the main thread. The multiprocessing executable is set for
+    the pool lifetime and restored after.
+
+    Args:
+        workers (int, optional): Number of workers. None uses the
+            concurrent.futures default
+
+    Yields:
+        concurrent.futures.Executor: The worker pool
+    """
+    executable = multiprocessing.spawn.get_executable()
+    multiprocessing.spawn.set_executable(_get_python_executable())
+    try:
+        with futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            yield pool
+    finally:
+        multiprocessing.spawn.set_executable(executable)
+
+
+def read_skin_files(filePaths, workers=None):
+    """Read and decode skin files in parallel, yielding them in order
+
+    The files are read by a pool of worker processes, with at most
+    get_max_pending files in flight. Each file is yielded as soon as it and
+    the previous files are ready.
+
+    Args:
+        filePaths (list of str): The file paths to read
+        workers (int, optional): Number of workers
+
+    Yields:
+        tuple: The file path, the skin pack data and the error raised
+            reading the file. The data is None if the reading failed
+    """
+    if not filePaths:
+        return
+
+    maxPending = get_max_pending(workers)
+    paths = iter(filePaths)
+    jobs = collections.deque()
+    with get_worker_pool(workers) as pool:
+        for filePath in paths:
+            jobs.append((filePath, pool.submit(read_skin_file, filePath)))
+            if len(jobs) >= maxPending:
+                break
+
+        while jobs:
+            filePath, future = jobs.popleft()
+            try:
+                result = filePath, future.result(), None
+            except Exception as e:
+                result = filePath, None, e
+
+            for nextPath in paths:
+                jobs.append((nextPath, pool.submit(read_skin_file, nextPath)))
+                break
+
+            yield result
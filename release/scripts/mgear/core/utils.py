@@ -386,3 +386,16 @@ def get_maya_path():
     maya_path = os.environ['MAYA_LOCATION']
     maya_path = os.path.normpath(os.path.join(maya_path,"bin"))
     return maya_path
+
+
+def get_mayapy_path():
+    """
+    Gets the path to the mayapy executable of the running Maya
+
+    Note: Only works from inside Maya, as Maya adds the path on startup.
+
+    :return: Absolute path to the mayapy executable
+    :rtype: str
+    """
+    name = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    return os.path.join(get_maya_path(), name)
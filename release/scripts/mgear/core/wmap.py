@@ -1,13 +1,308 @@
 # Weigth maps IO
 
+import io
 import json
+import os
 
 from maya import cmds
 import mgear.pymaya as pm
 import maya.OpenMaya as OpenMaya
+import maya.OpenMayaAnim as OpenMayaAnim
+import maya.api.OpenMaya as om2
 from .six import string_types
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
 FILE_EXT = ".wmap"
+FILE_NPZ_EXT = ".nwmap"
+
+# value of the weights not stored in the deformer
+DEFAULT_WEIGHT = 1.0
+
+
+######################################
+# Deformer weights
+######################################
+
+
+def _deformed_geometries(deformer):
+    """Get the geometries of a deformer
+
+    Args:
+        deformer (str): Name of the deformer
+
+    Returns:
+        list: (transform full path, shape, weightList index) of each geometry
+    """
+    shapes = cmds.deformer(deformer, q=True, geometry=True) or []
+    indices = cmds.deformer(deformer, q=True, geometryIndices=True) or []
+    geometries = []
+    for shape, index in zip(shapes, indices):
+        path = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+        geometries.append((path, shape, index))
+    return geometries
+
+
+def get_points(geometry):
+    """Get the world space points of a deformable geometry
+
+    Args:
+        geometry (str): Name of the shape
+
+    Returns:
+        array: (n, 3) positions
+    """
+    sel_list = om2.MSelectionList()
+    sel_list.add(geometry)
+    points = om2.MItGeometry(sel_list.getDagPath(0)).allPositions(
+        om2.MSpace.kWorld
+    )
+    return np.array(points, dtype=np.float64)[:, :3]
+
+
+def _point_count(geometry):
+    sel_list = om2.MSelectionList()
+    sel_list.add(geometry)
+    return om2.MItGeometry(sel_list.getDagPath(0)).count()
+
+
+def _weights_plug(deformer, index):
+    return "{}.weightList[{}].weights".format(deformer, index)
+
+
+def _read_weights(deformer, index, count):
+    # one getAttr for the whole range, the weights not stored in the
+    # deformer get their default value
+    if not count:
+        return []
+    weights = cmds.getAttr(
+        "{}[0:{}]".format(_weights_plug(deformer, index), count - 1)
+    )
+    if not isinstance(weights, list):
+        weights = [weights]
+    return weights
+
+
+def get_weight_arrays(deformer, points=False):
+    """Get the weight maps of a deformer as NumPy arrays
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        points (bool, optional): Also get the world space points of the
+            geometries, stored in the "_points" key, to remap the weights on
+            a different topology
+
+    Returns:
+        dict: The float32 weights by geometry path, and the geometry paths
+            in the "_deformed_index" key
+    """
+    _check_numpy(FILE_NPZ_EXT)
+    deformer = str(deformer)
+    data = {"_deformed_index": []}
+    if points:
+        data["_points"] = {}
+    for path, shape, index in _deformed_geometries(deformer):
+        data[path] = np.array(
+            _read_weights(deformer, index, _point_count(shape)),
+            dtype=np.float32,
+        )
+        data["_deformed_index"].append(path)
+        if points:
+            data["_points"][path] = get_points(shape)
+
+    return data
+
+
+def _complete_components(path):
+    """Get the components of all the points of a shape, in weights order
+
+    Args:
+        path (MDagPath): The shape, OpenMaya 1.0
+
+    Returns:
+        MObject: The components, None if the shape type isn't supported
+    """
+    if path.hasFn(OpenMaya.MFn.kMesh):
+        comp_fn = OpenMaya.MFnSingleIndexedComponent()
+        components = comp_fn.create(OpenMaya.MFn.kMeshVertComponent)
+        comp_fn.setCompleteData(OpenMaya.MFnMesh(path).numVertices())
+    elif path.hasFn(OpenMaya.MFn.kNurbsCurve):
+        comp_fn = OpenMaya.MFnSingleIndexedComponent()
+        components = comp_fn.create(OpenMaya.MFn.kCurveCVComponent)
+        comp_fn.setCompleteData(OpenMaya.MFnNurbsCurve(path).numCVs())
+    elif path.hasFn(OpenMaya.MFn.kNurbsSurface):
+        surface_fn = OpenMaya.MFnNurbsSurface(path)
+        comp_fn = OpenMaya.MFnDoubleIndexedComponent()
+        components = comp_fn.create(OpenMaya.MFn.kSurfaceCVComponent)
+        comp_fn.setCompleteData(surface_fn.numCVsInU(), surface_fn.numCVsInV())
+    else:
+        return None
+    return components
+
+
+def _set_weight_geometry_filter(deformer, index, shape, weights):
+    """Set a whole weight map with a single MFnWeightGeometryFilter call
+
+    Args:
+        deformer (str): Name of the deformer
+        index (int): The weightList index of the geometry
+        shape (str): Name of the deformed shape
+        weights (list): The weight of each point
+
+    Returns:
+        bool: False if the deformer or the shape type isn't supported
+    """
+    sel_list = OpenMaya.MSelectionList()
+    sel_list.add(deformer)
+    sel_list.add(shape)
+    deformer_obj = OpenMaya.MObject()
+    sel_list.getDependNode(0, deformer_obj)
+    if not deformer_obj.hasFn(OpenMaya.MFn.kWeightGeometryFilt):
+        return False
+
+    path = OpenMaya.MDagPath()
+    sel_list.getDagPath(1, path)
+    components = _complete_components(path)
+    if components is None:
+        return False
+
+    values = OpenMaya.MFloatArray()
+    OpenMaya.MScriptUtil.createFloatArrayFromList(
+        [float(w) for w in weights], values
+    )
+    try:
+        OpenMayaAnim.MFnWeightGeometryFilter(deformer_obj).setWeight(
+            path, index, components, values
+        )
+    except RuntimeError:
+        return False
+    return True
+
+
+def _write_weights(deformer, index, shape, weights):
+    # the whole map in one call when the deformer supports it, otherwise
+    # setAttr on the weights plug
+    if _set_weight_geometry_filter(deformer, index, shape, weights):
+        return
+
+    plug = _weights_plug(deformer, index)
+    if not NUMPY_READY:
+        cmds.setAttr(
+            "{}[0:{}]".format(plug, len(weights) - 1),
+            *weights,
+            size=len(weights)
+        )
+        return
+
+    # only sets the stored weights and the ones not at their default value,
+    # by runs of consecutive indices
+    weights = np.asarray(weights, dtype=np.float32)
+    changed = weights != DEFAULT_WEIGHT
+    stored = np.array(cmds.getAttr(plug, multiIndices=True) or [], dtype=int)
+    changed[stored[stored < len(weights)]] = True
+    indices = np.flatnonzero(changed)
+    if not len(indices):
+        return
+
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    for run in np.split(indices, breaks):
+        cmds.setAttr(
+            "{}[{}:{}]".format(plug, run[0], run[-1]),
+            *weights[run[0] : run[-1] + 1].tolist(),
+            size=len(run)
+        )
+
+
+def _match_geometries(deformer, data, geometry=None):
+    """Match the geometries of the data with the deformer geometries
+
+    By path, or by order if the paths don't match but the number of
+    geometries does. Only the given geometry is matched, if any.
+    """
+    geometries = _deformed_geometries(deformer)
+    paths = data["_deformed_index"]
+    if len(paths) == len(geometries) and not any(
+        g[0] in data for g in geometries
+    ):
+        matches = list(zip(paths, geometries))
+    else:
+        matches = [(g[0], g) for g in geometries if g[0] in data]
+
+    if geometry is not None:
+        names = set(cmds.ls(geometry, long=True))
+        matches = [
+            (key, (path, shape, index))
+            for key, (path, shape, index) in matches
+            if path in names or names.intersection(cmds.ls(shape, long=True))
+        ]
+    return matches
+
+
+def set_weight_arrays(deformer, data, geometry=None):
+    """Set the weight maps of a deformer from arrays
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        data (dict): The weights by geometry path, as get_weight_arrays
+        geometry (str, optional): Only set the weights of this geometry,
+            shape or transform. All the deformer geometries if None
+    """
+    deformer = str(deformer)
+    for key, (_, shape, index) in _match_geometries(deformer, data, geometry):
+        weights = data[key]
+        count = _point_count(shape)
+        if len(weights) != count:
+            pm.displayWarning(
+                "{}: {} weights for {} points, use remap_weight_arrays to "
+                "import on a different topology".format(
+                    shape, len(weights), count
+                )
+            )
+            continue
+        _write_weights(deformer, index, shape, weights)
+
+
+def remap_weight_arrays(deformer, data, geometry=None):
+    """Remap weight maps on the current points of the deformer geometries
+
+    Each point gets the weight of the closest point stored in the data. The
+    geometries whose points haven't changed are kept as they are.
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        data (dict): The weights and points by geometry path, as
+            get_weight_arrays with points
+        geometry (str, optional): Only remap the weights of this geometry,
+            shape or transform. All the deformer geometries if None
+
+    Returns:
+        dict: The remapped weights
+    """
+    from mgear.core import meshNavigation
+
+    remapped = dict(data)
+    for key, (_, shape, _) in _match_geometries(
+        str(deformer), data, geometry
+    ):
+        source_points = data.get("_points", {}).get(key)
+        if source_points is None:
+            continue
+        points = get_points(shape)
+        if len(points) == len(source_points) and np.allclose(
+            points, source_points, atol=1e-5
+        ):
+            continue
+        closest, _ = meshNavigation.closest_point_indices(
+            source_points, points
+        )
+        remapped[key] = np.asarray(data[key])[closest]
+
+    return remapped
 
 
 def get_weights(deformer):
@@ -21,41 +316,17 @@ def get_weights(deformer):
     Returns:
         dict: The weights dictionary
     """
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
-    dataDic = {}
-    dataDic["_deformed_index"] = []
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            weights = OpenMaya.MFloatArray()
-            deformer.__apimfn__().getWeights(dagPath, components, weights)
-            dataDic[dagPath.fullPathName()] = [
-                weights[i] for i in range(weights.length())
-            ]
-            dataDic["_deformed_index"].append(dagPath.fullPathName())
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for e, mesh in enumerate(def_objs):
-            VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-            weight = cmds.getAttr(
-                "{0}.weightList[{1}].weights[0:{2}]".format(
-                    deformer.name(), e, VertexNb
-                )
-            )
-            dataDic[mesh.fullPathName()] = weight
-            dataDic["_deformed_index"].append(mesh.fullPathName())
+    if NUMPY_READY:
+        data = get_weight_arrays(deformer)
+        for path in data["_deformed_index"]:
+            data[path] = data[path].tolist()
+        return data
+
+    deformer = str(deformer)
+    dataDic = {"_deformed_index": []}
+    for path, shape, index in _deformed_geometries(deformer):
+        dataDic[path] = _read_weights(deformer, index, _point_count(shape))
+        dataDic["_deformed_index"].append(path)
 
     return dataDic
 
@@ -68,68 +339,160 @@ def set_weights(deformer, dataWeights):
     Args:
         deformer (PyNode or str): Name or pynode of a deformer with weight map
     """
+    set_weight_arrays(deformer, dataWeights)
 
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            dw = dataWeights[dagPath.fullPathName()]
-            weights = OpenMaya.MFloatArray(len(dw))
-            for x in range(len(dw)):
-                weights.set(dw[x], int(x))
-
-            deformer.__apimfn__().setWeight(dagPath, components, weights)
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for mesh in def_objs:
-            if mesh.fullPathName() in dataWeights.keys():
-                weights = dataWeights[mesh.fullPathName()]
-                VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-                idx = dataWeights["_deformed_index"].index(mesh.fullPathName())
-                cmds.setAttr(
-                    "{0}.weightList[{1}].weights[0:{2}]".format(
-                        deformer.name(), idx, VertexNb
-                    ),
-                    *weights,
-                    size=len(weights)
+
+######################################
+# Files
+######################################
+
+
+def _dumps_sparse(data):
+    """Encode weight arrays in a NumPy archive
+
+    Each weight map stores the indices and values of the weights different
+    from its most common value, 0 or 1.
+
+    Args:
+        data (dict): The weights by geometry path, as get_weight_arrays
+
+    Returns:
+        bytes: The NumPy archive
+    """
+    arrays = {}
+    header = {"_deformed_index": data["_deformed_index"], "maps": []}
+    for i, path in enumerate(data["_deformed_index"]):
+        weights = np.asarray(data[path], dtype=np.float32)
+        zeros = np.count_nonzero(weights == 0.0)
+        ones = np.count_nonzero(weights == 1.0)
+        base = 0.0 if zeros > ones else 1.0
+        indices = np.flatnonzero(weights != base)
+        arrays["{}_indices".format(i)] = indices.astype(np.uint32)
+        arrays["{}_values".format(i)] = weights[indices]
+        header["maps"].append({"base": base, "count": len(weights)})
+
+        points = data.get("_points", {}).get(path)
+        if points is not None:
+            arrays["{}_points".format(i)] = np.asarray(
+                points, dtype=np.float32
+            )
+    arrays["header"] = np.array(json.dumps(header))
+
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    return buf.getvalue()
+
+
+def _loads_sparse(data):
+    """Decode weight arrays encoded with _dumps_sparse
+
+    Args:
+        data (bytes): The NumPy archive
+
+    Returns:
+        dict: The weights by geometry path, as get_weight_arrays
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        header = json.loads(str(npz["header"]))
+        wdata = {"_deformed_index": header["_deformed_index"]}
+        for i, path in enumerate(header["_deformed_index"]):
+            info = header["maps"][i]
+            weights = np.full(info["count"], info["base"], dtype=np.float32)
+            weights[npz["{}_indices".format(i)]] = npz["{}_values".format(i)]
+            wdata[path] = weights
+            key = "{}_points".format(i)
+            if key in npz:
+                wdata.setdefault("_points", {})[path] = npz[key].astype(
+                    np.float64
                 )
 
+    return wdata
 
-def export_weights(deformer, filePath):
-    """Export the wmap to a  json file
+
+def _check_numpy(file_ext):
+    if file_ext == FILE_NPZ_EXT and not NUMPY_READY:
+        raise RuntimeError(
+            "NumPy is not available. Can't process {} files".format(file_ext)
+        )
+
+
+def write_weights_file(filePath, data):
+    """Write weight maps. The format is set by the extension
 
     Args:
-        deformer (PyNode or str): Name or pynode of a deformer with weight map
-        filePath (str): Path to save the file
+        filePath (str): Path to save the file, FILE_NPZ_EXT for the binary
+            format, JSON otherwise
+        data (dict): The weights by geometry path
     """
-    wdata = get_weights(deformer)
+    file_ext = os.path.splitext(filePath)[-1]
+    _check_numpy(file_ext)
+    if file_ext == FILE_NPZ_EXT:
+        with open(filePath, "wb") as fp:
+            fp.write(_dumps_sparse(data))
+        return
+
+    wdata = {"_deformed_index": data["_deformed_index"]}
+    for path in data["_deformed_index"]:
+        wdata[path] = [float(w) for w in data[path]]
     with open(filePath, "w") as fp:
         json.dump(wdata, fp, indent=4, sort_keys=True)
 
 
-def import_weights(deformer, filePath):
-    """Import the wmap from a  json file
+def read_weights_file(filePath):
+    """Read weight maps. The format is set by the extension
+
+    Args:
+        filePath (str): Path to load the file
+
+    Returns:
+        dict: The weights by geometry path
+    """
+    file_ext = os.path.splitext(filePath)[-1]
+    _check_numpy(file_ext)
+    if file_ext == FILE_NPZ_EXT:
+        with open(filePath, "rb") as fp:
+            return _loads_sparse(fp.read())
+
+    with open(filePath, "r") as fp:
+        return json.load(fp)
+
+
+def export_weights(deformer, filePath, points=False):
+    """Export the wmap to a file
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        filePath (str): Path to save the file. FILE_NPZ_EXT files are
+            binary, sparse and compressed, other files are JSON
+        points (bool, optional): Store the points of the geometries, to
+            remap the weights on import. Binary files only
+    """
+    if NUMPY_READY:
+        data = get_weight_arrays(
+            deformer,
+            points=points and filePath.endswith(FILE_NPZ_EXT),
+        )
+    else:
+        data = get_weights(deformer)
+    write_weights_file(filePath, data)
+
+
+def import_weights(deformer, filePath, remap=True, geometry=None):
+    """Import the wmap from a file
 
     Args:
         deformer (PyNode or str): Name or pynode of a deformer to
                                   assign the wmap
         filePath (str): Path to load the file
+        remap (bool, optional): Remap the weights on the closest points if
+            the file stores the points and they have changed
+        geometry (str, optional): Only import the weights of this geometry,
+            shape or transform. All the deformer geometries if None
     """
-    with open(filePath, "r") as fp:
-        wdata = json.load(fp)
-    set_weights(deformer, wdata)
+    wdata = read_weights_file(filePath)
+    if remap and "_points" in wdata:
+        wdata = remap_weight_arrays(deformer, wdata, geometry)
+    set_weight_arrays(deformer, wdata, geometry)
 
 
 def export_weights_selected(filePath=None, *args):
@@ -184,6 +547,7 @@ def file_browser(mode=1):
         str: file path
     """
     fileFilters = "Deformer Weigth map (*{})".format(FILE_EXT)
+    fileFilters += ";;Deformer Weigth map Binary (*{})".format(FILE_NPZ_EXT)
     startDir = pm.workspace(q=True, rootDirectory=True)
     filePath = pm.fileDialog2(
         fileMode=mode, startingDirectory=startDir, fileFilter=fileFilters
@@ -10,11 +10,12 @@ you want to update with Flex
 from __future__ import absolute_import
 from mgear.flex import logger
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import clear_cache
+from mgear.flex.fingerprint import get_rest_shape
+from mgear.flex.fingerprint import get_shape_fingerprint
+from mgear.flex.fingerprint import is_matching_bounding_box
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
-from mgear.flex.query import is_matching_bouding_box
-from mgear.flex.query import is_matching_count
-from mgear.flex.query import is_matching_type
 
 
 @timer
@@ -31,24 +32,42 @@ def analyze_groups(source, target):
     logger.debug("Analysing the following groups - source: {}  - target: {}"
                  .format(source, target))
 
+    # starts from fresh fingerprints, kept for the following update
+    clear_cache()
+
     # gets the matching shapes
     matching_shapes = get_matching_shapes_from_group(source, target)
 
-    # gets mismatching shape types
-    mismatched_types = [x for x in matching_shapes if not is_matching_type(
-        x, matching_shapes[x])]
+    mismatched_types = []
+    mismatched_count = []
+    mismatched_topology = []
+    mismatched_bbox = []
+
+    # compares the source shapes and the target orig shapes fingerprints
+    for shape in matching_shapes:
+        source_print = get_shape_fingerprint(shape)
+        target_print = get_shape_fingerprint(get_rest_shape(
+            matching_shapes[shape]))
+
+        # gets mismatching shape types
+        if source_print.type != target_print.type:
+            mismatched_types.append(shape)
 
-    # gets mismatching shape vertices count
-    mismatched_count = [x for x in matching_shapes if not is_matching_count(
-        x, matching_shapes[x])]
+        # gets mismatching shape vertices count, or topology with the same
+        # vertices count
+        if source_print.count != target_print.count:
+            mismatched_count.append(shape)
+        elif source_print.topology != target_print.topology:
+            mismatched_topology.append(shape)
 
-    # gets mismatching shape bounding box
-    mismatched_bbox = [x for x in matching_shapes if not
-                       is_matching_bouding_box(x, matching_shapes[x])]
+        # gets mismatching shape bounding box
+        if not is_matching_bounding_box(source_print, target_print):
+            mismatched_bbox.append(shape)
 
     logger.info("-" * 90)
     logger.info("Mismatch shapes types: {}".format(mismatched_types))
     logger.info("Mismatch vertices shapes: {}".format(mismatched_count))
+    logger.info("Mismatch topology shapes: {}".format(mismatched_topology))
     logger.info("Mismatch volume shapes: {}".format(mismatched_bbox))
     logger.warning("-" * 90)
     logger.warning("Source missing shapes: {}" .format(
@@ -57,4 +76,5 @@ def analyze_groups(source, target):
         get_missing_shapes_from_group(target, source)))
     logger.warning("-" * 90)
 
-    return matching_shapes, mismatched_types, mismatched_count, mismatched_bbox
+    return (matching_shapes, mismatched_types, mismatched_count,
+            mismatched_topology, mismatched_bbox)
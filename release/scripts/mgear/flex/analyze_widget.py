@@ -103,7 +103,7 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         # hides vertical header
         self.table_widget.verticalHeader().setVisible(False)
 
-    def add_item(self, source, target, match, count, bbox):
+    def add_item(self, source, target, match, count, bbox, topology=None):
         """ Handles adding items to the table widget
 
         :param source: the source shape element
@@ -114,8 +114,14 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
 
         :param match: whether the type matches
         :type match: bool
+
+        :param topology: shapes with the same vertices count but a different
+                         topology
+        :type topology: list
         """
 
+        topology = topology or []
+
         # source item
         source_item = QtWidgets.QTableWidgetItem()
         source_item.setTextAlignment(QtCore.Qt.AlignCenter)
@@ -142,6 +148,8 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         count_item.setIcon(self.green_icon)
         if source in count:
             count_item.setIcon(self.red_icon)
+        elif source in topology:
+            count_item.setIcon(self.yellow_icon)
         count_item.setFlags(QtCore.Qt.ItemIsEnabled)
 
         # bounding box item
@@ -162,6 +170,8 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
             result_item.setIcon(self.red_icon)
         if source in bbox and source not in count:
             result_item.setIcon(self.green_icon)
+        if source in topology:
+            result_item.setIcon(self.yellow_icon)
         if source in match:
             result_item.setIcon(self.red_icon)
 
@@ -0,0 +1,255 @@
+""" flex.fingerprint
+
+flex.fingerprint module computes and caches the content fingerprint of the
+shapes analyzed and updated by Flex.
+
+The points and topology of each shape are read once and summarized in a
+fingerprint: shape type, points count, topology hash and bounding box. The
+fingerprints are cached until their shape gets dirty or deleted, so comparing
+the same shapes again, analyzing then updating a rig for example, doesn't query
+Maya again. The cache is cleared when a scene is opened or created, and by
+each analysis and at the end of each update.
+
+:module: flex.fingerprint
+"""
+
+# imports
+from __future__ import absolute_import
+import array
+import collections
+import hashlib
+from maya import cmds
+from maya.api import OpenMaya
+from mgear.flex import logger  # @UnusedImport
+from mgear.flex.query import get_shape_orig
+
+try:
+    import numpy
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+Fingerprint = collections.namedtuple("Fingerprint", ["type",
+                                                     "count",
+                                                     "topology",
+                                                     "bbox_min",
+                                                     "bbox_max"])
+
+# fingerprints and shape callbacks by shape uuid and full path, the nodes of
+# different references can share their uuid
+__fingerprints = {}
+__callbacks = {}
+__scene_callbacks = []
+
+
+def clear_cache():
+    """ Clears the cached fingerprints and removes their callbacks
+    """
+
+    for callbacks in list(__callbacks.values()) + [__scene_callbacks]:
+        _remove_callbacks(callbacks)
+
+    __callbacks.clear()
+    __fingerprints.clear()
+    del __scene_callbacks[:]
+
+
+def _remove_callbacks(callbacks):
+    """ Removes the given maya callbacks
+
+    :param callbacks: the callbacks ids
+    :type callbacks: list
+    """
+
+    for callback in callbacks:
+        try:
+            OpenMaya.MMessage.removeCallback(callback)
+        except RuntimeError:
+            # the shape was deleted
+            pass
+
+
+def get_rest_shape(shape):
+    """ Returns the orig shape of a deformed shape, or the shape itself
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape to compare
+    :rtype: str
+    """
+
+    orig_shape = get_shape_orig(shape)
+
+    return orig_shape[0] if orig_shape else shape
+
+
+def get_shape_fingerprint(shape):
+    """ Returns the fingerprint of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape type, points count, topology hash and bounding box
+             min and max
+    :rtype: Fingerprint
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(shape)
+    mobject = selection.getDependNode(0)
+    key = "{}{}".format(
+        OpenMaya.MFnDependencyNode(mobject).uuid().asString(),
+        selection.getDagPath(0).fullPathName())
+
+    fingerprint = __fingerprints.get(key)
+    if fingerprint is not None:
+        return fingerprint
+
+    shape_type = cmds.objectType(shape)
+    topology, points = _read_shape(mobject, shape_type)
+    bbox_min, bbox_max = _get_bounding_box(points)
+
+    fingerprint = Fingerprint(shape_type, len(points), topology,
+                              bbox_min, bbox_max)
+    __fingerprints[key] = fingerprint
+
+    # clears the fingerprint when the shape changes or is deleted, and the
+    # whole cache with the scene
+    if not __scene_callbacks:
+        for message in (OpenMaya.MSceneMessage.kBeforeNew,
+                        OpenMaya.MSceneMessage.kBeforeOpen):
+            __scene_callbacks.append(OpenMaya.MSceneMessage.addCallback(
+                message, _scene_changed))
+
+    if key not in __callbacks:
+        __callbacks[key] = [
+            OpenMaya.MNodeMessage.addNodeDirtyCallback(
+                mobject, _shape_dirty, key),
+            OpenMaya.MNodeMessage.addNodePreRemovalCallback(
+                mobject, _shape_removed, key)]
+
+    return fingerprint
+
+
+def _get_bounding_box(points):
+    """ Returns the bounding box of the points of a shape
+
+    :param points: the shape points
+    :type points: MPointArray
+
+    :return: the bounding box min and max
+    :rtype: tuple, tuple
+    """
+
+    if not len(points):
+        return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
+    if NUMPY_READY:
+        coords = numpy.array(points, dtype=numpy.float64)[:, :3]
+        bbox_min = tuple(float(c) for c in coords.min(axis=0))
+        bbox_max = tuple(float(c) for c in coords.max(axis=0))
+    else:
+        coords = [c for p in points for c in (p.x, p.y, p.z)]
+        bbox_min = tuple(min(coords[i::3]) for i in range(3))
+        bbox_max = tuple(max(coords[i::3]) for i in range(3))
+
+    return bbox_min, bbox_max
+
+
+def _read_shape(mobject, shape_type):
+    """ Returns the topology hash and the object space points of a shape
+
+    :param mobject: the maya shape object
+    :type mobject: MObject
+
+    :param shape_type: the shape node type
+    :type shape_type: str
+
+    :return: the topology hash and the points
+    :rtype: str, MPointArray
+    """
+
+    space = OpenMaya.MSpace.kObject
+
+    if shape_type == "nurbsCurve":
+        function_set = OpenMaya.MFnNurbsCurve(mobject)
+        topology = array.array("d", [function_set.degree, function_set.form])
+        topology.extend(function_set.knots())
+        points = function_set.cvPositions(space)
+
+    elif shape_type == "nurbsSurface":
+        function_set = OpenMaya.MFnNurbsSurface(mobject)
+        topology = array.array("d", [function_set.degreeInU,
+                                     function_set.degreeInV,
+                                     function_set.formInU,
+                                     function_set.formInV,
+                                     function_set.numCVsInU,
+                                     function_set.numCVsInV])
+        topology.extend(function_set.knotsInU())
+        topology.extend(function_set.knotsInV())
+        points = function_set.cvPositions(space)
+
+    else:
+        function_set = OpenMaya.MFnMesh(mobject)
+        counts, indices = function_set.getVertices()
+        topology = array.array("i", counts)
+        topology.append(-1)
+        topology.extend(indices)
+        points = function_set.getPoints(space)
+
+    return hashlib.sha1(topology.tobytes()).hexdigest(), points
+
+
+def _shape_dirty(*args):
+    """ Clears the fingerprint of a shape getting dirty
+
+    The shape key is the callback client data, the last argument.
+    """
+
+    __fingerprints.pop(args[-1], None)
+
+
+def _shape_removed(*args):
+    """ Clears the fingerprint and the callbacks of a shape getting deleted
+
+    The shape key is the callback client data, the last argument.
+    """
+
+    __fingerprints.pop(args[-1], None)
+    _remove_callbacks(__callbacks.pop(args[-1], []))
+
+
+def _scene_changed(*args):
+    """ Clears the cache before a scene is opened or created
+    """
+
+    clear_cache()
+
+
+def is_matching_bounding_box(source, target, tolerance=0.05):
+    """ Checks if the source and target fingerprints have the same bounding box
+
+    Unlike query.is_matching_bouding_box each axis of the bounding box is
+    compared.
+
+    :param source: source shape fingerprint
+    :type source: Fingerprint
+
+    :param target: target shape fingerprint
+    :type target: Fingerprint
+
+    :param tolerance: difference tolerance allowed. Default 0.05
+    :type tolerance: float
+
+    :return: If source and target matches their bounding box
+    :rtype: bool
+    """
+
+    for source_values, target_values in ((source.bbox_min, target.bbox_min),
+                                         (source.bbox_max, target.bbox_max)):
+        for source_value, target_value in zip(source_values, target_values):
+            if abs(source_value - target_value) > tolerance:
+                return False
+
+    return True
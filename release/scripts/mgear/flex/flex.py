@@ -293,7 +293,8 @@ class Flex(object):
         """ Scans the shapes inside the source and target group
 
         This function will query each source and corresponding target shape
-        checking if their type, vertices count and bounding box matches
+        checking if their type, vertices count, topology and bounding box
+        matches
 
         :param update_ui: whether or not the analyze ui should be updated
         :type: bool
@@ -307,13 +308,13 @@ class Flex(object):
 
         # runs analyze
         matching_shapes, mismatched_types, mismatched_count, \
-            mismatched_bbox = analyze_groups(source=self.source_group,
-                                             target=self.target_group)
+            mismatched_topology, mismatched_bbox = analyze_groups(
+                source=self.source_group, target=self.target_group)
 
         if update_ui:
             [self.analyze_ui.add_item(shape, matching_shapes[shape],
                                       mismatched_types, mismatched_count,
-                                      mismatched_bbox)
+                                      mismatched_bbox, mismatched_topology)
              for shape in matching_shapes]
 
     @set_focus
@@ -17,6 +17,8 @@ from mgear.flex.attributes import COMPONENT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import OBJECT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import RENDER_STATS_ATTRIBUTES
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import clear_cache
+from mgear.flex.fingerprint import get_shape_fingerprint
 from mgear.flex.query import get_deformers
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
@@ -24,8 +26,6 @@ from mgear.flex.query import get_parent
 from mgear.flex.query import get_shape_orig
 from mgear.flex.query import is_lock_attribute
 from mgear.flex.query import is_matching_bouding_box
-from mgear.flex.query import is_matching_count
-from mgear.flex.query import is_matching_type
 from mgear.flex.query import lock_unlock_attribute
 from mgear.flex.update_utils import add_attribute
 from mgear.flex.update_utils import copy_cluster_weights
@@ -248,25 +248,31 @@ def update_deformed_shape(source, target, mismatching_topology=True):
 
     logger.debug("Deformed shape found: {}".format(target))
 
+    deform_origin = deform_origin[0]
+    source_print = get_shape_fingerprint(source)
+    origin_print = get_shape_fingerprint(deform_origin)
+    # same vertices count with a different topology would give wrong
+    # deformer weights too
+    matching_topology = (source_print.count == origin_print.count and
+                         source_print.topology == origin_print.topology)
+
     # returns if source and target shapes don't match
-    if not is_matching_type(source, target):
+    if source_print.type != origin_print.type:
         logger.warning("{} and {} don't have same shape type. passing..."
                        .format(source, target))
         return
 
-    # returns if vertices count isn't equal and mismatching isn't requested
-    if not mismatching_topology and not is_matching_count(source, target):
-        logger.warning("{} and {} don't have same shape vertices count."
-                       "passing...".format(source, target))
+    # returns if topology isn't equal and mismatching isn't requested
+    if not mismatching_topology and not matching_topology:
+        logger.warning("{} and {} don't have same shape vertices count or "
+                       "topology. passing...".format(source, target))
         return
 
-    deform_origin = deform_origin[0]
-
     # updates map1 name
     copy_map1_name(source, deform_origin)
 
     # updates on mismatching topology
-    if mismatching_topology and not is_matching_count(source, target):
+    if mismatching_topology and not matching_topology:
         update_deformed_mismatching_shape(source, target, deform_origin)
         return
 
@@ -334,6 +340,30 @@ def update_rig(source, target, options):
     logger.info("Matching shapes: {}" .format(matching_shapes))
     logger.info("-" * 90)
 
+    try:
+        _update_shapes(matching_shapes, options)
+    finally:
+        # the updated shapes fingerprints are stale
+        clear_cache()
+
+    logger.info("-" * 90)
+    logger.info("Source missing shapes: {}" .format(
+        get_missing_shapes_from_group(source, target)))
+    logger.info("Target missing shapes: {}" .format(
+        get_missing_shapes_from_group(target, source)))
+    logger.info("-" * 90)
+
+
+def _update_shapes(matching_shapes, options):
+    """ Updates the matching shapes with the given options
+
+    :param matching_shapes: the target shapes by source shape
+    :type matching_shapes: dict
+
+    :param options: update options
+    :type options: dict
+    """
+
     for shape in matching_shapes:
         logger.debug("-" * 90)
         logger.debug("Updating: {}".format(matching_shapes[shape]))
@@ -370,13 +400,6 @@ def update_rig(source, target, options):
         if options["plugin_attributes"]:
             update_plugin_attributes(shape, matching_shapes[shape])
 
-    logger.info("-" * 90)
-    logger.info("Source missing shapes: {}" .format(
-        get_missing_shapes_from_group(source, target)))
-    logger.info("Target missing shapes: {}" .format(
-        get_missing_shapes_from_group(target, source)))
-    logger.info("-" * 90)
-
 
 def update_skincluster_node(source_skin, target_skin):
     """ Updates the skin weights on the given target skin from the source skin
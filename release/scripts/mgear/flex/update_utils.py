@@ -8,10 +8,12 @@ for the flex update process
 """
 
 # imports
+import os
 from maya import OpenMaya
 from maya import cmds
 from maya import mel
 
+from mgear.core import wmap
 from mgear.flex import logger
 from mgear.flex.attributes import BLENDSHAPE_TARGET
 from mgear.flex.decorators import timer
@@ -204,6 +206,7 @@ def copy_cluster_weights(shape, weight_file, method="bilinear"):
     :type weight_file: dict
 
     :param method: method type that should be used when updating the weights
+                   from xml files. Binary weight maps use the closest point
     :type method: str
     """
 
@@ -214,6 +217,15 @@ def copy_cluster_weights(shape, weight_file, method="bilinear"):
     for node in weight_file:
         if not weight_file[node]:
             continue
+
+        # binary weight maps are remapped by closest point, only on the
+        # updated shape as the cluster can deform other geometries
+        if weight_file[node].endswith(wmap.FILE_NPZ_EXT):
+            wmap.import_weights(node, os.path.join(temp_path,
+                                                   weight_file[node]),
+                                geometry=shape)
+            continue
+
         cmds.deformerWeights(weight_file[node], im=True, shape=short_name,
                              deformer=node, path=temp_path, method=method,
                              vertexConnections=True)
@@ -409,7 +421,16 @@ def create_clusters_backup(shape, nodes):
         except RuntimeError:
             weight_files[node] = None
             continue
-        # Creates the weight map if weights are found on shape points
+        # Creates the weight map if weights are found on shape points. The
+        # binary weight map stores the points to remap the weights
+        if wmap.NUMPY_READY:
+            weight_files[node] = '{}_{}{}'.format(shape, node,
+                                                  wmap.FILE_NPZ_EXT)
+            wmap.export_weights(node, os.path.join(temp_path,
+                                                   weight_files[node]),
+                                points=True)
+            continue
+
         cmds.deformerWeights('{}_{}.xml'.format(shape, node), export=True,
                              vertexConnections=True, weightPrecision=5,
                              shape=shape, deformer=node, path=temp_path)
@@ -1,10 +1,56 @@
+import importlib
+import os
+from functools import partial
+
 from maya import cmds
-import mgear.pymaya as pm
+from maya.api import OpenMaya as om2
 import mgear
-import os
 
 menuId = "mGear"
 
+# Submenus created empty, their menu module is imported to fill them the
+# first time they are opened:
+# (label, image, menu module, install function, divider before)
+LAZY_SUBMENUS = (
+    ("Shifter", "mgear_shifter.svg", "mgear.shifter.menu", "install", False),
+    ("ueGear", "UE5.svg", "mgear.uegear.menu", "install", True),
+)
+
+# Menu modules adding their own items, imported when the mGear menu is first
+# opened: (menu module, install function)
+MENU_INSTALLERS = (
+    ("mgear.simpleRig.menu", "install"),
+)
+
+LAZY_TOOL_SUBMENUS = (
+    (
+        "Skin and Weights",
+        "mgear_skin.svg",
+        "mgear.core.menu",
+        "install_skinning_menu",
+        False,
+    ),
+    ("Rigbits", "mgear_rigbits.svg", "mgear.rigbits.menu", "install", True),
+    ("Animbits", "mgear_animbits.svg", "mgear.animbits.menu", "install", False),
+    ("CFXbits", "mgear_cfxbits.svg", "mgear.cfxbits.menu", "install", False),
+)
+
+TOOL_INSTALLERS = (
+    ("mgear.crank.menu", "install"),
+    ("mgear.anim_picker.menu", "install"),
+    ("mgear.flex.menu", "install"),
+)
+
+# Utilities menu installers, called with the Utilities submenu
+UTILS_INSTALLERS = (
+    ("mgear.core.menu", "install_utils_menu"),
+    ("mgear.rigbits.menu", "install_utils_menu"),
+    ("mgear.core.dragdrop", "install_utils_menu"),
+)
+
+# submenus waiting to be filled, by label
+__pending_submenus = {}
+
 
 def create(menuId=menuId):
     """Create mGear main menu
@@ -18,9 +64,10 @@ def create(menuId=menuId):
 
     if cmds.menu(menuId, exists=True):
         try:
-            pm.deleteUI(menuId)
+            cmds.deleteUI(menuId)
         except RuntimeError:
-            pm.displayInfo("Tried to delete {}, but it was not found".format(menuId))
+            om2.MGlobal.displayInfo(
+                "Tried to delete {}, but it was not found".format(menuId))
 
     project_name = os.environ.get("MGEAR_PROJECT_NAME", None)
     if project_name:
@@ -28,11 +75,11 @@ def create(menuId=menuId):
     else:
         menuLabel = menuId
 
-    pm.menu(menuId,
-            parent="MayaWindow",
-            tearOff=True,
-            allowOptionBoxes=True,
-            label=menuLabel)
+    cmds.menu(menuId,
+              parent="MayaWindow",
+              tearOff=True,
+              allowOptionBoxes=True,
+              label=menuLabel)
 
     return menuId
 
@@ -45,50 +92,67 @@ def install_help_menu(menuId=menuId):
     """
 
     # Help
-    pm.setParent(menuId, menu=True)
-    pm.menuItem(divider=True)
-    pm.menuItem(parent=menuId,
-                subMenu=True,
-                tearOff=True,
-                label="Help",
-                image="mgear_help-circle.svg")
-    pm.menuItem(label="Web", command=str_web, image="mgear_globe.svg")
-    pm.menuItem(label="Forum",
-                command=str_forum,
-                image="mgear_message-circle.svg")
-    pm.menuItem(divider=True)
-    pm.menuItem(label="Documentation",
-                command=str_docs,
-                image="mgear_book.svg")
-    pm.menuItem(divider=True)
-    pm.menuItem(label="About", command=str_about, image="mgear_smile.svg")
+    cmds.setParent(menuId, menu=True)
+    cmds.menuItem(divider=True)
+    cmds.menuItem(parent=menuId,
+                  subMenu=True,
+                  tearOff=True,
+                  label="Help",
+                  image="mgear_help-circle.svg")
+    cmds.menuItem(label="Web", command=str_web, image="mgear_globe.svg")
+    cmds.menuItem(label="Forum",
+                  command=str_forum,
+                  image="mgear_message-circle.svg")
+    cmds.menuItem(divider=True)
+    cmds.menuItem(label="Documentation",
+                  command=str_docs,
+                  image="mgear_book.svg")
+    cmds.menuItem(divider=True)
+    cmds.menuItem(label="About", command=str_about, image="mgear_smile.svg")
 
 
 def install_utils_menu():
     """Install Utilities submenu
     """
-    pm.setParent(mgear.menu_id, menu=True)
-    pm.menuItem(divider=True)
-    commands = [("Reload", str_reload, "mgear_refresh-cw.svg")]
+    cmds.setParent(mgear.menu_id, menu=True)
+    cmds.menuItem(divider=True)
+    commands = [("Reload", str_reload, "mgear_refresh-cw.svg"),
+                ("Import Time Report",
+                 str_import_time_report,
+                 "mgear_clock.svg")]
 
     m = install("Utilities", commands, image="mgear_tool.svg")
     return m
 
 
+def install_utils_items():
+    """Fill the Utilities submenu with the items of all the tools"""
+    m = install("Utilities", [])
+    for module_name, function in UTILS_INSTALLERS:
+        getattr(importlib.import_module(module_name), function)(m)
+
+
 def install(label, commands, parent=menuId, image=""):
     """Installer Function for sub menus
 
+    If a lazy submenu with the same label is waiting to be filled, the
+    commands are added to it.
+
     Args:
         label (str): Name of the sub menu
         commands (list): List of commands to install
         parent (str, optional): Parent menu for the submenu
     """
     try:
-        m = pm.menuItem(parent=parent,
-                        subMenu=True,
-                        tearOff=True,
-                        label=label,
-                        image=image)
+        if parent == menuId and label in __pending_submenus:
+            m = __pending_submenus.pop(label)
+            cmds.setParent(m, menu=True)
+        else:
+            m = cmds.menuItem(parent=parent,
+                              subMenu=True,
+                              tearOff=True,
+                              label=label,
+                              image=image)
         for conf in commands:
             if len(conf) == 3:
                 label, command, img = conf
@@ -96,14 +160,14 @@ def install(label, commands, parent=menuId, image=""):
                 label, command = conf
                 img = ""
             if not command:
-                pm.menuItem(divider=True)
+                cmds.menuItem(divider=True)
                 continue
             if not label:
                 command(m)
-                pm.setParent(m, menu=True)
+                cmds.setParent(m, menu=True)
                 continue
 
-            pm.menuItem(label=label, command=command, image=img)
+            cmds.menuItem(label=label, command=command, image=img)
 
         return m
 
@@ -111,72 +175,160 @@ def install(label, commands, parent=menuId, image=""):
         template = ("An exception of type {0} occured. "
                     "Arguments:\n{1!r}")
         message = template.format(type(ex).__name__, ex.args)
-        pm.displayError(message)
+        om2.MGlobal.displayError(message)
 
 
-def install_main_menu():
-    """Create top level mGear menu"""
+def install_lazy(label, module_name, function, image="", parent=menuId):
+    """Install an empty sub menu, filled when it is first opened.
 
-    # Install mGear Menu
-    import mgear
-    mgear.install()
+    The module is imported and the function called to fill the sub menu,
+    calling install with the same label.
 
-    # Install Shifter Menu
-    import mgear.shifter.menu
-    mgear.shifter.menu.install()
+    Args:
+        label (str): Name of the sub menu
+        module_name (str): The module installing the sub menu
+        function (str): The module function installing the sub menu
+        image (str, optional): The sub menu image
+        parent (str, optional): Parent menu for the submenu
 
-    # Install ueGear Menu
-    import mgear.uegear.menu
-    mgear.uegear.menu.install()
+    Returns:
+        str: The sub menu
+    """
+    m = cmds.menuItem(parent=parent,
+                      subMenu=True,
+                      tearOff=True,
+                      label=label,
+                      image=image)
+    __pending_submenus[label] = m
+    cmds.menuItem(m,
+                  edit=True,
+                  postMenuCommandOnce=True,
+                  postMenuCommand=partial(
+                      _fill_lazy, label, module_name, function))
+    return m
 
-    # Install Simple Rig Menu
-    import mgear.simpleRig.menu
-    mgear.simpleRig.menu.install()
 
-    # Install Skinning Menu
-    import mgear.core.menu
-    mgear.core.menu.install_skinning_menu()
+def is_pending(label):
+    """Check if a lazy sub menu is waiting to be filled.
 
-    # Install Rigbits Menu
-    import mgear.rigbits.menu
-    mgear.rigbits.menu.install()
+    The sub menu installers use it to add their divider only when they are
+    not filling a lazy sub menu, which has its divider already.
 
-    # Install Animbits Menu
-    import mgear.animbits.menu
-    mgear.animbits.menu.install()
+    Args:
+        label (str): Name of the sub menu
 
-    # Install CFXbits Menu
-    import mgear.cfxbits.menu
-    mgear.cfxbits.menu.install()
+    Returns:
+        bool: True if the sub menu is waiting to be filled
+    """
+    return label in __pending_submenus
 
-    # Install Crank Menu
-    import mgear.crank.menu
-    mgear.crank.menu.install()
 
-    # Install Anim Picker Menu
-    import mgear.anim_picker.menu
-    mgear.anim_picker.menu.install()
+def _fill_lazy(label, module_name, function, *args):
+    try:
+        getattr(importlib.import_module(module_name), function)()
+    finally:
+        __pending_submenus.pop(label, None)
 
-    # Install Flex Menu
-    import mgear.flex.menu
-    mgear.flex.menu.install()
 
-    # Install Utilities Menu
-    import mgear.menu
-    m = mgear.menu.install_utils_menu()
-    mgear.core.menu.install_utils_menu(m)
-    mgear.rigbits.menu.install_utils_menu(m)
+def _install_submenus(submenus):
+    for label, image, module_name, function, divider in submenus:
+        cmds.setParent(mgear.menu_id, menu=True)
+        if divider:
+            cmds.menuItem(divider=True)
+        install_lazy(label, module_name, function, image=image)
 
-    # install dragdrop override in utilities
-    import mgear.core.dragdrop
-    mgear.core.dragdrop.install_utils_menu(m)
+
+def _call_installers(installers):
+    for module_name, function in installers:
+        getattr(importlib.import_module(module_name), function)()
+
+
+def install_dagmenu_item():
+    """Install the mGear viewport menu check box.
+
+    The dag menu module is imported when the check box is clicked.
+    """
+    cmds.setParent(mgear.menu_id, menu=True)
+    cmds.menuItem(divider=True)
+    cmds.menuItem(
+        "mgear_dagmenu_menuitem",
+        label="mGear Viewport Menu ",
+        command=_run_dagmenu,
+        checkBox=cmds.optionVar(query="mgear_dag_menu_OV"),
+    )
+
+
+def _run_dagmenu(*args):
+    import mgear.core.dagmenu
+
+    mgear.core.dagmenu.run(*args)
+
+
+def apply_startup_options():
+    """Apply the options saved by the menus, importing the tools only if
+    their option is enabled."""
+    for option_var in ("mgear_log_window_OV",
+                       "mgear_dag_menu_OV",
+                       "mgear_file_drop_OV"):
+        if not cmds.optionVar(exists=option_var):
+            cmds.optionVar(intValue=(option_var, 0))
+
+    mgear.use_log_window = cmds.optionVar(query="mgear_log_window_OV")
+
+    if cmds.optionVar(query="mgear_dag_menu_OV"):
+        import mgear.core.dagmenu
+
+        mgear.core.dagmenu.run(True)
+
+    if cmds.optionVar(query="mgear_file_drop_OV"):
+        import mgear.core.dragdrop
+
+        mgear.core.dragdrop.mgear_file_drop_toggle(True)
+
+
+def populate_main_menu(*args):
+    """Create the mGear menu items.
+
+    The heavy tool menus are lazy sub menus, importing their module only
+    when first opened. The tool modules are only imported when their menu
+    items are clicked.
+    """
+    _install_submenus(LAZY_SUBMENUS)
+    _call_installers(MENU_INSTALLERS)
+    _install_submenus(LAZY_TOOL_SUBMENUS)
+    _call_installers(TOOL_INSTALLERS)
+
+    # Install Utilities Menu
+    m = install_utils_menu()
+    __pending_submenus["Utilities"] = m
+    cmds.menuItem(m,
+                  edit=True,
+                  postMenuCommandOnce=True,
+                  postMenuCommand=partial(
+                      _fill_lazy, "Utilities", __name__,
+                      "install_utils_items"))
 
     # Install Help Menu
-    mgear.menu.install_help_menu()
+    install_help_menu()
 
     # Install Dag Menu option
-    import mgear.core.dagmenu
-    mgear.core.dagmenu.install()
+    install_dagmenu_item()
+
+
+def install_main_menu():
+    """Create top level mGear menu
+
+    The menu is filled when it is first opened, see populate_main_menu.
+    """
+
+    # Install mGear Menu
+    mgear.install()
+    apply_startup_options()
+
+    cmds.menu(mgear.menu_id,
+              edit=True,
+              postMenuCommandOnce=True,
+              postMenuCommand=populate_main_menu)
 
     # from cvwrap.menu import create_menuitems
     # create_menuitems()
@@ -207,3 +359,9 @@ str_reload = """
 import mgear
 mgear.reloadModule("mgear")
 """
+
+
+str_import_time_report = """
+from mgear.core import importtime
+importtime.report()
+"""
@@ -2,6 +2,10 @@ from .cmd import *
 from . import exception as general
 from .exception import MayaAttributeError, MayaNodeError
 from .util import UndoChunk
+from .modifier import Batch
+from .modifier import Batch as batch
+from .modifier import getAttrs
+from .modifier import setAttrs
 from .util import NameParser
 from . import util
 from .bind import PyNode
@@ -162,11 +162,11 @@ class Attribute(base.Attr):
         return self.node().name()
 
     def delete(self):
-        cmds.deleteAttr(self.name())
+        cmd.deleteAttr(self.name())
 
     def connect(self, other, **kwargs):
         force = kwargs.get("f", False)
-        return cmds.connectAttr(
+        return cmd.connectAttr(
             self.name(),
             other.name() if hasattr(other, "name") else other,
             force=force,
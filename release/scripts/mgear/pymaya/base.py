@@ -2,19 +2,19 @@
 STR_FUNCS = ["capitalize", "casefold", "center", "count", "encode", "endswith", "expandtabs", "find", "format", "format_map", "index", "isalnum", "isalpha", "isascii", "isdecimal", "isdigit", "islower", "isnumeric", "isprintable", "isspace", "istitle", "isupper", "join", "ljust", "lower", "lstrip", "maketrans", "partition", "replace", "rfind", "rindex", "rjust", "rpartition", "rsplit", "rstrip", "split", "splitlines", "startswith", "strip", "swapcase", "title", "upper", "zfill"]
 
 
-def _wrap_str_funcs(base, funcname):
-    def wrapper(*args, **kwargs):
-        return getattr(base.name(), funcname)(*args, **kwargs)
+def _wrap_str_funcs(funcname):
+    def wrapper(self, *args, **kwargs):
+        return getattr(self.name(), funcname)(*args, **kwargs)
 
+    wrapper.__name__ = funcname
     return wrapper
 
 
 class Base(object):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(Base, self).__init__()
-        for sf in STR_FUNCS:
-            if not hasattr(self, sf):
-                setattr(self, sf, _wrap_str_funcs(self, sf))
 
     def name(self):
         raise NotImplementedError("'name' is not implemented yet")
@@ -74,14 +74,22 @@ class Base(object):
         return self.name().__sizeof__()
 
 
+# the str functions resolve at class level, subclasses can override them
+for _sf in STR_FUNCS:
+    if not hasattr(Base, _sf):
+        setattr(Base, _sf, _wrap_str_funcs(_sf))
+
+
 class Node(Base):
-    pass
+    __slots__ = ()
 
 
 class Attr(Base):
-    pass
+    __slots__ = ()
 
 
 class Geom(Base):
+    __slots__ = ()
+
     def toStringList(self):
         raise NotImplementedError("{}.toStringList is not implemented yet".format(self.__class.__name__))
@@ -1,6 +1,8 @@
 from maya import cmds
 import re
 from . import base
+from . import cache
+from . import exception
 from . import node
 from . import geometry
 
@@ -15,7 +17,12 @@ def __find_attr(name):
             raise Exception("Unexpected name")
 
         an, ai = res.groups()
-        cur = getattr(cur, an)
+        # resolve through attr first, it uses the cached plugs and avoids
+        # the cmds.ls fallback of __getattribute__
+        try:
+            cur = cur.attr(an)
+        except (AttributeError, exception.MayaAttributeError):
+            cur = getattr(cur, an)
         if ai is not None:
             i = int(ai)
             cur = cur.__getitem__(i)
@@ -41,6 +48,10 @@ def PyNode(name_or_node):
     if isinstance(name_or_node, base.Base):
         return name_or_node
 
+    cached = cache.get(name_or_node)
+    if cached is not None:
+        return cached
+
     # Check if it's an attribute (contains a ".")
     if "." in name_or_node:
         try:
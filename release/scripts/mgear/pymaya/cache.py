@@ -0,0 +1,163 @@
+"""Node name resolution cache.
+
+Maps the node names given to ``PyNode``/``BindNode`` to the already created
+node wrappers, so repeated lookups of the same name are dictionary hits
+instead of ``objExists`` + ``nodeType`` + ``MSelectionList`` round trips.
+
+Every hit is validated against the MObjectHandle and the current node name,
+so renamed, deleted or re-parented nodes never resolve to a stale wrapper.
+Maya callbacks drop the entries of renamed and deleted nodes and clear the
+cache when a new scene is created or opened.
+
+The node wrappers keep the attributes resolved by ``attr``. The pymaya
+commands deleting or renaming attributes bump ``attr_generation``, and the
+wrappers resolved their attributes in a previous generation resolve them
+again, so a deleted attribute never resolves to its stale plug.
+"""
+from maya.api import OpenMaya
+
+
+enabled = True
+
+# bumped by the pymaya commands deleting or renaming attributes
+attr_generation = 0
+
+# name -> (MObjectHandle, node wrapper)
+__nodes = {}
+# MObjectHandle.hashCode() -> names cached for the node
+__names = {}
+__callbacks = []
+
+
+def invalidate_attributes():
+    """Make the node wrappers resolve their attributes again."""
+    global attr_generation
+    attr_generation += 1
+
+
+def _forget(mobject):
+    key = OpenMaya.MObjectHandle(mobject).hashCode()
+    names = __names.pop(key, ())
+    for name in names:
+        __nodes.pop(name, None)
+
+
+def _on_name_changed(mobject, prev_name, *args):
+    _forget(mobject)
+
+
+def _on_node_removed(mobject, *args):
+    _forget(mobject)
+
+
+def _on_scene_changed(*args):
+    clear()
+
+
+def install_callbacks():
+    """Register the Maya callbacks that keep the cache up to date.
+
+    Returns:
+        bool: True if the callbacks are registered
+    """
+    if __callbacks:
+        return True
+
+    try:
+        __callbacks.append(
+            OpenMaya.MNodeMessage.addNameChangedCallback(
+                OpenMaya.MObject(), _on_name_changed
+            )
+        )
+        __callbacks.append(
+            OpenMaya.MDGMessage.addNodeRemovedCallback(
+                _on_node_removed, "dependNode"
+            )
+        )
+        for msg in (
+            OpenMaya.MSceneMessage.kBeforeNew,
+            OpenMaya.MSceneMessage.kBeforeOpen,
+        ):
+            __callbacks.append(
+                OpenMaya.MSceneMessage.addCallback(msg, _on_scene_changed)
+            )
+    except RuntimeError:
+        remove_callbacks()
+        return False
+
+    return True
+
+
+def remove_callbacks():
+    """Remove the Maya callbacks registered by install_callbacks."""
+    for cb in __callbacks:
+        try:
+            OpenMaya.MMessage.removeCallback(cb)
+        except RuntimeError:
+            pass
+    del __callbacks[:]
+
+
+def clear():
+    """Remove all the cached nodes."""
+    __nodes.clear()
+    __names.clear()
+
+
+def get(name):
+    """Get the cached node wrapper for a name.
+
+    Args:
+        name (str): The node name as given to PyNode
+
+    Returns:
+        _Node: The node wrapper or None if not cached or no longer valid
+    """
+    if not enabled:
+        return None
+
+    entry = __nodes.get(name)
+    if entry is None:
+        return None
+
+    handle, node = entry
+    if handle.isValid() and name in (node.name(), node.longName()):
+        return node
+
+    del __nodes[name]
+    return None
+
+
+def add(name, node):
+    """Cache the node wrapper resolved for a name.
+
+    Args:
+        name (str): The node name as given to PyNode
+        node (_Node): The node wrapper
+    """
+    if not enabled or not install_callbacks():
+        return
+
+    handle = OpenMaya.MObjectHandle(node.object())
+    key = handle.hashCode()
+    __nodes[name] = (handle, node)
+    __names.setdefault(key, set()).add(name)
+
+
+class disabled(object):
+    """Context manager to resolve the names without the cache.
+
+    Example:
+        >>> with cache.disabled():
+        ...     node = pm.PyNode("pCube1")
+    """
+
+    def __enter__(self):
+        global enabled
+        self.__prev = enabled
+        enabled = False
+        clear()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global enabled
+        enabled = self.__prev
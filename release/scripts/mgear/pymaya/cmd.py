@@ -8,6 +8,8 @@ import functools
 import inspect
 import pprint
 from . import bind
+from . import cache
+from . import modifier
 from .geometry import MeshEdge, MeshVertex, MeshFace, BindGeometry
 
 
@@ -18,6 +20,8 @@ __SCOPE_ATTR_FUNCS = {"listAttr"}
 
 SCOPE_ATTR = 0
 SCOPE_NODE = 1
+# when True, the list results of the commands are returned as LazyList
+__LAZY_WRAP = [False]
 Callback = functools.partial
 displayError = OpenMaya.MGlobal.displayError
 displayInfo = OpenMaya.MGlobal.displayInfo
@@ -83,6 +87,7 @@ def exportSelected(*args, **kwargs):
 
 def hasAttr(obj, attr, checkShape=True):
     obj = _obj_to_name(obj)
+    modifier.sync()
 
     has = cmds.attributeQuery(attr, n=obj, ex=True)
     if not has and checkShape:
@@ -151,6 +156,117 @@ __all__.append("runtime")
 __all__.append("confirmBox")
 
 
+class LazyList(list):
+    """List of command results wrapped as PyNode on first access.
+
+    The elements are stored as returned by maya.cmds and each one is
+    converted by _name_to_obj only when it is accessed, so big queries
+    don't create thousands of node wrappers when only a few are used.
+    """
+
+    def __init__(self, iterable=(), scope=SCOPE_NODE, known_node=None):
+        super(LazyList, self).__init__(iterable)
+        self.__scope = scope
+        self.__known_node = known_node
+
+    def __wrap(self, index):
+        value = list.__getitem__(self, index)
+        if isinstance(value, (str, list, set, tuple)) and not isinstance(
+            value, LazyList
+        ):
+            value = _name_to_obj(
+                value, scope=self.__scope, known_node=self.__known_node
+            )
+            list.__setitem__(self, index, value)
+        return value
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(
+                list.__getitem__(self, index),
+                scope=self.__scope,
+                known_node=self.__known_node,
+            )
+        return self.__wrap(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.__wrap(i)
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self.__wrap(i)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return list(self).__repr__()
+
+    def pop(self, index=-1):
+        value = self.__wrap(index)
+        list.pop(self, index)
+        return value
+
+    def copy(self):
+        return LazyList(
+            list.__iter__(self),
+            scope=self.__scope,
+            known_node=self.__known_node,
+        )
+
+    def names(self):
+        """Get the names of the elements without wrapping them.
+
+        Returns:
+            list: The element names
+        """
+        return [_obj_to_name(x) for x in list.__iter__(self)]
+
+
+def setLazyWrap(value):
+    """Enable or disable returning the list results as LazyList.
+
+    Args:
+        value (bool): True to wrap the list elements on first access
+
+    Returns:
+        bool: The previous value
+    """
+    prev = __LAZY_WRAP[0]
+    __LAZY_WRAP[0] = bool(value)
+    return prev
+
+
+class LazyWrap(object):
+    """Context manager to return the list results as LazyList.
+
+    Example:
+        >>> with pm.LazyWrap():
+        ...     joints = pm.ls(type="joint")
+        ...     first = joints[0]
+    """
+
+    def __init__(self, value=True):
+        super(LazyWrap, self).__init__()
+        self.__value = value
+        self.__prev = None
+
+    def __enter__(self):
+        self.__prev = setLazyWrap(self.__value)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        setLazyWrap(self.__prev)
+
+
+__all__.append("LazyList")
+__all__.append("setLazyWrap")
+__all__.append("LazyWrap")
+
+
 def _obj_to_name(arg):
     """Convert a Maya object to its name representation.
 
@@ -164,7 +280,9 @@ def _obj_to_name(arg):
     Returns:
         any: The converted name, or a collection of converted names.
     """
-    if isinstance(arg, (list, set, tuple)):
+    if isinstance(arg, LazyList):
+        return arg.names()
+    elif isinstance(arg, (list, set, tuple)):
         return arg.__class__([_obj_to_name(x) for x in arg])
     elif isinstance(arg, dict):
         return {k: _obj_to_name(v) for k, v in arg.items()}
@@ -216,6 +334,7 @@ def _name_to_obj(arg, scope=SCOPE_NODE, known_node=None):
     If the input is a collection (list, set, or tuple), the function applies
     the conversion recursively. For a string input, it attempts to convert the
     string to a PyNode. If the conversion fails, it returns the original string.
+    Lists are returned as LazyList when the lazy wrap mode is enabled.
 
     Args:
         arg (any): The value to convert.
@@ -231,6 +350,8 @@ def _name_to_obj(arg, scope=SCOPE_NODE, known_node=None):
         return None
 
     if isinstance(arg, (list, set, tuple)):
+        if __LAZY_WRAP[0] and isinstance(arg, list):
+            return LazyList(arg, scope=scope, known_node=known_node)
         return arg.__class__(
             [_name_to_obj(x, scope=scope, known_node=known_node) for x in arg]
         )
@@ -254,6 +375,7 @@ def _pymaya_cmd_wrap(func, wrap_object=True, scope=SCOPE_NODE):
     def wrapper(*args, **kwargs):
         args = _obj_to_name(args)
         kwargs = _obj_to_name(kwargs)
+        modifier.sync()
 
         try:
             res = func(*args, **kwargs)
@@ -329,6 +451,7 @@ def _pymaya_cmd_wrap(func, wrap_object=True, scope=SCOPE_NODE):
 def getAttr(*args, **kwargs):
     args = _obj_to_name(args)
     kwargs = _obj_to_name(kwargs)
+    modifier.sync()
 
     try:
         res = cmds.getAttr(*args, **kwargs)
@@ -381,7 +504,9 @@ def setAttr(*args, **kwargs):
             elif len(fargs) == 17 and all(isinstance(n, float) for n in fargs[1:]):
                 kwargs["type"] = "matrix"
 
-        cmds.setAttr(*fargs, **kwargs)
+        current = modifier.Batch.current()
+        if current is None or not current.setAttr(*fargs, **kwargs):
+            cmds.setAttr(*fargs, **kwargs)
     except Exception as e:
         raise exception.MayaAttributeError(*e.args)
 
@@ -415,13 +540,52 @@ def addAttr(*args, **kwargs):
             kwargs["dataType"] = data_type
 
     try:
-        cmds.addAttr(*args, **kwargs)
+        current = modifier.Batch.current()
+        if current is None or not current.addAttr(*args, **kwargs):
+            cmds.addAttr(*args, **kwargs)
     except Exception as e:
         raise exception.MayaAttributeError(*e.args)
 
 
+def _attribute_edit(func):
+    """Wrap a command deleting or renaming attributes.
+
+    The node wrappers resolve their attributes again after it runs.
+    """
+    wrapped = _pymaya_cmd_wrap(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if kwargs.get("q") or kwargs.get("query"):
+            return wrapped(*args, **kwargs)
+        try:
+            return wrapped(*args, **kwargs)
+        finally:
+            cache.invalidate_attributes()
+
+    return wrapper
+
+
+deleteAttr = _attribute_edit(cmds.deleteAttr)
+renameAttr = _attribute_edit(cmds.renameAttr)
+aliasAttr = _attribute_edit(cmds.aliasAttr)
+
+
+__connectAttr = _pymaya_cmd_wrap(cmds.connectAttr)
+
+
+def connectAttr(*args, **kwargs):
+    args = _obj_to_name(args)
+    kwargs = _obj_to_name(kwargs)
+
+    current = modifier.Batch.current()
+    if current is None or not current.connectAttr(*args, **kwargs):
+        return __connectAttr(*args, **kwargs)
+
+
 def listAttr(obj, **kwargs):
     obj = _obj_to_name(obj)
+    modifier.sync()
     res = cmds.listAttr(obj, **kwargs)
 
     return _name_to_obj(res, scope=SCOPE_ATTR, known_node=obj) or []
@@ -453,6 +617,7 @@ def listHistory(*args, type=None, exactType=None, **kwargs):
 def listConnections(*args, sourceFirst=False, **kwargs):
     args = _obj_to_name(args)
     kwargs = _obj_to_name(kwargs)
+    modifier.sync()
 
     if sourceFirst:
         # first  list the source connections
@@ -785,6 +950,7 @@ def sets(*args, **kwargs):
 def disconnectAttr(*args, **kwargs):
     args = _obj_to_name(args)
     kwargs = _obj_to_name(kwargs)
+    modifier.sync()
 
     if len(args) == 1:
         cons = (
@@ -0,0 +1,590 @@
+"""Batched attribute edits.
+
+Inside a batch, the attribute creations, value sets and connections done
+through pymaya (addAttr, setAttr, connectAttr and the node and attribute
+methods using them) are queued in one MDagModifier, instead of running one
+command per call, and are registered in the undo queue as a single item.
+
+The queued edits are executed when the batch ends, or earlier when a pymaya
+call needs to see them, e.g. getting a queued attribute or running any other
+pymaya command. Direct maya.cmds calls don't execute them, call
+Batch.flush() before using maya.cmds on queued edits inside a batch.
+
+Example:
+    >>> with pm.batch():
+    ...     for i in range(10):
+    ...         node.addAttr("input{}".format(i), at="double", k=True)
+    ...         pm.connectAttr(driver.tx, "{}.input{}".format(node, i))
+"""
+import os
+from maya import cmds
+from maya.api import OpenMaya
+
+
+UNDO_PLUGIN = "pymaya_undo"
+
+# addAttr flags supported by the batch, short to long names
+ADD_ATTR_FLAGS = {
+    "ln": "longName",
+    "sn": "shortName",
+    "nn": "niceName",
+    "at": "attributeType",
+    "dt": "dataType",
+    "dv": "defaultValue",
+    "min": "minValue",
+    "max": "maxValue",
+    "smn": "softMinValue",
+    "smx": "softMaxValue",
+    "k": "keyable",
+    "r": "readable",
+    "s": "storable",
+    "w": "writable",
+    "h": "hidden",
+    "en": "enumName",
+}
+
+NUMERIC_TYPES = {
+    "bool": "kBoolean",
+    "long": "kInt",
+    "short": "kShort",
+    "byte": "kByte",
+    "char": "kChar",
+    "float": "kFloat",
+    "double": "kDouble",
+}
+
+UNIT_TYPES = {
+    "doubleLinear": "kDistance",
+    "doubleAngle": "kAngle",
+}
+
+__undo_ready = [None]
+
+
+######################################
+# Undo
+######################################
+
+
+def _load_undo_plugin():
+    if __undo_ready[0] is None:
+        try:
+            if not cmds.pluginInfo(UNDO_PLUGIN, q=True, loaded=True):
+                cmds.loadPlugin(
+                    os.path.join(
+                        os.path.dirname(__file__), UNDO_PLUGIN + ".py"
+                    ),
+                    quiet=True,
+                )
+            __undo_ready[0] = True
+        except RuntimeError:
+            OpenMaya.MGlobal.displayWarning(
+                "Can't load the {} plugin, batched edits can't be "
+                "undone".format(UNDO_PLUGIN)
+            )
+            __undo_ready[0] = False
+
+    return __undo_ready[0]
+
+
+def _record_undo(mod):
+    """Register an executed modifier as an undo item"""
+    if not cmds.undoInfo(q=True, state=True) or not _load_undo_plugin():
+        return
+
+    from . import pymaya_undo
+
+    pymaya_undo.push(mod)
+    getattr(cmds, pymaya_undo.COMMAND_NAME)()
+
+
+######################################
+# Plugs
+######################################
+
+
+def _unit_value(unit, value):
+    """Convert a value in UI units to a MAngle or MDistance"""
+    if unit == OpenMaya.MFnUnitAttribute.kAngle:
+        return OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit())
+    return OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit())
+
+
+def _plug_value_setter(mod, plug):
+    """Get the modifier function setting a value on the plug.
+
+    Returns:
+        function: Called with the plug and the value, None if the plug type
+            isn't supported
+    """
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya.MFn.kNumericAttribute):
+        ntype = OpenMaya.MFnNumericAttribute(attr).numericType()
+        if ntype == OpenMaya.MFnNumericData.kBoolean:
+            return lambda p, v: mod.newPlugValueBool(p, bool(v))
+        elif ntype in (
+            OpenMaya.MFnNumericData.kInt,
+            OpenMaya.MFnNumericData.kShort,
+            OpenMaya.MFnNumericData.kByte,
+            OpenMaya.MFnNumericData.kChar,
+        ):
+            return lambda p, v: mod.newPlugValueInt(p, int(v))
+        elif ntype in (
+            OpenMaya.MFnNumericData.kFloat,
+            OpenMaya.MFnNumericData.kDouble,
+        ):
+            return lambda p, v: mod.newPlugValueDouble(p, float(v))
+    elif attr.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return lambda p, v: mod.newPlugValueShort(p, int(v))
+    elif attr.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unit = OpenMaya.MFnUnitAttribute(attr).unitType()
+        if unit == OpenMaya.MFnUnitAttribute.kAngle:
+            return lambda p, v: mod.newPlugValueMAngle(p, _unit_value(unit, v))
+        elif unit == OpenMaya.MFnUnitAttribute.kDistance:
+            return lambda p, v: mod.newPlugValueMDistance(
+                p, _unit_value(unit, v)
+            )
+    elif attr.hasFn(OpenMaya.MFn.kTypedAttribute):
+        if (
+            OpenMaya.MFnTypedAttribute(attr).attrType()
+            == OpenMaya.MFnData.kString
+        ):
+            return lambda p, v: mod.newPlugValueString(p, v)
+
+    return None
+
+
+def _get_plug_value(plug):
+    """Get the value of a plug in UI units.
+
+    Returns:
+        any: The value, or a list of values for compound plugs. None if the
+            plug type isn't supported
+    """
+    if plug.isCompound:
+        values = [
+            _get_plug_value(plug.child(i)) for i in range(plug.numChildren())
+        ]
+        return None if None in values else values
+
+    attr = plug.attribute()
+    if attr.hasFn(OpenMaya.MFn.kNumericAttribute):
+        ntype = OpenMaya.MFnNumericAttribute(attr).numericType()
+        if ntype == OpenMaya.MFnNumericData.kBoolean:
+            return plug.asBool()
+        elif ntype in (
+            OpenMaya.MFnNumericData.kInt,
+            OpenMaya.MFnNumericData.kShort,
+            OpenMaya.MFnNumericData.kByte,
+            OpenMaya.MFnNumericData.kChar,
+        ):
+            return plug.asInt()
+        elif ntype in (
+            OpenMaya.MFnNumericData.kFloat,
+            OpenMaya.MFnNumericData.kDouble,
+        ):
+            return plug.asDouble()
+    elif attr.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return plug.asShort()
+    elif attr.hasFn(OpenMaya.MFn.kUnitAttribute):
+        unit = OpenMaya.MFnUnitAttribute(attr).unitType()
+        if unit == OpenMaya.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+        elif unit == OpenMaya.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+    elif attr.hasFn(OpenMaya.MFn.kTypedAttribute):
+        if (
+            OpenMaya.MFnTypedAttribute(attr).attrType()
+            == OpenMaya.MFnData.kString
+        ):
+            return plug.asString()
+
+    return None
+
+
+def _get_plug(name):
+    sel = OpenMaya.MSelectionList()
+    sel.add(name)
+    return sel.getPlug(0)
+
+
+def _get_node(name):
+    sel = OpenMaya.MSelectionList()
+    sel.add(name)
+    return sel.getDependNode(0)
+
+
+######################################
+# Attributes
+######################################
+
+
+def _parse_enum(enumName):
+    fields = []
+    index = 0
+    for field in enumName.split(":"):
+        if not field:
+            continue
+        if "=" in field:
+            field, index = field.split("=")
+            index = int(index)
+        fields.append((field, index))
+        index += 1
+    return fields
+
+
+def _create_attribute(kwargs):
+    """Create the attribute object described by the addAttr flags.
+
+    Args:
+        kwargs (dict): The addAttr flags, with long names
+
+    Returns:
+        MObject: The attribute, None if the flags aren't supported
+    """
+    longName = kwargs.get("longName")
+    if not longName:
+        return None
+    shortName = kwargs.get("shortName") or longName
+    attributeType = kwargs.get("attributeType")
+    dataType = kwargs.get("dataType")
+    default = kwargs.get("defaultValue")
+
+    fn = None
+    if dataType is not None:
+        if dataType != "string" or attributeType is not None:
+            return None
+        fn = OpenMaya.MFnTypedAttribute()
+        attr = fn.create(longName, shortName, OpenMaya.MFnData.kString)
+    elif attributeType is None or attributeType in NUMERIC_TYPES:
+        ntype = getattr(
+            OpenMaya.MFnNumericData,
+            NUMERIC_TYPES[attributeType or "double"],
+        )
+        fn = OpenMaya.MFnNumericAttribute()
+        attr = fn.create(longName, shortName, ntype, default or 0)
+        for flag, setter in (
+            ("minValue", fn.setMin),
+            ("maxValue", fn.setMax),
+            ("softMinValue", fn.setSoftMin),
+            ("softMaxValue", fn.setSoftMax),
+        ):
+            if kwargs.get(flag) is not None:
+                setter(kwargs[flag])
+    elif attributeType in UNIT_TYPES:
+        unit = getattr(OpenMaya.MFnUnitAttribute, UNIT_TYPES[attributeType])
+        fn = OpenMaya.MFnUnitAttribute()
+        attr = fn.create(longName, shortName, unit)
+        if default is not None:
+            fn.default = _unit_value(unit, default)
+        for flag, setter in (
+            ("minValue", fn.setMin),
+            ("maxValue", fn.setMax),
+            ("softMinValue", fn.setSoftMin),
+            ("softMaxValue", fn.setSoftMax),
+        ):
+            if kwargs.get(flag) is not None:
+                setter(_unit_value(unit, kwargs[flag]))
+    elif attributeType == "enum":
+        fn = OpenMaya.MFnEnumAttribute()
+        attr = fn.create(longName, shortName, int(default or 0))
+        for field, index in _parse_enum(kwargs.get("enumName") or ""):
+            fn.addField(field, index)
+    elif attributeType == "message":
+        fn = OpenMaya.MFnMessageAttribute()
+        attr = fn.create(longName, shortName)
+    else:
+        return None
+
+    if kwargs.get("niceName"):
+        fn.setNiceNameOverride(kwargs["niceName"])
+    for flag in ("keyable", "readable", "storable", "writable", "hidden"):
+        if flag in kwargs:
+            setattr(fn, flag, bool(kwargs[flag]))
+
+    return attr
+
+
+######################################
+# Batch
+######################################
+
+
+class Batch(object):
+    """Context manager queuing the pymaya attribute edits in one modifier.
+
+    Nested batches join the outer one. The edits queued when an error is
+    raised inside the batch are still executed, like they would be without
+    the batch, and errors of the queued edits are raised when they execute.
+    """
+
+    __current = None
+
+    def __init__(self):
+        super(Batch, self).__init__()
+        self.__mod = None
+        self.__queued = 0
+        self.__executed = False
+        self.__nested = False
+
+    @staticmethod
+    def current():
+        """Get the active batch.
+
+        Returns:
+            Batch: The active batch or None
+        """
+        return Batch.__current
+
+    def __enter__(self):
+        if Batch.__current is not None:
+            self.__nested = True
+            return Batch.__current
+
+        cmds.undoInfo(openChunk=True)
+        self.__mod = OpenMaya.MDagModifier()
+        Batch.__current = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__nested:
+            return
+
+        try:
+            self.seal()
+        finally:
+            Batch.__current = None
+            cmds.undoInfo(closeChunk=True)
+
+    def flush(self):
+        """Execute the queued edits."""
+        if not self.__queued:
+            return
+
+        self.__queued = 0
+        self.__executed = True
+        self.__mod.doIt()
+
+    def seal(self):
+        """Execute the queued edits and register them as an undo item.
+
+        The following edits go to a new modifier, so the undo order is kept
+        when commands that don't use the batch run in between.
+        """
+        self.flush()
+        if self.__executed:
+            self.__executed = False
+            _record_undo(self.__mod)
+            self.__mod = OpenMaya.MDagModifier()
+
+    def __retry(self, func, *args):
+        # names of queued attributes are only found after the execution
+        try:
+            return func(*args)
+        except RuntimeError:
+            if not self.__queued:
+                raise
+            self.flush()
+            return func(*args)
+
+    def addAttr(self, *args, **kwargs):
+        """Queue an attribute creation.
+
+        Args:
+            *args: The node name
+            **kwargs: The addAttr flags
+
+        Returns:
+            bool: True if queued, False if the flags aren't supported and
+                the command has to run, the batch is sealed before returning
+        """
+        flags = {ADD_ATTR_FLAGS.get(k, k): v for k, v in kwargs.items()}
+        attr = None
+        if len(args) == 1 and set(flags).issubset(ADD_ATTR_FLAGS.values()):
+            attr = _create_attribute(flags)
+
+        if attr is None:
+            self.seal()
+            return False
+
+        try:
+            node = self.__retry(_get_node, args[0])
+        except RuntimeError:
+            self.seal()
+            return False
+
+        self.__mod.addAttribute(node, attr)
+        self.__queued += 1
+        return True
+
+    def setAttr(self, *args, **kwargs):
+        """Queue an attribute value set.
+
+        Supports numeric, enum, angle, distance and string attributes, and
+        compounds of them. Values are in UI units, like maya.cmds.
+
+        Args:
+            *args: The attribute name and the values
+            **kwargs: The setAttr flags
+
+        Returns:
+            bool: True if queued, False if the flags aren't supported and
+                the command has to run, the batch is sealed before returning
+        """
+        kwargs.pop("type", kwargs.pop("typ", None))
+        plug = None
+        if len(args) > 1 and not kwargs:
+            try:
+                plug = self.__retry(_get_plug, args[0])
+            except (RuntimeError, TypeError):
+                plug = None
+
+        edits = []
+        if plug is not None:
+            values = list(args[1:])
+            if plug.isCompound and len(values) == plug.numChildren():
+                plugs = [plug.child(i) for i in range(len(values))]
+            elif not plug.isCompound and len(values) == 1:
+                plugs = [plug]
+            else:
+                plugs = []
+            for p, value in zip(plugs, values):
+                setter = _plug_value_setter(self.__mod, p)
+                if setter is None:
+                    edits = []
+                    break
+                edits.append((setter, p, value))
+
+        if not edits:
+            self.seal()
+            return False
+
+        for setter, p, value in edits:
+            setter(p, value)
+        self.__queued += len(edits)
+        return True
+
+    def connectAttr(self, *args, **kwargs):
+        """Queue an attribute connection.
+
+        Args:
+            *args: The source and destination attribute names
+            **kwargs: The connectAttr flags, only force is supported
+
+        Returns:
+            bool: True if queued, False if the flags aren't supported and
+                the command has to run, the batch is sealed before returning
+        """
+        force = kwargs.pop("force", kwargs.pop("f", False))
+        plugs = None
+        if len(args) == 2 and not kwargs:
+            try:
+                plugs = [self.__retry(_get_plug, a) for a in args]
+            except (RuntimeError, TypeError):
+                plugs = None
+
+        if plugs is None:
+            self.seal()
+            return False
+
+        src, dst = plugs
+        if dst.isDestination:
+            if not force:
+                self.seal()
+                return False
+            self.__mod.disconnect(dst.source(), dst)
+        self.__mod.connect(src, dst)
+        self.__queued += 1
+        return True
+
+
+def flush():
+    """Execute the edits queued in the active batch."""
+    current = Batch.current()
+    if current is not None:
+        current.flush()
+
+
+def sync():
+    """Execute and seal the edits of the active batch.
+
+    Called before the commands that don't go through the batch, so they run
+    after the queued edits.
+    """
+    current = Batch.current()
+    if current is not None:
+        current.seal()
+
+
+def execute(mod):
+    """Execute a modifier and register it as an undo item.
+
+    Used to create nodes with the API and keep them undoable. The active
+    batch is sealed first, so the undo order is kept.
+
+    Args:
+        mod (OpenMaya.MDGModifier): The modifier, it can be executed already
+            for its first operations
+    """
+    sync()
+    mod.doIt()
+    _record_undo(mod)
+
+
+def record(edit):
+    """Register executed API edits as an undo item.
+
+    Args:
+        edit (object): Any object with the doIt and undoIt methods of a
+            modifier, i.e. wrapping an OpenMayaAnim.MAnimCurveChange
+    """
+    _record_undo(edit)
+
+
+######################################
+# Bulk get/set
+######################################
+
+
+def getAttrs(attrs):
+    """Get the values of several attributes.
+
+    Reads the plugs directly, falling back to getAttr for the attribute
+    types not supported by the batch.
+
+    Args:
+        attrs (list): Attributes or attribute names
+
+    Returns:
+        list: The values, in UI units
+    """
+    from . import cmd
+
+    current = Batch.current()
+    if current is not None:
+        current.flush()
+
+    values = []
+    for at in attrs:
+        plug = at.plug() if hasattr(at, "plug") else _get_plug(at)
+        value = _get_plug_value(plug)
+        if value is None:
+            value = cmd.getAttr(at)
+        values.append(value)
+
+    return values
+
+
+def setAttrs(values):
+    """Set the values of several attributes in a single batch.
+
+    Args:
+        values (dict or list): Attribute or attribute name to value, or a
+            list of (attribute, value) pairs
+    """
+    from . import cmd
+
+    items = values.items() if isinstance(values, dict) else values
+    with Batch():
+        for at, value in items:
+            cmd.setAttr(at, value)
@@ -5,193 +5,35 @@ from maya import cmds
 from . import cmd
 from . import attr
 from . import base
+from . import cache
 from . import datatypes
 from . import exception
 from . import geometry
+from . import modifier
 from . import util
-from functools import partial
 import math
 
 
 RE_ATTR_INDEX = re.compile("\[([0-9]+)\]")
 
 
-def _getPivots(node, **kwargs):
-    kwargs.pop("pivots", kwargs.pop("piv", None))
-    kwargs["pivots"] = True
-    kwargs["q"] = True
-    res = cmd.xform(node, **kwargs)
-    return (datatypes.Vector(res[:3]), datatypes.Vector(res[3:]))
-
-
-def _setTransformation(node, matrix):
-    """Sets the transformation of the node using the provided matrix.
+class _Node(base.Node):
+    """Dependency node wrapper.
 
-    Args:
-        node: The node whose transformation will be set.
-        matrix: Can be either an OpenMaya.MMatrix, OpenMaya.MTransformationMatrix,
-                or a list of lists representing a 4x4 transformation matrix.
+    The methods are resolved at class level, dag nodes are wrapped by
+    DagNode and Transform, so creating a wrapper only allocates the slots
+    below and the function sets.
     """
 
-    # If the matrix is a list of lists, convert it to OpenMaya.MMatrix
-    if isinstance(matrix, (list, tuple)):
-        # Ensure it's a 4x4 matrix (list of 4 lists, each with 4 elements)
-        if len(matrix) == 4 and all(len(row) == 4 for row in matrix):
-            flat_matrix = [elem for row in matrix for elem in row]
-            m_matrix = OpenMaya.MMatrix(flat_matrix)
-            matrix = m_matrix
-        else:
-            raise ValueError("Matrix must be a 4x4 list of lists.")
-
-    # If the matrix is MMatrix, convert it to MTransformationMatrix
-    if isinstance(matrix, OpenMaya.MMatrix):
-        matrix = OpenMaya.MTransformationMatrix(matrix)
-
-    # Apply the transformation to the node
-    OpenMaya.MFnTransform(node.dagPath()).setTransformation(matrix)
-
-
-def _getTransformation(node):
-    return datatypes.TransformationMatrix(
-        OpenMaya.MFnTransform(node.dagPath()).transformationMatrix()
-    )
-
-
-def _getShape(node, **kwargs):
-    shapes = node.getShapes(**kwargs)
-    if shapes:
-        return shapes[0]
-
-    return None
-
-
-def _getShapes(node, **kwargs):
-    kwargs.pop("shapes", kwargs.pop("s", None))
-    kwargs["shapes"] = True
-    return cmd.listRelatives(node, fullPath=True, **kwargs)
-
-
-def _getParent(node, generations=1):
-    if generations == 1:
-        res = cmd.listRelatives(node, fullPath=True, p=True, c=False)
-        if res:
-            return res[0]
-
-        return None
-    else:
-        splt = [x for x in node.dagPath().fullPathName().split("|") if x]
-        spltlen = len(splt)
-        if generations >= 0:
-            if generations >= spltlen:
-                return None
-
-            return BindNode("|" + "|".join(splt[: spltlen - generations]))
-        else:
-            if abs(generations) > spltlen:
-                return None
-
-            return BindNode("|" + "|".join(splt[:-generations]))
-
-
-def _setParent(node, parent, **kwargs):
-    _addChild(parent, node, **kwargs)
-
-
-def _getChildren(node, **kwargs):
-    kwargs["c"] = True
-    if "fullPath" not in kwargs:
-        kwargs["fullPath"] = True
-    return cmd.listRelatives(node, **kwargs)
-
-
-def _addChild(node, child, **kwargs):
-    return cmd.parent(child, node, **kwargs)
-
-
-def _setMatrix(node, val, **kwargs):
-    kwargs.pop("m", kwargs.pop("matrix", None))
-    kwargs["m"] = cmd._dt_to_value(val)
-    cmd.xform(node, **kwargs)
-
-
-def _getMatrix(node, **kwargs):
-    kwargs.pop("m", kwargs.pop("matrix", None))
-    kwargs.pop("q", kwargs.pop("query", None))
-    kwargs.update({"q": True, "m": True})
-
-    return datatypes.Matrix(cmd.xform(node, **kwargs))
-
-
-def _getTranslation(node, **kwargs):
-    space = util.getSpaceArg(**kwargs)
-    return datatypes.Vector(
-        OpenMaya.MFnTransform(node.dagPath()).translation(space)
+    __slots__ = (
+        "__obj",
+        "__fn_dg",
+        "__fn_dag",
+        "__dagpath",
+        "__attrs",
+        "__attrs_generation",
+        "__weakref__",
     )
-
-
-def _setTranslation(node, value, **kwargs):
-    space = util.getSpaceArg(**kwargs)
-    OpenMaya.MFnTransform(node.dagPath()).setTranslation(value, space)
-
-
-def _getRotation(node, quaternion=False, **kwargs):
-    space = util.getSpaceArg(**kwargs)
-    res = OpenMaya.MFnTransform(node.dagPath()).rotation(
-        space=space, asQuaternion=True
-    )
-
-    if quaternion:
-        return datatypes.Quaternion(res)
-    else:
-        return datatypes.degrees(
-            datatypes.EulerRotation(res.asEulerRotation())
-        )
-
-
-def _setRotation(node, rotation, **kwargs):
-    if isinstance(rotation, (list, tuple)):
-        if len(rotation) == 3:
-            rotation = datatypes.EulerRotation(
-                *[math.radians(x) for x in rotation]
-            )
-        elif len(rotation) == 4:
-            rotation = datatypes.Quaternion(*rotation)
-
-    if isinstance(rotation, OpenMaya.MEulerRotation):
-        rotation = rotation.asQuaternion()
-
-    space = util.getSpaceArg(**kwargs)
-    OpenMaya.MFnTransform(node.dagPath()).setRotation(rotation, space)
-
-
-def _setScale(node, scale):
-    OpenMaya.MFnTransform(node.dagPath()).setScale(scale)
-
-
-def _getScale(node):
-    return OpenMaya.MFnTransform(node.dagPath()).scale()
-
-
-def _getBoundingBox(node, invisible=False, space="object"):
-    opts = {"query": True}
-    if invisible:
-        opts["boundingBoxInvisible"] = True
-    else:
-        opts["boundingBox"] = True
-
-    if space == "object":
-        opts["objectSpace"] = True
-    elif space == "world":
-        opts["worldSpace"] = True
-    else:
-        raise Exception("unknown space '{}'".format(space))
-
-    res = cmd.xform(node, **opts)
-
-    return datatypes.BoundingBox(res[:3], res[3:])
-
-
-class _Node(base.Node):
     __selection_list = OpenMaya.MSelectionList()
 
     @staticmethod
@@ -209,8 +51,9 @@ class _Node(base.Node):
 
     def __init__(self, nodename_or_mobject=None):
         super(_Node, self).__init__()
-        self.__attrs = {}
-        self.__api_mfn = None
+        # created on the first attr call
+        self.__attrs = None
+        self.__attrs_generation = cache.attr_generation
 
         if nodename_or_mobject is None:
             name = self.__class__.__name__
@@ -233,56 +76,52 @@ class _Node(base.Node):
             )
 
         self.__fn_dg = OpenMaya.MFnDependencyNode(self.__obj)
-        self.__api_mfn = self.__fn_dg
-        self.__is_transform = False
 
         if self.__obj.hasFn(OpenMaya.MFn.kDagNode):
-            dagpath = OpenMaya.MDagPath.getAPathTo(self.__obj)
-            self.__dagpath = dagpath
-            self.__fn_dag = OpenMaya.MFnDagNode(dagpath)
-            self.getParent = partial(_getParent, self)
-            self.setParent = partial(_setParent, self)
-            self.getChildren = partial(_getChildren, self)
-            self.addChild = partial(_addChild, self)
-            if self.__obj.hasFn(OpenMaya.MFn.kTransform):
-                self.__is_transform = True
-                self.getBoundingBox = partial(_getBoundingBox, self)
-                self.getPivots = partial(_getPivots, self)
-                self.setTransformation = partial(_setTransformation, self)
-                self.getTransformation = partial(_getTransformation, self)
-                self.getShape = partial(_getShape, self)
-                self.getShapes = partial(_getShapes, self)
-                self.setMatrix = partial(_setMatrix, self)
-                self.getMatrix = partial(_getMatrix, self)
-                self.getTranslation = partial(_getTranslation, self)
-                self.setTranslation = partial(_setTranslation, self)
-                self.setRotation = partial(_setRotation, self)
-                self.getRotation = partial(_getRotation, self)
-                self.getScale = partial(_getScale, self)
-                self.setScale = partial(_setScale, self)
-
-            self.__api_mfn = self.__fn_dag
+            self.__dagpath = OpenMaya.MDagPath.getAPathTo(self.__obj)
+            self.__fn_dag = OpenMaya.MFnDagNode(self.__dagpath)
+            # _Node used directly on a dag node, switch to the class with
+            # the dag methods. They only add methods, so the layout matches
+            if type(self) is _Node:
+                if self.__obj.hasFn(OpenMaya.MFn.kTransform):
+                    self.__class__ = Transform
+                else:
+                    self.__class__ = DagNode
         else:
             self.__dagpath = None
             self.__fn_dag = None
 
-    def __getattribute__(self, name):
-        try:
-            return super(_Node, self).__getattribute__(name)
-        except AttributeError:
-            nfnc = super(_Node, self).__getattribute__("name")
-            if cmds.ls("{}.{}".format(nfnc(), name)):
-                return super(_Node, self).__getattribute__("attr")(name)
-            elif cmds.ls("{}.{}[:]".format(nfnc(), name)):
-                return geometry.BindGeometry("{}.{}[:]".format(nfnc(), name))
-            elif self.__is_transform:
-                sp = self.getShape()
-                if sp:
-                    sym = getattr(sp, name, None)
-                    if sym:
-                        return sym
+    def __getattr__(self, name):
+        # only called when the regular lookup fails. Private and special
+        # names are never Maya attributes, and an unset slot must not
+        # recurse through name()
+        if name.startswith("_Node__") or (
+            name.startswith("__") and name.endswith("__")
+        ):
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(
+                    self.__class__.__name__, name
+                )
+            )
 
-            raise
+        modifier.flush()
+        nname = self.name()
+        if cmds.ls("{}.{}".format(nname, name)):
+            return self.attr(name)
+        elif cmds.ls("{}.{}[:]".format(nname, name)):
+            return geometry.BindGeometry("{}.{}[:]".format(nname, name))
+        elif isinstance(self, Transform):
+            sp = self.getShape()
+            if sp:
+                sym = getattr(sp, name, None)
+                if sym:
+                    return sym
+
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name
+            )
+        )
 
     def __eq__(self, other):
         if isinstance(other, str):
@@ -322,14 +161,15 @@ class _Node(base.Node):
         return self.__fn_dag is not None
 
     def __apimfn__(self):
-        return self.__api_mfn
+        if self.__fn_dag is not None:
+            return self.__fn_dag
+        return self.__fn_dg
 
     def name(self, long=False):
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = self.__fn_dag
         if fdag is not None:
             return fdag.partialPathName() if not long else fdag.fullPathName()
-        fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
-        return fdg.name()
+        return self.__fn_dg.name()
 
     def nodeName(self):
         return self.name()
@@ -338,19 +178,17 @@ class _Node(base.Node):
         return self.name()
 
     def longName(self):
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = self.__fn_dag
         if fdag is not None:
             return fdag.fullPathName()
-        fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
-        return fdg.name()
+        return self.__fn_dg.name()
 
     def shortName(self):
         """Return the short name of the node."""
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = self.__fn_dag
         if fdag is not None:
             return fdag.partialPathName().split("|")[-1]
-        fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
-        return fdg.name().split("|")[-1]
+        return self.__fn_dg.name().split("|")[-1]
 
     # def namespace(self, **kwargs):
     #     n = self.name()
@@ -418,8 +256,14 @@ class _Node(base.Node):
             >>> print(translate_x)
         """
         # Check if the attribute is already cached
-        attr_cache = super(_Node, self).__getattribute__("_Node__attrs")
-        if name in attr_cache:
+        attr_cache = self.__attrs
+        if (
+            attr_cache is None
+            or self.__attrs_generation != cache.attr_generation
+        ):
+            attr_cache = self.__attrs = {}
+            self.__attrs_generation = cache.attr_generation
+        elif name in attr_cache:
             return attr_cache[name]
 
         # Split the attribute name to handle compound attributes
@@ -435,26 +279,34 @@ class _Node(base.Node):
             idx = int(idre.group(1))
 
         # Attempt to find the attribute plug using the OpenMaya API
-        fn_dg = super(_Node, self).__getattribute__("_Node__fn_dg")
+        fn_dg = self.__fn_dg
         p = None
 
         try:
             p = fn_dg.findPlug(attrname, False)
         except Exception:
-            if checkShape:
+            if checkShape and isinstance(self, Transform):
                 try:
                     # Check the shape node if the attribute is not found
-                    get_shape = super(_Node, self).__getattribute__("getShape")
-                    shape = get_shape()
+                    shape = self.getShape()
                     p = shape.dgFn().findPlug(attrname, False)
                 except Exception:
                     pass
 
+        # The attribute may be queued in a batch
+        if p is None and modifier.Batch.current() is not None:
+            modifier.Batch.current().flush()
+            try:
+                p = fn_dg.findPlug(attrname, False)
+            except Exception:
+                pass
+
         # If the plug is still not resolved, confirm existence with cmds
         if p is None or p.isNull:
             full_attr_name = f"{self.name()}.{name}"
             if cmds.objExists(full_attr_name):
-                return attr.Attribute(full_attr_name)
+                attr_cache[name] = attr.Attribute(full_attr_name)
+                return attr_cache[name]
             raise exception.MayaAttributeError(f"No '{name}' attr found")
 
         # Handle indexed attributes (arrays)
@@ -516,6 +368,7 @@ class _Node(base.Node):
         return cmd.setAttr("{}.{}".format(self.name(), name), *args, **kwargs)
 
     def hasAttr(self, name, checkShape=True):
+        modifier.sync()
         return cmds.objExists("{}.{}".format(self.name(), name))
 
     def listAttr(self, **kwargs):
@@ -657,6 +510,174 @@ class _Node(base.Node):
         return history_instances
 
 
+class DagNode(_Node):
+    __slots__ = ()
+
+    def getParent(self, generations=1):
+        if generations == 1:
+            res = cmd.listRelatives(self, fullPath=True, p=True, c=False)
+            if res:
+                return res[0]
+
+            return None
+        else:
+            splt = [x for x in self.dagPath().fullPathName().split("|") if x]
+            spltlen = len(splt)
+            if generations >= 0:
+                if generations >= spltlen:
+                    return None
+
+                return BindNode("|" + "|".join(splt[: spltlen - generations]))
+            else:
+                if abs(generations) > spltlen:
+                    return None
+
+                return BindNode("|" + "|".join(splt[:-generations]))
+
+    def setParent(self, parent, **kwargs):
+        cmd.parent(self, parent, **kwargs)
+
+    def getChildren(self, **kwargs):
+        kwargs["c"] = True
+        if "fullPath" not in kwargs:
+            kwargs["fullPath"] = True
+        return cmd.listRelatives(self, **kwargs)
+
+    def addChild(self, child, **kwargs):
+        return cmd.parent(child, self, **kwargs)
+
+
+class Transform(DagNode):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "{}('{}')".format(self.__class__.__name__, self.name())
+
+    def getBoundingBox(self, invisible=False, space="object"):
+        opts = {"query": True}
+        if invisible:
+            opts["boundingBoxInvisible"] = True
+        else:
+            opts["boundingBox"] = True
+
+        if space == "object":
+            opts["objectSpace"] = True
+        elif space == "world":
+            opts["worldSpace"] = True
+        else:
+            raise Exception("unknown space '{}'".format(space))
+
+        res = cmd.xform(self, **opts)
+
+        return datatypes.BoundingBox(res[:3], res[3:])
+
+    def getPivots(self, **kwargs):
+        kwargs.pop("pivots", kwargs.pop("piv", None))
+        kwargs["pivots"] = True
+        kwargs["q"] = True
+        res = cmd.xform(self, **kwargs)
+        return (datatypes.Vector(res[:3]), datatypes.Vector(res[3:]))
+
+    def setTransformation(self, matrix):
+        """Sets the transformation of the node using the provided matrix.
+
+        Args:
+            matrix: Can be either an OpenMaya.MMatrix,
+                OpenMaya.MTransformationMatrix, or a list of lists
+                representing a 4x4 transformation matrix.
+        """
+
+        # If the matrix is a list of lists, convert it to OpenMaya.MMatrix
+        if isinstance(matrix, (list, tuple)):
+            # Ensure it's a 4x4 matrix (list of 4 lists, each with 4 elements)
+            if len(matrix) == 4 and all(len(row) == 4 for row in matrix):
+                flat_matrix = [elem for row in matrix for elem in row]
+                m_matrix = OpenMaya.MMatrix(flat_matrix)
+                matrix = m_matrix
+            else:
+                raise ValueError("Matrix must be a 4x4 list of lists.")
+
+        # If the matrix is MMatrix, convert it to MTransformationMatrix
+        if isinstance(matrix, OpenMaya.MMatrix):
+            matrix = OpenMaya.MTransformationMatrix(matrix)
+
+        # Apply the transformation to the node
+        OpenMaya.MFnTransform(self.dagPath()).setTransformation(matrix)
+
+    def getTransformation(self):
+        return datatypes.TransformationMatrix(
+            OpenMaya.MFnTransform(self.dagPath()).transformationMatrix()
+        )
+
+    def getShape(self, **kwargs):
+        shapes = self.getShapes(**kwargs)
+        if shapes:
+            return shapes[0]
+
+        return None
+
+    def getShapes(self, **kwargs):
+        kwargs.pop("shapes", kwargs.pop("s", None))
+        kwargs["shapes"] = True
+        return cmd.listRelatives(self, fullPath=True, **kwargs)
+
+    def setMatrix(self, val, **kwargs):
+        kwargs.pop("m", kwargs.pop("matrix", None))
+        kwargs["m"] = cmd._dt_to_value(val)
+        cmd.xform(self, **kwargs)
+
+    def getMatrix(self, **kwargs):
+        kwargs.pop("m", kwargs.pop("matrix", None))
+        kwargs.pop("q", kwargs.pop("query", None))
+        kwargs.update({"q": True, "m": True})
+
+        return datatypes.Matrix(cmd.xform(self, **kwargs))
+
+    def getTranslation(self, **kwargs):
+        space = util.getSpaceArg(**kwargs)
+        return datatypes.Vector(
+            OpenMaya.MFnTransform(self.dagPath()).translation(space)
+        )
+
+    def setTranslation(self, value, **kwargs):
+        space = util.getSpaceArg(**kwargs)
+        OpenMaya.MFnTransform(self.dagPath()).setTranslation(value, space)
+
+    def getRotation(self, quaternion=False, **kwargs):
+        space = util.getSpaceArg(**kwargs)
+        res = OpenMaya.MFnTransform(self.dagPath()).rotation(
+            space=space, asQuaternion=True
+        )
+
+        if quaternion:
+            return datatypes.Quaternion(res)
+        else:
+            return datatypes.degrees(
+                datatypes.EulerRotation(res.asEulerRotation())
+            )
+
+    def setRotation(self, rotation, **kwargs):
+        if isinstance(rotation, (list, tuple)):
+            if len(rotation) == 3:
+                rotation = datatypes.EulerRotation(
+                    *[math.radians(x) for x in rotation]
+                )
+            elif len(rotation) == 4:
+                rotation = datatypes.Quaternion(*rotation)
+
+        if isinstance(rotation, OpenMaya.MEulerRotation):
+            rotation = rotation.asQuaternion()
+
+        space = util.getSpaceArg(**kwargs)
+        OpenMaya.MFnTransform(self.dagPath()).setRotation(rotation, space)
+
+    def setScale(self, scale):
+        OpenMaya.MFnTransform(self.dagPath()).setScale(scale)
+
+    def getScale(self):
+        return OpenMaya.MFnTransform(self.dagPath()).scale()
+
+
 class _NodeTypes(object):
     __Instance = None
 
@@ -673,13 +694,37 @@ class _NodeTypes(object):
         else:
             clsname = "{}{}".format(typename[0].upper(), typename[1:])
 
-            class _New(_Node):
+            class _New(self.__baseClass(typename)):
+                __slots__ = ()
+
                 def __repr__(self):
                     return "{}('{}')".format(clsname, self.name())
 
             _New.__name__ = clsname
             self.__types[typename] = _New
 
+    def __baseClass(self, typename):
+        """Get the registered class of the closest inherited node type.
+
+        Args:
+            typename (str): The node type name
+
+        Returns:
+            type: The class to derive the node type class from
+        """
+        try:
+            inherited = cmds.nodeType(
+                typename, isTypeName=True, inherited=True
+            )
+        except RuntimeError:
+            inherited = None
+
+        for tn in reversed(inherited or []):
+            if tn != typename and tn in self.__types:
+                return self.__types[tn]
+
+        return _Node
+
     def getTypeClass(self, typename):
         self_types = super(_NodeTypes, self).__getattribute__(
             "_NodeTypes__types"
@@ -743,9 +788,13 @@ class _NodeTypes(object):
 
 
 nt = _NodeTypes()
+nt.registerClass("dagNode", cls=DagNode)
+nt.registerClass("transform", cls=Transform)
 
 
 class SoftMod(_Node):
+    __slots__ = ()
+
     def __init__(self, nodename_or_mobject):
         super(SoftMod, self).__init__(nodename_or_mobject)
 
@@ -758,6 +807,8 @@ nt.registerClass("softMod", cls=SoftMod)
 
 
 class ObjectSet(_Node):
+    __slots__ = ()
+
     def __init__(self, nodename_or_mobject):
         super(ObjectSet, self).__init__(nodename_or_mobject)
 
@@ -845,7 +896,9 @@ class ObjectSet(_Node):
 nt.registerClass("objectSet", cls=ObjectSet)
 
 
-class NurbsCurve(_Node):
+class NurbsCurve(DagNode):
+    __slots__ = ("__fn_curve",)
+
     def __init__(self, nodename_or_mobject):
         super(NurbsCurve, self).__init__(nodename_or_mobject)
         self.__fn_curve = OpenMaya.MFnNurbsCurve(self.dagPath())
@@ -962,6 +1015,8 @@ nt.registerClass("nurbsCurve", cls=NurbsCurve)
 
 
 class SkinCluster(_Node):
+    __slots__ = ("__skn",)
+
     def __init__(self, nodename_or_mobject):
         super(SkinCluster, self).__init__(nodename_or_mobject)
         self.__skn = OpenMayaAnim.MFnSkinCluster(self.object())
@@ -982,7 +1037,9 @@ class SkinCluster(_Node):
 nt.registerClass("skinCluster", cls=SkinCluster)
 
 
-class Mesh(_Node):
+class Mesh(DagNode):
+    __slots__ = ("__fm",)
+
     def __init__(self, nodename_or_mobject):
         super(Mesh, self).__init__(nodename_or_mobject)
         self.__fm = OpenMaya.MFnMesh(self.object())
@@ -998,7 +1055,9 @@ class Mesh(_Node):
 nt.registerClass("mesh", cls=Mesh)
 
 
-class Joint(_Node):
+class Joint(Transform):
+    __slots__ = ()
+
     def __init__(self, nodename_or_mobject):
         super(Joint, self).__init__(nodename_or_mobject)
 
@@ -1010,7 +1069,13 @@ nt.registerClass("joint", cls=Joint)
 
 
 def BindNode(name):
+    cached = cache.get(name)
+    if cached is not None:
+        return cached
+
     if not cmds.objExists(name):
         raise exception.MayaNodeError("No such node '{}'".format(name))
 
-    return nt.getTypeClass(cmds.nodeType(name))(name)
+    bound = nt.getTypeClass(cmds.nodeType(name))(name)
+    cache.add(name, bound)
+    return bound
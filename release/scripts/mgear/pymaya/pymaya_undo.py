@@ -0,0 +1,72 @@
+"""Maya plugin registering executed modifiers in the undo queue.
+
+The modifiers of pymaya.modifier.Batch run outside of any command, so Maya
+doesn't know how to undo them. After a modifier is executed, it is pushed to
+the shared queue and the pymayaUndo command is called, which takes it and
+becomes its undo item.
+
+Maya loads this file as a separate module, so the queue is shared through
+sys.modules.
+"""
+import sys
+import types
+
+from maya.api import OpenMaya
+
+
+COMMAND_NAME = "pymayaUndo"
+
+_shared = sys.modules.get("_pymaya_undo_shared")
+if _shared is None:
+    _shared = types.ModuleType("_pymaya_undo_shared")
+    _shared.modifiers = []
+    sys.modules["_pymaya_undo_shared"] = _shared
+
+
+def maya_useNewAPI():
+    pass
+
+
+def push(modifier):
+    """Queue an executed modifier for the next pymayaUndo command.
+
+    Args:
+        modifier (OpenMaya.MDGModifier): The executed modifier
+    """
+    _shared.modifiers.append(modifier)
+
+
+class PymayaUndo(OpenMaya.MPxCommand):
+    def __init__(self):
+        super(PymayaUndo, self).__init__()
+        self.__modifier = None
+
+    @staticmethod
+    def creator():
+        return PymayaUndo()
+
+    def doIt(self, args):
+        # the modifier is already executed, just keep it
+        if _shared.modifiers:
+            self.__modifier = _shared.modifiers.pop(0)
+
+    def undoIt(self):
+        if self.__modifier is not None:
+            self.__modifier.undoIt()
+
+    def redoIt(self):
+        if self.__modifier is not None:
+            self.__modifier.doIt()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(mobject):
+    plugin = OpenMaya.MFnPlugin(mobject, "mGear", "1.0", "Any")
+    plugin.registerCommand(COMMAND_NAME, PymayaUndo.creator)
+
+
+def uninitializePlugin(mobject):
+    plugin = OpenMaya.MFnPlugin(mobject)
+    plugin.deregisterCommand(COMMAND_NAME)
@@ -0,0 +1,1266 @@
+"""In-process stand-in for the maya modules used by pymaya.
+
+Implements the small subset of ``maya.cmds`` and ``maya.api.OpenMaya`` that
+pymaya touches when creating node wrappers, resolving attributes, wrapping
+commands and converting datatypes, backed by a plain python scene.
+
+It is meant to measure the overhead of pymaya itself, outside of Maya, so
+the commands are as cheap as possible and only cover the flags the
+benchmarks use. Node names are expected to be unique.
+
+Example:
+    >>> import fake_maya
+    >>> scene = fake_maya.install()
+    >>> scene.create("transform", "node1")
+    >>> import pymaya as pm
+"""
+import fnmatch
+import itertools
+import math
+import sys
+import types
+
+
+######################################
+# Scene
+######################################
+
+
+DAG_TYPES = {"transform", "joint", "locator", "mesh", "nurbsCurve"}
+
+FN_TYPES = {
+    "transform": ("kDependencyNode", "kDagNode", "kTransform"),
+    "joint": ("kDependencyNode", "kDagNode", "kTransform", "kJoint"),
+    "locator": ("kDependencyNode", "kDagNode", "kShape", "kLocator"),
+    "mesh": (
+        "kDependencyNode",
+        "kDagNode",
+        "kShape",
+        "kGeometric",
+        "kMesh",
+    ),
+    "nurbsCurve": (
+        "kDependencyNode",
+        "kDagNode",
+        "kShape",
+        "kGeometric",
+        "kNurbsCurve",
+    ),
+}
+
+INHERITED_TYPES = {
+    "transform": ["containerBase", "entity", "dagNode", "transform"],
+    "joint": ["containerBase", "entity", "dagNode", "transform", "joint"],
+    "locator": ["containerBase", "entity", "dagNode", "shape", "locator"],
+    "mesh": ["containerBase", "entity", "dagNode", "shape", "mesh"],
+    "nurbsCurve": [
+        "containerBase",
+        "entity",
+        "dagNode",
+        "shape",
+        "nurbsCurve",
+    ],
+}
+
+NODE_TYPES = sorted(
+    DAG_TYPES
+    | {"network", "multiplyDivide", "addDoubleLinear", "objectSet"}
+)
+
+
+class _Attr(object):
+    def __init__(self, longName, shortName, value=0.0, parent=None):
+        self.longName = longName
+        self.shortName = shortName
+        self.value = value
+        self.parent = parent
+        self.children = []
+        # the source (node, attr) of the incoming connection
+        self.source = None
+
+    def child(self, longName, shortName, value=0.0):
+        at = _Attr(longName, shortName, value=value, parent=self)
+        self.children.append(at)
+        return at
+
+
+class _Node(object):
+    def __init__(self, typ, name, parent=None):
+        self.type = typ
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.alive = True
+        self.attrs = {}
+        self.aliases = {}
+        self.add_attr("message", "msg", value=None)
+        if typ in DAG_TYPES:
+            for ln, sn in (
+                ("translate", "t"),
+                ("rotate", "r"),
+                ("scale", "s"),
+            ):
+                value = 1.0 if ln == "scale" else 0.0
+                at = self.add_attr(ln, sn, value=None)
+                for axis in "XYZ":
+                    self.register(
+                        at.child(ln + axis, sn + axis.lower(), value=value)
+                    )
+            self.add_attr("visibility", "v", value=True)
+
+    def register(self, at):
+        self.attrs[at.longName] = at
+        self.aliases[at.shortName] = at.longName
+        return at
+
+    def add_attr(self, longName, shortName=None, value=0.0):
+        return self.register(_Attr(longName, shortName or longName, value))
+
+    def find_attr(self, name):
+        name = self.aliases.get(name, name)
+        return self.attrs.get(name)
+
+    def full_path(self):
+        if self.type not in DAG_TYPES:
+            return self.name
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+
+class Scene(object):
+    """The nodes, selection and callbacks of the fake Maya session."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.selection = []
+        self.name_changed_callbacks = {}
+        self.removed_callbacks = {}
+        self.scene_callbacks = {}
+        self.__ids = itertools.count(1)
+
+    def new(self):
+        """Empty the scene, like ``cmds.file(new=True, f=True)``."""
+        for cb in list(self.scene_callbacks.values()):
+            cb[1]()
+        for node in self.nodes.values():
+            node.alive = False
+        self.nodes.clear()
+        del self.selection[:]
+
+    def find(self, name):
+        if not isinstance(name, str) or not name:
+            return None
+        return self.nodes.get(name.split("|")[-1])
+
+    def find_plug(self, name):
+        nodename, _, attrname = name.partition(".")
+        node = self.find(nodename)
+        if node is None:
+            return None, None
+        return node, node.find_attr(attrname)
+
+    def unique_name(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        for i in itertools.count(1):
+            candidate = "{}{}".format(base, i)
+            if candidate not in self.nodes:
+                return candidate
+
+    def create(self, typ, name=None, parent=None):
+        """Create a node and return its name."""
+        if typ not in NODE_TYPES:
+            raise RuntimeError("Unknown object type: {}".format(typ))
+        name = self.unique_name(name or "{}1".format(typ))
+        parent_node = self.find(parent) if parent else None
+        node = _Node(typ, name, parent=parent_node)
+        if parent_node is not None:
+            parent_node.children.append(node)
+        self.nodes[name] = node
+        return name
+
+    def rename(self, name, newname):
+        node = self.find(name)
+        if node is None:
+            raise RuntimeError("No object matches name: {}".format(name))
+        prev = node.name
+        del self.nodes[prev]
+        node.name = self.unique_name(newname)
+        self.nodes[node.name] = node
+        for cb in list(self.name_changed_callbacks.values()):
+            cb[1](MObject(node), prev)
+        return node.name
+
+    def delete(self, name):
+        node = self.find(name)
+        if node is None:
+            raise RuntimeError("No object matches name: {}".format(name))
+        for child in list(node.children):
+            self.delete(child.name)
+        for cb in list(self.removed_callbacks.values()):
+            cb[1](MObject(node))
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.alive = False
+        del self.nodes[node.name]
+
+    def add_callback(self, registry, *args):
+        cid = next(self.__ids)
+        registry[cid] = args
+        return cid
+
+    def remove_callback(self, cid):
+        for registry in (
+            self.name_changed_callbacks,
+            self.removed_callbacks,
+            self.scene_callbacks,
+        ):
+            registry.pop(cid, None)
+
+
+scene = Scene()
+
+
+######################################
+# maya.cmds
+######################################
+
+
+def _cmd_createNode(typ, name=None, n=None, parent=None, p=None, **kwargs):
+    return scene.create(typ, name=name or n, parent=parent or p)
+
+
+def _cmd_objExists(name):
+    if "." in name:
+        return scene.find_plug(name)[1] is not None
+    return scene.find(name) is not None
+
+
+def _cmd_nodeType(name, **kwargs):
+    if kwargs.get("isTypeName", kwargs.get("itn", False)):
+        if kwargs.get("inherited", kwargs.get("i", False)):
+            return INHERITED_TYPES.get(name, [name])
+        return name
+    node = scene.find(name.split(".")[0])
+    if node is None:
+        raise RuntimeError("No object matches name: {}".format(name))
+    return node.type
+
+
+def _cmd_allNodeTypes(**kwargs):
+    return list(NODE_TYPES)
+
+
+def _cmd_ls(*args, **kwargs):
+    if kwargs.get("sl", kwargs.get("selection", False)):
+        names = list(scene.selection)
+    elif not args:
+        names = list(scene.nodes)
+    else:
+        names = []
+        for arg in args:
+            for pattern in arg if isinstance(arg, (list, tuple)) else [arg]:
+                if "." in pattern:
+                    if "[" not in pattern and _cmd_objExists(pattern):
+                        names.append(pattern)
+                elif "*" in pattern or "?" in pattern:
+                    names.extend(fnmatch.filter(scene.nodes, pattern))
+                elif scene.find(pattern) is not None:
+                    names.append(scene.find(pattern).name)
+
+    typ = kwargs.get("type", kwargs.get("typ"))
+    if typ:
+        names = [n for n in names if scene.find(n).type == typ]
+    if kwargs.get("long", kwargs.get("l", False)):
+        names = [scene.find(n).full_path() for n in names]
+    return names
+
+
+def _cmd_rename(name, newname, **kwargs):
+    return scene.rename(name, newname)
+
+
+def _cmd_delete(*args, **kwargs):
+    for arg in args:
+        for name in arg if isinstance(arg, (list, tuple)) else [arg]:
+            scene.delete(name)
+
+
+def _cmd_select(*args, **kwargs):
+    if not kwargs.get("add", False):
+        del scene.selection[:]
+    for arg in args:
+        for name in arg if isinstance(arg, (list, tuple)) else [arg]:
+            scene.selection.append(scene.find(name).name)
+
+
+def _cmd_getAttr(name, **kwargs):
+    node, at = scene.find_plug(name)
+    if at is None:
+        raise ValueError("No object matches name: {}".format(name))
+    if kwargs.get("type", False):
+        return "double"
+    if at.children:
+        return [tuple(c.value for c in at.children)]
+    return at.value
+
+
+def _cmd_setAttr(name, *values, **kwargs):
+    node, at = scene.find_plug(name)
+    if at is None:
+        raise RuntimeError("No object matches name: {}".format(name))
+    if at.children:
+        for child, value in zip(at.children, values):
+            child.value = value
+    elif values:
+        at.value = values[0]
+
+
+def _cmd_addAttr(*args, **kwargs):
+    ln = kwargs.get("longName", kwargs.get("ln"))
+    sn = kwargs.get("shortName", kwargs.get("sn"))
+    node = scene.find(args[0]) if args else scene.find(scene.selection[0])
+    if node.find_attr(ln) is not None:
+        raise RuntimeError("Found attribute with the same name: {}".format(ln))
+    node.add_attr(ln, sn, value=kwargs.get("defaultValue", kwargs.get("dv")))
+
+
+def _cmd_deleteAttr(*args, **kwargs):
+    node, at = scene.find_plug(args[0])
+    if at is None:
+        raise RuntimeError("No object matches name: {}".format(args[0]))
+    del node.attrs[at.longName]
+    node.aliases.pop(at.shortName, None)
+
+
+def _cmd_renameAttr(name, newname, **kwargs):
+    node, at = scene.find_plug(name)
+    if at is None:
+        raise RuntimeError("No object matches name: {}".format(name))
+    del node.attrs[at.longName]
+    at.longName = newname
+    node.attrs[newname] = at
+
+
+def _cmd_aliasAttr(*args, **kwargs):
+    if kwargs.get("q", kwargs.get("query")):
+        return []
+    node, at = scene.find_plug(args[1])
+    node.aliases[args[0]] = at.longName
+
+
+def _cmd_connectAttr(src, dst, force=False, f=False, **kwargs):
+    src_plug = scene.find_plug(src)
+    node, at = scene.find_plug(dst)
+    if src_plug[1] is None or at is None:
+        raise RuntimeError("No object matches name")
+    if at.source is not None and not (force or f):
+        raise RuntimeError("{} is already connected".format(dst))
+    at.source = src_plug
+
+
+def _cmd_listAttr(name, **kwargs):
+    node = scene.find(name)
+    return [at for at in node.attrs]
+
+
+def _cmd_listRelatives(name, **kwargs):
+    node = scene.find(name)
+    if kwargs.get("parent", kwargs.get("p", False)):
+        nodes = [node.parent] if node.parent else []
+    else:
+        nodes = node.children
+        if kwargs.get("shapes", kwargs.get("s", False)):
+            nodes = [n for n in nodes if "kShape" in FN_TYPES.get(n.type, ())]
+    if not nodes:
+        return None
+    if kwargs.get("fullPath", kwargs.get("f", False)):
+        return [n.full_path() for n in nodes]
+    return [n.name for n in nodes]
+
+
+def _cmd_file(*args, **kwargs):
+    if kwargs.get("new", False):
+        scene.new()
+    elif kwargs.get("q", kwargs.get("query", False)):
+        return ""
+
+
+def _cmd_undoInfo(*args, **kwargs):
+    return None
+
+
+def _cmd_about(*args, **kwargs):
+    if kwargs.get("api", False):
+        return 20240000
+    return "2024"
+
+
+######################################
+# maya.api.OpenMaya
+######################################
+
+
+class _Constants(type):
+    """Gives a stable integer to any undeclared ``k*`` class constant."""
+
+    __values = {}
+
+    def __getattr__(cls, name):
+        if not name.startswith("k"):
+            raise AttributeError(name)
+        value = _Constants.__values.setdefault(
+            name, len(_Constants.__values) + 1
+        )
+        # like the real constants, later lookups are plain class attributes
+        setattr(cls, name, value)
+        return value
+
+
+class MFn(metaclass=_Constants):
+    pass
+
+
+class MSpace(object):
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kPostTransform = 3
+    kWorld = 4
+    kObject = kPreTransform
+
+
+class _Unsupported(metaclass=_Constants):
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError(
+            "{} is not available in the fake Maya backend".format(
+                self.__class__.__name__
+            )
+        )
+
+
+def _node_fns(typ, fns={}):
+    if typ not in fns:
+        fns[typ] = {getattr(MFn, fn) for fn in FN_TYPES.get(typ, ())}
+        fns[typ].add(MFn.kDependencyNode)
+    return fns[typ]
+
+
+class MObject(object):
+    def __init__(self, ref=None):
+        self._ref = ref
+        if isinstance(ref, _Node):
+            self._fns = _node_fns(ref.type)
+        elif isinstance(ref, _Attr):
+            self._fns = {MFn.kAttribute}
+            if ref.children:
+                self._fns.add(MFn.kCompoundAttribute)
+            else:
+                self._fns.add(MFn.kNumericAttribute)
+        else:
+            self._fns = set()
+
+    def isNull(self):
+        return self._ref is None
+
+    def hasFn(self, fn):
+        return fn in self._fns
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._ref is other._ref
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return id(self._ref)
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle(object):
+    def __init__(self, mobject):
+        self._ref = mobject._ref
+
+    def isValid(self):
+        return self._ref is not None and self._ref.alive
+
+    def isAlive(self):
+        return self.isValid()
+
+    def hashCode(self):
+        return id(self._ref)
+
+    def object(self):
+        return MObject(self._ref)
+
+
+class MDagPath(object):
+    def __init__(self, node=None):
+        self._node = node
+
+    @staticmethod
+    def getAPathTo(mobject):
+        return MDagPath(mobject._ref)
+
+    def node(self):
+        return MObject(self._node)
+
+    def transform(self):
+        return MObject(self._node)
+
+    def isValid(self):
+        return self._node is not None and self._node.alive
+
+    def fullPathName(self):
+        return self._node.full_path()
+
+    def partialPathName(self):
+        return self._node.name
+
+    def length(self):
+        return self._node.full_path().count("|")
+
+
+class MPlug(object):
+    def __init__(self, node=None, attr=None):
+        self._node = node
+        self._attr = attr
+
+    @property
+    def isNull(self):
+        return self._attr is None
+
+    @property
+    def isArray(self):
+        return False
+
+    @property
+    def isCompound(self):
+        return bool(self._attr.children)
+
+    @property
+    def isConnected(self):
+        return self._attr.source is not None
+
+    @property
+    def isDestination(self):
+        return self._attr.source is not None
+
+    def source(self):
+        if self._attr.source is None:
+            return MPlug()
+        return MPlug(*self._attr.source)
+
+    def node(self):
+        return MObject(self._node)
+
+    def attribute(self):
+        return MObject(self._attr)
+
+    def numChildren(self):
+        return len(self._attr.children)
+
+    def child(self, index):
+        return MPlug(self._node, self._attr.children[index])
+
+    def elementByLogicalIndex(self, index):
+        raise RuntimeError("Not an array plug")
+
+    def partialName(
+        self,
+        includeNodeName=False,
+        includeNonMandatoryIndices=False,
+        includeInstancedIndices=False,
+        useAlias=False,
+        useFullAttributePath=False,
+        useLongNames=False,
+    ):
+        names = []
+        at = self._attr
+        while at is not None:
+            names.append(at.longName if useLongNames else at.shortName)
+            if not useFullAttributePath:
+                break
+            at = at.parent
+        name = ".".join(reversed(names))
+        if includeNodeName:
+            name = "{}.{}".format(self._node.name, name)
+        return name
+
+    def name(self):
+        return "{}.{}".format(self._node.name, self._attr.shortName)
+
+    def asDouble(self):
+        return float(self._attr.value)
+
+    def asBool(self):
+        return bool(self._attr.value)
+
+    def asInt(self):
+        return int(self._attr.value)
+
+    def asShort(self):
+        return int(self._attr.value)
+
+    def asString(self):
+        return str(self._attr.value)
+
+    def setDouble(self, value):
+        self._attr.value = value
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, MPlug)
+            and self._node is other._node
+            and self._attr is other._attr
+        )
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self._items = []
+
+    def clear(self):
+        del self._items[:]
+
+    def length(self):
+        return len(self._items)
+
+    def add(self, name):
+        if "." in name:
+            node, at = scene.find_plug(name)
+            if at is None:
+                raise RuntimeError("(kInvalidParameter): Object does not exist")
+            self._items.append((node, at))
+        else:
+            node = scene.find(name)
+            if node is None:
+                raise RuntimeError("(kInvalidParameter): Object does not exist")
+            self._items.append((node, None))
+        return self
+
+    def getDependNode(self, index):
+        return MObject(self._items[index][0])
+
+    def getDagPath(self, index):
+        node = self._items[index][0]
+        if node.type not in DAG_TYPES:
+            raise TypeError("(kInvalidParameter): Object is not a DAG node")
+        return MDagPath(node)
+
+    def getPlug(self, index):
+        node, at = self._items[index]
+        if at is None:
+            raise TypeError("(kInvalidParameter): Object is not a plug")
+        return MPlug(node, at)
+
+    def getComponent(self, index):
+        return (MDagPath(self._items[index][0]), MObject())
+
+
+class MFnBase(object):
+    def __init__(self, mobject=None):
+        self._ref = None
+        if mobject is not None:
+            self.setObject(mobject)
+
+    def setObject(self, mobject):
+        if isinstance(mobject, MDagPath):
+            self._ref = mobject._node
+        else:
+            self._ref = mobject._ref
+        return self
+
+    def object(self):
+        return MObject(self._ref)
+
+
+class MFnDependencyNode(MFnBase):
+    def name(self):
+        return self._ref.name
+
+    def absoluteName(self):
+        return ":" + self._ref.name
+
+    @property
+    def typeName(self):
+        return self._ref.type
+
+    def hasAttribute(self, name):
+        return self._ref.find_attr(name) is not None
+
+    def findPlug(self, name, wantNetworkedPlug=False):
+        at = self._ref.find_attr(name)
+        if at is None:
+            raise RuntimeError("(kInvalidParameter): Cannot find the plug")
+        return MPlug(self._ref, at)
+
+    def plugsAlias(self, plug):
+        return ""
+
+
+class MFnDagNode(MFnDependencyNode):
+    def dagPath(self):
+        return MDagPath(self._ref)
+
+    def fullPathName(self):
+        return self._ref.full_path()
+
+    def partialPathName(self):
+        return self._ref.name
+
+    def parentCount(self):
+        return 1 if self._ref.parent is not None else 0
+
+    def parent(self, index):
+        return MObject(self._ref.parent)
+
+    def childCount(self):
+        return len(self._ref.children)
+
+    def child(self, index):
+        return MObject(self._ref.children[index])
+
+
+class MFnTransform(MFnDagNode):
+    def translation(self, space):
+        return MVector([c.value for c in self._ref.attrs["translate"].children])
+
+    def setTranslation(self, vector, space):
+        for c, v in zip(self._ref.attrs["translate"].children, vector):
+            c.value = v
+
+    def scale(self):
+        return [c.value for c in self._ref.attrs["scale"].children]
+
+    def setScale(self, scale):
+        for c, v in zip(self._ref.attrs["scale"].children, scale):
+            c.value = v
+
+
+class MFnAttribute(MFnBase):
+    @property
+    def name(self):
+        return self._ref.longName
+
+    @property
+    def shortName(self):
+        return self._ref.shortName
+
+
+class MFnNumericData(metaclass=_Constants):
+    pass
+
+
+class MFnNumericAttribute(MFnAttribute):
+    def create(self, longName, shortName, numericType, default=0):
+        self._ref = _Attr(longName, shortName, value=default)
+        return MObject(self._ref)
+
+    def numericType(self):
+        return MFnNumericData.kDouble
+
+    def setNiceNameOverride(self, name):
+        pass
+
+    def setMin(self, value):
+        pass
+
+    def setMax(self, value):
+        pass
+
+    def setSoftMin(self, value):
+        pass
+
+    def setSoftMax(self, value):
+        pass
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    def numChildren(self):
+        return len(self._ref.children)
+
+    def child(self, index):
+        return MObject(self._ref.children[index])
+
+
+class MDGModifier(object):
+    def __init__(self):
+        self._ops = []
+
+    def createNode(self, typ):
+        node = _Node(typ, scene.unique_name("{}1".format(typ)))
+        node.alive = False
+        self._ops.append(("create", node))
+        return MObject(node)
+
+    def renameNode(self, mobject, name):
+        self._ops.append(("rename", mobject._ref, name))
+        return self
+
+    def addAttribute(self, mobject, attribute):
+        self._ops.append(("addAttr", mobject._ref, attribute._ref))
+        return self
+
+    def connect(self, source, destination):
+        self._ops.append(("connect", source, destination))
+        return self
+
+    def disconnect(self, source, destination):
+        self._ops.append(("connect", None, destination))
+        return self
+
+    def __set_value(self, plug, value):
+        self._ops.append(("set", plug._attr, value))
+        return self
+
+    newPlugValueBool = __set_value
+    newPlugValueInt = __set_value
+    newPlugValueShort = __set_value
+    newPlugValueDouble = __set_value
+    newPlugValueString = __set_value
+
+    def doIt(self):
+        for op in self._ops:
+            if op[0] == "create":
+                op[1].name = scene.unique_name(op[1].name)
+                op[1].alive = True
+                scene.nodes[op[1].name] = op[1]
+            elif op[0] == "rename":
+                scene.rename(op[1].name, op[2])
+            elif op[0] == "addAttr":
+                op[1].register(op[2])
+            elif op[0] == "connect":
+                source = op[1] and (op[1]._node, op[1]._attr)
+                op[2]._attr.source = source
+            elif op[0] == "set":
+                op[1].value = op[2]
+        del self._ops[:]
+
+    def undoIt(self):
+        pass
+
+
+class MDagModifier(MDGModifier):
+    pass
+
+
+class MGlobal(object):
+    messages = []
+
+    @staticmethod
+    def displayInfo(msg):
+        MGlobal.messages.append(("info", msg))
+
+    @staticmethod
+    def displayWarning(msg):
+        MGlobal.messages.append(("warning", msg))
+
+    @staticmethod
+    def displayError(msg):
+        MGlobal.messages.append(("error", msg))
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(cid):
+        scene.remove_callback(cid)
+
+
+class MNodeMessage(MMessage):
+    @staticmethod
+    def addNameChangedCallback(mobject, func, clientData=None):
+        return scene.add_callback(scene.name_changed_callbacks, mobject, func)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeRemovedCallback(func, nodeType="dependNode", clientData=None):
+        return scene.add_callback(scene.removed_callbacks, nodeType, func)
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 1
+    kBeforeOpen = 2
+
+    @staticmethod
+    def addCallback(msg, func, clientData=None):
+        return scene.add_callback(scene.scene_callbacks, msg, func)
+
+
+class MAngle(object):
+    kRadians = 1
+    kDegrees = 2
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kRadians
+
+
+######################################
+# Datatypes
+######################################
+
+
+def _floats(args, size):
+    if len(args) == 1 and not isinstance(args[0], (int, float)):
+        args = list(args[0])
+    return [float(x) for x in args[:size]]
+
+
+class MVector(object):
+    def __init__(self, *args):
+        values = _floats(args, 3) if args else []
+        values += [0.0, 0.0, 0.0][len(values) :]
+        self.x, self.y, self.z = values
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __add__(self, other):
+        return MVector(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MVector(self.x * other, self.y * other, self.z * other)
+        return self.x * other[0] + self.y * other[1] + self.z * other[2]
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return MVector(self.x / other, self.y / other, self.z / other)
+
+    def __neg__(self):
+        return MVector(-self.x, -self.y, -self.z)
+
+    def __xor__(self, other):
+        return MVector(
+            self.y * other[2] - self.z * other[1],
+            self.z * other[0] - self.x * other[2],
+            self.x * other[1] - self.y * other[0],
+        )
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        length = self.length()
+        return self / length if length else MVector(self)
+
+    def normalize(self):
+        n = self.normal()
+        self.x, self.y, self.z = n.x, n.y, n.z
+        return self
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+
+MVector.kZeroVector = MVector()
+MVector.kOneVector = MVector(1, 1, 1)
+MVector.kXaxisVector = MVector(1, 0, 0)
+MVector.kXnegAxisVector = MVector(-1, 0, 0)
+MVector.kYaxisVector = MVector(0, 1, 0)
+MVector.kYnegAxisVector = MVector(0, -1, 0)
+MVector.kZaxisVector = MVector(0, 0, 1)
+MVector.kZnegAxisVector = MVector(0, 0, -1)
+
+
+class MPoint(object):
+    def __init__(self, *args):
+        values = _floats(args, 4) if args else []
+        values += [0.0, 0.0, 0.0, 1.0][len(values) :]
+        self.x, self.y, self.z, self.w = values
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyzw"[index], float(value))
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def distanceTo(self, other):
+        return math.sqrt(sum((a - b) ** 2 for a, b in zip(self[:3], other)))
+
+
+MPoint.kOrigin = MPoint()
+
+
+class MMatrix(object):
+    def __init__(self, *args):
+        if not args:
+            self._m = [float(i % 5 == 0) for i in range(16)]
+        elif isinstance(args[0], MMatrix):
+            self._m = list(args[0]._m)
+        else:
+            values = list(args[0])
+            if len(values) == 4:
+                values = [x for row in values for x in row]
+            self._m = [float(x) for x in values]
+
+    def __getitem__(self, index):
+        return self._m[index]
+
+    def __setitem__(self, index, value):
+        self._m[index] = float(value)
+
+    def __len__(self):
+        return 16
+
+    def __eq__(self, other):
+        return isinstance(other, MMatrix) and self._m == other._m
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __mul__(self, other):
+        a = self._m
+        b = other._m
+        return MMatrix(
+            [
+                sum(a[r * 4 + k] * b[k * 4 + c] for k in range(4))
+                for r in range(4)
+                for c in range(4)
+            ]
+        )
+
+    def transpose(self):
+        return MMatrix([self._m[c * 4 + r] for r in range(4) for c in range(4)])
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return all(abs(a - b) <= tolerance for a, b in zip(self._m, other))
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class MTransformationMatrix(object):
+    def __init__(self, matrix=None):
+        self._matrix = MMatrix(matrix) if matrix is not None else MMatrix()
+
+    def asMatrix(self):
+        return MMatrix(self._matrix)
+
+    def translation(self, space):
+        return MVector(self._matrix._m[12:15])
+
+    def setTranslation(self, vector, space):
+        for i, v in enumerate(vector):
+            self._matrix._m[12 + i] = float(v)
+        return self
+
+
+class MQuaternion(object):
+    def __init__(self, *args):
+        values = _floats(args, 4) if args else []
+        values += [0.0, 0.0, 0.0, 1.0][len(values) :]
+        self.x, self.y, self.z, self.w = values
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __len__(self):
+        return 4
+
+
+class MEulerRotation(object):
+    kXYZ = 0
+    kYZX = 1
+    kZXY = 2
+    kXZY = 3
+    kYXZ = 4
+    kZYX = 5
+
+    def __init__(self, *args):
+        order = MEulerRotation.kXYZ
+        if args and isinstance(args[0], MEulerRotation):
+            values = [args[0][0], args[0][1], args[0][2]]
+            order = args[0].order
+        elif args:
+            if len(args) == 4:
+                order = args[3]
+            values = _floats(args, 3)
+        else:
+            values = [0.0, 0.0, 0.0]
+        self._v = values
+        self.order = order
+
+    def __getitem__(self, index):
+        return self._v[index]
+
+    def __setitem__(self, index, value):
+        self._v[index] = float(value)
+
+    def __len__(self):
+        return 3
+
+    @property
+    def x(self):
+        return self._v[0]
+
+    @x.setter
+    def x(self, value):
+        self._v[0] = float(value)
+
+    @property
+    def y(self):
+        return self._v[1]
+
+    @y.setter
+    def y(self, value):
+        self._v[1] = float(value)
+
+    @property
+    def z(self):
+        return self._v[2]
+
+    @z.setter
+    def z(self, value):
+        self._v[2] = float(value)
+
+
+class MBoundingBox(object):
+    def __init__(self, *args):
+        self.min = MPoint(args[0]) if args else MPoint()
+        self.max = MPoint(args[1]) if len(args) > 1 else MPoint(self.min)
+
+    @property
+    def center(self):
+        return MPoint([(a + b) * 0.5 for a, b in zip(self.min, self.max)])
+
+    def width(self):
+        return self.max.x - self.min.x
+
+    def height(self):
+        return self.max.y - self.min.y
+
+    def depth(self):
+        return self.max.z - self.min.z
+
+
+######################################
+# Install
+######################################
+
+
+def _module(name, members, fallback=None):
+    mod = types.ModuleType(name)
+    mod.__dict__.update(members)
+    mod.__fake__ = True
+    if fallback is not None:
+        mod.__getattr__ = fallback
+    return mod
+
+
+def _unsupported(module_name):
+    created = {}
+
+    def __getattr__(name):
+        if not name.startswith("M"):
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(module_name, name)
+            )
+        if name not in created:
+            created[name] = type(name, (_Unsupported,), {})
+        return created[name]
+
+    return __getattr__
+
+
+def is_installed():
+    """Return True if the maya modules in sys.modules are this fake."""
+    return getattr(sys.modules.get("maya"), "__fake__", False)
+
+
+def install():
+    """Install the fake maya modules in sys.modules.
+
+    Returns:
+        Scene: The fake scene backing the commands
+
+    Raises:
+        RuntimeError: If the real maya modules are already imported
+    """
+    if is_installed():
+        return scene
+    if "maya" in sys.modules:
+        raise RuntimeError("The real maya modules are already imported")
+
+    cmds = _module(
+        "maya.cmds",
+        {
+            n[len("_cmd_") :]: f
+            for n, f in globals().items()
+            if n.startswith("_cmd_")
+        },
+    )
+    mel = _module("maya.mel", {"eval": lambda *args, **kwargs: ""})
+    standalone = _module(
+        "maya.standalone",
+        {"initialize": lambda *args, **kwargs: None},
+    )
+    om2_members = {
+        n: v
+        for n, v in globals().items()
+        if n.startswith("M") and isinstance(v, type)
+    }
+    om2 = _module(
+        "maya.api.OpenMaya", om2_members, _unsupported("maya.api.OpenMaya")
+    )
+    oma2 = _module(
+        "maya.api.OpenMayaAnim", {}, _unsupported("maya.api.OpenMayaAnim")
+    )
+    # API 1.0 types are distinct from the 2.0 ones
+    om1 = _module(
+        "maya.OpenMaya",
+        {"MVector": type("MVector", (MVector,), {}), "MSpace": MSpace},
+        _unsupported("maya.OpenMaya"),
+    )
+    api = _module("maya.api", {"OpenMaya": om2, "OpenMayaAnim": oma2})
+    maya = _module(
+        "maya",
+        {
+            "cmds": cmds,
+            "mel": mel,
+            "standalone": standalone,
+            "api": api,
+            "OpenMaya": om1,
+        },
+    )
+    for mod in (maya, cmds, mel, standalone, api, om2, oma2, om1):
+        sys.modules[mod.__name__] = mod
+
+    return scene
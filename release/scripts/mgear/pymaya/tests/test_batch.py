@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+from maya import standalone
+standalone.initialize()
+
+from maya import cmds
+
+mpath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if mpath not in sys.path:
+    sys.path.append(mpath)
+
+import pymaya as pm
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        cmds.file(new=True, f=True)
+
+    def test_add_attr(self):
+        node = pm.PyNode(cmds.createNode("transform", n="test"))
+        with pm.batch():
+            node.addAttr("flt", at="double", k=True, min=-1, max=1, dv=0.5)
+            node.addAttr("lng", at=int)
+            node.addAttr("ang", at="doubleAngle")
+            node.addAttr("enm", at="enum", en="a:b=5:c")
+            node.addAttr("msg", at="message")
+            node.addAttr("txt", dt="string")
+            # queued attributes can be used inside the batch
+            self.assertEqual(node.flt.get(), 0.5)
+
+        self.assertTrue(cmds.attributeQuery("flt", n="test", k=True))
+        self.assertEqual(cmds.attributeQuery("flt", n="test", max=True), [1])
+        self.assertEqual(cmds.getAttr("test.flt"), 0.5)
+        self.assertEqual(cmds.getAttr("test.lng", type=True), "long")
+        self.assertEqual(cmds.getAttr("test.ang", type=True), "doubleAngle")
+        self.assertEqual(
+            cmds.attributeQuery("enm", n="test", le=True), ["a:b=5:c"]
+        )
+        self.assertEqual(cmds.getAttr("test.msg", type=True), "message")
+        self.assertEqual(cmds.getAttr("test.txt", type=True), "string")
+
+    def test_set_attr(self):
+        node = pm.PyNode(cmds.createNode("transform", n="test"))
+        cmds.addAttr("test", ln="txt", dt="string")
+        with pm.batch():
+            node.tx.set(2)
+            node.setAttr("rotate", 0, 90, 0)
+            node.setAttr("txt", "hello", type="string")
+            node.v.set(False)
+
+        self.assertEqual(cmds.getAttr("test.tx"), 2)
+        self.assertAlmostEqual(cmds.getAttr("test.ry"), 90)
+        self.assertEqual(cmds.getAttr("test.txt"), "hello")
+        self.assertFalse(cmds.getAttr("test.v"))
+
+    def test_connect_attr(self):
+        src = pm.PyNode(cmds.createNode("transform", n="src"))
+        dst = pm.PyNode(cmds.createNode("transform", n="dst"))
+        cmds.connectAttr("dst.ty", "dst.tx")
+        with pm.batch():
+            src.tx.connect(dst.tx, f=True)
+            pm.connectAttr(src.ty, dst.ty)
+
+        self.assertEqual(
+            cmds.listConnections("dst.tx", s=True, d=False, p=True),
+            ["src.translateX"],
+        )
+        self.assertEqual(
+            cmds.listConnections("dst.ty", s=True, d=False, p=True),
+            ["src.translateY"],
+        )
+
+    def test_undo(self):
+        cmds.createNode("transform", n="test")
+        node = pm.PyNode("test")
+        cmds.undoInfo(state=True)
+        with pm.batch():
+            for i in range(10):
+                node.addAttr("at{}".format(i), at="double")
+                node.setAttr("at{}".format(i), i)
+            node.tx.set(1)
+
+        self.assertEqual(cmds.getAttr("test.at9"), 9)
+        cmds.undo()
+        self.assertFalse(cmds.objExists("test.at0"))
+        self.assertEqual(cmds.getAttr("test.tx"), 0)
+        cmds.redo()
+        self.assertEqual(cmds.getAttr("test.at9"), 9)
+
+    def test_nested(self):
+        node = pm.PyNode(cmds.createNode("transform", n="test"))
+        with pm.batch() as outer:
+            with pm.batch() as inner:
+                node.tx.set(1)
+            self.assertIs(inner, outer)
+            self.assertIs(pm.Batch.current(), outer)
+        self.assertIsNone(pm.Batch.current())
+        self.assertEqual(cmds.getAttr("test.tx"), 1)
+
+    def test_get_set_attrs(self):
+        node = pm.PyNode(cmds.createNode("transform", n="test"))
+        pm.setAttrs({node.tx: 1, "test.ty": 2, node.rz: 45})
+        self.assertEqual(pm.getAttrs([node.tx, "test.ty"]), [1, 2])
+        self.assertAlmostEqual(pm.getAttrs([node.rz])[0], 45)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,486 @@
+"""pymaya micro-benchmarks.
+
+Runs pymaya against the in-process fake maya modules of fake_maya, so the
+measurements are the overhead of pymaya itself: node construction, attribute
+access, command wrapping and datatype conversion.
+
+For each benchmark reports:
+    ops/sec: operations per second, best of several repeats
+    cost: time per operation relative to a pure python calibration loop,
+        which makes the numbers comparable between machines
+    bytes/op, blocks/op: memory retained by the objects each operation
+        returns, measured with tracemalloc
+    peak/op: peak memory allocated while running a single operation
+
+The test fails if a benchmark is slower or allocates more than the saved
+baseline, within a tolerance. The tolerances can be changed with the
+PYMAYA_BENCH_TIME_TOLERANCE and PYMAYA_BENCH_MEMORY_TOLERANCE environment
+variables (0.5 = 50% over the baseline).
+
+The benchmarks are skipped when the real maya modules are already imported.
+
+Usage:
+    python test_benchmark.py                  # run the regression tests
+    python test_benchmark.py --report         # only print the results
+    python test_benchmark.py --save-baseline  # store the current results
+"""
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+import unittest
+
+import fake_maya
+
+FAKE_MAYA = "maya" not in sys.modules or fake_maya.is_installed()
+if FAKE_MAYA:
+    scene = fake_maya.install()
+
+    mpath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    if mpath not in sys.path:
+        sys.path.append(mpath)
+
+    import pymaya as pm
+    from pymaya import cache
+    from pymaya import cmd
+    from pymaya import node
+
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"
+)
+TIME_TOLERANCE = float(os.environ.get("PYMAYA_BENCH_TIME_TOLERANCE", 1.0))
+MEMORY_TOLERANCE = float(
+    os.environ.get("PYMAYA_BENCH_MEMORY_TOLERANCE", 0.25)
+)
+# seconds per timing repeat
+TARGET_TIME = 0.05
+REPEATS = 5
+# number of operations whose results are kept to measure the memory
+MEMORY_OPS = 200
+# times a slow benchmark is measured again before reporting a regression
+RETRIES = 2
+
+BENCHMARKS = []
+
+
+def benchmark(group):
+    """Register a benchmark function returning the operation to measure.
+
+    Args:
+        group (str): node, attribute, command or datatype
+    """
+
+    def register(func):
+        BENCHMARKS.append((group, func.__name__[len("bench_") :], func))
+        return func
+
+    return register
+
+
+######################################
+# Scene
+######################################
+
+
+def build_scene():
+    """Create the nodes used by the benchmarks."""
+    scene.new()
+    scene.create("transform", "bench_root")
+    for i in range(10):
+        scene.create("transform", "bench_{}".format(i), parent="bench_root")
+    scene.create("network", "bench_network")
+    scene.nodes["bench_network"].add_attr("payload", "pl")
+
+
+######################################
+# Node construction
+######################################
+
+
+@benchmark("node")
+def bench_pynode_cached():
+    pm.PyNode("bench_0")
+    return lambda: pm.PyNode("bench_0")
+
+
+@benchmark("node")
+def bench_pynode_transform():
+    def op():
+        with cache.disabled():
+            return pm.PyNode("bench_0")
+
+    return op
+
+
+@benchmark("node")
+def bench_pynode_dependency_node():
+    def op():
+        with cache.disabled():
+            return pm.PyNode("bench_network")
+
+    return op
+
+
+@benchmark("node")
+def bench_node_from_mobject():
+    sel = fake_maya.MSelectionList().add("bench_0")
+    mobject = sel.getDependNode(0)
+    return lambda: node._Node(mobject)
+
+
+######################################
+# Attribute access
+######################################
+
+
+@benchmark("attribute")
+def bench_attr_cached():
+    n = pm.PyNode("bench_0")
+    return lambda: n.attr("translateX")
+
+
+@benchmark("attribute")
+def bench_attr_compound():
+    def op():
+        with cache.disabled():
+            return pm.PyNode("bench_0").attr("translate.translateX")
+
+    return op
+
+
+@benchmark("attribute")
+def bench_attr_getattr_fallback():
+    n = pm.PyNode("bench_0")
+    return lambda: n.tx
+
+
+@benchmark("attribute")
+def bench_attr_dynamic():
+    n = pm.PyNode("bench_network")
+    return lambda: n.payload
+
+
+@benchmark("attribute")
+def bench_pynode_attribute_name():
+    return lambda: pm.PyNode("bench_0.translateX")
+
+
+######################################
+# Command wrapping
+######################################
+
+
+@benchmark("command")
+def bench_ls_wrap():
+    return lambda: pm.ls("bench_?")
+
+
+@benchmark("command")
+def bench_command_str_result():
+    n = pm.PyNode("bench_0")
+    return lambda: pm.nodeType(n)
+
+
+@benchmark("command")
+def bench_get_attr():
+    at = pm.PyNode("bench_0").attr("translateX")
+    return lambda: pm.getAttr(at)
+
+
+@benchmark("command")
+def bench_set_attr():
+    at = pm.PyNode("bench_0").attr("translateX")
+    return lambda: pm.setAttr(at, 1.0)
+
+
+@benchmark("command")
+def bench_batch_set_attr():
+    ats = [pm.PyNode("bench_{}".format(i)).attr("translateX") for i in range(10)]
+
+    def op():
+        with pm.batch():
+            for at in ats:
+                pm.setAttr(at, 1.0)
+
+    return op
+
+
+######################################
+# Datatype conversion
+######################################
+
+
+@benchmark("datatype")
+def bench_obj_to_name():
+    nodes = [pm.PyNode("bench_{}".format(i)) for i in range(10)]
+    args = (nodes, {"p": nodes[0]}, "bench_root")
+    return lambda: cmd._obj_to_name(args)
+
+
+@benchmark("datatype")
+def bench_dt_to_value():
+    args = (
+        pm.datatypes.Matrix(),
+        [pm.datatypes.Vector(1, 2, 3), pm.datatypes.Point(1, 2, 3)],
+    )
+    return lambda: cmd._dt_to_value(args)
+
+
+@benchmark("datatype")
+def bench_vector():
+    return lambda: pm.datatypes.Vector(1, 2, 3)
+
+
+@benchmark("datatype")
+def bench_matrix():
+    return lambda: pm.datatypes.Matrix()
+
+
+@benchmark("datatype")
+def bench_euler_rotation():
+    return lambda: pm.datatypes.EulerRotation(1, 2, 3)
+
+
+######################################
+# Measure
+######################################
+
+
+def _calibration():
+    # a fixed pure python workload: object creation, attribute and dict
+    # access, similar in nature to the wrapper code being measured
+    class _Obj(object):
+        def __init__(self, name):
+            self.name = name
+            self.attrs = {}
+
+    def op():
+        obj = _Obj("calibration")
+        obj.attrs[obj.name] = len(obj.name)
+        return "{}.{}".format(obj.name, obj.attrs[obj.name])
+
+    return op
+
+
+def _seconds_per_op(op):
+    timer = timeit.Timer(op)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= TARGET_TIME * 0.2:
+            break
+        number *= 10
+    number = max(1, int(number * TARGET_TIME / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=REPEATS, number=number)) / number
+
+
+def _memory_per_op(op):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        op()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        op()
+        peak = tracemalloc.get_traced_memory()[1] - start
+
+        results = [None] * MEMORY_OPS
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        for i in range(MEMORY_OPS):
+            results[i] = op()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(s.size_diff for s in stats)
+    count = sum(s.count_diff for s in stats)
+    del results
+    return (
+        max(size, 0) / float(MEMORY_OPS),
+        max(count, 0) / float(MEMORY_OPS),
+        peak,
+    )
+
+
+def run_benchmarks(names=None):
+    """Run the benchmarks.
+
+    Args:
+        names (list of str, optional): Names of the benchmarks to run.
+            None runs all of them
+
+    Returns:
+        dict: The results by benchmark name
+    """
+    build_scene()
+    calibration_op = _calibration()
+    results = {}
+    for group, name, func in BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+        op = func()
+        op()
+        # calibrate next to each measurement, so changes of the machine load
+        # during the run affect both
+        calibration = _seconds_per_op(calibration_op)
+        seconds = _seconds_per_op(op)
+        bytes_per_op, blocks_per_op, peak = _memory_per_op(op)
+        results[name] = {
+            "group": group,
+            "ops_per_sec": round(1.0 / seconds, 1),
+            "cost": round(seconds / calibration, 3),
+            "bytes_per_op": round(bytes_per_op, 1),
+            "blocks_per_op": round(blocks_per_op, 2),
+            "peak_bytes": peak,
+        }
+
+    return results
+
+
+def report(results, baseline=None, stream=sys.stdout):
+    """Print the benchmark results as a table.
+
+    Args:
+        results (dict): The results of run_benchmarks
+        baseline (dict, optional): The baseline results to compare with
+        stream (file, optional): Where to print
+    """
+    baseline = baseline or {}
+    line = "{:<28}{:>12}{:>9}{:>9}{:>11}{:>10}{:>10}\n"
+    stream.write(
+        line.format(
+            "benchmark", "ops/sec", "cost", "base", "bytes/op", "blocks", "peak"
+        )
+    )
+    for name, res in results.items():
+        base = baseline.get(name, {}).get("cost", "-")
+        stream.write(
+            line.format(
+                name,
+                "{:,.0f}".format(res["ops_per_sec"]),
+                res["cost"],
+                base,
+                res["bytes_per_op"],
+                res["blocks_per_op"],
+                res["peak_bytes"],
+            )
+        )
+
+
+def regressions(results, baseline):
+    """Compare the results with a baseline.
+
+    Args:
+        results (dict): The results of run_benchmarks
+        baseline (dict): The baseline results
+
+    Returns:
+        list of str: A description of each regression found
+    """
+    found = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base["cost"] * (1.0 + TIME_TOLERANCE)
+        if res["cost"] > limit:
+            found.append(
+                "{}: cost {} > {} (baseline {})".format(
+                    name, res["cost"], round(limit, 3), base["cost"]
+                )
+            )
+        for key in ("bytes_per_op", "blocks_per_op"):
+            # small absolute slack so zero baselines don't fail on noise
+            limit = base[key] * (1.0 + MEMORY_TOLERANCE) + 1
+            if res[key] > limit:
+                found.append(
+                    "{}: {} {} > {} (baseline {})".format(
+                        name, key, res[key], round(limit, 2), base[key]
+                    )
+                )
+
+    return found
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r") as fp:
+        return json.load(fp)["benchmarks"]
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    data = {
+        "python": platform.python_version(),
+        "benchmarks": results,
+    }
+    with open(path, "w") as fp:
+        json.dump(data, fp, indent=4, sort_keys=True)
+        fp.write("\n")
+
+
+######################################
+# Tests
+######################################
+
+
+@unittest.skipUnless(FAKE_MAYA, "the real maya modules are imported")
+class TestBenchmark(unittest.TestCase):
+    results = None
+    baseline = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = load_baseline()
+        cls.results = run_benchmarks()
+        sys.stdout.write("\n")
+        report(cls.results, cls.baseline)
+
+    def check_group(self, group):
+        if not self.baseline:
+            self.skipTest("no benchmark baseline saved")
+        results = {
+            k: v for k, v in self.results.items() if v["group"] == group
+        }
+        found = regressions(results, self.baseline)
+        for _ in range(RETRIES):
+            if not found:
+                break
+            # timings are noisy, measure the slow ones again
+            slow = [
+                k for k in results if any(f.startswith(k + ":") for f in found)
+            ]
+            for name, res in run_benchmarks(slow).items():
+                res["cost"] = min(res["cost"], results[name]["cost"])
+                results[name] = res
+            found = regressions(results, self.baseline)
+        self.assertFalse(found, "\n".join(found))
+
+    def test_node(self):
+        self.check_group("node")
+
+    def test_attribute(self):
+        self.check_group("attribute")
+
+    def test_command(self):
+        self.check_group("command")
+
+    def test_datatype(self):
+        self.check_group("datatype")
+
+
+if __name__ == "__main__":
+    if "--save-baseline" in sys.argv:
+        results = run_benchmarks()
+        report(results)
+        save_baseline(results)
+    elif "--report" in sys.argv:
+        report(run_benchmarks(), load_baseline())
+    else:
+        unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from maya import standalone
+standalone.initialize()
+
+from maya import cmds
+
+mpath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if mpath not in sys.path:
+    sys.path.append(mpath)
+
+import pymaya as pm
+from pymaya import cache
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        cmds.file(new=True, f=True)
+
+    def test_cached_node(self):
+        cmds.createNode("transform", n="test")
+        node = pm.PyNode("test")
+        self.assertIs(node, pm.PyNode("test"))
+        self.assertIs(node.attr("tx"), pm.PyNode("test.tx"))
+
+    def test_rename(self):
+        cmds.createNode("transform", n="test")
+        node = pm.PyNode("test")
+        cmds.rename("test", "test2")
+        self.assertIs(node, pm.PyNode("test2"))
+        cmds.createNode("transform", n="test")
+        self.assertIsNot(node, pm.PyNode("test"))
+        self.assertEqual(pm.PyNode("test").name(), "test")
+
+    def test_delete(self):
+        cmds.createNode("transform", n="test")
+        pm.PyNode("test")
+        cmds.delete("test")
+        with self.assertRaises(RuntimeError):
+            pm.PyNode("test")
+
+    def test_attribute_removed(self):
+        cmds.createNode("transform", n="test")
+        cmds.addAttr("test", ln="custom", at="double")
+        node = pm.PyNode("test")
+        custom = node.attr("custom")
+        pm.deleteAttr("test.custom")
+        pm.addAttr("test", ln="custom", at="long")
+        self.assertIs(node, pm.PyNode("test"))
+        self.assertIsNot(node.attr("custom"), custom)
+        self.assertEqual(node.attr("custom").type(), "long")
+
+    def test_attribute_deleted(self):
+        cmds.createNode("transform", n="test")
+        cmds.addAttr("test", ln="custom", at="double")
+        node = pm.PyNode("test")
+        node.attr("custom").delete()
+        with self.assertRaises(pm.MayaAttributeError):
+            node.attr("custom")
+
+    def test_ambiguous_name(self):
+        cmds.createNode("transform", n="parent")
+        cmds.createNode("transform", n="child", p="parent")
+        child = pm.PyNode("child")
+        cmds.duplicate("parent")
+        self.assertEqual(child.name(), "parent|child")
+        with self.assertRaises(Exception):
+            pm.PyNode("child")
+
+    def test_disabled(self):
+        cmds.createNode("transform", n="test")
+        node = pm.PyNode("test")
+        with cache.disabled():
+            self.assertIsNot(node, pm.PyNode("test"))
+            self.assertEqual(node, pm.PyNode("test"))
@@ -90,3 +90,18 @@ class TestCmd(unittest.TestCase):
             pm.PyNode("No_Such_Node")
 
         self.assertEqual(pm.util.degrees(math.pi), 180.0)
+
+    def test_lazy_wrap(self):
+        pm.createNode("joint", n="jnt1")
+        pm.createNode("joint", n="jnt2")
+
+        with pm.LazyWrap():
+            joints = pm.ls(type="joint")
+            self.assertTrue(isinstance(joints, pm.LazyList))
+            self.assertEqual(joints.names(), ["jnt1", "jnt2"])
+            self.assertTrue(isinstance(joints[0], pm.nt.Joint))
+            self.assertEqual([x.name() for x in joints], ["jnt1", "jnt2"])
+            pm.select(joints)
+            self.assertEqual(cmds.ls(sl=True), ["jnt1", "jnt2"])
+
+        self.assertFalse(isinstance(pm.ls(type="joint"), pm.LazyList))
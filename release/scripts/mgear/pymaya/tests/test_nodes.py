@@ -83,3 +83,22 @@ class TestNode(unittest.TestCase):
         self.assertIsNotNone(node.v)
         with self.assertRaises(pm.MayaAttributeError):
             node.attr("testtest")
+
+    def test_type_classes(self):
+        cmds.createNode("transform", n="test")
+        cmds.createNode("joint", n="jnt", p="test")
+        cmds.createNode("network", n="net")
+        node = pm.PyNode("test")
+        jnt = pm.PyNode("jnt")
+        net = pm.PyNode("net")
+
+        self.assertTrue(isinstance(node, pm.nt.Transform))
+        self.assertTrue(isinstance(jnt, pm.nt.Transform))
+        self.assertTrue(isinstance(jnt, pm.nt.DagNode))
+        self.assertFalse(isinstance(net, pm.nt.DagNode))
+        self.assertEqual(jnt.getParent(), node)
+        self.assertFalse(hasattr(net, "getParent"))
+
+        # the methods live in the class, not in the instance
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertTrue(isinstance(pm.node._Node("test"), pm.nt.Transform))
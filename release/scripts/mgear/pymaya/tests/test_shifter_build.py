@@ -0,0 +1,137 @@
+"""Shifter Rig.build tests, outside of Maya.
+
+The shifter package is loaded with its Maya and mGear dependencies replaced
+by mocks, so only the build flow of Rig is tested.
+"""
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+SHIFTER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "shifter"
+)
+
+MOCKED_MODULES = [
+    "maya",
+    "maya.cmds",
+    "maya.api",
+    "maya.api.OpenMaya",
+    "mgear",
+    "mgear.pymaya",
+    "mgear.pymaya.datatypes",
+    "mgear.pymaya.versions",
+    "mgear.core",
+    "mgear.core.utils",
+    "mgear.core.primitive",
+    "mgear.core.attribute",
+    "mgear.core.skin",
+    "mgear.core.dag",
+    "mgear.core.icon",
+    "mgear.core.node",
+    "mgear.shifter_classic_components",
+    "mgear.shifter_epic_components",
+    "mgear.shifter.guide",
+    "mgear.shifter.component",
+    "mgear.shifter.naming",
+    "mgear.shifter.template_cache",
+    "mgear.shifter.component_registry",
+    "mgear.shifter.profiler",
+    "mgear.shifter.incremental",
+]
+
+
+def load_shifter(modules):
+    """Load the shifter package with mocked dependencies.
+
+    Args:
+        modules (dict): The mocked modules, by name
+
+    Returns:
+        module: The shifter package
+    """
+    spec = importlib.util.spec_from_file_location(
+        "mgear.shifter",
+        os.path.join(SHIFTER_PATH, "__init__.py"),
+        submodule_search_locations=[SHIFTER_PATH],
+    )
+    shifter = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, modules):
+        sys.modules["mgear.shifter"] = shifter
+        spec.loader.exec_module(shifter)
+    return shifter
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.modules = dict((m, mock.MagicMock()) for m in MOCKED_MODULES)
+        self.incremental = self.modules["mgear.shifter.incremental"]
+        self.shifter = load_shifter(self.modules)
+
+        self.rig = self.shifter.Rig()
+        self.rig.guide.values = {"rig_name": "rig"}
+        self.rig.model = mock.MagicMock()
+        self.rig.component_nodes = {}
+        for method in (
+            "initialHierarchy",
+            "updateHierarchy",
+            "processComponents",
+            "finalize",
+        ):
+            patcher = mock.patch.object(self.rig, method)
+            self.addCleanup(patcher.stop)
+            setattr(self, method, patcher.start())
+
+    def test_full_build(self):
+        self.incremental.is_enabled.return_value = False
+        self.rig.build()
+        self.rig.build(incremental=False)
+
+        self.incremental.get_plan.assert_not_called()
+        self.assertEqual(self.initialHierarchy.call_count, 2)
+        self.processComponents.assert_called_with()
+        self.assertFalse(self.rig.track_nodes)
+        self.incremental.store.assert_not_called()
+
+    def test_full_build_enabled(self):
+        self.incremental.is_enabled.return_value = True
+        self.rig.build()
+
+        self.incremental.get_plan.assert_not_called()
+        self.assertTrue(self.rig.track_nodes)
+        self.incremental.store.assert_called_once_with(self.rig, {})
+
+    def test_incremental_build(self):
+        self.incremental.is_enabled.return_value = False
+        plan = self.incremental.get_plan.return_value
+        self.rig.build(incremental=True)
+
+        self.incremental.get_plan.assert_called_once_with(self.rig)
+        self.updateHierarchy.assert_called_once_with(plan)
+        self.processComponents.assert_called_once_with(plan)
+        self.initialHierarchy.assert_not_called()
+        self.finalize.assert_called_once_with()
+        self.incremental.store.assert_called_once_with(self.rig, {})
+
+    def test_incremental_build_without_rig(self):
+        self.incremental.get_plan.return_value = None
+        self.rig.build(incremental=True)
+
+        self.updateHierarchy.assert_not_called()
+        self.initialHierarchy.assert_called_once_with()
+        self.processComponents.assert_called_once_with()
+
+    def test_incremental_build_fallback(self):
+        self.incremental.IncrementalBuildError = RuntimeError
+        self.processComponents.side_effect = [RuntimeError("ik_ctl"), None]
+        model = self.rig.model
+        self.rig.build(incremental=True)
+
+        self.incremental.delete_rig.assert_called_once_with(model)
+        self.initialHierarchy.assert_called_once_with()
+        self.assertEqual(self.processComponents.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Skin file IO tests, outside of Maya.
+
+skin_io doesn't use the Maya API, so it is loaded directly from its file.
+"""
+import contextlib
+import importlib.util
+import multiprocessing
+import multiprocessing.spawn
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent import futures
+from unittest import mock
+
+CORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "core"
+)
+
+
+def load_skin_io():
+    """Load the skin_io module from its file.
+
+    The core folder is added at the end of the path, so the worker
+    processes can import the module sent to them.
+
+    Returns:
+        module: The skin_io module
+    """
+    if CORE_PATH not in sys.path:
+        sys.path.append(CORE_PATH)
+    spec = importlib.util.spec_from_file_location(
+        "skin_io", os.path.join(CORE_PATH, "skin_io.py")
+    )
+    skin_io = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(skin_io)
+    sys.modules["skin_io"] = skin_io
+    return skin_io
+
+
+def get_pack(name):
+    return {
+        "objs": [name],
+        "objDDic": [{"weights": {"joint1": [[0, 1.0]]}, "skinClsName": name}],
+    }
+
+
+class TestSkinIO(unittest.TestCase):
+    def setUp(self):
+        self.skin_io = load_skin_io()
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def write_files(self, names):
+        return [
+            self.skin_io.write_skin_file(
+                os.path.join(self.folder, name + self.skin_io.FILE_EXT),
+                get_pack(name),
+            )
+            for name in names
+        ]
+
+    def test_round_trip(self):
+        for ext in (self.skin_io.FILE_EXT, self.skin_io.FILE_JSON_EXT):
+            path = os.path.join(self.folder, "body" + ext)
+            self.skin_io.write_skin_file(path, get_pack("body"))
+            self.assertEqual(
+                self.skin_io.read_skin_file(path), get_pack("body")
+            )
+
+    def test_worker_pool(self):
+        executable = multiprocessing.spawn.get_executable()
+        with self.skin_io.get_worker_pool(2) as pool:
+            self.assertIsInstance(pool, futures.ProcessPoolExecutor)
+            self.assertEqual(
+                os.fsdecode(multiprocessing.spawn.get_executable()),
+                sys.executable,
+            )
+        # the process wide multiprocessing settings are kept
+        self.assertEqual(multiprocessing.spawn.get_executable(), executable)
+
+    def test_read_skin_files_order(self):
+        names = ["body", "head", "hand", "foot", "eye"]
+        paths = self.write_files(names)
+
+        results = list(self.skin_io.read_skin_files(paths, workers=2))
+
+        self.assertEqual([r[0] for r in results], paths)
+        self.assertEqual([r[1] for r in results], [get_pack(n) for n in names])
+        self.assertEqual([r[2] for r in results], [None] * len(names))
+
+    def test_read_skin_files_pending(self):
+        paths = self.write_files(["body", "head", "hand", "foot", "eye"])
+        submitted = []
+
+        @contextlib.contextmanager
+        def thread_pool(workers=None):
+            with futures.ThreadPoolExecutor(workers) as pool:
+                submit = pool.submit
+
+                def record(fn, *args):
+                    submitted.append(args[0])
+                    return submit(fn, *args)
+
+                with mock.patch.object(pool, "submit", record):
+                    yield pool
+
+        with mock.patch.object(self.skin_io, "get_worker_pool", thread_pool):
+            reader = self.skin_io.read_skin_files(paths, workers=1)
+            # two files in flight for one worker
+            self.assertEqual(next(reader)[0], paths[0])
+            self.assertEqual(submitted, paths[:3])
+            self.assertEqual(next(reader)[0], paths[1])
+            self.assertEqual(submitted, paths[:4])
+            self.assertEqual([r[0] for r in reader], paths[2:])
+
+        self.assertEqual(submitted, paths)
+
+    def test_read_skin_files_error(self):
+        paths = self.write_files(["body", "head"])
+        paths.insert(1, os.path.join(self.folder, "missing.gSkin"))
+
+        results = list(self.skin_io.read_skin_files(paths))
+
+        self.assertEqual([r[0] for r in results], paths)
+        self.assertEqual(results[0][1], get_pack("body"))
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[1][2], (IOError, OSError))
+        self.assertEqual(results[2][1], get_pack("head"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""ueGear bridge tests, against a local HTTP server.
+
+The bridge is loaded with its mGear dependencies replaced, and sends its
+requests to a http.server stand-in of the Unreal Remote Control server.
+"""
+import http.client
+import http.server
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+BRIDGE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "uegear",
+    "bridge.py",
+)
+
+
+def load_bridge():
+    """Load the bridge module from its file.
+
+    Returns:
+        module: The bridge module
+    """
+    moves = types.ModuleType("mgear.core.six.moves")
+    moves.http_client = http.client
+    log = types.ModuleType("mgear.uegear.log")
+    log.uegear_logger = logging.getLogger("ueGear.test")
+    modules = {
+        "mgear": mock.MagicMock(),
+        "mgear.core": mock.MagicMock(),
+        "mgear.core.six": mock.MagicMock(moves=moves),
+        "mgear.core.six.moves": moves,
+        "mgear.uegear": mock.MagicMock(log=log),
+        "mgear.uegear.log": log,
+    }
+    spec = importlib.util.spec_from_file_location("bridge", BRIDGE_PATH)
+    bridge = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, modules):
+        spec.loader.exec_module(bridge)
+    return bridge
+
+
+class RemoteHandler(http.server.BaseHTTPRequestHandler):
+    """Answers the remote calls with the response set on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length).decode("utf-8"))
+        self.server.requests.append((self.client_address, self.path, body))
+
+        data = json.dumps(self.server.response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        # closes the connection the client keeps alive, as if idle too long
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBridge(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bridge = load_bridge()
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), RemoteHandler
+        )
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.response = {"return": "true"}
+        self.server.drop_connections = False
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self.bridge.close_connections)
+
+        self.client = self.bridge.UeGearBridge(
+            port=self.server.server_address[1]
+        )
+        self.client.timeout = 5
+
+    def test_keep_alive(self):
+        self.assertEqual(self.client.execute("ping"), {"return": True})
+        self.assertEqual(self.client.execute("ping"), {"return": True})
+
+        addresses = [r[0] for r in self.server.requests]
+        self.assertEqual(len(addresses), 2)
+        self.assertEqual(addresses[0], addresses[1])
+        self.assertEqual(self.server.requests[0][1], self.bridge.CALL_ROUTE)
+        self.assertEqual(
+            self.server.requests[0][2]["functionName"], "ping"
+        )
+
+    def test_stale_connection(self):
+        self.server.drop_connections = True
+        is_stale = mock.Mock(wraps=self.bridge.is_stale_connection_error)
+        with mock.patch.object(
+            self.bridge, "is_stale_connection_error", is_stale
+        ):
+            self.assertEqual(self.client.execute("ping"), {"return": True})
+            self.assertEqual(self.client.execute("pong"), {"return": True})
+
+        # the second call fails on the reused connection, and is sent again
+        # on a new one
+        self.assertEqual(is_stale.call_count, 1)
+        self.assertTrue(is_stale.call_args[0][0])
+        addresses = [r[0] for r in self.server.requests]
+        self.assertNotEqual(addresses[0], addresses[-1])
+        self.assertEqual(
+            self.server.requests[-1][2]["functionName"], "pong"
+        )
+
+    def test_execute_batch(self):
+        self.server.response = {
+            "Responses": [
+                {
+                    "RequestId": 2,
+                    "ResponseCode": 200,
+                    "ResponseBody": '{"return": "[1, 2]"}',
+                },
+                {
+                    "RequestId": 0,
+                    "ResponseCode": 200,
+                    "ResponseBody": {"return": "name"},
+                },
+                {
+                    "RequestId": 1,
+                    "ResponseCode": 500,
+                    "ResponseBody": {"return": "error"},
+                },
+                {"RequestId": 7, "ResponseBody": {"return": True}},
+            ]
+        }
+        calls = [("a", {"x": 1}), ("b", None), ("c", {}), ("d", {})]
+
+        responses = self.client.execute_batch(calls)
+
+        self.assertEqual(
+            responses,
+            [
+                {"return": "name"},
+                {"return": False},
+                {"return": [1, 2]},
+                {"return": False},
+            ],
+        )
+        route, body = self.server.requests[0][1:]
+        self.assertEqual(route, self.bridge.BATCH_ROUTE)
+        self.assertEqual(
+            [r["Body"]["functionName"] for r in body["Requests"]],
+            ["a", "b", "c", "d"],
+        )
+        self.assertEqual(
+            [r["RequestId"] for r in body["Requests"]], [0, 1, 2, 3]
+        )
+
+    def test_execute_batch_unreachable(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        responses = self.client.execute_batch([("a", {}), ("b", {})])
+
+        self.assertEqual(responses, [{"return": False}] * 2)
+
+    def test_decode_return(self):
+        decode_return = self.bridge.decode_return
+        self.assertEqual(decode_return('{"a": [1, 2]}'), {"a": [1, 2]})
+        self.assertEqual(decode_return("{'a': (1, 2)}"), {"a": (1, 2)})
+        self.assertEqual(decode_return("None"), None)
+        self.assertEqual(decode_return("not a value"), "not a value")
+        self.assertEqual(decode_return("__import__('os')"), "__import__('os')")
+        self.assertEqual(decode_return(3), 3)
+
+        self.server.response = {"return": "['a', 'b']"}
+        self.assertEqual(self.client.execute("names"), {"return": ["a", "b"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
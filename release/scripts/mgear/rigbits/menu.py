@@ -9,8 +9,9 @@ menuID = "Rigbits"
 
 def install():
     """Install Rigbits submenu"""
-    pm.setParent(mgear.menu_id, menu=True)
-    pm.menuItem(divider=True)
+    if not mgear.menu.is_pending(menuID):
+        pm.setParent(mgear.menu_id, menu=True)
+        pm.menuItem(divider=True)
     commands = (
         ("Add NPO", str_add_NPO),
         ("-----", None),
@@ -19,6 +19,10 @@ from mgear.core import primitive, attribute, skin, dag, icon, node
 from mgear import shifter_classic_components
 from mgear import shifter_epic_components
 from mgear.shifter import naming
+from mgear.shifter import template_cache
+from mgear.shifter import component_registry
+from mgear.shifter import profiler
+from mgear.shifter import incremental as incremental_build
 import importlib
 from mgear.core import utils
 
@@ -36,7 +40,7 @@ if not pm.pluginInfo("matrixNodes", q=True, loaded=True):
 COMPONENT_PATH = os.path.join(os.path.dirname(__file__), "component")
 TEMPLATE_PATH = os.path.join(COMPONENT_PATH, "templates")
 
-SHIFTER_COMPONENT_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_PATH"
+SHIFTER_COMPONENT_ENV_KEY = component_registry.COMPONENT_ENV_KEY
 
 
 def log_window():
@@ -95,42 +99,21 @@ def log_window():
 
 
 def getComponentDirectories():
-    """Get the components directory"""
-    # TODO: ready to support multiple default directories
-    return mgear.core.utils.gatherCustomModuleDirectories(
-        SHIFTER_COMPONENT_ENV_KEY,
-        [
-            os.path.join(os.path.dirname(shifter_classic_components.__file__)),
-            os.path.join(os.path.dirname(shifter_epic_components.__file__)),
-        ],
-    )
-    # return mgear.core.utils.gatherCustomModuleDirectories(
-    #     SHIFTER_COMPONENT_ENV_KEY,
-    #     os.path.join(os.path.dirname(shifter_classic_components.__file__)))
+    """Get the components directory
+
+    The directories are scanned once per session, see component_registry.
+    """
+    return component_registry.get_directories()
 
 
 def importComponentGuide(comp_type):
     """Import the Component guide"""
-    dirs = getComponentDirectories()
-    defFmt = "mgear.shifter.component.{}.guide"
-    customFmt = "{}.guide"
-
-    module = mgear.core.utils.importFromStandardOrCustomDirectories(
-        dirs, defFmt, customFmt, comp_type
-    )
-    return module
+    return component_registry.import_component_guide(comp_type)
 
 
 def importComponent(comp_type):
     """Import the Component"""
-    dirs = getComponentDirectories()
-    defFmt = "mgear.shifter.component.{}"
-    customFmt = "{}"
-
-    module = mgear.core.utils.importFromStandardOrCustomDirectories(
-        dirs, defFmt, customFmt, comp_type
-    )
-    return module
+    return component_registry.import_component(comp_type)
 
 
 def reloadComponents(*args):
@@ -139,6 +122,7 @@ def reloadComponents(*args):
     Args:
         *args: Dummy
     """
+    component_registry.refresh()
     compDir = getComponentDirectories()
 
     for x in compDir:
@@ -184,8 +168,37 @@ class Rig(object):
 
         self.build_data = {}
 
+        # control buffers created from the icon shapes library
+        self.ctl_buffers_built = []
+
+        # record the nodes of each component, for the incremental builds
+        self.track_nodes = False
+
+    def _reset_build(self):
+        """Clear the built components, to build again."""
+        self.groups = {}
+        self.subGroups = {}
+        self.bindPlanes = {}
+        self.combinedBindPlanes = {}
+        self.components = {}
+        self.componentsIndex = []
+        self.build_data = {}
+        self.ctl_buffers_built = []
+
     @utils.one_undo
-    def buildFromDict(self, conf_dict):
+    @profiler.profiled("buildFromDict")
+    def buildFromDict(self, conf_dict, incremental=False):
+        """Build the rig from a guide template dictionary.
+
+        Args:
+            conf_dict (dict): The guide template dictionary
+            incremental (bool, optional): Rebuild only the changed
+                components of the rig built from the same guide, without
+                running the custom steps. See shifter.incremental
+
+        Returns:
+            dict: The collected data, None if not collected
+        """
         log_window()
         startTime = datetime.datetime.now()
         mgear.log("\n" + "= SHIFTER RIG SYSTEM " + "=" * 46)
@@ -204,9 +217,13 @@ class Rig(object):
 
         # Build
         mgear.log("\n" + "= BUILDING RIG " + "=" * 46)
-        self.from_dict_custom_step(conf_dict, pre=True)
-        self.build()
-        self.from_dict_custom_step(conf_dict, pre=False)
+        if incremental:
+            pm.displayWarning("Custom steps are skipped by incremental builds")
+            self.build(incremental=True)
+        else:
+            self.from_dict_custom_step(conf_dict, pre=True)
+            self.build()
+            self.from_dict_custom_step(conf_dict, pre=False)
         # Collect post-build data
         if self.options["data_collector_embedded"] or self.options["data_collector"]:
             build_data = self.collect_build_data()
@@ -232,8 +249,16 @@ class Rig(object):
         return build_data
 
     @utils.one_undo
-    def buildFromSelection(self):
-        """Build the rig from selected guides."""
+    @profiler.profiled("buildFromSelection")
+    def buildFromSelection(self, incremental=False):
+        """Build the rig from selected guides.
+
+        Args:
+            incremental (bool, optional): Rebuild only the changed
+                components of the rig built from the same guide, without
+                running the custom steps. Only for the full guide
+                selection. See shifter.incremental
+        """
 
         startTime = datetime.datetime.now()
         mgear.log("\n" + "= SHIFTER RIG SYSTEM " + "=" * 46)
@@ -251,10 +276,17 @@ class Rig(object):
                 return
 
         # check if is partial build or full guide build
-        ismodel = False
-        if selection[0].hasAttr("ismodel"):
+        ismodel = selection[0].hasAttr("ismodel")
+        if incremental and not ismodel:
+            pm.displayWarning(
+                "Incremental builds need the guide root selected, "
+                "building the selected components"
+            )
+            incremental = False
+        if incremental:
+            pm.displayWarning("Custom steps are skipped by incremental builds")
+        elif ismodel:
             self.preCustomStep(selection)
-            ismodel = True
 
         if not self.stopBuild:
             mgear.log("\n" + "= GUIDE VALIDATION " + "=" * 46)
@@ -265,8 +297,8 @@ class Rig(object):
 
             # Build
             mgear.log("\n" + "= BUILDING RIG " + "=" * 46)
-            self.build()
-            if ismodel:
+            self.build(incremental=incremental)
+            if ismodel and not incremental:
                 self.postCustomStep()
 
             # Collect post-build data
@@ -293,17 +325,50 @@ class Rig(object):
 
         return build_data
 
-    def build(self):
-        """Build the rig."""
+    def build(self, incremental=False):
+        """Build the rig.
+
+        Args:
+            incremental (bool, optional): Rebuild only the changed
+                components of the rig built from the same guide, and store
+                the data of the next incremental build. See
+                shifter.incremental
+
+        Returns:
+            dagNode: The rig root
+        """
 
         self.options = self.guide.values
         self.guides = self.guide.components
 
         self.customStepDic["mgearRun"] = self
+        self.track_nodes = incremental or incremental_build.is_enabled()
 
-        self.initialHierarchy()
-        self.processComponents()
-        self.finalize()
+        plan = incremental_build.get_plan(self) if incremental else None
+        if plan:
+            try:
+                with profiler.section("stage", "updateHierarchy"):
+                    self.updateHierarchy(plan)
+                with profiler.section("stage", "processComponents"):
+                    self.processComponents(plan)
+            except incremental_build.IncrementalBuildError as e:
+                mgear.log(
+                    "{}, rebuilding the full rig".format(e), mgear.sev_warning
+                )
+                incremental_build.delete_rig(self.model)
+                self._reset_build()
+                plan = None
+
+        if not plan:
+            with profiler.section("stage", "initialHierarchy"):
+                self.initialHierarchy()
+            with profiler.section("stage", "processComponents"):
+                self.processComponents()
+        with profiler.section("stage", "finalize"):
+            self.finalize()
+
+        if self.track_nodes:
+            incremental_build.store(self, self.component_nodes)
 
         return self.model
 
@@ -372,7 +437,7 @@ class Rig(object):
             str: The guide data
         """
         if self.guide.guide_template_dict:
-            return json.dumps(self.guide.guide_template_dict)
+            return template_cache.guide_data(self.guide.guide_template_dict)
         else:
             return json.dumps(self.guide.get_guide_template_dict())
 
@@ -515,22 +580,86 @@ class Rig(object):
                 self.global_ctl.s >> self.jnt_org.s
             pm.connectAttr(self.jntVis_att, self.jnt_org.attr("visibility"))
 
-    def processComponents(self):
+    def updateHierarchy(self, plan):
+        """Update the initial hierarchy of a built rig.
+
+        Get the rig model, the main properties and the base organisation
+        nulls, update the build informations and delete the components to
+        rebuild.
+
+        Args:
+            plan (incremental_build.Plan): The components to rebuild
+        """
+        mgear.log("Update Hierarchy")
+
+        self.model = plan.model
+        self.isRig_att = self.model.attr("is_rig")
+        self.rigName_att = self.model.attr("rig_name")
+        self.ctlVis_att = self.model.attr("ctl_vis")
+        self.jntVis_att = self.model.attr("jnt_vis")
+        if self.model.hasAttr("ctl_vis_on_playback"):
+            self.ctlVisPlayback_att = self.model.attr("ctl_vis_on_playback")
+        if self.model.hasAttr("ctl_x_ray"):
+            self.ctlXRay_att = self.model.attr("ctl_x_ray")
+        self.rigGroups = self.model.attr("rigGroups")
+        self.rigPoses = self.model.attr("rigPoses")
+        self.rigCtlTags = self.model.attr("rigCtlTags")
+        self.rigScriptNodes = self.model.attr("rigScriptNodes")
+
+        # INFOS
+        for attr, value in (
+            ("user", getpass.getuser()),
+            ("date", str(datetime.datetime.now())),
+            ("gear_version", mgear.getVersion()),
+            ("guide_data", self.get_guide_data()),
+        ):
+            self.model.attr(attr).set(value)
+
+        if self.options["worldCtl"]:
+            name = self.options["world_ctl_name"] or "world_ctl"
+        else:
+            name = "global_C0_ctl"
+        self.global_ctl = dag.findChild(self.model, name)
+        self.setupWS = dag.findChild(self.model, "setup")
+        if self.options["joint_rig"]:
+            self.root_joint = None
+            self.jnt_org = dag.findChild(self.model, "jnt_org")
+
+        incremental_build.delete_components(plan)
+
+    def processComponents(self, plan=None):
         """
         Process the components of the rig, following the creation steps.
+
+        Args:
+            plan (incremental_build.Plan, optional): The components to
+                rebuild, the other components are already built
         """
 
         # Init
         self.components_infos = {}
+        tracker = incremental_build.NodeTracker(enabled=self.track_nodes)
 
         for comp in self.guide.componentsIndex:
             guide_ = self.guides[comp]
-            mgear.log("Init : " + guide_.fullName + " (" + guide_.type + ")")
+            if plan and comp not in plan.dirty:
+                comp = incremental_build.BuiltComponent(
+                    self, guide_, plan.data[comp]
+                )
+            else:
+                mgear.log(
+                    "Init : " + guide_.fullName + " (" + guide_.type + ")"
+                )
 
-            module = importComponent(guide_.type)
-            Component = getattr(module, "Component")
+                with profiler.section(
+                    "step", "Init", guide_.fullName, guide_.type
+                ):
+                    module = importComponent(guide_.type)
+                    Component = getattr(module, "Component")
 
-            comp = Component(self, guide_)
+                    with tracker:
+                        tracker.current = guide_.fullName
+                        comp = Component(self, guide_)
             if comp.fullName not in self.componentsIndex:
                 self.components[comp.fullName] = comp
                 self.componentsIndex.append(comp.fullName)
@@ -543,21 +672,32 @@ class Rig(object):
 
         # Creation steps
         self.steps = component.Main.steps
-        for i, name in enumerate(self.steps):
-            # for count, compName in enumerate(self.componentsIndex):
-            for compName in self.componentsIndex:
-                comp = self.components[compName]
-                mgear.log(
-                    name + " : " + comp.fullName + " (" + comp.type + ")"
-                )
-                comp.stepMethods[i]()
+        with tracker:
+            for i, name in enumerate(self.steps):
+                # for count, compName in enumerate(self.componentsIndex):
+                for compName in self.componentsIndex:
+                    if plan and compName not in plan.dirty:
+                        continue
+                    comp = self.components[compName]
+                    mgear.log(
+                        name + " : " + comp.fullName + " (" + comp.type + ")"
+                    )
+                    tracker.current = compName
+                    with profiler.section(
+                        "step", name, comp.fullName, comp.type
+                    ):
+                        comp.stepMethods[i]()
+
+                if (
+                    self.options["step"] >= 1
+                    and i >= self.options["step"] - 1
+                ):
+                    break
 
-            if self.options["step"] >= 1 and i >= self.options["step"] - 1:
-                break
+        self.component_nodes = tracker.get_uuids()
 
     def finalize(self):
         """Finalize the rig."""
-        groupIdx = 0
 
         # Properties --------------------------------------
         mgear.log("Finalize")
@@ -581,19 +721,29 @@ class Rig(object):
             for name, objects in component_.subGroups.items():
                 self.addToSubGroup(objects, name)
 
+        # the groups of an updated rig are kept
+        existing = {}
+        for s in self.model.rigGroups.listConnections(type="objectSet"):
+            existing[s.name()] = s
+        groupIdx = attribute.get_next_available_index(self.model.rigGroups)
+
         # Create master set to group all the groups
-        masterSet = pm.sets(n=self.model.name() + "_sets_grp", em=True)
-        pm.connectAttr(masterSet.message, self.model.rigGroups[groupIdx])
-        groupIdx += 1
+        masterSet = existing.get(self.model.name() + "_sets_grp")
+        if masterSet is None:
+            masterSet = pm.sets(n=self.model.name() + "_sets_grp", em=True)
+            pm.connectAttr(masterSet.message, self.model.rigGroups[groupIdx])
+            groupIdx += 1
 
         # Creating all groups
         pm.select(cl=True)
         for name, objects in self.groups.items():
-            s = pm.sets(n=self.model.name() + "_" + name + "_grp")
+            s = existing.get(self.model.name() + "_" + name + "_grp")
+            if s is None:
+                s = pm.sets(n=self.model.name() + "_" + name + "_grp")
+                pm.connectAttr(s.message, self.model.rigGroups[groupIdx])
+                groupIdx += 1
+                masterSet.add(s)
             s.union(objects)
-            pm.connectAttr(s.message, self.model.rigGroups[groupIdx])
-            groupIdx += 1
-            masterSet.add(s)
         for parentGroup, subgroups in self.subGroups.items():
             pg = pm.PyNode(self.model.name() + "_" + parentGroup + "_grp")
             for sg in subgroups:
@@ -603,15 +753,18 @@ class Rig(object):
                 pg.add(sub)
 
         # create geo group
-
-        geoSet = pm.sets(n=self.model.name() + "_geo_grp", em=True)
-        pm.connectAttr(geoSet.message, self.model.rigGroups[groupIdx])
-        masterSet.add(geoSet)
-        groupIdx += 1
+        if self.model.name() + "_geo_grp" not in existing:
+            geoSet = pm.sets(n=self.model.name() + "_geo_grp", em=True)
+            pm.connectAttr(geoSet.message, self.model.rigGroups[groupIdx])
+            masterSet.add(geoSet)
+            groupIdx += 1
 
         # Bind pose ---------------------------------------
         # controls_grp = self.groups["controllers"]
         # pprint(controls_grp, stream=None, indent=1, width=100)
+        old_poses = self.model.rigPoses[0].listConnections()
+        if old_poses:
+            pm.delete(old_poses)
         ctl_master_grp = pm.PyNode(self.model.name() + "_controllers_grp")
         pm.select(ctl_master_grp, replace=True)
         dag_node = pm.dagPose(save=True, selection=True)
@@ -762,6 +915,9 @@ class Rig(object):
             for shape in ctl_ref.getShapes():
                 ctl.addChild(shape, shape=True, add=True)
                 pm.rename(shape, name + "Shape")
+        elif icon.is_registered(bufferName):
+            ctl = icon.create(parent, name, m, color, bufferName)
+            self.ctl_buffers_built.append(bufferName)
         else:
             ctl = icon.create(parent, name, m, color, iconShape, **kwargs)
 
@@ -0,0 +1,470 @@
+"""Shifter content addressed build cache.
+
+The nodes created by a build are exported to the cache folder, named by the
+hash of the build inputs:
+
+    * the guide template, after normalization
+    * the mGear version
+    * the source files of the components used by the template, and of the
+      base component
+    * the extra files of the build: the custom steps and the skin file of
+      the template, see get_build_files, and the rig builder pre script
+
+Building again with the same inputs imports the cached nodes instead, and
+restores the files written by the build, i.e. the data collector file. The
+least recently used builds are removed when the cache folder gets bigger
+than the maximum size.
+
+The cache is enabled setting the MGEAR_SHIFTER_BUILD_CACHE_PATH environment
+variable to the cache folder. The maximum size, in megabytes, is set with
+MGEAR_SHIFTER_BUILD_CACHE_SIZE.
+
+Only the nodes created by the build are cached, so the edits of the custom
+steps or of the skin import on the nodes existing before the build aren't
+restored. The modules imported by the custom steps aren't hashed either.
+The templates asking for the data collector file path while building are
+always built.
+
+Example:
+    >>> from mgear.shifter import build_cache, template_cache
+    >>> conf = template_cache.load(path)
+    >>> key = build_cache.get_key(conf, build_cache.get_build_files(conf))
+    >>> with build_cache.CachedBuild(key) as cached:
+    ...     if not cached.hit:
+    ...         io.build_from_file(conf=conf)
+"""
+import hashlib
+import json
+import os
+
+from maya import cmds
+
+import mgear
+from mgear.shifter import component_registry
+from mgear.shifter import incremental
+from mgear.shifter.guide import MGEAR_SHIFTER_CUSTOMSTEP_KEY
+
+CACHE_PATH_ENV_KEY = "MGEAR_SHIFTER_BUILD_CACHE_PATH"
+CACHE_SIZE_ENV_KEY = "MGEAR_SHIFTER_BUILD_CACHE_SIZE"
+
+# maximum size of the cache folder, in megabytes
+DEFAULT_CACHE_SIZE = 5120
+
+ARTIFACT_EXT = ".mb"
+
+# files written by the build, stored next to the artifact
+OUTPUTS_EXT = ".outputs.json"
+
+# recording build, the nested builds are not cached
+_current = [None]
+
+
+def get_cache_directory():
+    """Get the cache folder.
+
+    Returns:
+        str: The folder, None if the cache is disabled
+    """
+    return os.environ.get(CACHE_PATH_ENV_KEY) or None
+
+
+def get_cache_size():
+    """Get the maximum size of the cache folder.
+
+    Returns:
+        int: The size in bytes
+    """
+    try:
+        size = float(os.environ.get(CACHE_SIZE_ENV_KEY, DEFAULT_CACHE_SIZE))
+    except ValueError:
+        size = DEFAULT_CACHE_SIZE
+    return int(size * 1024 * 1024)
+
+
+######################################
+# Key
+######################################
+
+
+def _update(hasher, label, data):
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    hasher.update(label.encode("utf-8"))
+    hasher.update(str(len(data)).encode("utf-8"))
+    hasher.update(data)
+
+
+def _update_file(hasher, label, path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except (IOError, OSError):
+        data = b"<missing>"
+    _update(hasher, label, data)
+
+
+def get_component_files(conf):
+    """Get the source files of the components used by a template.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        list: The (component type, relative path, path) of each file, sorted
+    """
+    comp_types = set(
+        c_dict["param_values"]["comp_type"]
+        for c_dict in conf["components_dict"].values()
+    )
+
+    files = [
+        (
+            "component",
+            "__init__.py",
+            os.path.join(
+                os.path.dirname(__file__), "component", "__init__.py"
+            ),
+        )
+    ]
+    for comp_type in sorted(comp_types):
+        info = component_registry.get_component(comp_type)
+        if info is None:
+            files.append((comp_type, "", ""))
+            continue
+        for folder, dirs, names in os.walk(info.path):
+            dirs.sort()
+            for name in sorted(names):
+                if name.endswith(".py"):
+                    path = os.path.join(folder, name)
+                    files.append(
+                        (comp_type, os.path.relpath(path, info.path), path)
+                    )
+
+    return files
+
+
+def get_custom_step_files(conf):
+    """Get the custom step files enabled in a template.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        list: The custom step paths, in order
+    """
+    p_val = conf["guide_root"]["param_values"]
+    paths = []
+    for do_attr, attr in (
+        ("doPreCustomStep", "preCustomStep"),
+        ("doPostCustomStep", "postCustomStep"),
+    ):
+        if not p_val.get(do_attr) or not p_val.get(attr):
+            continue
+        for step in p_val[attr].split(","):
+            if not step or step.startswith("*"):
+                continue
+            path = step.split("|")[-1][1:]
+            if os.environ.get(MGEAR_SHIFTER_CUSTOMSTEP_KEY, ""):
+                path = os.path.join(
+                    os.environ.get(MGEAR_SHIFTER_CUSTOMSTEP_KEY, ""), path
+                )
+            paths.append(path)
+
+    return paths
+
+
+def get_build_files(conf):
+    """Get the files read by the build of a template, out of the components.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        list: The custom step paths, in order, and the imported skin file
+    """
+    p_val = conf["guide_root"]["param_values"]
+    paths = get_custom_step_files(conf)
+    if p_val.get("importSkin") and p_val.get("skin"):
+        paths.append(p_val["skin"])
+    return paths
+
+
+def get_output_files(conf):
+    """Get the files written by the build of a template.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        list: The data collector file path
+    """
+    p_val = conf["guide_root"]["param_values"]
+    if p_val.get("data_collector") and p_val.get("data_collector_path"):
+        return [p_val["data_collector_path"]]
+    return []
+
+
+def is_cacheable(conf):
+    """Check if the build of a template can be cached.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        bool: False if the build asks for the data collector file path
+    """
+    p_val = conf["guide_root"]["param_values"]
+    return not (p_val.get("data_collector") and not get_output_files(conf))
+
+
+def get_key(conf, extra_files=None):
+    """Get the cache key of a template build.
+
+    Args:
+        conf (dict): The guide template
+        extra_files (list of str, optional): Other files used by the build
+
+    Returns:
+        str: The key
+    """
+    hasher = hashlib.sha1()
+    _update(hasher, "version", mgear.getVersion())
+    _update(
+        hasher, "template", json.dumps(conf, sort_keys=True, default=str)
+    )
+
+    for comp_type, name, path in get_component_files(conf):
+        _update_file(hasher, "{}/{}".format(comp_type, name), path)
+    for i, path in enumerate(extra_files or []):
+        _update_file(hasher, "extra_{}".format(i), path)
+
+    return hasher.hexdigest()
+
+
+######################################
+# Artifacts
+######################################
+
+
+def get_artifact(key):
+    """Get the cached build of a key, marking it as recently used.
+
+    Args:
+        key (str): The cache key
+
+    Returns:
+        str: The artifact path, None if not cached
+    """
+    directory = get_cache_directory()
+    if not directory or not key:
+        return None
+
+    path = os.path.join(directory, key + ARTIFACT_EXT)
+    try:
+        os.utime(path, None)
+    except OSError:
+        return None
+    return path
+
+
+def _get_outputs_path(path):
+    return os.path.splitext(path)[0] + OUTPUTS_EXT
+
+
+def import_artifact(path):
+    """Import a cached build in the scene, and restore its output files.
+
+    Args:
+        path (str): The artifact path
+
+    Returns:
+        list: The imported nodes
+    """
+    mgear.log("Importing cached build: {}".format(path))
+    outputs_path = _get_outputs_path(path)
+    if os.path.isfile(outputs_path):
+        with open(outputs_path, "r") as f:
+            outputs = json.load(f)
+        for output_path, data in outputs.items():
+            with open(output_path, "w") as f:
+                f.write(data)
+
+    return cmds.file(
+        path,
+        i=True,
+        type="mayaBinary",
+        ignoreVersion=True,
+        preserveReferences=True,
+        mergeNamespacesOnClash=False,
+        returnNewNodes=True,
+    )
+
+
+def store_artifact(key, nodes, output_files=None):
+    """Export nodes, and the files written by the build, to the cache.
+
+    The artifact is exported to a temporary file first, so the concurrent
+    builds never import a partial file. The output files are stored before
+    the artifact.
+
+    Args:
+        key (str): The cache key
+        nodes (list of str): The nodes to export
+        output_files (list of str, optional): The files written by the build
+
+    Returns:
+        str: The artifact path, None if not stored
+    """
+    directory = get_cache_directory()
+    nodes = cmds.ls(nodes, long=True)
+    if not directory or not key or not nodes:
+        return None
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    path = os.path.join(directory, key + ARTIFACT_EXT)
+    temp_path = "{}.{}.tmp{}".format(path, os.getpid(), ARTIFACT_EXT)
+    selection = cmds.ls(selection=True)
+    try:
+        if output_files:
+            outputs = {}
+            for output_path in output_files:
+                with open(output_path, "r") as f:
+                    outputs[output_path] = f.read()
+            with open(_get_outputs_path(path), "w") as f:
+                json.dump(outputs, f)
+
+        cmds.select(nodes, replace=True, noExpand=True)
+        cmds.file(
+            temp_path,
+            exportSelected=True,
+            type="mayaBinary",
+            force=True,
+            constructionHistory=True,
+            channels=True,
+            constraints=True,
+            expressions=True,
+            shader=True,
+            preserveReferences=True,
+        )
+        os.replace(temp_path, path)
+    except (RuntimeError, OSError) as e:
+        mgear.log(
+            "Can't store the build in the cache: {}".format(e),
+            mgear.sev_warning,
+        )
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+    finally:
+        cmds.select(selection, replace=True, noExpand=True)
+
+    evict()
+    return path
+
+
+def evict(max_size=None):
+    """Remove the least recently used builds, to fit the maximum size.
+
+    Args:
+        max_size (int, optional): The size in bytes, the configured size if
+            None
+    """
+    directory = get_cache_directory()
+    if not directory or not os.path.isdir(directory):
+        return
+    if max_size is None:
+        max_size = get_cache_size()
+
+    artifacts = []
+    for name in os.listdir(directory):
+        if not name.endswith(ARTIFACT_EXT) or ".tmp" in name:
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        size = stat.st_size
+        outputs_path = _get_outputs_path(path)
+        if os.path.isfile(outputs_path):
+            size += os.path.getsize(outputs_path)
+        artifacts.append((stat.st_mtime, size, path))
+
+    total = sum(a[1] for a in artifacts)
+    for _, size, path in sorted(artifacts):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        outputs_path = _get_outputs_path(path)
+        if os.path.isfile(outputs_path):
+            os.remove(outputs_path)
+        total -= size
+
+
+def clear():
+    """Remove all the cached builds."""
+    evict(max_size=0)
+
+
+class CachedBuild(object):
+    """Imports the cached build of a key, or records the build to cache it.
+
+    Does nothing if the key is None, or inside another recording build. The
+    build is not stored if it raises an error, or if discarded.
+
+    Args:
+        key (str): The cache key
+        output_files (list of str, optional): The files written by the
+            build, stored with it
+
+    Attributes:
+        hit (bool): True if the cached build was imported
+        nodes (list): The imported nodes
+
+    Example:
+        >>> with build_cache.CachedBuild(key) as cached:
+        ...     if not cached.hit and not build():
+        ...         cached.discard()
+    """
+
+    def __init__(self, key, output_files=None):
+        self.key = key
+        self.output_files = output_files or []
+        self.hit = False
+        self.nodes = []
+        self.__discarded = False
+        self.__tracker = None
+
+    def discard(self):
+        """Don't store the recorded build, i.e. if a part of it failed."""
+        self.__discarded = True
+
+    def __enter__(self):
+        if not self.key or _current[0] is not None:
+            return self
+
+        artifact = get_artifact(self.key)
+        if artifact:
+            self.nodes = import_artifact(artifact) or []
+            self.hit = True
+            return self
+
+        _current[0] = self
+        self.__tracker = incremental.NodeTracker()
+        self.__tracker.__enter__()
+        self.__tracker.current = self.key
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__tracker is None:
+            return
+
+        self.__tracker.__exit__(exc_type, exc_value, traceback)
+        _current[0] = None
+        if exc_type is None and not self.__discarded:
+            nodes = self.__tracker.get_uuids().get(self.key, [])
+            store_artifact(self.key, nodes, self.output_files)
@@ -1043,6 +1043,9 @@ class Main(object):
                 ctl.addChild(shape, shape=True, add=True)
                 pm.rename(shape, fullName + "Shape")
             icon.setcolor(ctl, color)
+        elif icon.is_registered(bufferName):
+            ctl = icon.create(parent, fullName, m, color, bufferName)
+            self.rig.ctl_buffers_built.append(bufferName)
         else:
             ctl = icon.create(parent, fullName, m, color, iconShape, **kwargs)
 
@@ -0,0 +1,315 @@
+"""Shifter component registry.
+
+The component directories are scanned once per session. Each component type
+is mapped to its directory and the guide information (name, author, url,
+email, version and description), read from the guide.py file without
+importing it.
+
+The scan is saved in a manifest file, with the modification time of each
+component directory. The next sessions only scan again the directories
+with components added or removed, edits of the guide information are picked
+up by refresh().
+
+The component and guide modules are imported on first use, and kept.
+
+Example:
+    >>> from mgear.shifter import component_registry
+    >>> component_registry.get_component("arm_2jnt_01").description
+    >>> module = component_registry.import_component_guide("arm_2jnt_01")
+"""
+import ast
+import collections
+import json
+import os
+
+import mgear
+import mgear.core.utils
+from mgear import shifter_classic_components
+from mgear import shifter_epic_components
+
+COMPONENT_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_PATH"
+
+MANIFEST_VERSION = 1
+MANIFEST_PATH = os.path.join(
+    os.getenv("MAYA_APP_DIR") or os.path.expanduser("~"),
+    "mGear",
+    "shifter_components.json",
+)
+
+# guide module variables read as the component information
+INFO_KEYS = ["type", "name", "author", "url", "email", "version", "description"]
+
+ComponentInfo = collections.namedtuple(
+    "ComponentInfo", ["base_path", "path"] + INFO_KEYS
+)
+
+# directories, components and modules of the session, the environment
+# variable value they were built for is kept to detect changes
+__registry = {}
+__modules = {}
+
+
+def get_default_directories():
+    """Get the default component directories.
+
+    Returns:
+        list: The directories
+    """
+    return [
+        os.path.dirname(shifter_classic_components.__file__),
+        os.path.dirname(shifter_epic_components.__file__),
+    ]
+
+
+def refresh():
+    """Clear the registry and the imported modules, scanning again.
+
+    The component directories are scanned again on next use, and the guide
+    information of all the components is read again.
+    """
+    __registry.clear()
+    __modules.clear()
+    _build(rescan=True)
+
+
+######################################
+# Manifest
+######################################
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r") as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("directories", {})
+
+
+def _save_manifest(directories):
+    try:
+        if not os.path.isdir(os.path.dirname(MANIFEST_PATH)):
+            os.makedirs(os.path.dirname(MANIFEST_PATH))
+        with open(MANIFEST_PATH, "w") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "directories": directories},
+                f,
+                indent=1,
+            )
+    except (IOError, OSError):
+        mgear.log(
+            "Can't save the component manifest: {}".format(MANIFEST_PATH),
+            mgear.sev_warning,
+        )
+
+
+######################################
+# Scan
+######################################
+
+
+def read_guide_info(path):
+    """Read the guide information of a component, without importing it.
+
+    The module variables assigned with a literal value are read from the
+    guide.py file.
+
+    Args:
+        path (str): The component directory
+
+    Returns:
+        dict: The information, the type and name are the directory name
+            if not found
+    """
+    comp_type = os.path.basename(path)
+    info = dict.fromkeys(INFO_KEYS, "")
+    info["type"] = comp_type
+    info["name"] = comp_type
+
+    try:
+        with open(os.path.join(path, "guide.py"), "r") as f:
+            tree = ast.parse(f.read())
+    except (IOError, OSError, SyntaxError, ValueError):
+        return info
+
+    for statement in tree.body:
+        if not isinstance(statement, ast.Assign):
+            continue
+        for target in statement.targets:
+            if not isinstance(target, ast.Name):
+                continue
+            key = target.id.lower()
+            if key not in INFO_KEYS or target.id != key.upper():
+                continue
+            try:
+                info[key] = ast.literal_eval(statement.value)
+            except ValueError:
+                pass
+
+    return info
+
+
+def _scan_directory(path):
+    """Scan the components of a directory.
+
+    Returns:
+        dict: The guide information, by component directory name
+    """
+    components = {}
+    for name in sorted(os.listdir(path)):
+        comp_path = os.path.join(path, name)
+        if os.path.exists(os.path.join(comp_path, "__init__.py")):
+            components[name] = read_guide_info(comp_path)
+
+    return components
+
+
+def _get_search_paths():
+    """Get the default and environment variable directories, in order"""
+    paths = get_default_directories()
+    for path in os.environ.get(COMPONENT_ENV_KEY, "").split(os.pathsep):
+        if path and path not in paths and os.path.isdir(path):
+            paths.append(path)
+    return paths
+
+
+def _build(rescan=False):
+    """Build the registry of the session, if needed.
+
+    Args:
+        rescan (bool, optional): Scan all the directories, ignoring the
+            manifest
+    """
+    env_value = os.environ.get(COMPONENT_ENV_KEY, "")
+    if __registry.get("env_value") == env_value:
+        return
+
+    manifest = {} if rescan else _load_manifest()
+    changed = rescan
+    directories = collections.OrderedDict()
+    components = collections.OrderedDict()
+
+    for path in _get_search_paths():
+        if not os.path.exists(path):
+            mgear.log(
+                "Component directory not found: {}".format(path),
+                mgear.sev_error,
+            )
+            continue
+
+        mtime = os.path.getmtime(path)
+        entry = manifest.get(path)
+        if entry is None or entry.get("mtime") != mtime:
+            entry = {"mtime": mtime, "components": _scan_directory(path)}
+            manifest[path] = entry
+            changed = True
+
+        directories[path] = sorted(entry["components"])
+        for name in directories[path]:
+            if name in components:
+                mgear.log(
+                    "Custom component name: {}, already in default "
+                    "components. Names should be unique. This component is"
+                    " not loaded".format(name),
+                    mgear.sev_warning,
+                )
+                continue
+            info = entry["components"][name]
+            components[name] = ComponentInfo(
+                base_path=path,
+                path=os.path.join(path, name),
+                **{key: info.get(key, "") for key in INFO_KEYS}
+            )
+
+    if changed:
+        _save_manifest(manifest)
+
+    __registry["env_value"] = env_value
+    __registry["directories"] = directories
+    __registry["components"] = components
+
+
+######################################
+# Registry
+######################################
+
+
+def get_directories():
+    """Get the component directories and their components.
+
+    Returns:
+        dict: The component names, by directory. Same as
+            mgear.core.utils.gatherCustomModuleDirectories
+    """
+    _build()
+    return collections.OrderedDict(
+        (path, list(names))
+        for path, names in __registry["directories"].items()
+    )
+
+
+def get_components():
+    """Get the information of all the components.
+
+    Returns:
+        dict: The ComponentInfo, by component type
+    """
+    _build()
+    return collections.OrderedDict(__registry["components"])
+
+
+def get_component(comp_type):
+    """Get the information of a component.
+
+    Args:
+        comp_type (str): The component type
+
+    Returns:
+        ComponentInfo: The information, None if the component is not found
+    """
+    _build()
+    return __registry["components"].get(comp_type)
+
+
+def _import(comp_type, default_formatter, custom_formatter):
+    key = custom_formatter.format(comp_type)
+    module = __modules.get(key)
+    if module is None:
+        module = mgear.core.utils.importFromStandardOrCustomDirectories(
+            __registry["directories"],
+            default_formatter,
+            custom_formatter,
+            comp_type,
+        )
+        __modules[key] = module
+
+    return module
+
+
+def import_component(comp_type):
+    """Import the component module, on first use.
+
+    Args:
+        comp_type (str): The component type
+
+    Returns:
+        module: The component module
+    """
+    _build()
+    return _import(comp_type, "mgear.shifter.component.{}", "{}")
+
+
+def import_component_guide(comp_type):
+    """Import the component guide module, on first use.
+
+    Args:
+        comp_type (str): The component type
+
+    Returns:
+        module: The component guide module
+    """
+    _build()
+    return _import(comp_type, "mgear.shifter.component.{}.guide", "{}.guide")
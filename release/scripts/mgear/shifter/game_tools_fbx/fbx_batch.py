@@ -14,6 +14,11 @@ Process
    initialised, and perform alterations on the master fbx, and then generate a new FBX
    before ending the batch task.
 
+The partitions and animation clips can also be exported as independent jobs,
+each one by its own MayaBatch process, see partition_thread.run_jobs. The
+conditioning is then done once, and saved with its export data so the
+partition jobs can load it.
+
 Tasks / Conditions
 ------------------
 - Removing namespaces.
@@ -25,6 +30,7 @@ Note
 ----
 - Print logs are being used by the partition subprocess thread to detect progress.
 """
+import json
 import os
 import traceback
 from collections import OrderedDict
@@ -36,6 +42,14 @@ import mgear.pymaya as pm
 from mgear.core import pyFBX as pfbx
 import mgear.shifter.game_tools_disconnect as gtDisc
 
+
+def get_conditioned_data_path(master_ma_path):
+    """
+    Gets the path of the export data saved with a conditioned .ma file.
+    """
+    return os.path.splitext(master_ma_path)[0] + "_conditioned.json"
+
+
 def perform_fbx_condition(
         remove_namespace,
         scene_clean,
@@ -45,11 +59,16 @@ def perform_fbx_condition(
         skinning=True,
         blendshapes=True,
         partitions=True,
-        export_data=None):
+        export_data=None,
+        export_partitions=True):
     """
     Performs the FBX file conditioning and partition exports.
 
     This is called by a MayaBatch process.
+
+    When export_partitions is False, the partitions are not exported. The
+    conditioned .ma file is kept, with the conditioned root joint and export
+    data saved next to it, for the partition jobs to export them.
     """
     print("--------------------------")
     print(" PERFORM FBX CONDITIONING")
@@ -149,6 +168,18 @@ def perform_fbx_condition(
         pfbx.FBXExport(f=master_fbx_path, s=True)
         status = True
 
+    if partitions and export_data is not None and not export_partitions:
+        # The partition jobs load the conditioned file and data, and clean
+        # them up once they are all exported.
+        print("[Partitions]")
+        print("   Saving conditioned data for Partition jobs..")
+        with open(get_conditioned_data_path(master_ma_path), "w") as f:
+            json.dump(
+                {"root_joint": root_joint, "export_data": export_data}, f
+            )
+        cmds.file(new=True, force=True)
+        return True
+
     if partitions and export_data is not None:
         print("[Partitions]")
         print("   Preparing scene for Partition creation..")
@@ -167,6 +198,200 @@ def perform_fbx_condition(
     return status
 
 
+def perform_job(job_path):
+    """
+    Performs an export job, saved as a JSON file by partition_thread.
+
+    This is called by a MayaBatch worker process. The result of the job is
+    saved in the job file, and the process exits with an error code if the
+    job failed.
+
+    Jobs:
+    - "partition": exports one partition from the conditioned .ma file.
+    - "animation_clip": exports one animation clip from a prepared .ma file.
+    """
+    with open(job_path, "r") as f:
+        job = json.load(f)
+
+    print("[Job] {}: {}".format(job["type"], job["name"]))
+
+    result = False
+    try:
+        if job["type"] == "partition":
+            result = export_partition(job["scene_path"], job["name"])
+        elif job["type"] == "animation_clip":
+            from mgear.shifter.game_tools_fbx import utils
+
+            cmds.file(job["scene_path"], open=True, force=True, save=False)
+            result = utils.export_animation_clip(
+                job["export_data"], job["clip_data"]
+            )
+    except Exception:
+        print(traceback.format_exc())
+        result = False
+
+    job["result"] = result
+    with open(job_path, "w") as f:
+        json.dump(job, f)
+
+    if not result:
+        print("[Job Failed] {}".format(job["name"]))
+        cmds.quit(force=True, exitCode=1)
+
+    print("[Job Completed] {}".format(job["name"]))
+    return result
+
+
+def export_partition(scene_path, partition_name):
+    """
+    Exports a single partition of a conditioned .ma file.
+
+    The conditioned root joint and export data are loaded from the file saved
+    by perform_fbx_condition.
+    """
+    with open(get_conditioned_data_path(scene_path), "r") as f:
+        conditioned_data = json.load(f)
+    export_data = conditioned_data["export_data"]
+    root_joint = conditioned_data["root_joint"]
+
+    partition = export_data.get("partitions", dict()).get(partition_name)
+    if not partition:
+        cmds.warning("  Partition {} not defined!".format(partition_name))
+        return False
+
+    print("Open Conditioned Scene: {}".format(scene_path))
+    cmds.file(scene_path, open=True, force=True, save=False)
+
+    partition_meshes = partition.get("skeletal_meshes")
+    partition_data = _get_partition_data([root_joint], partition_meshes)
+    if not partition_data:
+        print("   Partition {} contains no data.".format(partition_name))
+        return True
+
+    return _export_partition_fbx(
+        partition_name,
+        partition_meshes,
+        partition_data.get("hierarchy", []),
+        export_data)
+
+
+def _get_partition_data(jnt_roots, meshes):
+    """
+    Gets the root joint and joint hierarchy of the meshes of a partition.
+
+    :return: "root" and "hierarchy" of the partition, empty if none of the
+        meshes is influenced by the root joints.
+    :rtype: dict
+    """
+    joint_hierarchy = OrderedDict()
+    for mesh in meshes:
+        # we retrieve all end joints from the influenced joints
+        influences = cmds.skinCluster(mesh, query=True, influence=True)
+
+        # Gets hierarchy from the root joint to the influence joints.
+        for jnt_root in jnt_roots:
+            joint_hierarchy.setdefault(jnt_root, list())
+
+            for inf_jnt in influences:
+                jnt_hierarchy = _get_joint_list(jnt_root, inf_jnt)
+                for hierarchy_jnt in jnt_hierarchy:
+                    if hierarchy_jnt not in joint_hierarchy[jnt_root]:
+                        joint_hierarchy[jnt_root].append(hierarchy_jnt)
+
+    partition_data = dict()
+
+    # the joint chain to export will be the shorter one between the root joint and the influences
+    short_hierarchy = None
+    for root_jnt, joint_hierarchy in joint_hierarchy.items():
+        total_joints = len(joint_hierarchy)
+        if total_joints <= 0:
+            continue
+        if short_hierarchy is None:
+            short_hierarchy = joint_hierarchy
+            partition_data["root"] = root_jnt
+        elif len(short_hierarchy) > len(joint_hierarchy):
+            short_hierarchy = joint_hierarchy
+            partition_data["root"] = root_jnt
+    if short_hierarchy is None:
+        return partition_data
+
+    # we make sure we update the hierarchy to include all joints between the skeleton root joint and
+    # the first joint of the found joint hierarchy
+    root_jnt = _get_root_joint(short_hierarchy[0])
+    if root_jnt not in short_hierarchy:
+        parent_hierarchy = _get_joint_list(root_jnt, short_hierarchy[0])
+        short_hierarchy = parent_hierarchy + short_hierarchy
+
+    partition_data["hierarchy"] = short_hierarchy
+
+    return partition_data
+
+
+def _export_partition_fbx(
+        partition_name, partition_meshes, partition_joints, export_data):
+    """
+    Deletes the meshes and joints not in the partition from the open scene,
+    and exports the partition fbx.
+    """
+    file_path = export_data.get("file_path", "")
+    file_name = export_data.get("file_name", "")
+    cull_joints = export_data.get("cull_joints", False)
+
+    # Deletes meshes that are not included in the partition.
+    all_meshes = _get_all_mesh_dag_objects()
+    for mesh in all_meshes:
+        if not mesh in partition_meshes:
+            cmds.delete(mesh)
+
+    # Delete joints that are not included in the partition
+    if cull_joints:
+        print("    Culling Joints...")
+        all_joints = _get_all_joint_dag_objects()
+        for jnt in reversed(all_joints):
+            if not jnt in partition_joints:
+                cmds.delete(jnt)
+
+    # Exporting fbx
+    partition_file_name = file_name + "_" + partition_name + ".fbx"
+    export_path = os.path.join(file_path, partition_file_name)
+
+    print("Exporting FBX: {}".format(export_path))
+    try:
+        preset_path = export_data.get("preset_path", None)
+        up_axis = export_data.get("up_axis", None)
+        fbx_version = export_data.get("fbx_version", None)
+        file_type = export_data.get("file_type", "binary").lower()
+        # export settings config
+        pfbx.FBXResetExport()
+        # set configuration
+        if preset_path is not None:
+            # load FBX export preset file
+            pfbx.FBXLoadExportPresetFile(f=preset_path)
+        fbx_version_str = None
+        if up_axis is not None:
+            pfbx.FBXExportUpAxis(up_axis.lower())
+        if fbx_version is not None:
+            fbx_version_str = "{}00".format(
+                fbx_version.split("/")[0].replace(" ", "")
+            )
+            pfbx.FBXExportFileVersion(v=fbx_version_str)
+        if file_type == "ascii":
+            pfbx.FBXExportInAscii(v=True)
+
+        cmds.select(clear=True)
+        cmds.select(partition_joints + partition_meshes)
+        pfbx.FBXExport(f=export_path, s=True)
+    except Exception:
+        cmds.error(
+            "Something wrong happened while export Partition {}: {}".format(
+                partition_name,
+                traceback.format_exc()
+            )
+        )
+        return False
+    return True
+
+
 def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
     """
     Exports the individual partition hierarchies that have been specified.
@@ -177,16 +402,11 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
     """
     print("   Correlating Mesh to joints...")
 
-    file_path = export_data.get("file_path", "")
-    file_name = export_data.get("file_name", "")
-
     partitions = export_data.get("partitions", dict())
     if not partitions:
         cmds.warning("  Partitions not defined!")
         return False
 
-    cull_joints = export_data.get("cull_joints", False)
-
     # Collects all partition data, so it can be more easily accessed in the next stage
     # where mesh and skeleton data is deleted and exported.
 
@@ -201,47 +421,8 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
             continue
 
         meshes = data.get("skeletal_meshes", None)
-
-        joint_hierarchy = OrderedDict()
-        for mesh in meshes:
-            # we retrieve all end joints from the influenced joints
-            influences = cmds.skinCluster(mesh, query=True, influence=True)
-
-            # Gets hierarchy from the root joint to the influence joints.
-            for jnt_root in jnt_roots:
-                joint_hierarchy.setdefault(jnt_root, list())
-
-                for inf_jnt in influences:
-                    jnt_hierarchy = _get_joint_list(jnt_root, inf_jnt)
-                    for hierarchy_jnt in jnt_hierarchy:
-                        if hierarchy_jnt not in joint_hierarchy[jnt_root]:
-                            joint_hierarchy[jnt_root].append(hierarchy_jnt)
-
-        partitions_data.setdefault(partition_name, dict())
-
-        # the joint chain to export will be the shorter one between the root joint and the influences
-        short_hierarchy = None
-        for root_jnt, joint_hierarchy in joint_hierarchy.items():
-            total_joints = len(joint_hierarchy)
-            if total_joints <= 0:
-                continue
-            if short_hierarchy is None:
-                short_hierarchy = joint_hierarchy
-                partitions_data[partition_name]["root"] = root_jnt
-            elif len(short_hierarchy) > len(joint_hierarchy):
-                short_hierarchy = joint_hierarchy
-                partitions_data[partition_name]["root"] = root_jnt
-        if short_hierarchy is None:
-            continue
-
-        # we make sure we update the hierarchy to include all joints between the skeleton root joint and
-        # the first joint of the found joint hierarchy
-        root_jnt = _get_root_joint(short_hierarchy[0])
-        if root_jnt not in short_hierarchy:
-            parent_hierarchy = _get_joint_list(root_jnt, short_hierarchy[0])
-            short_hierarchy = parent_hierarchy + short_hierarchy
-
-        partitions_data[partition_name]["hierarchy"] = short_hierarchy
+        partitions_data[partition_name] = _get_partition_data(
+            jnt_roots, meshes)
 
     print("   Modifying Hierarchy...")
 
@@ -262,57 +443,9 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
         # Loads the conditioned scene file, to perform partition actions on.
         cmds.file(scene_path, open=True, force=True, save=False)
 
-        # Deletes meshes that are not included in the partition.
-        all_meshes = _get_all_mesh_dag_objects()
-        for mesh in all_meshes:
-            if not mesh in partition_meshes:
-                cmds.delete(mesh)
-
-        # Delete joints that are not included in the partition
-        if cull_joints:
-            print("    Culling Joints...")
-            all_joints = _get_all_joint_dag_objects()
-            for jnt in reversed(all_joints):
-                if not jnt in partition_joints:
-                    cmds.delete(jnt)
-
-        # Exporting fbx
-        partition_file_name = file_name + "_" + partition_name + ".fbx"
-        export_path = os.path.join(file_path, partition_file_name)
-
-        print("Exporting FBX: {}".format(export_path))
-        try:
-            preset_path = export_data.get("preset_path", None)
-            up_axis = export_data.get("up_axis", None)
-            fbx_version = export_data.get("fbx_version", None)
-            file_type = export_data.get("file_type", "binary").lower()
-            # export settings config
-            pfbx.FBXResetExport()
-            # set configuration
-            if preset_path is not None:
-                # load FBX export preset file
-                pfbx.FBXLoadExportPresetFile(f=preset_path)
-            fbx_version_str = None
-            if up_axis is not None:
-                pfbx.FBXExportUpAxis(up_axis.lower())
-            if fbx_version is not None:
-                fbx_version_str = "{}00".format(
-                    fbx_version.split("/")[0].replace(" ", "")
-                )
-                pfbx.FBXExportFileVersion(v=fbx_version_str)
-            if file_type == "ascii":
-                pfbx.FBXExportInAscii(v=True)
-
-            cmds.select(clear=True)
-            cmds.select(partition_joints + partition_meshes)
-            pfbx.FBXExport(f=export_path, s=True)
-        except Exception:
-            cmds.error(
-                "Something wrong happened while export Partition {}: {}".format(
-                    partition_name,
-                    traceback.format_exc()
-                )
-            )
+        if not _export_partition_fbx(
+                partition_name, partition_meshes, partition_joints,
+                export_data):
             return False
     return True
 
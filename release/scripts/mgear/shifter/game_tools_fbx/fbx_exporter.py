@@ -988,25 +988,13 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         root_joint = export_config.get("joint_root", "")
         cmds.parent(root_joint, world=True)
 
-        # Store the fbx locations that were successfully exported.
-        export_fbx_paths = []
-
-        # Exports each clip
-        for clip_data in anim_clip_data:
-
-            # skip disabled clips.
-            if not clip_data["enabled"]:
-                continue
-
-            result = utils.export_animation_clip(export_config, clip_data)
-            if not result:
-                print(
-                    "\t!!! >>> Failed to export clip: {}".format(
-                        clip_data["title"]
-                    )
-                )
-            else:
-                export_fbx_paths.append(result)
+        # Saves the altered scene, each clip is exported from it by its own
+        # MayaBatch job. The scene is saved with the job logs, in the temporary
+        # directory, not in the export folder.
+        _log_dir = partition_thread.get_log_directory()
+        _jobs_ma_path = os.path.join(_log_dir, "temporary_anim_jobs.ma")
+        cmds.file(rename=_jobs_ma_path)
+        cmds.file(save=True, type="mayaAscii", force=True)
 
         # Load temporary scene after all exportation
         # Set temporary scene file path to stashed scene file path
@@ -1019,6 +1007,44 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         if original_selection:
             pm.select(original_selection)
 
+        # skip disabled clips.
+        clips = [
+            clip_data for clip_data in anim_clip_data if clip_data["enabled"]
+        ]
+
+        self.default_progress_bar()
+        self.progress_bar.setHidden(False)
+
+        # Creates a Thread to run the clip jobs in.
+        self.anim_clip_thread = partition_thread.AnimationClipThread(
+            string.normalize_path(_jobs_ma_path),
+            export_config,
+            clips,
+            log_dir=_log_dir,
+        )
+        self.anim_clip_thread.completed.connect(
+            self._import_animations_into_unreal
+        )
+        self.anim_clip_thread.progress_signal.connect(
+            self.update_progress_bar
+        )
+        self.update_progress_bar(5)
+        self.anim_clip_thread.start()
+
+        return True
+
+    def _import_animations_into_unreal(self, export_fbx_paths, success):
+        """
+        Event triggered when the animation clips Thread has completed.
+
+        Imports the exported clips into unreal, if enabled.
+
+        Recieves the fbx locations that were successfully exported.
+        """
+        if not success:
+            print("\t!!! >>> Failed to export some clips, see the job logs")
+            self.error_progress_bar()
+
         # Unreal Import, if enabled.
         if self.ue_import_cbx.isChecked():
             skeleton_path = self.ue_skeleton_listwgt.selectedItems()[0].text()
@@ -1030,7 +1056,9 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                 result = uegear.export_animation_to_unreal(
                     path, unreal_folder, animation_name, skeleton_path
                 )
-        return True
+
+        if success:
+            self.update_progress_bar(100)
 
     # helper methods
     def _get_or_create_export_node(self):
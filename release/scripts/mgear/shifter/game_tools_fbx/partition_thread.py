@@ -1,9 +1,13 @@
 import os
+import json
+import queue
 import subprocess
+import threading
 from typing import Callable
 import tempfile
 import shlex
 import datetime
+import traceback
 
 from mgear.vendor.Qt.QtCore import QThread, Signal
 from mgear.core import (
@@ -14,6 +18,252 @@ from mgear.core import (
 
 import maya.cmds as cmds
 
+# Number of MayaBatch processes exporting jobs at the same time, one core is
+# left to the user session.
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+
+def get_batch_command(script_path):
+    """
+    Gets the command launching a MayaBatch process running a MEL script.
+
+    :param script_path: The MEL script to run
+    :type script_path: str
+    :return: The command arguments, and if they must run in a shell
+    :rtype: tuple(list or str, bool)
+    """
+    mayabatch_dir = coreUtils.get_maya_path()
+    mayabatch_path = os.path.join(mayabatch_dir, "maya")
+
+    # Depending on the os we would need to change from maya, to maya batch
+    # windows uses mayabatch
+    if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
+        mayabatch_args = ['"'+mayabatch_path+'"']
+        mayabatch_args.append("-batch")
+        mayabatch_args.append("-script")
+        mayabatch_args.append('"'+script_path+'"')
+
+        return " ".join(mayabatch_args), True
+
+    mayabatch_args = [shlex.quote(mayabatch_path)]
+    mayabatch_args.append("-batch")
+    mayabatch_args.append("-script")
+    mayabatch_args.append(shlex.quote(script_path))
+
+    return mayabatch_args, False
+
+
+def write_batch_script(script_content):
+    """
+    Writes a MEL temporary job file.
+
+    :return: The path of the MEL file
+    :rtype: str
+    """
+    script_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.mel')
+    script_file.write(script_content)
+    script_file_path = script_file.name
+    script_file.close()
+
+    return script_file_path
+
+
+def run_batch(script_path, log_path=None, on_line=None):
+    """
+    Runs a MEL script in a MayaBatch process, and waits for it to end.
+
+    :param script_path: The MEL script to run
+    :type script_path: str
+    :param log_path: The file the process output is written to
+    :type log_path: str, optional
+    :param on_line: Called with each line of the process output
+    :type on_line: Callable, optional
+    :return: If the process completed successfully
+    :rtype: bool
+    """
+    mayabatch_args, mayabatch_shell = get_batch_command(script_path)
+
+    print("-------------------------------------------")
+    print("[Launching] MayaBatch")
+    print("   {}".format(mayabatch_args))
+    if log_path:
+        print("   Log: {}".format(log_path))
+    print("-------------------------------------------")
+
+    log_file = open(log_path, "w") if log_path else None
+    try:
+        with subprocess.Popen(mayabatch_args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            shell=mayabatch_shell,
+            universal_newlines=True,
+            bufsize=1
+            ) as process:
+
+            # Process each line (sentence) from the subprocess output
+            for line in process.stdout:
+                if log_file:
+                    log_file.write(line)
+                if on_line:
+                    on_line(line.strip())
+
+            returncode = process.wait()
+    except FileNotFoundError as error:
+        print("Error:", error)
+        return False
+    finally:
+        if log_file:
+            log_file.close()
+
+    print("Return Code: {}".format(returncode))
+    return returncode == 0
+
+
+def get_log_directory():
+    """
+    Creates a new directory for the logs of an export.
+
+    :return: The logs directory path
+    :rtype: str
+    """
+    log_dir = os.path.join(
+        tempfile.gettempdir(),
+        "mgear_fbx_export",
+        "logs_{}".format(datetime.datetime.now().strftime("%m%d%Y%H%M%S%f")))
+    os.makedirs(log_dir, exist_ok=True)
+
+    return log_dir
+
+
+def write_job(log_dir, index, job_type, name, scene_path, **job_data):
+    """
+    Writes an export job, performed by fbx_batch.perform_job.
+
+    :param log_dir: The directory the job and its log are written to
+    :type log_dir: str
+    :param index: The job index, naming the files as the names can repeat
+    :type index: int
+    :param job_type: "partition" or "animation_clip"
+    :type job_type: str
+    :param name: The partition or clip name
+    :type name: str
+    :param scene_path: The .ma file the job exports from
+    :type scene_path: str
+    :return: The job file path
+    :rtype: str
+    """
+    job = {"type": job_type, "name": name, "scene_path": scene_path}
+    job.update(job_data)
+
+    job_path = string.normalize_path(
+        os.path.join(
+            log_dir, "{:03d}_{}_{}.json".format(index, job_type, name)))
+    with open(job_path, "w") as f:
+        json.dump(job, f)
+
+    return job_path
+
+
+def run_job(job_path):
+    """
+    Runs an export job in a MayaBatch process, and waits for it to end.
+
+    The output of the job is written in a log file next to the job file.
+
+    :param job_path: The job file written by write_job
+    :type job_path: str
+    :return: The job data, with its "result", and the job success
+    :rtype: tuple(dict, bool)
+    """
+    script_path = write_batch_script(
+        'python "from mgear.shifter.game_tools_fbx import fbx_batch";\n'
+        'python "fbx_batch.perform_job(\'{}\')";\n'.format(job_path))
+    log_path = os.path.splitext(job_path)[0] + ".log"
+    try:
+        success = run_batch(script_path, log_path)
+    finally:
+        os.remove(script_path)
+
+    with open(job_path, "r") as f:
+        job = json.load(f)
+    success = success and bool(job.get("result"))
+    if not success:
+        job["result"] = False
+        print("[Job Failed] {} - Log: {}".format(job["name"], log_path))
+
+    return job, success
+
+
+def run_jobs(job_paths, workers=None, on_job_done=None):
+    """
+    Runs export jobs with several concurrent MayaBatch worker processes.
+
+    The jobs are fed to the workers through a bounded queue. The output of each
+    job is written in a log file next to the job file. A job raising an error
+    is failed, with a False "result", and the workers go on with the next jobs.
+
+    :param job_paths: The job files written by write_job
+    :type job_paths: list(str)
+    :param workers: The number of worker processes, DEFAULT_WORKERS if None
+    :type workers: int, optional
+    :param on_job_done: Called with the job data, the job success, and the
+        number of jobs done, when each job ends
+    :type on_job_done: Callable, optional
+    :return: The jobs data, with their "result", in the given order
+    :rtype: list(dict)
+    """
+    if not job_paths:
+        return []
+
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(job_paths)))
+    jobs_queue = queue.Queue(maxsize=workers)
+    results = [None] * len(job_paths)
+    lock = threading.Lock()
+    done = []
+
+    def worker():
+        while True:
+            item = jobs_queue.get()
+            if item is None:
+                return
+
+            index, job_path = item
+            job = {
+                "name": os.path.splitext(os.path.basename(job_path))[0],
+                "result": False,
+            }
+            success = False
+            try:
+                job, success = run_job(job_path)
+            except Exception:
+                print("[Job Failed] {}".format(job["name"]))
+                traceback.print_exc()
+            finally:
+                with lock:
+                    results[index] = job
+                    done.append(job_path)
+                    if on_job_done:
+                        try:
+                            on_job_done(job, success, len(done))
+                        except Exception:
+                            traceback.print_exc()
+                jobs_queue.task_done()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    for item in enumerate(job_paths):
+        jobs_queue.put(item)
+    for _ in threads:
+        jobs_queue.put(None)
+
+    for thread in threads:
+        thread.join()
+
+    return results
+
 
 class PartitionThread(QThread):
     """ Thread that handles the creation of fbx partitions"""
@@ -21,15 +271,19 @@ class PartitionThread(QThread):
     completed = Signal(object, bool)
     progress_signal = Signal(float)
 
-    def __init__(self, export_config):
+    def __init__(self, export_config, workers=None):
         """
         Initializes the thread.
+
+        The partitions are exported by jobs, with workers concurrent MayaBatch
+        processes.
         """
         super().__init__()
 
         # self.log_message = log_message_function
 
         self.export_config = export_config
+        self.workers = workers
 
         # Makes sure the Thread removes itself
         self.finished.connect(self.deleteLater)
@@ -73,8 +327,9 @@ class PartitionThread(QThread):
 
         export_path = string.normalize_path(os.path.join(file_path, file_name))
 
-        log_path = os.path.normpath(os.path.join(file_path, "logs_{}.txt".format(datetime.datetime.now().strftime("%m%d%Y%H%M"))))
+        log_dir = get_log_directory()
         print("\t>>> Export Path: {}".format(export_path))
+        print("\t>>> Logs: {}".format(log_dir))
 
         path_is_valid = os.path.exists(export_path)
 
@@ -82,14 +337,15 @@ class PartitionThread(QThread):
         if not path_is_valid:
             return False
 
-        # Creates a MEL temporary job file..
+        # Creates a MEL temporary job file, the partitions are exported by
+        # their own jobs once the scene is conditioned.
         script_content = """
 python "from mgear.shifter.game_tools_fbx import fbx_batch";
 python "master_path='{master_path}'";
 python "root_joint='{joint_root}'";
 python "root_geos={geo_roots}";
 python "export_data={e_data}";
-python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data)";
+python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data, False)";
 """.format(
             ns=remove_namespaces,
             sc=scene_clean,
@@ -101,114 +357,77 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
             ps=use_partitions,
             e_data=export_data)
 
-        script_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.mel')
-        script_file.write(script_content)
-        script_file_path = script_file.name
-        script_file.close()
-
-        mayabatch_dir = coreUtils.get_maya_path()
-        mayabatch_path = None
-        mayabatch_args = None
-        mayabatch_shell = False
-
-        # Depending on the os we would need to change from maya, to maya batch
-        # windows uses mayabatch
-        if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
-            option = "mayabatch"
-        else:
-            option = "maya"
-
-        if option == "maya":
-            mayabatch_command = 'maya'
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = [shlex.quote(mayabatch_path)]
-            mayabatch_args.append("-batch")
-            mayabatch_shell = False
-            mayabatch_args.append("-script")
-            mayabatch_args.append(shlex.quote(script_file_path))
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append(shlex.quote(log_path))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("   {}".format(" ".join(mayabatch_args)))
-            print("-------------------------------------------")
-
-        else:
-            mayabatch_command = "maya"
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = ['"'+mayabatch_path+'"']
-            mayabatch_args.append("-batch")
-            mayabatch_shell = True
-            mayabatch_args.append("-script")
-            mayabatch_args.append('"'+script_file_path+'"')
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append('"'+log_path+'"')
-
-            mayabatch_args = "{}".format(" ".join(mayabatch_args))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("-------------------------------------------")
+        script_file_path = write_batch_script(script_content)
 
         self.progress_signal.emit(50)
 
-        try:
-            with subprocess.Popen(mayabatch_args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                shell=mayabatch_shell,
-                universal_newlines=True,
-                bufsize=1
-                ) as process:
-
-                # Process each line (sentence) from the subprocess output
-                # Looks for specific sentences in the logs and uses those as progress milestones.
-                for line in process.stdout:
-                    line = line.strip()
-                    print(line)
-                    if line.find("Conditioned file:") >= 0:
-                        self.progress_signal.emit(60)
-                    if line.find("Removing Namespace..") >= 0:
-                        self.progress_signal.emit(65)
-                    if line.find("Cleaning Scene..") >= 0:
-                        self.progress_signal.emit(75)
-                    if line.find("[Partitions]") >= 0:
-                        self.progress_signal.emit(80)
-
-                # Capture the output and errors
-                stdout, stderr = process.communicate()
-
-                # Check the return code
-                #returncode = process.returncode
-                returncode = process.wait()
-                print("Return Code: {}".format(returncode))
-
-                # Check the result
-                if returncode == 0:
-                    print("Mayabatch process completed successfully.")
-                    print("-------------------------------------------")
-                    # print("Output:", stdout)
-                    #print("-------------------------------------------")
-                else:
-                    print("Mayabatch process failed.")
-                    print("Error:", stderr)
-                    print("-------------------------------------------")
-                    return False
-        except FileNotFoundError as error:
-            print("Error:", error)
-            return False
+        # Looks for specific sentences in the logs and uses those as progress milestones.
+        def on_line(line):
+            print(line)
+            if line.find("Conditioned file:") >= 0:
+                self.progress_signal.emit(60)
+            if line.find("Removing Namespace..") >= 0:
+                self.progress_signal.emit(65)
+            if line.find("Cleaning Scene..") >= 0:
+                self.progress_signal.emit(75)
+            if line.find("[Partitions]") >= 0:
+                self.progress_signal.emit(80)
+
+        success = run_batch(
+            script_file_path,
+            os.path.join(log_dir, "condition.log"),
+            on_line)
 
         # Clean up Mel batch file
         if os.path.exists(script_file_path):
             print("[Removing File] {}".format(script_file_path))
             os.remove(script_file_path)
 
+        if not success:
+            print("Mayabatch process failed.")
+            print("-------------------------------------------")
+            return False
+        print("Mayabatch process completed successfully.")
+        print("-------------------------------------------")
+
+        if use_partitions:
+            success = self.export_partitions(export_path, log_dir)
+
         # If all goes well return the export path location, else None
-        return True
+        return success
+
+    def export_partitions(self, conditioned_path, log_dir):
+        """
+        Exports each partition of the conditioned .ma file with its own job.
+
+        The conditioned .ma file and its data are removed once all the jobs
+        are done.
+        """
+        partitions = self.export_config.get("partitions", dict())
+        job_paths = [
+            write_job(log_dir, index, "partition", name, conditioned_path)
+            for index, name in enumerate(partitions.keys())
+        ]
+
+        def on_job_done(job, success, done_count):
+            print("[Partition {}] {}/{} - {}".format(
+                "Exported" if success else "Failed",
+                done_count, len(job_paths), job["name"]))
+            self.progress_signal.emit(80 + 15 * done_count / len(job_paths))
+
+        jobs = run_jobs(job_paths, self.workers, on_job_done)
+
+        from mgear.shifter.game_tools_fbx import fbx_batch
+
+        for path in job_paths + [
+            conditioned_path,
+            fbx_batch.get_conditioned_data_path(conditioned_path),
+        ]:
+            if os.path.exists(path):
+                print("[Removing File] {}".format(path))
+                os.remove(path)
+
+        return all(job["result"] for job in jobs)
 
     def init_data(self):
         """
@@ -248,3 +467,72 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
         print("Temporary Master file: {}".format(master_path))
 
         return
+
+
+class AnimationClipThread(QThread):
+    """ Thread that handles the export of animation clips"""
+
+    completed = Signal(object, bool)
+    progress_signal = Signal(float)
+
+    def __init__(
+        self, scene_path, export_config, clips, workers=None, log_dir=None
+    ):
+        """
+        Initializes the thread.
+
+        Each clip is exported from the scene_path .ma file by its own job,
+        with workers concurrent MayaBatch processes. The .ma file is removed
+        once all the clips are exported.
+
+        The jobs and their logs are written to log_dir, a new directory
+        from get_log_directory if None.
+        """
+        super().__init__()
+
+        self.scene_path = scene_path
+        self.export_config = export_config
+        self.clips = clips
+        self.workers = workers
+        self.log_dir = log_dir
+
+        # Makes sure the Thread removes itself
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        """
+        Main function that gets called when the thread starts.
+
+        Emits the exported fbx paths, and if all the clips were exported.
+        """
+        self.progress_signal.emit(10)
+
+        log_dir = self.log_dir or get_log_directory()
+        print("\t>>> Logs: {}".format(log_dir))
+        job_paths = [
+            write_job(
+                log_dir,
+                index,
+                "animation_clip",
+                clip_data["title"],
+                self.scene_path,
+                export_data=self.export_config,
+                clip_data=clip_data)
+            for index, clip_data in enumerate(self.clips)
+        ]
+
+        def on_job_done(job, success, done_count):
+            print("[Clip {}] {}/{} - {}".format(
+                "Exported" if success else "Failed",
+                done_count, len(job_paths), job["name"]))
+            self.progress_signal.emit(10 + 85 * done_count / len(job_paths))
+
+        jobs = run_jobs(job_paths, self.workers, on_job_done)
+
+        for path in job_paths + [self.scene_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+        export_fbx_paths = [job["result"] for job in jobs if job["result"]]
+        self.completed.emit(
+            export_fbx_paths, len(export_fbx_paths) == len(jobs))
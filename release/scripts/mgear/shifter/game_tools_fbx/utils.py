@@ -167,8 +167,9 @@ def export_animation_clip(config_data, clip_data):
             animlayer_mute = cmds.animLayer(anim_layer, query=True, mute=True)
             cmds.animLayer(anim_layer, edit=True, mute=False)
 
-        # disable viewport
-        mel.eval("paneLayout -e -manage false $gMainPane")
+        # disable viewport, there is none in batch mode
+        if not cmds.about(batch=True):
+            mel.eval("paneLayout -e -manage false $gMainPane")
 
         pfbx.FBXResetExport()
 
@@ -255,7 +256,8 @@ def export_animation_clip(config_data, clip_data):
             cmds.file(modified=False)
 
         # enable viewport
-        mel.eval("paneLayout -e -manage true $gMainPane")
+        if not cmds.about(batch=True):
+            mel.eval("paneLayout -e -manage true $gMainPane")
 
     return path
 
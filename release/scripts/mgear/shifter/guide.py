@@ -27,6 +27,7 @@ from . import guide_ui as guui
 from . import custom_step_ui as csui
 from . import naming_rules_ui as naui
 from . import naming
+from . import profiler
 
 # pyside
 from maya.app.general.mayaMixin import MayaQDockWidget
@@ -516,11 +517,17 @@ class Rig(Main):
     def setFromHierarchy(self, root, branch=True):
         """Set the guide from given hierarchy.
 
+        The DAG name indexes are kept while parsing, see dag.name_index.
+
         Arguments:
             root (dagNode): The root of the hierarchy to parse.
             branch (bool): True to parse children components.
 
         """
+        with dag.name_index():
+            self._setFromHierarchy(root, branch)
+
+    def _setFromHierarchy(self, root, branch=True):
         startTime = datetime.datetime.now()
         # Start
         mgear.log("Checking guide")
@@ -1475,28 +1482,29 @@ class HelperSlots(object):
                 else:
                     runPath = stepPath
 
-                customStep = imp.load_source(fileName, runPath)
-                if hasattr(customStep, "CustomShifterStep"):
-                    argspec = inspect.getfullargspec(
-                        customStep.CustomShifterStep.__init__
-                    )
-                    if "stored_dict" in argspec.args:
-                        cs = customStep.CustomShifterStep(customStepDic)
-                        cs.setup()
-                        cs.run()
+                with profiler.section("custom_step", fileName):
+                    customStep = imp.load_source(fileName, runPath)
+                    if hasattr(customStep, "CustomShifterStep"):
+                        argspec = inspect.getfullargspec(
+                            customStep.CustomShifterStep.__init__
+                        )
+                        if "stored_dict" in argspec.args:
+                            cs = customStep.CustomShifterStep(customStepDic)
+                            cs.setup()
+                            cs.run()
+                        else:
+                            cs = customStep.CustomShifterStep()
+                            cs.run(customStepDic)
+                        customStepDic[cs.name] = cs
+                        pm.displayInfo(
+                            "SUCCEED: Custom Shifter Step Class: %s. "
+                            "Succeed!!" % stepPath
+                        )
                     else:
-                        cs = customStep.CustomShifterStep()
-                        cs.run(customStepDic)
-                    customStepDic[cs.name] = cs
-                    pm.displayInfo(
-                        "SUCCEED: Custom Shifter Step Class: %s. "
-                        "Succeed!!" % stepPath
-                    )
-                else:
-                    pm.displayInfo(
-                        "SUCCEED: Custom Step simple script: %s. "
-                        "Succeed!!" % stepPath
-                    )
+                        pm.displayInfo(
+                            "SUCCEED: Custom Step simple script: %s. "
+                            "Succeed!!" % stepPath
+                        )
 
         except Exception as ex:
             template = "An exception of type {0} occurred. "
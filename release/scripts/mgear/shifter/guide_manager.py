@@ -91,6 +91,18 @@ def build_from_selection(*args):
     rg.buildFromSelection()
 
 
+def update_from_selection(*args):
+    """Rebuild the changed components of the rig built from the selected
+    guide
+
+    Args:
+        *args: None
+    """
+    shifter.log_window()
+    rg = shifter.Rig()
+    rg.buildFromSelection(incremental=True)
+
+
 def inspect_settings(tabIdx=0, *args):
     """Open the component or root setting UI.
 
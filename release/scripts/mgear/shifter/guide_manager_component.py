@@ -1,6 +1,4 @@
-import os
 import sys
-import traceback
 from functools import partial
 
 import mgear.pymaya as pm
@@ -12,8 +10,8 @@ from mgear.vendor.Qt import QtCore, QtWidgets, QtGui
 
 from mgear import shifter
 from mgear.shifter import guide_manager
+from mgear.shifter import component_registry
 from mgear.shifter import guide_manager_component_ui as gmcUI
-import importlib
 
 PY2 = sys.version_info[0] == 2
 
@@ -79,49 +77,14 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.setLayout(self.gmc_layout)
 
     def get_component_list(self):
-        comp_list = []
-        compDir = shifter.getComponentDirectories()
-        trackLoadComponent = []
-        for path, comps in compDir.items():
-            pm.progressWindow(
-                title="Loading Components", progress=0, max=len(comps)
-            )
-            for comp_name in comps:
-                pm.progressWindow(
-                    e=True, step=1, status="\nLoading: %s" % comp_name
-                )
-                if comp_name == "__init__.py":
-                    continue
-                elif comp_name in trackLoadComponent:
-                    pm.displayWarning(
-                        "Custom component name: %s, already in default "
-                        "components. Names should be unique. This component is"
-                        " not loaded" % comp_name
-                    )
-                    continue
-                else:
-                    trackLoadComponent.append(comp_name)
-
-                if not os.path.exists(
-                    os.path.join(path, comp_name, "__init__.py")
-                ):
-                    continue
-                try:
-                    module = shifter.importComponentGuide(comp_name)
-                    if PY2:
-                        reload(module)
-                    else:
-                        importlib.reload(module)
-                    comp_list.append(module.TYPE)
-                except Exception as e:
-                    pm.displayWarning(
-                        "{} can't be load. Error at import".format(comp_name)
-                    )
-                    pm.displayError(e)
-                    pm.displayError(traceback.format_exc())
-
-        pm.progressWindow(e=True, endProgress=True)
-        return comp_list
+        """Get the component types, without importing them.
+
+        The component registry of the session is used, see _reloadList to
+        scan the component directories again.
+        """
+        return [
+            info.type for info in component_registry.get_components().values()
+        ]
 
     def setSourceModel(self, model):
         """Set the source model for the listview
@@ -138,6 +101,11 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             model.appendRow(QtGui.QStandardItem(c_node))
         self.setSourceModel(model)
 
+    def _reloadList(self):
+        """Scan the component directories again and refresh the listview"""
+        component_registry.refresh()
+        self._refreshList()
+
     ###########################
     # "right click context menu"
     ###########################
@@ -162,7 +130,7 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         menu_item_02 = self.comp_menu.addAction("Refresh List")
 
         menu_item_01.triggered.connect(self.draw_component)
-        menu_item_02.triggered.connect(self._refreshList)
+        menu_item_02.triggered.connect(self._reloadList)
 
         self.comp_menu.move(parentPosition + QPos)
         self.comp_menu.show()
@@ -235,21 +203,17 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         try:
             item = self.gmcUIInst.component_listView.selectedIndexes()[0]
             comp_name = item.data()
-            module = shifter.importComponentGuide(comp_name)
-            if PY2:
-                reload(module)
-            else:
-                importlib.reload(module)
+            info = component_registry.get_component(comp_name)
             info_text = (
-                "{}\n".format(module.DESCRIPTION)
+                "{}\n".format(info.description)
                 + "\n-------------------------------\n\n"
-                + "Author: {}\n".format(module.AUTHOR)
-                + "Url: {}\n".format(module.URL)
-                + "Version: {}\n".format(str(module.VERSION))
-                + "Type: {}\n".format(module.TYPE)
-                + "Name: {}\n".format(module.NAME)
+                + "Author: {}\n".format(info.author)
+                + "Url: {}\n".format(info.url)
+                + "Version: {}\n".format(str(info.version))
+                + "Type: {}\n".format(info.type)
+                + "Name: {}\n".format(info.name)
             )
-        except IndexError:
+        except (IndexError, AttributeError):
             info_text = ""
 
         self.gmcUIInst.info_plainTextEdit.setPlainText(info_text)
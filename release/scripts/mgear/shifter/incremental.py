@@ -0,0 +1,588 @@
+"""Shifter incremental rebuild.
+
+The builds store on the rig the hash of the guide of each component, with
+the nodes created by the component and its relatives. Building again in
+incremental mode, only the components with a changed guide are rebuilt:
+
+    * the hash of the component guide template dictionary changed, including
+      the parent linkage and its control buffers
+    * a component they depend on is rebuilt or removed: the parent
+      component, and the components referenced by the parameters, i.e. the
+      space references and the UI host
+    * the UI host of a rebuilt or removed component, since the attributes
+      are added to it
+
+The nodes of the rebuilt and removed components are deleted and the rebuilt
+components are connected to the unchanged ones, with the relatives stored
+on the rig. If the rig options changed, or if a rebuilt component needs
+more from an unchanged component than its relatives, the rig is fully
+rebuilt.
+
+The joints of the rebuilt components are created again, so the skin of
+these joints must be imported again. The custom steps are not run by the
+incremental builds.
+
+Recording the nodes and storing the build data is opt-in, so the published
+rigs don't carry it: only the incremental builds store it, or every build
+if the MGEAR_SHIFTER_INCREMENTAL environment variable is set. The first
+incremental build of a rig without stored data is a full build.
+
+Example:
+    >>> from mgear import shifter
+    >>> rig = shifter.Rig()
+    >>> rig.buildFromSelection(incremental=True)
+"""
+import collections
+import hashlib
+import json
+import os
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+import mgear
+import mgear.pymaya as pm
+from mgear.core import attribute
+from mgear.shifter import naming
+
+MGEAR_SHIFTER_INCREMENTAL_KEY = "MGEAR_SHIFTER_INCREMENTAL"
+
+# rig root attribute, with the rig hash and the component roots
+RIG_ATTR = "build_hash"
+# component root attributes
+HASH_ATTR = "componentHash"
+DATA_ATTR = "componentBuildData"
+
+Plan = collections.namedtuple(
+    "Plan", ["model", "dirty", "removed", "data"]
+)
+
+
+class IncrementalBuildError(RuntimeError):
+    """A rebuilt component needs more from an unchanged component than
+    its stored relatives."""
+
+
+def is_enabled():
+    """Check if every build stores the incremental build data.
+
+    Returns:
+        bool: True if the MGEAR_SHIFTER_INCREMENTAL environment variable is
+            set
+    """
+    return bool(os.environ.get(MGEAR_SHIFTER_INCREMENTAL_KEY, ""))
+
+
+######################################
+# Hash
+######################################
+
+
+def _hash(data):
+    content = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def get_template(rig):
+    """Get the guide template dictionary of the rig guide.
+
+    Args:
+        rig (Rig): The rig
+
+    Returns:
+        dict: The guide template dictionary
+    """
+    if rig.guide.guide_template_dict:
+        return rig.guide.guide_template_dict
+    return rig.guide.get_guide_template_dict()
+
+
+def get_rig_hash(template):
+    """Get the hash of the rig options.
+
+    Args:
+        template (dict): The guide template dictionary
+
+    Returns:
+        str: The hash
+    """
+    return _hash(template["guide_root"])
+
+
+def get_component_hashes(template):
+    """Get the hash of each component guide.
+
+    The hash includes the component parameters, transforms, parent linkage
+    and the control buffers named after the component.
+
+    Args:
+        template (dict): The guide template dictionary
+
+    Returns:
+        dict: The hash, by component full name
+    """
+    buffers = template.get("ctl_buffers_dict") or {}
+    hashes = {}
+    for name in template["components_list"]:
+        c_dict = dict(template["components_dict"][name])
+        c_dict.pop("child_components", None)
+        prefix = name + "_"
+        c_dict["ctl_buffers"] = dict(
+            (crv, buffers.get(crv))
+            for crv in buffers.get("curves_names", [])
+            if crv.startswith(prefix)
+        )
+        hashes[name] = _hash(c_dict)
+
+    return hashes
+
+
+######################################
+# Dependencies
+######################################
+
+
+def _get_component_name(guide_name):
+    if not guide_name:
+        return None
+    names = naming.get_component_and_relative_name(
+        guide_name.strip().split("|")[-1]
+    )
+    if names:
+        return names[0]
+
+
+def get_dependencies(template):
+    """Get the components each component depends on.
+
+    Args:
+        template (dict): The guide template dictionary
+
+    Returns:
+        dict: The set of component names, by component full name
+    """
+    components = set(template["components_list"])
+    dependencies = {}
+    for name in template["components_list"]:
+        c_dict = template["components_dict"][name]
+        deps = set()
+        if c_dict["parent_fullName"]:
+            deps.add(c_dict["parent_fullName"])
+        for value in c_dict["param_values"].values():
+            if not isinstance(value, str):
+                continue
+            for guide_name in value.split(","):
+                comp_name = _get_component_name(guide_name)
+                if comp_name in components and comp_name != name:
+                    deps.add(comp_name)
+        dependencies[name] = deps
+
+    return dependencies
+
+
+def get_dirty(template, old_hashes, old_hosts):
+    """Get the components to rebuild.
+
+    Args:
+        template (dict): The guide template dictionary
+        old_hashes (dict): The hash of the built components, by name
+        old_hosts (dict): The UI host component of the built components, by
+            name
+
+    Returns:
+        tuple: The set of components to rebuild and the set of removed
+            components
+    """
+    hashes = get_component_hashes(template)
+    dependencies = get_dependencies(template)
+    hosts = dict(old_hosts)
+    for name in template["components_list"]:
+        c_dict = template["components_dict"][name]
+        hosts[name] = _get_component_name(
+            c_dict["param_values"].get("ui_host")
+        )
+
+    dirty = set(n for n in hashes if hashes[n] != old_hashes.get(n))
+    removed = set(old_hashes) - set(hashes)
+
+    pending = list(dirty | removed)
+    while pending:
+        name = pending.pop()
+        candidates = [n for n, deps in dependencies.items() if name in deps]
+        candidates.append(hosts.get(name))
+        for other in candidates:
+            if other in hashes and other not in dirty:
+                dirty.add(other)
+                pending.append(other)
+
+    return dirty, removed
+
+
+######################################
+# Rig data
+######################################
+
+
+def find_rig(rig_name):
+    """Find the rig root built with this name.
+
+    Args:
+        rig_name (str): The rig name
+
+    Returns:
+        PyNode: The rig root, None if not found or not unique
+    """
+    models = [
+        m
+        for m in pm.ls(rig_name, type="transform")
+        if m.hasAttr("is_rig") and not m.getParent()
+    ]
+    if len(models) == 1:
+        return models[0]
+
+
+def get_uuid(node):
+    """Get the UUID of a node.
+
+    Args:
+        node (PyNode or str): The node
+
+    Returns:
+        str: The UUID, None if the node doesn't exist
+    """
+    if node is None or isinstance(node, bool):
+        return None
+    uuids = cmds.ls(str(node), uuid=True)
+    if uuids:
+        return uuids[0]
+
+
+def get_node(uuid):
+    """Get a node from its UUID.
+
+    Args:
+        uuid (str): The UUID
+
+    Returns:
+        PyNode: The node, None if it doesn't exist
+    """
+    if uuid:
+        nodes = pm.ls(uuid)
+        if nodes:
+            return nodes[0]
+
+
+def _get_uuids(nodes):
+    return dict((k, get_uuid(v)) for k, v in nodes.items())
+
+
+def load(model):
+    """Load the build data stored on a rig.
+
+    Args:
+        model (PyNode): The rig root
+
+    Returns:
+        tuple: The rig hash and the build data of each component, by name.
+            None if the rig doesn't have build data
+    """
+    if not model.hasAttr(RIG_ATTR):
+        return None
+    try:
+        rig_data = json.loads(model.attr(RIG_ATTR).get())
+    except ValueError:
+        return None
+
+    components = {}
+    for name, uuid in rig_data["components"].items():
+        root = get_node(uuid)
+        if root is None or not root.hasAttr(DATA_ATTR):
+            return None
+        data = json.loads(root.attr(DATA_ATTR).get())
+        data["hash"] = root.attr(HASH_ATTR).get()
+        components[name] = data
+
+    return rig_data["rig"], components
+
+
+def store(rig, nodes):
+    """Store the build data of the rebuilt components on the rig.
+
+    Args:
+        rig (Rig): The built rig
+        nodes (dict): The UUIDs of the nodes created by each component, by
+            name
+    """
+    template = get_template(rig)
+    hashes = get_component_hashes(template)
+    keep_build_data = (
+        rig.options["data_collector_embedded"]
+        or rig.options["data_collector"]
+    )
+
+    roots = {}
+    for name in rig.componentsIndex:
+        comp = rig.components[name]
+        roots[name] = get_uuid(comp.root)
+        if isinstance(comp, BuiltComponent):
+            continue
+
+        data = {
+            "nodes": nodes.get(name, []),
+            "root": roots[name],
+            "ui_host": _get_component_name(comp.settings.get("ui_host")),
+            "relatives": _get_uuids(comp.relatives),
+            "controlRelatives": _get_uuids(comp.controlRelatives),
+            "jointRelatives": comp.jointRelatives,
+            "aliasRelatives": comp.aliasRelatives,
+            "jointList": [get_uuid(j) for j in comp.jointList],
+            "jnt_pos": [
+                get_uuid(j["obj"] if isinstance(j, dict) else j[0])
+                for j in comp.jnt_pos
+            ],
+            "controlers": [get_uuid(c) for c in comp.controlers],
+            "build_data": comp.build_data if keep_build_data else {},
+        }
+        attribute.addAttribute(comp.root, HASH_ATTR, "string", hashes[name])
+        attribute.addAttribute(
+            comp.root, DATA_ATTR, "string", json.dumps(data, default=str)
+        )
+
+    rig_data = json.dumps(
+        {"rig": get_rig_hash(template), "components": roots}
+    )
+    if rig.model.hasAttr(RIG_ATTR):
+        rig.model.attr(RIG_ATTR).set(rig_data)
+    else:
+        attribute.addAttribute(rig.model, RIG_ATTR, "string", rig_data)
+
+
+def get_plan(rig):
+    """Get the components to rebuild on the rig built from the same guide.
+
+    If the rig can't be rebuilt incrementally, it is deleted to be fully
+    rebuilt.
+
+    Args:
+        rig (Rig): The rig to build, with its options set
+
+    Returns:
+        Plan: The rig root, the components to rebuild, the removed
+            components and the build data of the built components. None if
+            the rig must be fully rebuilt
+    """
+    model = find_rig(rig.options["rig_name"])
+    if model is None:
+        mgear.log("No rig to update, building the full rig")
+        return None
+
+    template = get_template(rig)
+    loaded = load(model)
+    if loaded is None or loaded[0] != get_rig_hash(template):
+        mgear.log(
+            "The rig options changed or the rig was built without build "
+            "data, rebuilding the full rig",
+            mgear.sev_warning,
+        )
+        delete_rig(model)
+        return None
+
+    data = loaded[1]
+    dirty, removed = get_dirty(
+        template,
+        dict((n, d["hash"]) for n, d in data.items()),
+        dict((n, d.get("ui_host")) for n, d in data.items()),
+    )
+    mgear.log(
+        "Rebuilding {} of {} components, {} removed".format(
+            len(dirty), len(template["components_list"]), len(removed)
+        )
+    )
+    return Plan(model, dirty, removed, data)
+
+
+######################################
+# Delete
+######################################
+
+
+def delete_rig(model):
+    """Delete a rig, with its sets, poses and controller tags.
+
+    Args:
+        model (PyNode): The rig root
+    """
+    nodes = []
+    for attr in ("rigGroups", "rigPoses", "rigCtlTags", "rigScriptNodes"):
+        if model.hasAttr(attr):
+            nodes.extend(model.attr(attr).listConnections())
+    pm.delete(nodes + [model])
+
+
+def delete_components(plan):
+    """Delete the nodes of the rebuilt and removed components.
+
+    Args:
+        plan (Plan): The incremental build plan
+    """
+    skinned = set()
+    for name in sorted(plan.dirty | plan.removed):
+        if name not in plan.data:
+            continue
+        for uuid in plan.data[name]["jointList"]:
+            for joint in cmds.ls(uuid) or []:
+                if cmds.listConnections(joint, type="skinCluster"):
+                    skinned.add(name)
+        for uuid in plan.data[name]["nodes"]:
+            existing = cmds.ls(uuid)
+            if existing:
+                cmds.delete(existing)
+
+    if skinned:
+        mgear.log(
+            "The joints of these components are rebuilt, their skin must be"
+            " imported again: {}".format(", ".join(sorted(skinned))),
+            mgear.sev_warning,
+        )
+
+
+######################################
+# Components
+######################################
+
+
+class NodeTracker(object):
+    """Records the nodes created by each component while building.
+
+    Args:
+        enabled (bool, optional): If False, nothing is recorded
+
+    Attributes:
+        nodes (dict): The handles of the created nodes, by component name
+    """
+
+    def __init__(self, enabled=True):
+        self.nodes = collections.defaultdict(list)
+        self.current = None
+        self.enabled = enabled
+        self.__callback = None
+
+    def __enter__(self):
+        if self.enabled:
+            self.__callback = om2.MDGMessage.addNodeAddedCallback(
+                self.__node_added, "dependNode"
+            )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__callback is not None:
+            om2.MMessage.removeCallback(self.__callback)
+            self.__callback = None
+        self.current = None
+
+    def __node_added(self, mobject, clientData):
+        if self.current is not None:
+            self.nodes[self.current].append(om2.MObjectHandle(mobject))
+
+    def get_uuids(self):
+        """Get the UUIDs of the created nodes still existing.
+
+        Returns:
+            dict: The UUIDs, by component name
+        """
+        return dict(
+            (
+                name,
+                [
+                    om2.MFnDependencyNode(h.object()).uuid().asString()
+                    for h in handles
+                    if h.isAlive() and h.isValid()
+                ],
+            )
+            for name, handles in self.nodes.items()
+        )
+
+
+class BuiltComponent(object):
+    """An unchanged component of an incremental build.
+
+    Gives the rebuilt components the relatives of the component, read from
+    the data stored on the rig.
+    """
+
+    def __init__(self, rig, guide, data):
+        self.rig = rig
+        self.guide = guide
+        self.settings = guide.values
+        self.name = self.settings["comp_name"]
+        self.side = self.settings["comp_side"]
+        self.index = self.settings["comp_index"]
+
+        self.root = get_node(data["root"])
+        self.relatives = self._get_nodes(data["relatives"])
+        self.controlRelatives = self._get_nodes(data["controlRelatives"])
+        self.jointRelatives = data["jointRelatives"]
+        self.aliasRelatives = data["aliasRelatives"]
+        self.hostRelatives = {}
+        self.jointList = [get_node(u) for u in data["jointList"]]
+        self.jnt_pos = [{"obj": get_node(u)} for u in data["jnt_pos"]]
+        self.controlers = [get_node(u) for u in data["controlers"]]
+        self.build_data = data["build_data"]
+
+        self.ui = None
+        self.groups = {}
+        self.subGroups = {}
+
+    @staticmethod
+    def _get_nodes(uuids):
+        return dict((k, get_node(v)) for k, v in uuids.items())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        raise IncrementalBuildError(
+            "The unchanged component {} doesn't have the attribute {}, "
+            "needed by a rebuilt component".format(self.fullName, name)
+        )
+
+    @property
+    def fullName(self):
+        return self.guide.fullName
+
+    @property
+    def type(self):
+        return self.guide.type
+
+    @property
+    def parent_comp(self):
+        if self.guide.parentComponent is None:
+            return None
+        return self.rig.components.get(self.guide.parentComponent.fullName)
+
+    def getRelation(self, name):
+        if name not in self.relatives:
+            mgear.log(
+                "Can't find reference for object : {}.{}".format(
+                    self.fullName, name
+                ),
+                mgear.sev_error,
+            )
+            return False
+        return self.relatives[name]
+
+    def getControlRelation(self, name):
+        if name not in self.controlRelatives:
+            mgear.log(
+                "Control tag relative: Can't find reference for "
+                " object : {}.{}".format(self.fullName, name),
+                mgear.sev_error,
+            )
+            return False
+        return self.controlRelatives[name]
+
+    def getName(self, name="", side=None, **kwargs):
+        if side is None:
+            side = self.side
+        if name:
+            return "_".join([self.name, side + str(self.index), str(name)])
+        return self.fullName
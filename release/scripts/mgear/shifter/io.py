@@ -5,6 +5,9 @@ import sys
 import mgear.pymaya as pm
 from mgear import shifter
 from mgear.core import curve
+from mgear.core import icon
+from mgear.shifter import template_cache
+from mgear.shifter import build_cache
 
 if sys.version_info[0] == 2:
     string_types = (basestring, )
@@ -184,20 +187,66 @@ def build_from_file(filePath=None, conf=False, *args):
     The rig will be build from a previously exported guide template, without
     creating the guide in the scene.
 
+    The template file is normalized and cached by template_cache. Use
+    template_cache.prefetch to prepare the next files in the background when
+    building several rigs.
+
+    If the build cache is enabled, a previous build of the same inputs is
+    imported instead of building the rig. The returned Rig then has the
+    guide, the options and the imported model, but no components. See
+    build_cache.
+
     Args:
         filePath (None, optional): Guide template file path
 
+    Returns:
+        Rig: The built rig
     """
     if not conf:
-        conf = _import_guide_template(filePath)
+        if not filePath:
+            filePath = _get_file()
+        if not filePath:
+            pm.displayWarning("File path to template is None")
+            return
+        conf = template_cache.load(filePath)
     if conf:
-        rig = shifter.Rig()
-        rig.buildFromDict(conf)
-
-        # controls shapes buffer
-        if conf["ctl_buffers_dict"]:
-            curve.update_curve_from_data(conf["ctl_buffers_dict"],
-                                         rplStr=["_controlBuffer", ""])
+        key = None
+        if build_cache.get_cache_directory() and build_cache.is_cacheable(
+            conf
+        ):
+            key = build_cache.get_key(conf, build_cache.get_build_files(conf))
+
+        with build_cache.CachedBuild(
+            key, build_cache.get_output_files(conf)
+        ) as cached:
+            rig = shifter.Rig()
+            if cached.hit:
+                rig.guide.set_from_dict(conf)
+                rig.options = rig.guide.values
+                models = [
+                    n
+                    for n in pm.ls(cached.nodes, type="transform")
+                    if n.hasAttr("is_rig")
+                ]
+                rig.model = models[0] if models else None
+                return rig
+            buffers = conf["ctl_buffers_dict"]
+
+            # the controls are created with their buffer shapes directly
+            names = icon.register_curve_data(buffers) if buffers else []
+            try:
+                rig.buildFromDict(conf)
+            finally:
+                icon.unregister_shapes(names)
+
+            # controls shapes buffer
+            if buffers:
+                pending = [crv for crv in buffers["curves_names"]
+                           if crv not in rig.ctl_buffers_built]
+                if pending:
+                    curve.update_curve_from_data(
+                        dict(buffers, curves_names=pending),
+                        rplStr=["_controlBuffer", ""])
         return rig
 
 
@@ -16,6 +16,11 @@ def install():
         ("Extract Controls", str_extract_controls, "mgear_move.svg"),
         ("-----", None),
         ("Build from Selection", str_build_from_selection, "mgear_play.svg"),
+        (
+            "Update Rig from Selection",
+            str_update_from_selection,
+            "mgear_refresh-cw.svg",
+        ),
         (
             "Build From Guide Template File",
             str_build_from_file,
@@ -236,6 +241,11 @@ from mgear.shifter import guide_manager
 guide_manager.build_from_selection()
 """
 
+str_update_from_selection = """
+from mgear.shifter import guide_manager
+guide_manager.update_from_selection()
+"""
+
 str_build_from_file = """
 from mgear.shifter import io
 io.build_from_file(None)
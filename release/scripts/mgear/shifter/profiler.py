@@ -0,0 +1,391 @@
+"""Shifter build profiler.
+
+Records the wall time, the nodes created and the attributes added by each
+build section: the creation steps of each component, the build stages and
+the custom steps.
+
+The profiler is enabled around a build:
+
+    >>> from mgear.shifter import profiler
+    >>> with profiler.BuildProfiler() as prof:
+    ...     rig = io.build_from_file(path)
+    >>> prof.save_json("build.json")
+    >>> prof.save_folded("build.folded")
+
+Nothing is profiled if the rig is imported from the build cache. Unset
+MGEAR_SHIFTER_BUILD_CACHE_PATH to profile the build.
+
+Or for every build, setting the MGEAR_SHIFTER_PROFILE_PATH environment
+variable to the folder where the results of each build are saved.
+
+The folded file is the collapsed stacks format of the flame graph tools
+(flamegraph.pl, speedscope), in microseconds of self time.
+
+The attributes are counted on the nodes created while profiling, so
+attributes added to the nodes existing before the build aren't counted.
+"""
+import datetime
+import functools
+import json
+import os
+import timeit
+
+from maya.api import OpenMaya
+
+import mgear
+
+MGEAR_SHIFTER_PROFILE_KEY = "MGEAR_SHIFTER_PROFILE_PATH"
+
+# number of rows in the logged summary
+SUMMARY_SIZE = 10
+
+_current = [None]
+
+
+class _NullSection(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section(object):
+    def __init__(self, profiler, category, name, component, comp_type):
+        self.profiler = profiler
+        self.record = {
+            "category": category,
+            "name": name,
+            "component": component,
+            "comp_type": comp_type,
+        }
+
+    def __enter__(self):
+        self.profiler._push(self.record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler._pop(self.record)
+
+
+class BuildProfiler(object):
+    """Build sections recorder.
+
+    Attributes:
+        records (list of dict): The finished sections, children first
+    """
+
+    def __init__(self):
+        super(BuildProfiler, self).__init__()
+        self.records = []
+        self.started = None
+        self.__stack = []
+        self.__nodes = 0
+        self.__attrs = 0
+        self.__callbacks = []
+        self.__node_callbacks = []
+
+    # =====================================================
+    # Recording
+
+    def start(self):
+        """Start recording and set as the current profiler."""
+        if current() is not None:
+            raise RuntimeError("A build profiler is already running")
+
+        _current[0] = self
+        self.started = datetime.datetime.now().isoformat()
+        self.__callbacks.append(
+            OpenMaya.MDGMessage.addNodeAddedCallback(
+                self.__node_added, "dependNode"
+            )
+        )
+
+    def stop(self):
+        """Stop recording."""
+        if current() is self:
+            _current[0] = None
+
+        for callbacks in (self.__callbacks, self.__node_callbacks):
+            for cid in callbacks:
+                try:
+                    OpenMaya.MMessage.removeCallback(cid)
+                except RuntimeError:
+                    # the node was deleted
+                    pass
+            del callbacks[:]
+
+        while self.__stack:
+            self._pop(self.__stack[-1])
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __node_added(self, mobject, clientData):
+        self.__nodes += 1
+        try:
+            self.__node_callbacks.append(
+                OpenMaya.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                    mobject, self.__attribute_changed
+                )
+            )
+        except RuntimeError:
+            pass
+
+    def __attribute_changed(self, msg, plug, clientData):
+        if msg & OpenMaya.MNodeMessage.kAttributeAdded:
+            self.__attrs += 1
+
+    def section(self, category, name, component=None, comp_type=None):
+        """Get a context manager recording a build section.
+
+        Args:
+            category (str): The section category, i.e. stage, step or
+                custom_step
+            name (str): The section name, i.e. the step name
+            component (str, optional): The component full name
+            comp_type (str, optional): The component type
+
+        Returns:
+            context manager: The section recorder
+        """
+        return _Section(self, category, name, component, comp_type)
+
+    def _push(self, record):
+        parent = self.__stack[-1] if self.__stack else None
+        frames = [record["name"]]
+        if record["comp_type"]:
+            frames.append(record["comp_type"])
+        if record["component"]:
+            frames.append(record["component"])
+        record["stack"] = (parent["stack"] if parent else []) + frames
+        record["children"] = {"wall": 0.0, "nodes": 0, "attrs": 0}
+        record["start"] = timeit.default_timer()
+        record["nodes"] = self.__nodes
+        record["attrs"] = self.__attrs
+        self.__stack.append(record)
+
+    def _pop(self, record):
+        if not any(r is record for r in self.__stack):
+            return
+        while self.__stack.pop() is not record:
+            pass
+
+        record["wall"] = timeit.default_timer() - record.pop("start")
+        record["nodes"] = self.__nodes - record["nodes"]
+        record["attrs"] = self.__attrs - record["attrs"]
+        children = record.pop("children")
+        for key in ("wall", "nodes", "attrs"):
+            record["self_" + key] = record[key] - children[key]
+
+        if self.__stack:
+            parent = self.__stack[-1]["children"]
+            for key in ("wall", "nodes", "attrs"):
+                parent[key] += record[key]
+
+        self.records.append(record)
+
+    # =====================================================
+    # Results
+
+    def totals(self, key):
+        """Get the self totals of the records grouped by a key.
+
+        Args:
+            key (str): The record key, i.e. comp_type, component, name or
+                category
+
+        Returns:
+            dict: The wall time, nodes, attrs and calls by key value, sorted
+                by wall time
+        """
+        totals = {}
+        for record in self.records:
+            value = record[key]
+            if value is None:
+                continue
+            total = totals.setdefault(
+                value, {"wall": 0.0, "nodes": 0, "attrs": 0, "calls": 0}
+            )
+            total["wall"] += record["self_wall"]
+            total["nodes"] += record["self_nodes"]
+            total["attrs"] += record["self_attrs"]
+            total["calls"] += 1
+
+        return dict(
+            sorted(totals.items(), key=lambda x: x[1]["wall"], reverse=True)
+        )
+
+    def to_dict(self):
+        """Get the profile as a dictionary.
+
+        Returns:
+            dict: The records and the totals by component type, component,
+                step and category
+        """
+        return {
+            "started": self.started,
+            "records": self.records,
+            "comp_types": self.totals("comp_type"),
+            "components": self.totals("component"),
+            "steps": self.totals("name"),
+            "categories": self.totals("category"),
+        }
+
+    def save_json(self, path):
+        """Save the profile as JSON.
+
+        Args:
+            path (str): The file path
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def folded(self):
+        """Get the profile in the flame graph collapsed stacks format.
+
+        Returns:
+            list of str: One line per stack, with the self time in
+                microseconds
+        """
+        stacks = {}
+        for record in self.records:
+            stack = ";".join(f.replace(";", "_") for f in record["stack"])
+            stacks[stack] = stacks.get(stack, 0) + record["self_wall"]
+
+        return [
+            "{} {}".format(stack, int(wall * 1e6))
+            for stack, wall in stacks.items()
+            if wall > 0
+        ]
+
+    def save_folded(self, path):
+        """Save the profile in the flame graph collapsed stacks format.
+
+        Args:
+            path (str): The file path
+        """
+        with open(path, "w") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def log_summary(self):
+        """Log the slowest component types and custom steps."""
+        mgear.log("\n" + "= BUILD PROFILE " + "=" * 46)
+        line = "{:<40}{:>10}{:>8}{:>8}{:>8}"
+        for title, key in (
+            ("component type", "comp_type"),
+            ("step", "name"),
+        ):
+            mgear.log(line.format(title, "seconds", "nodes", "attrs", "calls"))
+            for value, total in list(self.totals(key).items())[:SUMMARY_SIZE]:
+                mgear.log(
+                    line.format(
+                        value,
+                        round(total["wall"], 3),
+                        total["nodes"],
+                        total["attrs"],
+                        total["calls"],
+                    )
+                )
+
+
+def current():
+    """Get the running profiler.
+
+    Returns:
+        BuildProfiler: The profiler or None
+    """
+    return _current[0]
+
+
+def section(category, name, component=None, comp_type=None):
+    """Record a build section with the running profiler.
+
+    Args:
+        category (str): The section category, i.e. stage, step or
+            custom_step
+        name (str): The section name, i.e. the step name
+        component (str, optional): The component full name
+        comp_type (str, optional): The component type
+
+    Returns:
+        context manager: The section recorder, doing nothing if no profiler
+            is running
+    """
+    prof = _current[0]
+    if prof is None:
+        return _NULL_SECTION
+    return prof.section(category, name, component, comp_type)
+
+
+def profiled(name):
+    """Decorator - Profile a build function with build_session.
+
+    Args:
+        name (str): The build section name
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrap(*args, **kwargs):
+            with build_session(name):
+                return func(*args, **kwargs)
+
+        return wrap
+
+    return decorator
+
+
+class build_session(object):
+    """Context manager profiling a whole build.
+
+    Records a build section if a profiler is running. If not, and the
+    MGEAR_SHIFTER_PROFILE_PATH environment variable is set, profiles the
+    build and saves the results in that folder.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+        self.section = None
+
+    def __enter__(self):
+        path = os.environ.get(MGEAR_SHIFTER_PROFILE_KEY, "")
+        if current() is None and path:
+            self.profiler = BuildProfiler()
+            self.profiler.start()
+        self.section = section("build", self.name)
+        self.section.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.section.__exit__(exc_type, exc_value, traceback)
+        if self.profiler is None:
+            return
+
+        self.profiler.stop()
+        self.profiler.log_summary()
+        path = os.environ.get(MGEAR_SHIFTER_PROFILE_KEY, "")
+        basename = "shifter_build_{}".format(
+            datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        )
+        try:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            self.profiler.save_json(os.path.join(path, basename + ".json"))
+            self.profiler.save_folded(
+                os.path.join(path, basename + ".folded")
+            )
+            mgear.log("Build profile saved in: {}".format(path))
+        except (IOError, OSError) as e:
+            mgear.log(
+                "Can't save the build profile: {}".format(e),
+                mgear.sev_warning,
+            )
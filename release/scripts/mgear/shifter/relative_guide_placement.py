@@ -28,6 +28,7 @@ Attributes:
 # python
 import json
 import math
+import re
 
 # dcc
 import maya.cmds as mc
@@ -87,6 +88,8 @@ SKIP_NODETYPES = ["aimConstraint", "pointConstraint", "parentConstraint"]
 
 UNIVERSAL_MESH_NAME = "skin_geo_setup"
 
+RE_VERTEX_NAME = re.compile(r"^(.+)\.vtx\[([0-9]+)\]$")
+
 
 # general functions -----------------------------------------------------------
 
@@ -162,6 +165,48 @@ def getVertMatrix(closestVert):
     return orig_ref_matrix
 
 
+def getVertMatrixFromIndex(mesh_index, vertex):
+    """create a matrix from the vertex and the normals of the surrounding
+    faces, using the mesh spatial index
+
+    Args:
+        mesh_index (meshNavigation.MeshSpatialIndex): index of the mesh
+        vertex (int): closest vert to guide
+
+    Returns:
+        TransformationMatrix: the reference matrix
+    """
+    face_pos, normal = mesh_index.vertex_frame(vertex)
+    face_pos = pm.dt.Vector(*[float(p) for p in face_pos])
+    normal_rot = getOrient([float(n) for n in normal], [0, 1, 0], ro=0)
+    orig_ref_matrix = pm.dt.TransformationMatrix()
+    orig_ref_matrix.setTranslation(face_pos, pm.dt.Space.kWorld)
+    orig_ref_matrix.setRotation(normal_rot)
+
+    return orig_ref_matrix
+
+
+def getVertPosition(vertex_name, mesh_indices=None):
+    """Get the world position of a vertex
+
+    Args:
+        vertex_name (str): name of the vertex, ie. "bodyShape.vtx[12]"
+        mesh_indices (dict, optional): mesh name to MeshSpatialIndex cache.
+            If None the position is queried from the vertex node
+
+    Returns:
+        vector: world position
+    """
+    match = RE_VERTEX_NAME.match(vertex_name)
+    if mesh_indices is None or not match:
+        return pm.PyNode(vertex_name).getPosition("world")
+
+    mesh, vertex = match.groups()
+    if mesh not in mesh_indices:
+        mesh_indices[mesh] = meshNavigation.MeshSpatialIndex(mesh)
+    return mesh_indices[mesh].vertex_position(int(vertex))
+
+
 def getOrient(normal, tangent, ro=0):
     """convert normal direction into euler rotations
 
@@ -192,7 +237,8 @@ def getOrient(normal, tangent, ro=0):
 def getRepositionMatrix(node_matrix,
                         orig_ref_matrix,
                         mr_orig_ref_matrix,
-                        closestVerts):
+                        closestVerts,
+                        mesh_indices=None):
     """Get the delta matrix from the original position and multiply by the
     new vert position. Add the rotations from the face normals.
 
@@ -200,14 +246,15 @@ def getRepositionMatrix(node_matrix,
         node_matrix (pm.dt.Matrix): matrix of the guide
         orig_ref_matrix (pm.dt.Matrix): matrix from the original vert position
         closestVerts (str): name of the closest vert
+        mesh_indices (dict, optional): mesh name to MeshSpatialIndex cache,
+            to read the vertex positions from
 
     Returns:
         mmatrix: matrix of the new offset position, worldSpace
     """
-    current_vert = pm.PyNode(closestVerts[0])
-    mr_current_vert = pm.PyNode(closestVerts[1])
-    current_length = vector.getDistance(current_vert.getPosition("world"),
-                                        mr_current_vert.getPosition("world"))
+    current_pos = getVertPosition(closestVerts[0], mesh_indices)
+    mr_current_pos = getVertPosition(closestVerts[1], mesh_indices)
+    current_length = vector.getDistance(current_pos, mr_current_pos)
 
     orig_length = vector.getDistance(orig_ref_matrix.translate,
                                      mr_orig_ref_matrix.translate)
@@ -218,9 +265,7 @@ def getRepositionMatrix(node_matrix,
     orig_center_matrix = transform.setMatrixPosition(
         orig_center_matrix, orig_center)
 
-    current_center = vector.linearlyInterpolate(
-        current_vert.getPosition("world"),
-        mr_current_vert.getPosition("world"))
+    current_center = vector.linearlyInterpolate(current_pos, mr_current_pos)
 
     length_percentage = 1
     if current_length != 0 or orig_length != 0:
@@ -318,6 +363,50 @@ def getGuideRelativeDictionaryLegacy(mesh, guideOrder):
 def yieldGuideRelativeDictionary(mesh, guideOrder, relativeGuide_dict):
     """create a dictionary of guide:[[shape.vtx[int]], relativeMatrix]
 
+    Args:
+        mesh (string): name of the mesh
+        guideOrder (list): the order to query the guide hierarchy
+
+    Returns:
+        dictionary: create a dictionary of guide:[[edgeIDs], relativeMatrix]
+    """
+    if not meshNavigation.NUMPY_READY:
+        for result in yieldGuideRelativeDictionaryLegacy(
+                mesh, guideOrder, relativeGuide_dict):
+            yield result
+        return
+
+    # the mesh data is read once, the closest vertices of all the guides are
+    # queried in one pass
+    mesh_index = meshNavigation.MeshSpatialIndex(mesh)
+    guides = [pm.PyNode(guide) for guide in guideOrder]
+    vertices, _ = mesh_index.closest_vertices(
+        [list(guide.getTranslation(space="world")) for guide in guides])
+
+    for guide, vertex in zip(guides, vertices):
+        vertexIds = [mesh_index.vertex_name(vertex)]
+        orig_ref_matrix = getVertMatrixFromIndex(mesh_index, vertex)
+        a_mat = guide.getMatrix(worldSpace=True)
+
+        mm = ((orig_ref_matrix - a_mat) * -1) + a_mat
+        pos = mm[3][:3]
+
+        mr_vertex = mesh_index.closest_vertex(pos)
+        mr_orig_ref_matrix = getVertMatrixFromIndex(mesh_index, mr_vertex)
+        vertexIds.append(mesh_index.vertex_name(mr_vertex))
+
+        relativeGuide_dict[guide.name()] = [vertexIds,
+                                            a_mat.get(),
+                                            orig_ref_matrix.get(),
+                                            mr_orig_ref_matrix.get()]
+        yield relativeGuide_dict
+
+
+def yieldGuideRelativeDictionaryLegacy(mesh, guideOrder, relativeGuide_dict):
+    """create a dictionary of guide:[[shape.vtx[int]], relativeMatrix]
+
+    Queries the mesh for each guide, used when NumPy isn't available.
+
     Args:
         mesh (string): name of the mesh
         guideOrder (list): the order to query the guide hierarchy
@@ -406,6 +495,8 @@ def yieldUpdateGuidePlacement(guideOrder, guideDictionary):
         guideOrder (list): of the hierarchy to crawl
         guideDictionary (dictionary): dict of the guide:edge, matrix position
     """
+    # the vertex positions are read from the mesh once
+    mesh_indices = {} if meshNavigation.NUMPY_READY else None
     for guide in guideOrder:
         if guide not in guideDictionary or not mc.objExists(guide):
             continue
@@ -419,7 +510,8 @@ def yieldUpdateGuidePlacement(guideOrder, guideDictionary):
         repoMatrix = getRepositionMatrix(pm.dt.Matrix(node_matrix),
                                          pm.dt.Matrix(orig_ref_matrix),
                                          pm.dt.Matrix(mr_orig_ref_matrix),
-                                         vertexIds)
+                                         vertexIds,
+                                         mesh_indices=mesh_indices)
         yield repoMatrix
 
 
@@ -1,13 +1,20 @@
 import json
 import os
+import subprocess
+import tempfile
 import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import maya.api.OpenMaya as om
 import maya.cmds as cmds
+import maya.utils as mayaUtils
 import mgear.pymaya as pm
 
+from mgear.core import utils as coreUtils
 from mgear.shifter import io
 from mgear.shifter import guide_manager
+from mgear.shifter import build_cache
+from mgear.shifter import template_cache
 
 try:
     import pyblish.api
@@ -29,6 +36,137 @@ except:
     )
 
 
+# Python code run by the mayapy worker processes, with the job file path as
+# argument. The standalone session is initialized before importing the builder.
+WORKER_SCRIPT = """
+import sys
+import maya.standalone
+maya.standalone.initialize(name="python")
+from mgear.shifter.rig_builder import builder
+builder.perform_worker_job(sys.argv[1])
+maya.standalone.uninitialize()
+"""
+
+
+def display_message(display, message):
+    """Displays a message from any thread.
+
+    The message is displayed by the main thread, when it is idle, as the
+    distributed build can run in a background thread.
+
+    Args:
+        display (callable): The display function, e.g. pm.displayInfo
+        message (str): The message
+    """
+    mayaUtils.executeDeferred(display, message)
+
+
+def run_worker_job(job_dir, index, data, row, validate, passed_only):
+    """Builds a row in a mayapy process, and waits for it to end.
+
+    The job and its result are exchanged as JSON files, and the process
+    output is written to a log file, in job_dir.
+
+    Args:
+        job_dir (str): The directory of the job, result and log files
+        index (int): The row index, naming the files
+        data (dict): The build data
+        row (dict): The row data
+        validate (bool): Option to run Pyblish validators
+        passed_only (bool): Option to publish only rigs that pass validation
+
+    Returns:
+        dict: The row result, with its success, validator results, report
+            and log path
+    """
+    name = "{:03d}_{}".format(index, row.get("output_name"))
+    job_path = os.path.join(job_dir, name + ".json")
+    result_path = os.path.join(job_dir, name + "_result.json")
+    log_path = os.path.join(job_dir, name + ".log")
+
+    with open(job_path, "w") as f:
+        json.dump(
+            {
+                "data": data,
+                "row": row,
+                "validate": validate,
+                "passed_only": passed_only,
+                "result_path": result_path,
+            },
+            f,
+        )
+    if os.path.exists(result_path):
+        os.remove(result_path)
+
+    # the worker finds mgear as this session does
+    env = os.environ.copy()
+    scripts_dir = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    )
+    env["PYTHONPATH"] = os.pathsep.join(
+        [scripts_dir] + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+
+    with open(log_path, "w") as log_file:
+        returncode = subprocess.call(
+            [coreUtils.get_mayapy_path(), "-c", WORKER_SCRIPT, job_path],
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+
+    result = {"success": False}
+    if os.path.exists(result_path):
+        with open(result_path, "r") as f:
+            result = json.load(f)
+    result["success"] = result["success"] and returncode == 0
+    result["log_path"] = log_path
+
+    return result
+
+
+def perform_worker_job(job_path):
+    """Builds the row of a job file, in a mayapy worker process.
+
+    The success, validator results and report of the row are written to the
+    result file of the job.
+
+    Args:
+        job_path (str): The job file written by run_worker_job
+    """
+    with open(job_path, "r") as f:
+        job = json.load(f)
+
+    output_name = job["row"].get("output_name")
+    result = {"success": False}
+    rig_builder = RigBuilder()
+    try:
+        result["report"] = rig_builder.build_row(
+            job["data"], job["row"], job["validate"], job["passed_only"]
+        )
+        result["success"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+        print(result["error"])
+
+    # the pyblish instances and errors are sent as strings
+    checks = rig_builder.results_dict.get(output_name)
+    if checks is not None:
+        result["results"] = {
+            check_name: {
+                "instance": str(check_data["instance"]),
+                "success": check_data["success"],
+                "error": None
+                if check_data["error"] is None
+                else str(check_data["error"]),
+            }
+            for check_name, check_data in checks.items()
+        }
+
+    with open(job["result_path"], "w") as f:
+        json.dump(result, f)
+
+
 class RigBuilder(object):
     def __init__(self):
         self.results_dict = {}
@@ -101,7 +239,9 @@ class RigBuilder(object):
         report_string = "\n".join(results)
         return valid, report_string
 
-    def execute_build_logic(self, json_data, validate=True, passed_only=False):
+    def execute_build_logic(
+        self, json_data, validate=True, passed_only=False, workers=0, retries=1
+    ):
         """
         Executes the rig building logic based on the provided JSON data.
         Optionally runs Pyblish validators on the builds.
@@ -110,6 +250,10 @@ class RigBuilder(object):
             json_data (str): A JSON string containing the necessary data
             validate (bool): Option to run Pyblish validators
             passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of mayapy processes building the rows at
+                the same time. With 0 or 1, the rows are built in this session
+            retries (int): Number of times a row failing in a worker process
+                is built again
         """
         if type(json_data) is str:
             data = json.loads(json_data)
@@ -119,71 +263,75 @@ class RigBuilder(object):
         data_rows = data.get("rows")
         if not data_rows:
             return
+
+        if workers > 1:
+            return self.execute_distributed_build_logic(
+                data, validate, passed_only, workers, retries
+            )
+
+        report_string = ""
         for row in data_rows:
             # Continue with the logic only if file_path is provided
-            file_path = row.get("file_path")
-            if not file_path:
+            if not row.get("file_path"):
                 return
 
-            output_folder = data.get("output_folder")
-            if not output_folder:
-                output_folder = os.path.dirname(file_path)
-            
-            custom_output_path = row.get("custom_output_path")
-            
-            # if row has a custom path, override output folder with custom path
-            if custom_output_path:
-                print(f"custom output{custom_output_path}")
-                output_folder = custom_output_path
-                
-
-            output_name = row.get("output_name")
-            maya_file_name = "{}.ma".format(output_name)
-            maya_file_path = os.path.join(output_folder, maya_file_name)
-
-            pre_script_path = data.get("pre_script")
-            if pre_script_path:
-                io.import_guide_template(file_path)
-                guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
-                if guide_root:
-                    guide_root = guide_root[0]
-                    pm.displayInfo(
-                        "Updating the guide with pre-script: {}".format(pre_script_path)
-                    )
-                    with open(pre_script_path, "r") as file:
-                        try:
-                            exec(file.read())
-                        except Exception as e:
-                            error_message = str(e)
-                            full_traceback = traceback.format_exc()
-                            pm.displayWarning(
-                                "Update script failed, check error log"
-                            )
-                            pm.displayError(
-                                "Exception message:", error_message
-                            )
-                            pm.displayError("Full traceback:", full_traceback)
-
-                    pm.select(guide_root, r=True)
-                    pm.displayInfo("Building rig '{}'...".format(output_name))
-                    guide_manager.build_from_selection()
-                    pm.delete(guide_root)
-                else:
-                    pm.displayWarning("Guide not found.")
-            else:
-                pm.displayInfo("Building rig '{}'...".format(output_name))
-                io.build_from_file(file_path)
+            report_string = self.build_row(data, row, validate, passed_only)
+
+        if validate:
+            pm.displayInfo(report_string)
 
-            post_script_path = data.get("post_script")
-            
-            if post_script_path:
+        return self.results_dict
+
+    def get_cache_key(self, data, file_path):
+        """Gets the build cache key of a row.
+
+        Args:
+            data (dict): The build data, with the scripts
+            file_path (str): The guide template file path
+
+        Returns:
+            str: The key, None if the build cache is disabled or the
+                template build can't be cached
+        """
+        if not build_cache.get_cache_directory():
+            return None
+
+        conf = template_cache.load(file_path)
+        if not conf or not build_cache.is_cacheable(conf):
+            return None
+
+        # the post script runs after importing the cached build
+        scripts = [path for path in [data.get("pre_script")] if path]
+        return build_cache.get_key(
+            conf, build_cache.get_build_files(conf) + scripts
+        )
+
+    def build_rig(self, data, file_path, output_name):
+        """Builds the rig of a row, running the pre script.
+
+        Args:
+            data (dict): The build data, with the scripts
+            file_path (str): The guide template file path
+            output_name (str): The rig output name
+
+        Returns:
+            bool: False if the pre script failed, or the guide wasn't found
+        """
+        success = True
+        pre_script_path = data.get("pre_script")
+        if pre_script_path:
+            io.import_guide_template(file_path)
+            guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
+            if guide_root:
+                guide_root = guide_root[0]
                 pm.displayInfo(
-                        "Updating the guide with post-script: {}".format(post_script_path)
-                    )
-                with open(post_script_path, "r") as file:
+                    "Updating the guide with pre-script: {}".format(pre_script_path)
+                )
+                with open(pre_script_path, "r") as file:
                     try:
                         exec(file.read())
                     except Exception as e:
+                        success = False
                         error_message = str(e)
                         full_traceback = traceback.format_exc()
                         pm.displayWarning(
@@ -194,31 +342,215 @@ class RigBuilder(object):
                         )
                         pm.displayError("Full traceback:", full_traceback)
 
-            context = None
-            save_build = True
-            report_string = self.format_report_header()
-
-            if PYBLISH_READY and validate:
-                pm.displayInfo("Validating rig '{}'...\n".format(output_name))
-                context = self.run_validators()
-                self.build_results_dict(output_name, context)
-                valid, report = self.generate_instance_report(output_name)
-
-                report_string += "{}\n".format(report)
-                if passed_only and not valid:
-                    save_build = False
-                    pm.displayInfo(
-                        "Found errors, please fix and rebuild the rig."
+                pm.select(guide_root, r=True)
+                pm.displayInfo("Building rig '{}'...".format(output_name))
+                guide_manager.build_from_selection()
+                pm.delete(guide_root)
+            else:
+                success = False
+                pm.displayWarning("Guide not found.")
+        else:
+            pm.displayInfo("Building rig '{}'...".format(output_name))
+            # the build cache of the row is recording, io doesn't use it
+            io.build_from_file(file_path)
+
+        return success
+
+    def run_post_script(self, data):
+        """Runs the post script of the build data on the built rig.
+
+        Args:
+            data (dict): The build data, with the scripts
+        """
+        post_script_path = data.get("post_script")
+
+        if post_script_path:
+            pm.displayInfo(
+                    "Updating the guide with post-script: {}".format(post_script_path)
+                )
+            with open(post_script_path, "r") as file:
+                try:
+                    exec(file.read())
+                except Exception as e:
+                    error_message = str(e)
+                    full_traceback = traceback.format_exc()
+                    pm.displayWarning(
+                        "Update script failed, check error log"
+                    )
+                    pm.displayError(
+                        "Exception message:", error_message
                     )
+                    pm.displayError("Full traceback:", full_traceback)
 
-                report_string += "{}\n".format(" -" * 35)
+    def build_row(self, data, row, validate=True, passed_only=False):
+        """Builds, validates and saves the rig of a row, in this session.
 
-            cmds.file(rename=maya_file_path)
-            cmds.file(save=save_build, type="mayaAscii")
-            cmds.file(new=True, force=True)
+        Args:
+            data (dict): The build data, with the output folder and scripts
+            row (dict): The row data, with the file path and output name
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
 
+        Returns:
+            str: The validator report of the row
+        """
+        file_path = row.get("file_path")
+        output_folder = data.get("output_folder")
+        if not output_folder:
+            output_folder = os.path.dirname(file_path)
+
+        custom_output_path = row.get("custom_output_path")
+
+        # if row has a custom path, override output folder with custom path
+        if custom_output_path:
+            print(f"custom output{custom_output_path}")
+            output_folder = custom_output_path
+
+        output_name = row.get("output_name")
+        maya_file_name = "{}.ma".format(output_name)
+        maya_file_path = os.path.join(output_folder, maya_file_name)
+
+        cache_key = self.get_cache_key(data, file_path)
+        output_files = []
+        if cache_key:
+            conf = template_cache.load(file_path)
+            output_files = build_cache.get_output_files(conf)
+        with build_cache.CachedBuild(cache_key, output_files) as cached:
+            # the failed builds are not cached
+            if not cached.hit and not self.build_rig(
+                data, file_path, output_name
+            ):
+                cached.discard()
+        self.run_post_script(data)
+
+        context = None
+        save_build = True
+        report_string = self.format_report_header()
+
+        if PYBLISH_READY and validate:
+            pm.displayInfo("Validating rig '{}'...\n".format(output_name))
+            context = self.run_validators()
+            self.build_results_dict(output_name, context)
+            valid, report = self.generate_instance_report(output_name)
+
+            report_string += "{}\n".format(report)
+            if passed_only and not valid:
+                save_build = False
+                pm.displayInfo(
+                    "Found errors, please fix and rebuild the rig."
+                )
+
+            report_string += "{}\n".format(" -" * 35)
+
+        cmds.file(rename=maya_file_path)
+        cmds.file(save=save_build, type="mayaAscii")
+        cmds.file(new=True, force=True)
+
+        return report_string
+
+    def execute_distributed_build_logic(
+        self, data, validate=True, passed_only=False, workers=2, retries=1,
+        on_row_done=None
+    ):
+        """
+        Builds the rows in parallel, each one in a headless mayapy process.
+
+        The results of each row are added to self.results_dict as soon as its
+        process ends. A row failing with an error is built again, up to
+        retries times.
+
+        It only waits for the processes, so it can run in a background
+        thread to keep Maya responsive. The messages are then displayed by
+        the main thread, and on_row_done is called from the running thread.
+
+        Args:
+            data (dict): The build data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of mayapy processes running at the same time
+            retries (int): Number of times a failed row is built again
+            on_row_done (callable): Called with the output name, success and
+                report of each row when its process ends
+
+        Returns:
+            dict: The validator results, by output name
+        """
+        rows = [row for row in data.get("rows", []) if row.get("file_path")]
+        if not rows:
+            return self.results_dict
+
+        job_dir = tempfile.mkdtemp(prefix="mgear_rig_builder_")
+        display_message(
+            pm.displayInfo,
+            "Building {} rigs with {} workers, logs: {}".format(
+                len(rows), workers, job_dir
+            ),
+        )
+
+        report_strings = []
+        failed = []
+        attempts = dict()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = dict()
+            for index, row in enumerate(rows):
+                future = executor.submit(
+                    run_worker_job,
+                    job_dir, index, data, row, validate, passed_only
+                )
+                pending[future] = index
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    row = rows[index]
+                    output_name = row.get("output_name")
+                    result = future.result()
+
+                    attempts[index] = attempts.get(index, 0) + 1
+                    if not result["success"] and attempts[index] <= retries:
+                        display_message(
+                            pm.displayWarning,
+                            "Rig '{}' failed, building it again...".format(
+                                output_name
+                            ),
+                        )
+                        future = executor.submit(
+                            run_worker_job,
+                            job_dir, index, data, row, validate, passed_only
+                        )
+                        pending[future] = index
+                        continue
+
+                    if result["success"]:
+                        display_message(
+                            pm.displayInfo,
+                            "Rig '{}' built.".format(output_name),
+                        )
+                    else:
+                        failed.append(output_name)
+                        display_message(
+                            pm.displayError,
+                            "Rig '{}' failed, see log: {}".format(
+                                output_name, result["log_path"]
+                            ),
+                        )
+                    if result.get("results") is not None:
+                        self.results_dict[output_name] = result["results"]
+                    report_strings.append(result.get("report", ""))
+
+                    if on_row_done:
+                        on_row_done(
+                            output_name, result["success"], result.get("report")
+                        )
+
+        if failed:
+            display_message(
+                pm.displayWarning,
+                "Failed to build {} rigs: {}".format(len(failed), failed),
+            )
         if validate:
-            pm.displayInfo(report_string)
+            display_message(pm.displayInfo, "".join(report_strings))
 
         return self.results_dict
 
@@ -3,7 +3,7 @@ import json
 
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
-from mgear.vendor.Qt import QtGui, QtWidgets
+from mgear.vendor.Qt import QtCore, QtGui, QtWidgets
 from mgear.core import pyqt, widgets
 from mgear.shifter.rig_builder import builder
 
@@ -26,6 +26,7 @@ class RigBuilderUI(
         self.resize(900, 650)
 
         self.builder = builder.RigBuilder()
+        self.build_thread = None
         self.create_actions()
         self.create_layout()
         self.create_connections()
@@ -83,6 +84,19 @@ class RigBuilderUI(
             "Publish Passed Rigs Only"
         )
         run_validators_layout.addWidget(self.publish_passed_checkbox)
+        run_validators_layout.addStretch()
+
+        # Rigs built at the same time by mayapy processes, 1 builds them in
+        # this session
+        self.workers_spinbox = QtWidgets.QSpinBox()
+        self.workers_spinbox.setRange(1, os.cpu_count() or 1)
+        self.workers_spinbox.setValue(1)
+        self.workers_spinbox.setToolTip(
+            "Number of rigs built at the same time in background mayapy "
+            "processes. With 1, the rigs are built in this session."
+        )
+        run_validators_layout.addWidget(QtWidgets.QLabel("Parallel Builds"))
+        run_validators_layout.addWidget(self.workers_spinbox)
 
         if not builder.PYBLISH_READY:
             self.run_validators_checkbox.setEnabled(False)
@@ -151,6 +165,12 @@ class RigBuilderUI(
         self.layout.addWidget(self.remove_button)
         self.layout.addWidget(self.build_button)
 
+        # Rigs built by the mayapy processes
+        self.build_progress_bar = QtWidgets.QProgressBar()
+        self.build_progress_bar.setFormat("%v / %m rigs built")
+        self.build_progress_bar.setHidden(True)
+        self.layout.addWidget(self.build_progress_bar)
+
     def create_connections(self):
         """Connects buttons to their functions."""
 
@@ -229,11 +249,67 @@ class RigBuilderUI(
         data = self.collect_table_data()
         validate = self.run_validators_checkbox.isChecked()
         passed_rigs_only = self.publish_passed_checkbox.isChecked()
+        workers = self.workers_spinbox.value()
+        if workers > 1:
+            self.start_distributed_build(
+                json.loads(data), validate, passed_rigs_only, workers
+            )
+            return
+
         results_dict = self.builder.execute_build_logic(
-            data, validate=validate, passed_only=passed_rigs_only
+            data,
+            validate=validate,
+            passed_only=passed_rigs_only,
+        )
+        self.on_build_completed(results_dict)
+
+    def start_distributed_build(self, data, validate, passed_only, workers):
+        """Builds the rigs in mayapy processes, from a background thread.
+
+        Args:
+            data (dict): The build data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of mayapy processes running at the same time
+        """
+        rows = [row for row in data["rows"] if row.get("file_path")]
+        if not rows:
+            return
+
+        self.build_button.setEnabled(False)
+        self.build_progress_bar.setRange(0, len(rows))
+        self.build_progress_bar.setValue(0)
+        self.build_progress_bar.setHidden(False)
+
+        self.build_thread = DistributedBuildThread(
+            self.builder, data, validate, passed_only, workers
         )
+        self.build_thread.row_done.connect(self.on_row_done)
+        self.build_thread.completed.connect(self.on_build_completed)
+        self.build_thread.start()
+
+    def on_row_done(self, output_name, success, report):
+        """Updates the build progress when a rig is built or failed.
+
+        Args:
+            output_name (str): The rig output name
+            success (bool): True if the rig was built
+            report (str): The validator report of the rig
+        """
+        self.build_progress_bar.setValue(self.build_progress_bar.value() + 1)
+
+    def on_build_completed(self, results_dict):
+        """Shows the validator results once all the rigs are built.
+
+        Args:
+            results_dict (dict): validator result data generated by RigBuilder
+        """
+        self.build_thread = None
+        self.build_button.setEnabled(True)
+        self.build_progress_bar.setHidden(True)
         if (
-            self.run_validators_checkbox.isChecked()
+            results_dict is not None
+            and self.run_validators_checkbox.isChecked()
             and self.results_popup_checkbox.isChecked()
         ):
             self.create_results_popup(results_dict)
@@ -391,6 +467,46 @@ class RigBuilderUI(
             custom_path_widget.setText(folder_path)
 
 
+class DistributedBuildThread(QtCore.QThread):
+    """Thread waiting for the mayapy processes of a distributed build."""
+
+    row_done = QtCore.Signal(str, bool, object)
+    completed = QtCore.Signal(object)
+
+    def __init__(self, rig_builder, data, validate, passed_only, workers):
+        """
+        Args:
+            rig_builder (RigBuilder): The builder storing the results
+            data (dict): The build data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Number of mayapy processes running at the same time
+        """
+        super(DistributedBuildThread, self).__init__()
+        self.rig_builder = rig_builder
+        self.data = data
+        self.validate = validate
+        self.passed_only = passed_only
+        self.workers = workers
+
+        # Makes sure the Thread removes itself
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        """Builds the rows, emitting row_done as each process ends."""
+        results_dict = None
+        try:
+            results_dict = self.rig_builder.execute_distributed_build_logic(
+                self.data,
+                self.validate,
+                self.passed_only,
+                self.workers,
+                on_row_done=self.row_done.emit,
+            )
+        finally:
+            self.completed.emit(results_dict)
+
+
 class ResultsPopupDialog(QtWidgets.QDialog):
     """
     A custom pop-up to display Pyblish validator results.
@@ -0,0 +1,465 @@
+"""Shifter guide template (.sgt) normalization cache.
+
+Building a rig from a template file only needs the Maya nodes creation on
+the main thread. The work depending only on the template content is done
+ahead in a background thread and cached by the content hash:
+
+    * schema check of the guide root and the components
+    * parent resolution, the components order is kept
+    * naming rules validation, solving them for each component. The
+      failures are logged as warnings, like the build does
+    * parameter defaults for the parameters missing in old templates
+    * serialization of the guide_data stored in the rig
+
+The parameter defaults are read from the guide classes, which are only
+imported in the main thread. They are cached by component type, so once a
+type is known the templates using it are fully normalized in the
+background.
+
+load returns a copy of the cached template, so the builds can edit it. A
+prefetched template is only used if its file hasn't changed since.
+
+Example:
+    >>> from mgear.shifter import io, template_cache
+    >>> template_cache.prefetch(paths)
+    >>> for path in paths:
+    ...     cmds.file(new=True, force=True)
+    ...     io.build_from_file(path)
+"""
+import collections
+import copy
+import hashlib
+import json
+import os
+import threading
+from concurrent import futures
+
+import mgear
+import mgear.pymaya as pm
+from mgear.shifter import naming
+
+ROOT_KEYS = ["guide_root", "components_list", "components_dict"]
+COMPONENT_KEYS = ["param_values", "tra", "atra", "pos", "apos", "blade"]
+COMPONENT_PARAMS = ["comp_type", "comp_name", "comp_side", "comp_index"]
+
+# number of normalized templates kept in memory
+CACHE_SIZE = 16
+
+# key of the guide root in the defaults cache
+ROOT_TYPE = None
+
+__lock = threading.Lock()
+__cache = collections.OrderedDict()
+# entries of the last templates returned by load, by id of the copy
+__by_id = collections.OrderedDict()
+__pending = {}
+__defaults = {}
+__pool = [None]
+
+
+def template_hash(data):
+    """Get the hash of a template content.
+
+    Args:
+        data (bytes or str): The template file content
+
+    Returns:
+        str: The hash
+    """
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+def clear():
+    """Clear the cached templates and parameter defaults."""
+    with __lock:
+        __cache.clear()
+        __by_id.clear()
+        __pending.clear()
+        __defaults.clear()
+
+
+######################################
+# Normalization
+######################################
+
+
+def _check_schema(conf, errors):
+    if not isinstance(conf, dict):
+        errors.append("The template is not a dictionary")
+        return
+
+    for key in ROOT_KEYS:
+        if key not in conf:
+            errors.append("Missing template key: {}".format(key))
+    if errors:
+        return
+
+    if "param_values" not in conf["guide_root"]:
+        errors.append("Missing guide root key: param_values")
+
+    components_dict = conf["components_dict"]
+    for comp in conf["components_list"]:
+        c_dict = components_dict.get(comp)
+        if c_dict is None:
+            errors.append("Missing component data: {}".format(comp))
+            continue
+        for key in COMPONENT_KEYS:
+            if key not in c_dict:
+                errors.append("{}: missing key {}".format(comp, key))
+        for param in COMPONENT_PARAMS:
+            if param not in c_dict.get("param_values", {}):
+                errors.append("{}: missing parameter {}".format(comp, param))
+
+
+def _resolve_parents(conf, errors):
+    """Check the parent component of each component is in the template.
+
+    The components_list and child_components orders are kept.
+    """
+    components_dict = conf["components_dict"]
+    components = set(conf["components_list"])
+    for comp in conf["components_list"]:
+        c_dict = components_dict[comp]
+        c_dict.setdefault("parent_localName", None)
+        parent = c_dict.setdefault("parent_fullName", None)
+        if parent and parent not in components:
+            errors.append(
+                "{}: can't find the parent component {}".format(comp, parent)
+            )
+
+
+def _apply_defaults(conf):
+    """Add the missing parameters with their default values.
+
+    Returns:
+        set: The component types whose defaults aren't known yet
+    """
+    missing = set()
+    items = [(ROOT_TYPE, conf["guide_root"])]
+    for comp in conf["components_list"]:
+        c_dict = conf["components_dict"][comp]
+        items.append((c_dict["param_values"]["comp_type"], c_dict))
+
+    for comp_type, data in items:
+        defaults = __defaults.get(comp_type)
+        if defaults is None:
+            missing.add(comp_type)
+            continue
+        values = data["param_values"]
+        for name, value in defaults.items():
+            if name not in values:
+                values[name] = copy.deepcopy(value)
+
+    return missing
+
+
+def _solve_names(conf, warnings):
+    """Validate the naming rules and solve them for each component."""
+    root_values = conf["guide_root"]["param_values"]
+    rules = {}
+    for ext in ("ctl", "jnt"):
+        prefix = "joint" if ext == "jnt" else "ctl"
+        rule = root_values.get("{}_name_rule".format(prefix))
+        if not rule:
+            continue
+        if not naming.name_rule_validator(
+            rule, naming.NAMING_RULE_TOKENS, log=False
+        ):
+            warnings.append(
+                "Invalid {} naming rule: {}".format(prefix, rule)
+            )
+            continue
+        rules[ext] = rule
+
+    if not rules:
+        return
+
+    sides = {
+        "ctl": {
+            "L": root_values.get("side_left_name", naming.DEFAULT_SIDE_L_NAME),
+            "R": root_values.get(
+                "side_right_name", naming.DEFAULT_SIDE_R_NAME
+            ),
+            "C": root_values.get(
+                "side_center_name", naming.DEFAULT_SIDE_C_NAME
+            ),
+        },
+        "jnt": {
+            "L": root_values.get(
+                "side_joint_left_name", naming.DEFAULT_JOINT_SIDE_L_NAME
+            ),
+            "R": root_values.get(
+                "side_joint_right_name", naming.DEFAULT_JOINT_SIDE_R_NAME
+            ),
+            "C": root_values.get(
+                "side_joint_center_name", naming.DEFAULT_JOINT_SIDE_C_NAME
+            ),
+        },
+    }
+    extensions = {
+        "ctl": (
+            root_values.get("ctl_name_ext", naming.DEFAULT_CTL_EXT_NAME),
+            root_values.get("ctl_index_padding", 0),
+        ),
+        "jnt": (
+            root_values.get("joint_name_ext", naming.DEFAULT_JOINT_EXT_NAME),
+            root_values.get("joint_index_padding", 0),
+        ),
+    }
+
+    for ext, rule in rules.items():
+        for comp in conf["components_list"]:
+            params = conf["components_dict"][comp]["param_values"]
+            side = params["comp_side"]
+            values = {
+                "component": params["comp_name"],
+                "side": sides[ext].get(side, side),
+                "index": str(params["comp_index"]),
+                "padding": extensions[ext][1],
+                "description": "root",
+                "extension": extensions[ext][0],
+            }
+            if not naming.name_solve(rule, values, validate=False):
+                warnings.append(
+                    "{}: can't solve the {} naming rule {}".format(
+                        comp, ext, rule
+                    )
+                )
+
+
+def _normalize(conf, content_hash):
+    errors = []
+    warnings = []
+    missing = set()
+
+    _check_schema(conf, errors)
+    if not errors:
+        _resolve_parents(conf, errors)
+    if not errors:
+        missing = _apply_defaults(conf)
+        _solve_names(conf, warnings)
+
+    entry = {
+        "hash": content_hash,
+        "conf": conf,
+        "errors": errors,
+        "warnings": warnings,
+        "missing_types": missing,
+        "guide_data": None,
+    }
+    if not errors and not missing:
+        entry["guide_data"] = json.dumps(conf)
+
+    return entry
+
+
+def _store(entry):
+    with __lock:
+        if entry["hash"] in __cache:
+            return __cache[entry["hash"]]
+
+        __cache[entry["hash"]] = entry
+        while len(__cache) > CACHE_SIZE:
+            __cache.popitem(last=False)
+
+    return entry
+
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime, stat.st_size
+
+
+def _prefetch(file_path):
+    """Read a template file, with the file signature before reading it."""
+    signature = _file_signature(file_path)
+    return signature, _read(file_path)
+
+
+def _read(file_path):
+    """Read and normalize a template file, using the cache if possible."""
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    content_hash = template_hash(data)
+    with __lock:
+        entry = __cache.get(content_hash)
+        if entry is not None:
+            __cache.move_to_end(content_hash)
+            return entry
+
+    try:
+        conf = json.loads(data.decode("utf-8"))
+    except ValueError as e:
+        return {
+            "hash": content_hash,
+            "conf": None,
+            "errors": ["Can't parse the template: {}".format(e)],
+            "warnings": [],
+            "missing_types": set(),
+            "guide_data": None,
+        }
+
+    return _store(_normalize(conf, content_hash))
+
+
+######################################
+# Parameter defaults
+######################################
+
+
+def _get_defaults(comp_type):
+    """Get the parameter defaults of a component type, in the main thread.
+
+    Args:
+        comp_type (str): The component type, ROOT_TYPE for the guide root
+
+    Returns:
+        dict: The default values, None if the type can't be found
+    """
+    if comp_type in __defaults:
+        return __defaults[comp_type]
+
+    if comp_type is ROOT_TYPE:
+        from mgear.shifter import guide
+
+        defaults = guide.Rig().get_param_values()
+    else:
+        import mgear.shifter as shifter
+
+        try:
+            module = shifter.importComponentGuide(comp_type)
+        except ImportError:
+            return None
+        defaults = module.Guide().get_param_values()
+
+    __defaults[comp_type] = defaults
+    return defaults
+
+
+def _finish(entry):
+    """Apply the parameter defaults still missing in an entry."""
+    if not entry["missing_types"]:
+        return
+
+    for comp_type in entry["missing_types"]:
+        if _get_defaults(comp_type) is None:
+            error = "Can't find the component type: {}".format(comp_type)
+            if error not in entry["errors"]:
+                entry["errors"].append(error)
+
+    with __lock:
+        if entry["missing_types"] and not entry["errors"]:
+            _apply_defaults(entry["conf"])
+            entry["missing_types"] = set()
+            entry["guide_data"] = json.dumps(entry["conf"])
+
+
+######################################
+# Public
+######################################
+
+
+def load_async(file_path):
+    """Start the normalization of a template file in a background thread.
+
+    Args:
+        file_path (str): The template file path
+
+    Returns:
+        concurrent.futures.Future: The future of the normalization. Its
+            result is the file signature, modification time and size, and
+            the cache entry
+    """
+    file_path = os.path.abspath(file_path)
+    with __lock:
+        future = __pending.get(file_path)
+        if future is None:
+            if __pool[0] is None:
+                __pool[0] = futures.ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="shifter_template"
+                )
+            future = __pool[0].submit(_prefetch, file_path)
+            __pending[file_path] = future
+
+    return future
+
+
+def prefetch(file_paths):
+    """Normalize several template files in the background.
+
+    The next load of each file uses the result, if the file hasn't changed.
+
+    Args:
+        file_paths (list of str): The template file paths
+
+    Returns:
+        list: The futures of the normalizations
+    """
+    return [load_async(path) for path in file_paths]
+
+
+def load(file_path):
+    """Get the normalized template of a file.
+
+    Args:
+        file_path (str): The template file path
+
+    Returns:
+        dict: A copy of the normalized template, None if it isn't valid
+    """
+    with __lock:
+        future = __pending.pop(os.path.abspath(file_path), None)
+
+    entry = None
+    if future is not None:
+        signature, entry = future.result()
+        # the file changed after prefetching it
+        if signature != _file_signature(file_path):
+            entry = None
+    if entry is None:
+        entry = _read(file_path)
+
+    _finish(entry)
+    conf = _report(entry, file_path)
+    if conf is None:
+        return None
+
+    conf = copy.deepcopy(conf)
+    with __lock:
+        __by_id[id(conf)] = entry
+        while len(__by_id) > CACHE_SIZE:
+            __by_id.popitem(last=False)
+    return conf
+
+
+def _report(entry, source):
+    for warning in entry["warnings"]:
+        mgear.log("{}: {}".format(source, warning), mgear.sev_warning)
+
+    if entry["errors"]:
+        for error in entry["errors"]:
+            mgear.log("{}: {}".format(source, error), mgear.sev_error)
+        pm.displayError("Invalid guide template: {}".format(source))
+        return None
+
+    return entry["conf"]
+
+
+def guide_data(conf):
+    """Get the serialized guide data of a template.
+
+    Args:
+        conf (dict): The guide template
+
+    Returns:
+        str: The JSON string, from the cache if the template comes from load
+            and wasn't edited since
+    """
+    entry = __by_id.get(id(conf))
+    if entry is not None and entry["guide_data"] and entry["conf"] == conf:
+        return entry["guide_data"]
+
+    return json.dumps(conf)
@@ -3,24 +3,169 @@
 
 """
 ueGear Client to interact with ueGear Commands within Unreal Engine.
+
+The requests are sent over persistent HTTP connections, pooled by server, so
+the TCP connection is not opened again on each call. Several calls can be sent
+in a single request with the Unreal Remote Control batch endpoint, and calls
+can run on a background thread, returning futures.
 """
 
 from __future__ import print_function, division, absolute_import
 
+import ast
+import errno
 import json
 import pprint
+import socket
+import threading
 
-from mgear.core.six.moves import urllib
-
-# from urllib.request import urlopen, Request
-
-Request = urllib.request.Request
-urlopen = urllib.request.urlopen
+from mgear.core.six.moves import http_client
 
 from mgear.uegear import log
 
 logger = log.uegear_logger
 
+CALL_ROUTE = "/remote/object/call"
+BATCH_ROUTE = "/remote/batch"
+
+# maximum number of idle connections kept alive by server
+POOL_SIZE = 4
+
+# errors of a reused connection closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    getattr(http_client, "RemoteDisconnected", http_client.BadStatusLine),
+)
+STALE_CONNECTION_ERRNOS = (errno.ECONNRESET, errno.ECONNABORTED, errno.EPIPE)
+
+# idle connections by (host address, port)
+__pools = {}
+__pools_lock = threading.Lock()
+
+# thread pool of the non blocking calls, created on first use
+__executor = None
+
+
+# =====================================================================================================================
+# CONNECTION POOL
+# =====================================================================================================================
+
+
+def acquire_connection(host_address, port, timeout):
+    """
+    Returns an idle keep-alive connection to the given server, or a new one.
+
+    :param str host_address: server host address.
+    :param int port: server port.
+    :param float timeout: time in seconds after which the requests will timeout.
+    :return: HTTP connection to the server.
+    :rtype: http_client.HTTPConnection
+    """
+
+    with __pools_lock:
+        idle = __pools.get((host_address, port))
+        connection = idle.pop() if idle else None
+
+    if connection is None:
+        return http_client.HTTPConnection(host_address, port, timeout=timeout)
+
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+
+    return connection
+
+
+def is_stale_connection_error(error):
+    """
+    Returns whether the error is raised by a connection closed by the server, before reading the response.
+    The timeouts are not, the server may still be running the request.
+
+    :param Exception error: error raised sending the request or getting the response.
+    :return: True if the request can be sent again on a new connection.
+    :rtype: bool
+    """
+
+    if isinstance(error, socket.timeout):
+        return False
+    if isinstance(error, STALE_CONNECTION_ERRORS):
+        return True
+
+    return getattr(error, "errno", None) in STALE_CONNECTION_ERRNOS
+
+
+def release_connection(host_address, port, connection):
+    """
+    Gives back a connection to the pool, so next requests reuse it.
+
+    :param str host_address: server host address.
+    :param int port: server port.
+    :param http_client.HTTPConnection connection: connection to release.
+    """
+
+    with __pools_lock:
+        idle = __pools.setdefault((host_address, port), list())
+        if len(idle) < POOL_SIZE:
+            idle.append(connection)
+            return
+
+    connection.close()
+
+
+def close_connections():
+    """
+    Closes all the idle connections of the pool.
+    """
+
+    with __pools_lock:
+        connections = [c for idle in __pools.values() for c in idle]
+        __pools.clear()
+
+    for connection in connections:
+        connection.close()
+
+
+def get_executor():
+    """
+    Returns the thread pool running the non blocking calls.
+
+    :return: thread pool executor.
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+
+    global __executor
+
+    with __pools_lock:
+        if __executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            __executor = ThreadPoolExecutor(max_workers=POOL_SIZE)
+
+    return __executor
+
+
+def decode_return(value):
+    """
+    Returns the Python value of a return string sent by the server.
+
+    The value is parsed as JSON, then as a Python literal. Unlike eval, no
+    code sent by the server is ever run.
+
+    :param value: return value to decode.
+    :return: decoded value, or the given value if it can not be decoded.
+    """
+
+    if not isinstance(value, str):
+        return value
+
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
 
 class UeGearBridge(object):
     """
@@ -35,8 +180,8 @@ class UeGearBridge(object):
         self._timeout = (
             1000  # connection to the server will time out after this value.
         )
-        self._echo_execution = True  # whether client should print the response coming from server.
-        self._echo_payload = True  # whether client should print the JSON payload it's sending to server.
+        self._echo_execution = False  # whether client should log the response coming from server.
+        self._echo_payload = False  # whether client should log the JSON payload it's sending to server.
         self._is_executing = (
             False  # whether client is still executing a command.
         )
@@ -100,6 +245,77 @@ class UeGearBridge(object):
     # BASE
     # =================================================================================================================
 
+    def payload(self, command, parameters=None):
+        """
+        Returns the JSON payload calling given command.
+
+        :param str command: The command name that you want to execute within PyUeGearCommands class.
+        :param dict parameters: arguments for the command to execute.
+        :return: remote object call payload.
+        :rtype: dict
+        """
+
+        return {
+            "objectPath": self._commands_object_path,
+            "functionName": command,
+            "parameters": parameters or dict(),
+            "generateTransaction": True,
+        }
+
+    def request(self, route, body, timeout=0):
+        """
+        Sends a PUT request to the server, on a pooled keep-alive connection.
+
+        A reused connection may have been closed by the server while idle, so
+        the request is sent again once on a new connection if the reused one is
+        reset or disconnected before getting the response. Timeouts are never
+        retried.
+
+        :param str route: server route, for example "/remote/object/call".
+        :param dict body: JSON body of the request.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: JSON response of the server.
+        :rtype: dict
+        :raises: IOError if the server can not be reached.
+        """
+
+        timeout = timeout if timeout > 0 else self._timeout
+        data = json.dumps(body).encode("ascii")
+
+        for attempt in range(2):
+            connection = acquire_connection(
+                self._host_address, self._port, timeout
+            )
+            reused = connection.sock is not None
+            try:
+                connection.request("PUT", route, data, self._headers)
+                response = connection.getresponse()
+            except (http_client.HTTPException, socket.error) as error:
+                connection.close()
+                if attempt or not reused or not is_stale_connection_error(error):
+                    raise
+                continue
+
+            try:
+                content = response.read()
+            except (http_client.HTTPException, socket.error):
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                release_connection(self._host_address, self._port, connection)
+
+            return json.loads(content.decode("utf-8"))
+
+    def _echo(self, payload, response):
+        if self._echo_payload:
+            logger.info(pprint.pformat(payload))
+
+        if self._echo_execution:
+            logger.info(pprint.pformat(response))
+
     def execute(self, command, parameters=None, timeout=0):
         """
         Executes given command for this client. The server will look for this command in the modules it has loaded.
@@ -113,41 +329,99 @@ class UeGearBridge(object):
         """
 
         self._is_executing = True
-        timeout = timeout if timeout > 0 else self._timeout
-        parameters = parameters or dict()
+        payload = self.payload(command, parameters)
 
-        url = "http://{}:{}/remote/object/call".format(
-            self._host_address, self._port
-        )
-        payload = {
-            "objectPath": self._commands_object_path,
-            "functionName": command,
-            "parameters": parameters,
-            "generateTransaction": True,
-        }
         try:
-            request = Request(
-                url,
-                json.dumps(payload).encode("ascii"),
-                self._headers,
-                method="PUT",
-            )
-            with urlopen(request, timeout=timeout) as response:
-                response = json.load(response)
+            response = self.request(CALL_ROUTE, payload, timeout)
         except Exception:
+            logger.debug("Remote call failed", exc_info=True)
             response = {"return": False}
+        if "return" in response:
+            response = {"return": decode_return(response["return"])}
+
+        self._echo(payload, response)
+        self._is_executing = False
+
+        return response
+
+    def execute_batch(self, calls, timeout=0):
+        """
+        Executes several commands in a single request to the server.
+
+        :param list(tuple(str, dict)) calls: command names and parameters to execute, in order.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: responses coming from the Unreal Remote Server, in the order of the calls. A failed call response
+            is {"return": False}, as with execute.
+        :rtype: list(dict)
+        """
+
+        if not calls:
+            return list()
+
+        self._is_executing = True
+        payloads = [self.payload(*call) for call in calls]
+        body = {
+            "Requests": [
+                {
+                    "RequestId": i,
+                    "URL": CALL_ROUTE,
+                    "Verb": "PUT",
+                    "Body": payload,
+                }
+                for i, payload in enumerate(payloads)
+            ]
+        }
+
+        responses = [{"return": False} for _ in payloads]
         try:
-            evaluated_return = eval(response.get("return"))
-            response = {"return": evaluated_return}
+            batch = self.request(BATCH_ROUTE, body, timeout)
         except Exception:
-            pass
+            logger.debug("Remote batch call failed", exc_info=True)
+            batch = dict()
+
+        for result in batch.get("Responses", list()):
+            index = result.get("RequestId")
+            body = result.get("ResponseBody")
+            if isinstance(body, str):
+                body = decode_return(body)
+            if (
+                isinstance(index, int)
+                and 0 <= index < len(responses)
+                and result.get("ResponseCode", 200) < 300
+                and isinstance(body, dict)
+            ):
+                if "return" in body:
+                    body = {"return": decode_return(body["return"])}
+                responses[index] = body
+
+        self._echo(payloads, responses)
+        self._is_executing = False
 
-        if self._echo_payload:
-            pprint.pprint(payload)
+        return responses
 
-        if self._echo_execution:
-            pprint.pprint(response)
+    def execute_async(self, command, parameters=None, timeout=0):
+        """
+        Executes given command on a background thread, without blocking.
 
-        self._is_executing = False
+        :param str command:  The command name that you want to execute within PyUeGearCommands class.
+        :param dict parameters: arguments for the command to execute.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: future of the response coming from the Unreal Remote Server.
+        :rtype: concurrent.futures.Future
+        """
 
-        return response
+        return get_executor().submit(
+            self.execute, command, parameters, timeout
+        )
+
+    def execute_batch_async(self, calls, timeout=0):
+        """
+        Executes several commands in a single request, on a background thread.
+
+        :param list(tuple(str, dict)) calls: command names and parameters to execute, in order.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: future of the responses coming from the Unreal Remote Server.
+        :rtype: concurrent.futures.Future
+        """
+
+        return get_executor().submit(self.execute_batch, calls, timeout)
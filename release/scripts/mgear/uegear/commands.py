@@ -153,14 +153,24 @@ def export_selected_assets_to_unreal(
 
     import_path_for_new_assets = ""
 
+    # Checks all the assets in a single request
+    asset_paths = list()
     for static_mesh in static_meshes:
         asset_path = tag.tag_values(
             tag_name=tag.TAG_ASSET_PATH_ATTR_NAME, nodes=[static_mesh]
         )
-        asset_path = asset_path[0] if asset_path else ""
-        asset_exists = uegear_bridge.execute(
-            "does_asset_exist", parameters={"asset_path": asset_path}
-        ).get("ReturnValue", False)
+        asset_paths.append(asset_path[0] if asset_path else "")
+    assets_exist = uegear_bridge.execute_batch(
+        [
+            ("does_asset_exist", {"asset_path": asset_path})
+            for asset_path in asset_paths
+        ]
+    )
+
+    for static_mesh, asset_path, exists_response in zip(
+        static_meshes, asset_paths, assets_exist
+    ):
+        asset_exists = exists_response.get("ReturnValue", False)
 
         if not asset_exists:
             asset_file_name = static_mesh.split("|")[-1]
@@ -587,6 +597,7 @@ def update_selected_transforms():
 
     try:
         objects = cmds.ls(sl=True, sn=True)
+        calls = list()
         for obj in objects:
             ue_world_transform = (
                 ueUtils.get_unreal_engine_transform_for_maya_node(obj)
@@ -598,16 +609,21 @@ def update_selected_transforms():
                 continue
             actor_guid = actor_guids[0]
 
-            result = uegear_bridge.execute(
-                "set_actor_world_transform",
-                parameters={
-                    "actor_guid": actor_guid,
-                    "translation": str(ue_world_transform["rotatePivot"]),
-                    "rotation": str(ue_world_transform["rotation"]),
-                    "scale": str(ue_world_transform["scale"]),
-                    "world_up": str(world_up),
-                },
+            calls.append(
+                (
+                    "set_actor_world_transform",
+                    {
+                        "actor_guid": actor_guid,
+                        "translation": str(ue_world_transform["rotatePivot"]),
+                        "rotation": str(ue_world_transform["rotation"]),
+                        "scale": str(ue_world_transform["scale"]),
+                        "world_up": str(world_up),
+                    },
+                )
             )
+
+        # All the actors are moved in a single request
+        uegear_bridge.execute_batch(calls)
     finally:
         for i, selected_node in enumerate(selected_nodes):
             cmds.setAttr(f"{node_name}.rotateOrder", old_rotation_orders[i])
@@ -766,6 +782,7 @@ def update_sequencer_camera_from_maya():
         tag.TAG_ASSET_PATH_ATTR_NAME, cameras
     )
     camera_export_path = dict()
+    calls = list()
 
     # Export Camera to temp location
     temp_folder = tempfile.gettempdir()
@@ -792,14 +809,19 @@ def update_sequencer_camera_from_maya():
 
         camera_export_path[camera_name] = fbx_file_path
 
-        uegear_bridge.execute(
-            "update_sequencer_camera_from_maya",
-            parameters={
-                "camera_name": camera_name,
-                "sequencer_package": camera_sequence_paths[i],
-                "fbx_path": fbx_file_path,
-            },
-        ).get("ReturnValue", False)
+        calls.append(
+            (
+                "update_sequencer_camera_from_maya",
+                {
+                    "camera_name": camera_name,
+                    "sequencer_package": camera_sequence_paths[i],
+                    "fbx_path": fbx_file_path,
+                },
+            )
+        )
+
+    # Updates all the cameras in a single request
+    uegear_bridge.execute_batch(calls)
 
     # Clean up temporary data
     for path in camera_export_path.values():
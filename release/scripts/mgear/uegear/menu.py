@@ -9,8 +9,9 @@ menuID = "ueGear"
 def install():
     """Installs ueGear sub-menu"""
 
-    cmds.setParent(mgear.menu_id, menu=True)
-    cmds.menuItem(divider=True)
+    if not mgear.menu.is_pending(menuID):
+        cmds.setParent(mgear.menu_id, menu=True)
+        cmds.menuItem(divider=True)
     commands = (
         ("Apply ueGear Tag to selected nodes", str_auto_tag),
         ("Remove ueGear Tags from selected nodes", str_remove_tag),